@@ -115,6 +115,22 @@ MIDDLEWARE = [
     'allauth.account.middleware.AccountMiddleware',
 ]
 
+# Prometheus metrikleri (/metrics) - çok süreçli çalışmada PROMETHEUS_MULTIPROC_DIR ayarlanmalı
+# Uç noktaya staff kullanıcılar veya "Authorization: Bearer <METRICS_TOKEN>" başlığı ile erişilir
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'False').lower() == 'true'
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+if METRICS_ENABLED:
+    MIDDLEWARE.insert(0, 'core.metrics.MetricsMiddleware')
+
+# Sorgu bütçesi profilleyicisi - örneklenen isteklerin sorguları logs/query_profile.log'a yazılır
+# (özet: python manage.py perf_report)
+QUERY_PROFILER_ENABLED = os.getenv('QUERY_PROFILER_ENABLED', 'False').lower() == 'true'
+QUERY_PROFILER_SAMPLE_RATE = float(os.getenv('QUERY_PROFILER_SAMPLE_RATE', '0.01'))
+QUERY_PROFILER_DUPLICATE_THRESHOLD = int(os.getenv('QUERY_PROFILER_DUPLICATE_THRESHOLD', '3'))
+QUERY_PROFILER_LOG = BASE_DIR / 'logs' / 'query_profile.log'
+if QUERY_PROFILER_ENABLED:
+    MIDDLEWARE.insert(0, 'core.query_profiler.QueryProfilerMiddleware')
+
 # Debug Toolbar sadece development ortamında
 if DEBUG:
     INSTALLED_APPS.append('debug_toolbar')
@@ -298,14 +314,14 @@ ADMIN_ENABLED = True  # Admin paneli aktif/pasif kontrolü
 if not DEBUG:
     CACHES = {
         'default': {
-            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'BACKEND': 'core.cache_backends.RedisCache',
             'LOCATION': os.getenv('REDIS_URL', 'redis://127.0.0.1:6379/1'),
         }
     }
 else:
     CACHES = {
         'default': {
-            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'BACKEND': 'core.cache_backends.LocMemCache',
         }
     }
 
@@ -318,6 +334,10 @@ LOGGING = {
             'format': '{levelname} {asctime} {module} {process:d} {thread:d} {message}',
             'style': '{',
         },
+        'raw': {
+            'format': '{message}',
+            'style': '{',
+        },
     },
     'handlers': {
         'file': {
@@ -331,6 +351,15 @@ LOGGING = {
             'class': 'logging.StreamHandler',
             'formatter': 'verbose',
         },
+        'query_profile': {
+            'level': 'INFO',
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': QUERY_PROFILER_LOG,
+            'maxBytes': 10 * 1024 * 1024,  # 10MB
+            'backupCount': 5,
+            'delay': True,
+            'formatter': 'raw',
+        },
     },
     'root': {
         'handlers': ['console', 'file'] if not DEBUG else ['console'],
@@ -347,6 +376,11 @@ LOGGING = {
             'level': 'DEBUG' if DEBUG else 'INFO',
             'propagate': False,
         },
+        'moldpark.query_profile': {
+            'handlers': ['query_profile'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
 
@@ -26,6 +26,7 @@ from django.shortcuts import redirect
 from django.contrib import messages
 from django.views.static import serve
 from accounts.views import center_login
+from core.metrics import metrics_view
 import os
 
 def admin_access_check(user):
@@ -81,6 +82,9 @@ urlpatterns = [
     # SERVICE WORKER
     path('sw.js', service_worker_view, name='service_worker'),
     
+    # PROMETHEUS METRİKLERİ
+    path('metrics', metrics_view, name='metrics'),
+    
     # GÜVENLİ ADMIN ERİŞİMİ
     path('admin/', custom_admin_view, name='admin_redirect'),
     path('django-admin/', admin.site.urls),  # Gerçek admin panel
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CenterConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'center'
+
+    def ready(self):
+        # Panel istatistikleri önbelleği signal'larını yükle
+        from center import signals  # noqa
@@ -0,0 +1,149 @@
+"""
+Merkez Paneli İstatistik Servisi
+Kalıp durum, kulak yönü, kalıp tipi, zaman ve kargo sayımlarını tek bir
+`aggregate()` sorgusunda `Count(filter=Q(...))` ile hesaplar; aktif revizyonlu
+kalıp sayısı için ayrıca tek sorgu çalışır. Sonuç merkez başına önbelleğe
+alınır ve kalıp / revizyon kayıtları değiştiğinde geçersiz kılınır.
+"""
+from datetime import datetime, timedelta
+from datetime import time as dt_time
+
+from django.core.cache import cache
+from django.db.models import Count, Exists, OuterRef, Q
+from django.utils import timezone
+
+from core import cache_versions
+from mold.models import EarMold, ModeledMold
+from producer.models import ProducerNetwork
+
+
+CACHE_TIMEOUT = 60 * 5  # 5 dakika
+VERSION_KEY = 'center_dashboard:{}:version'
+STATS_KEY = 'center_dashboard:{center}:{version}:{day}'
+
+STATUS_KEYS = [
+    'waiting', 'processing', 'completed', 'delivered_pending_approval',
+    'delivered', 'rejected', 'shipping',
+]
+
+# Panelde "revizyonda" sayılan revizyon talebi durumları
+ACTIVE_REVISION_STATUSES = [
+    'pending', 'admin_review', 'approved', 'rejected', 'producer_review',
+    'accepted', 'in_progress', 'quality_check', 'ready_for_delivery',
+]
+
+ACTIVITY_DAYS = 7
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, dt_time.min))
+
+
+def get_version(center_id):
+    """Merkez panel sürümü - yoksa zaman damgası ile başlatılır"""
+    return cache_versions.get_version(VERSION_KEY.format(center_id))
+
+
+def invalidate(center_id):
+    """Merkezin önbellekteki panel istatistiklerini geçersiz kıl"""
+    if not center_id:
+        return
+    cache_versions.bump_version(VERSION_KEY.format(center_id))
+
+
+def compute_stats(center, today=None):
+    """
+    Panel istatistiklerini hesapla - kalıp sayısından bağımsız olarak 3 sorgu
+
+    Returns:
+        dict: total_molds, status_stats, ear_side_stats, mold_type_stats,
+              time_stats, shipment_stats, daily_activity, network_stats
+    """
+    today = today or timezone.localdate()
+    this_week_start = today - timedelta(days=today.weekday())
+    this_month_start = today.replace(day=1)
+    last_30_days = today - timedelta(days=30)
+    activity_days = [today - timedelta(days=i) for i in range(ACTIVITY_DAYS - 1, -1, -1)]
+
+    physical = Q(is_physical_shipment=True)
+    has_model = Exists(ModeledMold.objects.filter(ear_mold=OuterRef('pk')))
+
+    aggregates = {
+        'total': Count('id'),
+        'total_physical': Count('id', filter=physical),
+        # 3D modelleme: dijital tarama VEYA model dosyası yüklenmiş kalıp
+        'digital_scans': Count('id', filter=Q(is_physical_shipment=False) | Q(has_model)),
+        'in_transit': Count('id', filter=physical & Q(shipment_status='in_transit')),
+        'delivered_to_producer': Count('id', filter=physical & Q(shipment_status='delivered_to_producer')),
+        'today': Count('id', filter=Q(created_at__gte=_day_start(today))),
+        'this_week': Count('id', filter=Q(created_at__gte=_day_start(this_week_start))),
+        'this_month': Count('id', filter=Q(created_at__gte=_day_start(this_month_start))),
+        'last_30_days': Count('id', filter=Q(created_at__gte=_day_start(last_30_days))),
+    }
+    for status in STATUS_KEYS:
+        aggregates[f'status_{status}'] = Count('id', filter=Q(status=status))
+    for side, _ in EarMold.EAR_SIDE_CHOICES:
+        aggregates[f'side_{side}'] = Count('id', filter=Q(ear_side=side))
+    for mold_type, _ in EarMold.MOLD_TYPE_CHOICES:
+        aggregates[f'type_{mold_type}'] = Count('id', filter=Q(mold_type=mold_type))
+    for index, day in enumerate(activity_days):
+        aggregates[f'day_{index}'] = Count('id', filter=Q(
+            created_at__gte=_day_start(day), created_at__lt=_day_start(day + timedelta(days=1))
+        ))
+
+    counts = EarMold.objects.filter(center=center).aggregate(**aggregates)
+
+    # Sadece aktif revizyon talebi olan kalıplar
+    revision_count = EarMold.objects.filter(
+        center=center,
+        modeled_files__revision_requests__status__in=ACTIVE_REVISION_STATUSES,
+    ).distinct().count()
+
+    network_stats = ProducerNetwork.objects.filter(center=center).aggregate(
+        active_networks=Count('id', filter=Q(status='active')),
+        total_networks=Count('id'),
+        pending_networks=Count('id', filter=Q(status='pending')),
+    )
+
+    status_stats = {status: counts[f'status_{status}'] for status in STATUS_KEYS}
+    status_stats['revision'] = revision_count
+
+    return {
+        'total_molds': counts['total'],
+        'status_stats': status_stats,
+        'ear_side_stats': {side: counts[f'side_{side}'] for side, _ in EarMold.EAR_SIDE_CHOICES},
+        'mold_type_stats': {mold_type: counts[f'type_{mold_type}'] for mold_type, _ in EarMold.MOLD_TYPE_CHOICES},
+        'time_stats': {
+            'today': counts['today'],
+            'this_week': counts['this_week'],
+            'this_month': counts['this_month'],
+            'last_30_days': counts['last_30_days'],
+        },
+        'shipment_stats': {
+            'total_physical': counts['total_physical'],
+            'digital_scans': counts['digital_scans'],
+            'in_transit': counts['in_transit'],
+            'delivered_to_producer': counts['delivered_to_producer'],
+        },
+        'daily_activity': [
+            {'date': day, 'count': counts[f'day_{index}'], 'day_name': day.strftime('%a')}
+            for index, day in enumerate(activity_days)
+        ],
+        'network_stats': network_stats,
+    }
+
+
+def get_dashboard_stats(center):
+    """
+    Önbellekli panel istatistikleri
+
+    Anahtar merkez sürümü ve günü içerir; gün değişince zaman bazlı
+    sayımlar kendiliğinden yenilenir.
+    """
+    today = timezone.localdate()
+    key = STATS_KEY.format(center=center.pk, version=get_version(center.pk), day=today.isoformat())
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_stats(center, today)
+        cache.set(key, stats, CACHE_TIMEOUT)
+    return stats
@@ -0,0 +1,42 @@
+"""
+Center Signal'ları - Panel istatistikleri önbelleğinin geçersiz kılınması
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from mold.models import EarMold, ModeledMold, RevisionRequest
+from producer.models import ProducerNetwork
+
+from .dashboard_stats import invalidate
+
+
+def _invalidate_on_commit(center_id):
+    if center_id:
+        transaction.on_commit(lambda: invalidate(center_id))
+
+
+@receiver(post_save, sender=EarMold)
+@receiver(post_delete, sender=EarMold)
+def invalidate_dashboard_for_mold(sender, instance, **kwargs):
+    _invalidate_on_commit(instance.center_id)
+
+
+@receiver(post_save, sender=ModeledMold)
+@receiver(post_delete, sender=ModeledMold)
+def invalidate_dashboard_for_modeled_mold(sender, instance, **kwargs):
+    """Model dosyası 3D modelleme sayımını değiştirir"""
+    center_id = EarMold.objects.filter(pk=instance.ear_mold_id).values_list('center_id', flat=True).first()
+    _invalidate_on_commit(center_id)
+
+
+@receiver(post_save, sender=RevisionRequest)
+@receiver(post_delete, sender=RevisionRequest)
+def invalidate_dashboard_for_revision(sender, instance, **kwargs):
+    _invalidate_on_commit(instance.center_id)
+
+
+@receiver(post_save, sender=ProducerNetwork)
+@receiver(post_delete, sender=ProducerNetwork)
+def invalidate_dashboard_for_network(sender, instance, **kwargs):
+    _invalidate_on_commit(instance.center_id)
@@ -1,3 +1,147 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from center.dashboard_stats import compute_stats, get_dashboard_stats
+from center.usage_stats import get_monthly_usage, get_recent_usage, get_usage_totals
+from core.models import Invoice, PricingPlan, UserSubscription
+from core.tests.factories import make_center, make_mold, make_network, make_producer
+from mold.models import EarMold, ModeledMold, RevisionRequest
+from producer.earnings_service import last_months, month_bounds
+
+
+class DashboardStatsTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.center = make_center()
+        make_network(make_producer(), self.center)
+        for index, status in enumerate(['waiting', 'processing', 'completed', 'delivered', 'waiting']):
+            mold = make_mold(self.center, physical=index % 2 == 0, status=status,
+                             ear_side='right' if index % 2 else 'left')
+            EarMold.objects.filter(pk=mold.pk).update(created_at=timezone.now() - timedelta(days=index * 10))
+        self.physical = EarMold.objects.filter(center=self.center, is_physical_shipment=True).first()
+
+    def test_counts_match_querysets(self):
+        with self.assertNumQueries(3):
+            stats = compute_stats(self.center)
+
+        molds = EarMold.objects.filter(center=self.center)
+        self.assertEqual(stats['total_molds'], 5)
+        self.assertEqual(stats['status_stats']['waiting'], 2)
+        self.assertEqual(stats['ear_side_stats']['right'], molds.filter(ear_side='right').count())
+        self.assertEqual(stats['time_stats']['last_30_days'], 4)
+        self.assertEqual(stats['shipment_stats']['total_physical'], 3)
+        self.assertEqual(stats['shipment_stats']['digital_scans'], 2)
+        self.assertEqual(stats['network_stats']['active_networks'], 1)
+        self.assertEqual(sum(day['count'] for day in stats['daily_activity']), 1)
+
+    def test_model_file_counts_as_digital_scan(self):
+        ModeledMold.objects.create(ear_mold=self.physical, file='modeled/test.stl')
+        self.assertEqual(compute_stats(self.center)['shipment_stats']['digital_scans'], 3)
+
+    def test_cached_until_mold_or_revision_changes(self):
+        stats = get_dashboard_stats(self.center)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_dashboard_stats(self.center), stats)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            make_mold(self.center, physical=False)
+        self.assertEqual(get_dashboard_stats(self.center)['total_molds'], 6)
+
+        modeled = ModeledMold.objects.create(ear_mold=self.physical, file='modeled/test.stl')
+        with self.captureOnCommitCallbacks(execute=True):
+            RevisionRequest.objects.create(
+                modeled_mold=modeled, center=self.center, revision_type='other',
+                title='Revizyon', description='Kenar düzeltme',
+            )
+        self.assertEqual(get_dashboard_stats(self.center)['status_stats']['revision'], 1)
+
+    def test_other_center_cache_is_kept(self):
+        other = make_center('Diger Merkez')
+        get_dashboard_stats(other)
+        with self.captureOnCommitCallbacks(execute=True):
+            make_mold(self.center)
+        with self.assertNumQueries(0):
+            get_dashboard_stats(other)
+
+
+class UsageStatsTests(TestCase):
+
+    def setUp(self):
+        self.center = make_center()
+        # Son 3 ayın her birine bir fiziksel ve bir dijital kalıp
+        self.months = list(reversed(last_months(3)))
+        for year, month in self.months:
+            created_at = month_bounds(year, month)[0] + timedelta(days=1)
+            for physical in (True, False):
+                mold = make_mold(self.center, physical=physical)
+                EarMold.objects.filter(pk=mold.pk).update(created_at=created_at)
+        self.modeled = EarMold.objects.filter(center=self.center, is_physical_shipment=True).first()
+        ModeledMold.objects.create(ear_mold=self.modeled, file='modeled/test.stl')
+
+    def test_monthly_series_in_one_query(self):
+        with self.assertNumQueries(1):
+            series = get_monthly_usage(self.center, 6)
+
+        self.assertEqual(len(series), 6)
+        self.assertEqual([row['total'] for row in series[:3]], [0, 0, 0])
+        self.assertEqual([(row['year'], row['month_number']) for row in series[3:]], self.months)
+        self.assertEqual(sum(row['physical'] for row in series), 3)
+        # Model dosyası yüklenmiş fiziksel kalıp 3D modelleme olarak da sayılır
+        self.assertEqual(sum(row['digital'] for row in series), 4)
+
+    def test_totals_and_recent_usage(self):
+        start = month_bounds(*self.months[-1])[0]
+        totals = get_usage_totals(self.center, start, start)
+        self.assertEqual((totals['physical_this_month'], totals['physical_total']), (1, 3))
+        self.assertEqual(totals['digital_total'], 4)
+        self.assertEqual(totals['waiting'], 6)
+
+        recent = get_recent_usage(self.center, limit=10)
+        self.assertEqual(len(recent), 6)
+        self.assertEqual({item['id'] for item in recent if item['has_model']}, {self.modeled.pk})
+
+    def test_usage_data_endpoint(self):
+        plan = PricingPlan.objects.create(
+            name='Standart Abonelik', plan_type='standard', per_mold_price_try=450,
+            modeling_service_fee_try=19, monthly_fee_try=100,
+        )
+        UserSubscription.objects.create(user=self.center.user, plan=plan, status='active')
+        self.client.force_login(self.center.user)
+        url = reverse('center:my_usage_data')
+
+        response = self.client.get(url, {'months': 24})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['months']), 24)
+        self.assertEqual(response.json()['months'][-1]['physical'], 1)
+
+        self.assertEqual(self.client.get(url, {'months': 'abc'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'months': 99}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('center:my_usage')).status_code, 200)
+
+
+class DashboardViewTests(TestCase):
+
+    def test_invoice_totals(self):
+        center = make_center()
+        for number, status in [('F-1', 'paid'), ('F-2', 'issued')]:
+            Invoice.objects.create(
+                user=center.user, invoice_type='center', invoice_number=number,
+                status=status, issue_date=timezone.localdate(), due_date=timezone.localdate(),
+                total_amount=Decimal('100.00'),
+            )
+        self.client.force_login(center.user)
+
+        response = self.client.get(reverse('center:dashboard'))
 
-# Create your tests here.
+        self.assertEqual(response.status_code, 200)
+        invoice_stats = response.context['invoice_stats']
+        self.assertEqual(invoice_stats['total_amount'], Decimal('200.00'))
+        self.assertEqual(invoice_stats['paid_amount'], Decimal('100.00'))
+        self.assertEqual(invoice_stats['pending_amount'], Decimal('100.00'))
+        self.assertEqual(response.context['total_molds'], 0)
@@ -16,6 +16,7 @@ urlpatterns = [
 
     # Usage Details
     path('my-usage/', views.my_usage, name='my_usage'),
+    path('my-usage/data/', views.my_usage_data, name='my_usage_data'),
     path('usage/', views.billing_invoices, name='usage_details'),
     path('usage/<int:invoice_id>/', views.billing_invoice_detail, name='usage_invoice_detail'),
     
@@ -0,0 +1,101 @@
+"""
+Merkez Kullanım Analitiği
+Fiziksel kalıp ve 3D modelleme kullanımını ay bazında tek bir `TruncMonth`
+gruplu sorgusu ile hesaplar; boş aylar Python tarafında doldurulur.
+Kullanım sayfası ve grafiğin JSON uç noktası aynı fonksiyonları kullanır.
+"""
+from django.db.models import Count, Exists, OuterRef, Q
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from mold.models import EarMold, ModeledMold
+from producer.earnings_service import MONTH_NAMES, last_months, month_bounds
+
+
+MAX_MONTHS = 60
+
+# 3D modelleme: dijital tarama VEYA model dosyası yüklenmiş kalıp
+HAS_MODEL = Exists(ModeledMold.objects.filter(ear_mold=OuterRef('pk')))
+DIGITAL = Q(is_physical_shipment=False) | Q(has_model=True)
+PHYSICAL = Q(is_physical_shipment=True)
+
+
+def usage_queryset(center):
+    """Merkez kalıpları - 3D modelleme tespiti için has_model ile"""
+    return EarMold.objects.filter(center=center).annotate(has_model=HAS_MODEL)
+
+
+def get_monthly_usage(center, months=12):
+    """
+    Son `months` ayın fiziksel / dijital kullanım serisi - eskiden yeniye
+
+    Returns:
+        list: [{'year', 'month_number', 'month', 'physical', 'digital', 'total'}]
+    """
+    months = max(1, min(int(months), MAX_MONTHS))
+    month_list = list(reversed(last_months(months)))
+    start = month_bounds(*month_list[0])[0]
+
+    rows = (
+        usage_queryset(center)
+        .filter(created_at__gte=start)
+        .annotate(period=TruncMonth('created_at', tzinfo=timezone.get_current_timezone()))
+        .order_by()
+        .values('period')
+        .annotate(
+            physical=Count('id', filter=PHYSICAL),
+            digital=Count('id', filter=DIGITAL),
+        )
+    )
+    counts = {}
+    for row in rows:
+        period = timezone.localtime(row['period']) if timezone.is_aware(row['period']) else row['period']
+        counts[(period.year, period.month)] = row
+
+    series = []
+    for year, month in month_list:
+        row = counts.get((year, month), {})
+        physical = row.get('physical', 0)
+        digital = row.get('digital', 0)
+        series.append({
+            'year': year,
+            'month_number': month,
+            'month': MONTH_NAMES[month],
+            'physical': physical,
+            'digital': digital,
+            'total': physical + digital,
+        })
+    return series
+
+
+def get_usage_totals(center, month_start, year_start):
+    """Bu ay / bu yıl / toplam kullanım ve durum sayımları - tek aggregate sorgusu"""
+    this_month = Q(created_at__gte=month_start)
+    this_year = Q(created_at__gte=year_start)
+    return usage_queryset(center).aggregate(
+        physical_this_month=Count('id', filter=PHYSICAL & this_month),
+        physical_this_year=Count('id', filter=PHYSICAL & this_year),
+        physical_total=Count('id', filter=PHYSICAL),
+        digital_this_month=Count('id', filter=DIGITAL & this_month),
+        digital_this_year=Count('id', filter=DIGITAL & this_year),
+        digital_total=Count('id', filter=DIGITAL),
+        waiting=Count('id', filter=Q(status='waiting')),
+        processing=Count('id', filter=Q(status='processing')),
+        completed=Count('id', filter=Q(status='completed')),
+        delivered=Count('id', filter=Q(status='delivered')),
+    )
+
+
+def get_recent_usage(center, limit=10):
+    """Son kullanımlar - model dosyası kontrolü Exists ile aynı sorguda"""
+    recent = []
+    for mold in usage_queryset(center).order_by('-created_at')[:limit]:
+        recent.append({
+            'date': mold.created_at,
+            'patient': f"{mold.patient_name} {mold.patient_surname}",
+            'type': 'Fiziksel Kalıp' if mold.is_physical_shipment else '3D Modelleme',
+            'has_model': mold.has_model,
+            'status': mold.get_status_display(),
+            'id': mold.id
+        })
+    return recent
@@ -18,6 +18,7 @@ from django.http import JsonResponse, Http404
 from django.utils import timezone
 from django.core.paginator import Paginator
 from django.http import JsonResponse
+from core.badge_counters import get_unread_broadcasts
 from core.models import Invoice
 import os
 
@@ -170,50 +171,20 @@ def dashboard(request):
     
 
     # TEMEL İSTATİSTİKLER
+    # Tüm kalıp sayımları tek aggregate sorgusundan gelir ve merkez başına önbelleğe alınır
+    from .dashboard_stats import get_dashboard_stats
+
+    stats = get_dashboard_stats(center)
     molds = center.molds.all()
-    total_molds = molds.count()
-    
-    # Durum bazlı istatistikler
-    status_stats = {
-        'waiting': molds.filter(status='waiting').count(),
-        'processing': molds.filter(status='processing').count(),
-        'completed': molds.filter(status='completed').count(),
-        'delivered_pending_approval': molds.filter(status='delivered_pending_approval').count(),
-        'delivered': molds.filter(status='delivered').count(),
-        'revision': molds.filter(
-            modeled_files__revision_requests__status__in=['pending', 'admin_review', 'approved', 'rejected', 'producer_review', 'accepted', 'in_progress', 'quality_check', 'ready_for_delivery']
-        ).distinct().count(),  # Sadece aktif revizyon talepleri olan kalıpları say
-        'rejected': molds.filter(status='rejected').count(),
-        'shipping': molds.filter(status='shipping').count(),
-    }
+    total_molds = stats['total_molds']
+    status_stats = stats['status_stats']
     
     pending_molds = status_stats['waiting'] + status_stats['processing']
     active_molds = total_molds - status_stats['delivered'] - status_stats['rejected']
     
-    # Kulak yönü istatistikleri
-    ear_side_stats = {
-        'right': molds.filter(ear_side='right').count(),
-        'left': molds.filter(ear_side='left').count(),
-    }
-    
-    # Kalıp türü istatistikleri  
-    mold_type_stats = {}
-    for choice in EarMold.MOLD_TYPE_CHOICES:
-        mold_type_stats[choice[0]] = molds.filter(mold_type=choice[0]).count()
-    
-    # ZAMAN BAZLI İSTATİSTİKLER
-    from datetime import datetime, timedelta
-    today = timezone.now().date()
-    this_week_start = today - timedelta(days=today.weekday())
-    this_month_start = today.replace(day=1)
-    last_30_days = today - timedelta(days=30)
-    
-    time_stats = {
-        'today': molds.filter(created_at__date=today).count(),
-        'this_week': molds.filter(created_at__date__gte=this_week_start).count(),
-        'this_month': molds.filter(created_at__date__gte=this_month_start).count(),
-        'last_30_days': molds.filter(created_at__date__gte=last_30_days).count(),
-    }
+    ear_side_stats = stats['ear_side_stats']
+    mold_type_stats = stats['mold_type_stats']
+    time_stats = stats['time_stats']
     
     # ABONELİK VE LİMİT KONTROLÜ
     from core.models import UserSubscription, SubscriptionRequest
@@ -229,7 +200,8 @@ def dashboard(request):
     try:
         subscription = UserSubscription.objects.get(user=request.user, status='active')
         has_active_subscription = True
-        used_molds = subscription.models_used_this_month
+        # Bu ayın kullanımı defterden - GET isteği sayaçlara yazmaz
+        used_molds = subscription.get_current_month_usage()['physical']
         monthly_limit = subscription.plan.monthly_model_limit or 999999
         remaining_limit = min(200, max(0, monthly_limit - used_molds))  # Maksimum 200 ile sınırla
         
@@ -237,9 +209,6 @@ def dashboard(request):
             usage_percentage = min(100, int((used_molds / monthly_limit) * 100))
             usage_offset = 327 - (327 * usage_percentage / 100)
         
-        # Subscription reset kontrolü
-        subscription.reset_monthly_usage_if_needed()
-        
         # ABONELİK UYARILARI
         if subscription.plan.plan_type == 'trial':
             if remaining_limit == 0:
@@ -334,26 +303,13 @@ def dashboard(request):
         status='active'
     ).select_related('producer')
     
-    network_stats = {
-        'active_networks': producer_networks.count(),
-        'total_networks': ProducerNetwork.objects.filter(center=center).count(),
-        'pending_networks': ProducerNetwork.objects.filter(center=center, status='pending').count(),
-    }
+    network_stats = stats['network_stats']
     
     # SON AKTİVİTELER
     recent_molds = molds.select_related().order_by('-created_at')[:8]
     
     # Son 7 güne ait günlük aktivite
-    daily_activity = []
-    for i in range(7):
-        day = today - timedelta(days=i)
-        day_molds = molds.filter(created_at__date=day).count()
-        daily_activity.append({
-            'date': day,
-            'count': day_molds,
-            'day_name': day.strftime('%a')
-        })
-    daily_activity.reverse()
+    daily_activity = stats['daily_activity']
     
     # BİLDİRİMLER
     from core.models import SimpleNotification
@@ -384,8 +340,7 @@ def dashboard(request):
     except Exception:
         unread_direct = 0
     
-    # MessageRecipient tablosu kaldırıldığı için broadcast hesaplaması yapma
-    unread_broadcast = 0
+    unread_broadcast = get_unread_broadcasts(request.user)
     
     total_messages = user_messages.count()
     unread_message_count = unread_direct + unread_broadcast
@@ -399,17 +354,7 @@ def dashboard(request):
         average_processing_time = "N/A"
     
     # FİZİKSEL GÖNDERİM İSTATİSTİKLERİ
-    physical_shipments = molds.filter(is_physical_shipment=True)
-    # 3D modelleme sayısı: is_physical_shipment=False olanlar VEYA ModeledMold kaydı olanlar
-    digital_scans_count = molds.filter(
-        Q(is_physical_shipment=False) | Q(modeled_files__isnull=False)
-    ).distinct().count()
-    shipment_stats = {
-        'total_physical': physical_shipments.count(),
-        'digital_scans': digital_scans_count,
-        'in_transit': physical_shipments.filter(shipment_status='in_transit').count(),
-        'delivered_to_producer': physical_shipments.filter(shipment_status='delivered_to_producer').count(),
-    }
+    shipment_stats = stats['shipment_stats']
     
     # FATURA BİLGİLERİ
     from core.models import Invoice, UserSubscription
@@ -438,14 +383,20 @@ def dashboard(request):
             issue_date__month=current_month
         )
 
-        invoice_stats['total_invoices'] = invoices.count()
-        invoice_stats['paid_invoices'] = invoices.filter(status='paid').count()
-        invoice_stats['pending_invoices'] = invoices.filter(status='issued').count()
-        invoice_stats['overdue_invoices'] = invoices.filter(status='overdue').count()
-
-        invoice_stats['total_amount'] = sum(inv.total_amount for inv in invoices)
-        invoice_stats['paid_amount'] = sum(inv.total_amount for inv in invoices.filter(status='paid'))
-        invoice_stats['pending_amount'] = sum(inv.total_amount for inv in invoices.filter(status='issued'))
+        invoice_totals = invoices.aggregate(
+            total_invoices=Count('id'),
+            paid_invoices=Count('id', filter=Q(status='paid')),
+            pending_invoices=Count('id', filter=Q(status='issued')),
+            overdue_invoices=Count('id', filter=Q(status='overdue')),
+            # Alan adıyla çakışmaması için toplamlar farklı adla hesaplanır
+            amount_total=models.Sum('total_amount'),
+            amount_paid=models.Sum('total_amount', filter=Q(status='paid')),
+            amount_pending=models.Sum('total_amount', filter=Q(status='issued')),
+        )
+        invoice_totals['total_amount'] = invoice_totals.pop('amount_total') or 0
+        invoice_totals['paid_amount'] = invoice_totals.pop('amount_paid') or 0
+        invoice_totals['pending_amount'] = invoice_totals.pop('amount_pending') or 0
+        invoice_stats.update(invoice_totals)
 
         # Son 3 fatura
         invoice_stats['recent_invoices'] = invoices.order_by('-issue_date')[:3]
@@ -961,6 +912,7 @@ def admin_revision_list(request):
     """Admin revizyon talepleri listesi - sadece görüntüleme"""
     try:
         from mold.models import RevisionRequest
+        from mold.revision_timeline import overdue
         
         # Filtreler
         status_filter = request.GET.get('status', '')
@@ -971,7 +923,7 @@ def admin_revision_list(request):
         revision_requests = RevisionRequest.objects.select_related(
             'modeled_mold__ear_mold',
             'center'
-        ).all()
+        ).prefetch_related('events')
         
         # Filtreleme
         if status_filter:
@@ -993,7 +945,7 @@ def admin_revision_list(request):
         pending_count = revision_requests.filter(status='pending').count()
         in_progress_count = revision_requests.filter(status='in_progress').count()
         completed_count = revision_requests.filter(status='completed').count()
-        overdue_count = len([r for r in revision_requests if r.is_overdue()])
+        overdue_count = overdue(revision_requests).count()
         
         # Sayfalama
         paginator = Paginator(revision_requests, 10)
@@ -1848,45 +1800,25 @@ def my_usage(request):
     
     # Fiziksel kalıplar
     physical_molds = all_molds.filter(is_physical_shipment=True)
-    physical_this_month = physical_molds.filter(created_at__gte=current_month_start).count()
-    physical_this_year = physical_molds.filter(created_at__gte=current_year_start).count()
-    physical_total = physical_molds.count()
     
     # 3D modelleme hizmetleri (is_physical_shipment=False VEYA ModeledMold kaydı olanlar)
     digital_molds = all_molds.filter(
         Q(is_physical_shipment=False) | Q(modeled_files__isnull=False)
     ).distinct()
-    digital_this_month = digital_molds.filter(created_at__gte=current_month_start).count()
-    digital_this_year = digital_molds.filter(created_at__gte=current_year_start).count()
-    digital_total = digital_molds.count()
 
-    
+    # Kullanım sayımları tek aggregate, aylık grafik tek TruncMonth sorgusu ile
+    from .usage_stats import get_monthly_usage, get_recent_usage, get_usage_totals
+
+    usage_totals = get_usage_totals(center, current_month_start, current_year_start)
+    physical_this_month = usage_totals['physical_this_month']
+    physical_this_year = usage_totals['physical_this_year']
+    physical_total = usage_totals['physical_total']
+    digital_this_month = usage_totals['digital_this_month']
+    digital_this_year = usage_totals['digital_this_year']
+    digital_total = usage_totals['digital_total']
+
     # Aylık kullanım grafiği için veri (son 12 ay)
-    monthly_data = []
-    for i in range(11, -1, -1):
-        month_date = today - timedelta(days=30*i)
-        month_start = month_date.replace(day=1)
-        month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
-        
-        month_physical = physical_molds.filter(
-            created_at__gte=month_start,
-            created_at__lte=month_end
-        ).count()
-        
-        month_digital = all_molds.filter(
-            Q(is_physical_shipment=False) | Q(modeled_files__isnull=False)
-        ).filter(
-            created_at__gte=month_start,
-            created_at__lte=month_end
-        ).distinct().count()
-        
-        monthly_data.append({
-            'month': month_date.strftime('%B'),
-            'year': month_date.year,
-            'physical': month_physical,
-            'digital': month_digital,
-            'total': month_physical + month_digital
-        })
+    monthly_data = get_monthly_usage(center, 12)
     
     # Kullanım limitleri
     usage_limits = {
@@ -1904,7 +1836,7 @@ def my_usage(request):
             # Aylık limit (maksimum 105 ile sınırlı)
             plan_limit = subscription.plan.monthly_model_limit or 0
             usage_limits['monthly_limit'] = min(105, plan_limit) if plan_limit > 0 else 105
-            usage_limits['used_this_month'] = subscription.models_used_this_month
+            usage_limits['used_this_month'] = subscription.get_current_month_usage()['physical']
             usage_limits['remaining'] = max(0, usage_limits['monthly_limit'] - usage_limits['used_this_month'])
             
             if usage_limits['monthly_limit'] > 0:
@@ -1920,26 +1852,14 @@ def my_usage(request):
     
     # Durum bazlı istatistikler
     status_stats = {
-        'waiting': all_molds.filter(status='waiting').count(),
-        'processing': all_molds.filter(status='processing').count(),
-        'completed': all_molds.filter(status='completed').count(),
-        'delivered': all_molds.filter(status='delivered').count(),
+        'waiting': usage_totals['waiting'],
+        'processing': usage_totals['processing'],
+        'completed': usage_totals['completed'],
+        'delivered': usage_totals['delivered'],
     }
     
     # Son 10 kullanım
-    recent_usage = []
-    for mold in all_molds.order_by('-created_at')[:10]:
-        usage_type = 'Fiziksel Kalıp' if mold.is_physical_shipment else '3D Modelleme'
-        if not mold.is_physical_shipment and mold.modeled_files.exists():
-            usage_type = '3D Modelleme'
-        
-        recent_usage.append({
-            'date': mold.created_at,
-            'patient': f"{mold.patient_name} {mold.patient_surname}",
-            'type': usage_type,
-            'status': mold.get_status_display(),
-            'id': mold.id
-        })
+    recent_usage = get_recent_usage(center, 10)
     
     # Faturalama özeti
     current_month = datetime.now().month
@@ -2205,6 +2125,25 @@ def my_usage(request):
     return render(request, 'center/my_usage.html', context)
 
 
+@login_required
+@center_required
+def my_usage_data(request):
+    """Aylık kullanım grafiği verisi (JSON) - ?months=1..60"""
+    from .usage_stats import MAX_MONTHS, get_monthly_usage
+
+    try:
+        months = int(request.GET.get('months', 12))
+    except (TypeError, ValueError):
+        return JsonResponse({'success': False, 'message': 'Geçersiz ay sayısı.'}, status=400)
+    if not 1 <= months <= MAX_MONTHS:
+        return JsonResponse({'success': False, 'message': f'Ay sayısı 1-{MAX_MONTHS} arasında olmalı.'}, status=400)
+
+    return JsonResponse({
+        'success': True,
+        'months': get_monthly_usage(request.user.center, months),
+    })
+
+
 # ==================== SEVK İRSALİYESİ İŞLEMLERİ ====================
 
 @login_required
@@ -4,8 +4,10 @@ from .models import (
     ContactMessage, Message, PricingPlan, UserSubscription, PaymentHistory,
     SimpleNotification, SubscriptionRequest, PricingConfiguration,
     BankTransferConfiguration, PaymentMethod, Payment,
-    CargoCompany, CargoShipment, CargoTracking, CargoIntegration, CargoLabel
+    CargoCompany, CargoShipment, CargoTracking, CargoIntegration, CargoLabel,
+    LedgerPeriod, CenterLedgerSnapshot, ProducerLedgerSnapshot
 )
+from .pricing_cache import invalidate as invalidate_pricing_cache
 
 @admin.register(ContactMessage)
 class ContactMessageAdmin(admin.ModelAdmin):
@@ -295,6 +297,8 @@ class PricingConfigurationAdmin(admin.ModelAdmin):
         PricingConfiguration.objects.filter(is_active=True).update(is_active=False)
         pricing.is_active = True
         pricing.save()
+        # Tüm worker'ların süreç içi fiyatlandırma kopyasını yenile
+        invalidate_pricing_cache()
         
         self.message_user(request, f'{pricing.name} fiyatlandırması aktif edildi.')
     activate_pricing.short_description = "Seçilen fiyatlandırmayı aktif yap"
@@ -302,6 +306,7 @@ class PricingConfigurationAdmin(admin.ModelAdmin):
     def deactivate_pricing(self, request, queryset):
         """Seçilen fiyatlandırmaları pasif yap"""
         count = queryset.update(is_active=False)
+        invalidate_pricing_cache()
         self.message_user(request, f'{count} fiyatlandırma pasif edildi.')
     deactivate_pricing.short_description = "Seçilen fiyatlandırmaları pasif yap"
     
@@ -605,3 +610,45 @@ class CargoLabelAdmin(admin.ModelAdmin):
         queryset.update(is_active=False)
         self.message_user(request, f'{queryset.count()} etiket şablonu devre dışı bırakıldı.')
     deactivate_labels.short_description = "Şablonları devre dışı bırak"
+
+
+class ReadOnlyLedgerAdmin(admin.ModelAdmin):
+    """Kapatılmış dönem kayıtları sadece görüntülenir - close_ledger_period komutu ile yazılır"""
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(LedgerPeriod)
+class LedgerPeriodAdmin(ReadOnlyLedgerAdmin):
+    list_display = ('__str__', 'status', 'closed_at', 'closed_by')
+    list_filter = ('status', 'year')
+    ordering = ('-year', '-month')
+
+
+@admin.register(CenterLedgerSnapshot)
+class CenterLedgerSnapshotAdmin(ReadOnlyLedgerAdmin):
+    list_display = (
+        'period', 'center_name', 'physical_count', 'digital_count',
+        'gross_amount', 'vat_amount', 'moldpark_fee', 'paid_amount'
+    )
+    list_filter = ('period',)
+    search_fields = ('center_name',)
+    list_select_related = ('period',)
+
+
+@admin.register(ProducerLedgerSnapshot)
+class ProducerLedgerSnapshotAdmin(ReadOnlyLedgerAdmin):
+    list_display = (
+        'period', 'producer_name', 'total_orders', 'gross_revenue',
+        'moldpark_fee', 'net_earnings', 'paid_amount', 'pending_amount'
+    )
+    list_filter = ('period',)
+    search_fields = ('producer_name',)
+    list_select_related = ('period',)
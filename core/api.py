@@ -17,9 +17,13 @@ from producer.models import Producer, ProducerOrder, ProducerNetwork
 from mold.models import EarMold
 from datetime import timedelta
 import json
+import time
 from django.db import connection
 from django.conf import settings
 from django.contrib.admin.views.decorators import staff_member_required
+from .metrics import process_uptime
+from .lead_time import LEAD_TIME, MAX_DAYS, get_lead_time_stats, summarize, visible_producer_ids
+from .status_snapshot import get_snapshot, snapshot_response
 
 
 class SystemStatusAPI(View):
@@ -27,7 +31,12 @@ class SystemStatusAPI(View):
     
     @method_decorator(login_required)
     def get(self, request):
-        """Sistem genel durumu"""
+        """Sistem genel durumu - önbellekteki anlık görüntüden"""
+        snapshot = get_snapshot('system_status', self.build_status)
+        return snapshot_response(request, snapshot)
+    
+    def build_status(self):
+        """Sistem genel durumu belgesi"""
         now = timezone.now()
         last_24h = now - timedelta(hours=24)
         last_7d = now - timedelta(days=7)
@@ -38,7 +47,7 @@ class SystemStatusAPI(View):
             'system': {
                 'status': 'healthy',
                 'version': '2.0.0',
-                'uptime': '24/7',
+                'uptime': process_uptime(),
                 'last_updated': now.isoformat(),
             },
             'users': {
@@ -81,23 +90,12 @@ class SystemStatusAPI(View):
         health_score = self.calculate_health_score(stats)
         stats['system']['health_score'] = health_score
         
-        return JsonResponse(stats)
+        return stats
     
     def get_performance_metrics(self, since_date):
         """Performans metrikleri hesapla"""
-        completed_orders = ProducerOrder.objects.filter(
-            status='delivered',
-            created_at__gte=since_date,
-            actual_delivery__isnull=False
-        )
-        
-        avg_delivery_time = 0
-        if completed_orders.exists():
-            total_time = sum([
-                (order.actual_delivery - order.created_at).days 
-                for order in completed_orders
-            ])
-            avg_delivery_time = round(total_time / completed_orders.count(), 1)
+        # Teslimat süreleri veritabanında hesaplanır ve önbellekten okunur
+        lead_time = get_lead_time_stats(30)
         
         # Kalite skorları
         quality_scores = EarMold.objects.filter(
@@ -106,7 +104,8 @@ class SystemStatusAPI(View):
         ).aggregate(avg_quality=Avg('quality_score'))
         
         return {
-            'avg_delivery_days': avg_delivery_time,
+            'avg_delivery_days': lead_time['overall']['mean'],
+            'lead_time': lead_time,
             'avg_quality_score': round(quality_scores['avg_quality'] or 0, 1),
             'completion_rate': self.calculate_completion_rate(since_date),
         }
@@ -147,6 +146,29 @@ class SystemStatusAPI(View):
         return max(0, min(100, score))
 
 
+@require_http_methods(["GET"])
+@login_required
+def lead_time_api(request):
+    """Teslimat süresi analitiği API - genel, üretici, öncelik ve ay bazında (üretici kırılımı kullanıcıya göre)"""
+    try:
+        days = int(request.GET.get('days', 30))
+    except (TypeError, ValueError):
+        return JsonResponse({'error': 'Geçersiz gün sayısı'}, status=400)
+    if not 1 <= days <= MAX_DAYS:
+        return JsonResponse({'error': f'Gün sayısı 1 ile {MAX_DAYS} arasında olmalıdır'}, status=400)
+    
+    stats = get_lead_time_stats(days)
+    producer_ids = visible_producer_ids(request.user)
+    by_producer = stats['by_producer']
+    if producer_ids is not None:
+        by_producer = [row for row in by_producer if row['producer_id'] in producer_ids]
+    return JsonResponse({
+        **stats,
+        'by_producer': by_producer,
+        'last_updated': timezone.now().isoformat(),
+    })
+
+
 @require_http_methods(["GET"])
 @login_required
 def production_pipeline_api(request):
@@ -288,149 +310,156 @@ def health_check_api(request):
         }, status=500)
 
 
-@require_http_methods(["GET"])
-@login_required
-def system_health_api(request):
-    """Sistem sağlık durumu API"""
+def build_system_health():
+    """Sistem sağlık durumu belgesi"""
+    # Temel sağlık kontrolleri
+    health_data = {
+        'timestamp': timezone.now().isoformat(),
+        'score': 85,  # Dinamik hesaplanacak
+        'status': 'healthy',
+        'components': {}
+    }
+    
+    # Database sağlığı
     try:
-        # Temel sağlık kontrolleri
-        health_data = {
-            'timestamp': timezone.now().isoformat(),
-            'score': 85,  # Dinamik hesaplanacak
+        start = time.perf_counter()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        health_data['components']['database'] = {
             'status': 'healthy',
-            'components': {}
+            'response_time': f'{(time.perf_counter() - start) * 1000:.1f}ms'
         }
-        
-        # Database sağlığı
-        try:
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT 1")
-            health_data['components']['database'] = {
+    except Exception as e:
+        health_data['components']['database'] = {
+            'status': 'unhealthy',
+            'error': str(e)
+        }
+        health_data['score'] -= 30
+    
+    # Cache sağlığı
+    try:
+        from django.core.cache import cache
+        cache.set('health_check', 'ok', 60)
+        if cache.get('health_check') == 'ok':
+            health_data['components']['cache'] = {
                 'status': 'healthy',
-                'response_time': '< 50ms'
+                'type': 'active'
             }
-        except Exception as e:
-            health_data['components']['database'] = {
-                'status': 'unhealthy',
-                'error': str(e)
-            }
-            health_data['score'] -= 30
-        
-        # Cache sağlığı
-        try:
-            from django.core.cache import cache
-            cache.set('health_check', 'ok', 60)
-            if cache.get('health_check') == 'ok':
-                health_data['components']['cache'] = {
-                    'status': 'healthy',
-                    'type': 'active'
-                }
-            else:
-                health_data['components']['cache'] = {
-                    'status': 'warning',
-                    'type': 'inactive'
-                }
-                health_data['score'] -= 10
-        except Exception:
+        else:
             health_data['components']['cache'] = {
                 'status': 'warning',
-                'type': 'unavailable'
-            }
-            health_data['score'] -= 5
-        
-        # Disk kullanımı
-        try:
-            import shutil
-            total, used, free = shutil.disk_usage(settings.BASE_DIR)
-            usage_percent = (used / total) * 100
-            
-            health_data['components']['disk'] = {
-                'status': 'healthy' if usage_percent < 80 else 'warning' if usage_percent < 90 else 'critical',
-                'usage_percent': round(usage_percent, 1),
-                'free_gb': round(free / (1024**3), 1)
-            }
-            
-            if usage_percent > 90:
-                health_data['score'] -= 20
-            elif usage_percent > 80:
-                health_data['score'] -= 10
-                
-        except Exception:
-            health_data['components']['disk'] = {
-                'status': 'unknown',
-                'error': 'Unable to check disk usage'
-            }
-        
-        # Ağ sağlığı
-        active_networks = ProducerNetwork.objects.filter(status='active').count()
-        total_networks = ProducerNetwork.objects.count()
-        
-        if total_networks > 0:
-            network_health_percent = (active_networks / total_networks) * 100
-            health_data['components']['network'] = {
-                'status': 'healthy' if network_health_percent > 70 else 'warning',
-                'active_networks': active_networks,
-                'total_networks': total_networks,
-                'health_percent': round(network_health_percent, 1)
-            }
-            
-            if network_health_percent < 50:
-                health_data['score'] -= 15
-            elif network_health_percent < 70:
-                health_data['score'] -= 5
-        else:
-            health_data['components']['network'] = {
-                'status': 'healthy',
-                'active_networks': 0,
-                'total_networks': 0
+                'type': 'inactive'
             }
-        
-        # Kritik uyarılar
-        critical_alerts = []
-        
-        # Geciken siparişler
-        overdue_orders = ProducerOrder.objects.filter(
-            estimated_delivery__lt=timezone.now(),
-            status__in=['received', 'designing', 'production', 'quality_check']
-        ).count()
-        
-        if overdue_orders > 10:
-            critical_alerts.append({
-                'type': 'overdue_orders',
-                'message': f'{overdue_orders} sipariş gecikmiş',
-                'severity': 'high'
-            })
             health_data['score'] -= 10
+    except Exception:
+        health_data['components']['cache'] = {
+            'status': 'warning',
+            'type': 'unavailable'
+        }
+        health_data['score'] -= 5
+    
+    # Disk kullanımı
+    try:
+        import shutil
+        total, used, free = shutil.disk_usage(settings.BASE_DIR)
+        usage_percent = (used / total) * 100
+        
+        health_data['components']['disk'] = {
+            'status': 'healthy' if usage_percent < 80 else 'warning' if usage_percent < 90 else 'critical',
+            'usage_percent': round(usage_percent, 1),
+            'free_gb': round(free / (1024**3), 1)
+        }
         
-        # Güvenlik riskleri
-        risky_producers = Producer.objects.filter(
-            user__is_staff=True
-        ) | Producer.objects.filter(
-            user__is_superuser=True
-        )
-        
-        if risky_producers.exists():
-            critical_alerts.append({
-                'type': 'security_risk',
-                'message': f'{risky_producers.count()} üretici hesabının admin yetkisi var',
-                'severity': 'critical'
-            })
-            health_data['score'] -= 25
-        
-        health_data['critical_alerts'] = critical_alerts
-        health_data['last_check'] = timezone.now()
-        
-        # Genel durum belirleme
-        if health_data['score'] >= 90:
-            health_data['status'] = 'excellent'
-        elif health_data['score'] >= 70:
-            health_data['status'] = 'good'
-        elif health_data['score'] >= 50:
-            health_data['status'] = 'warning'
-        else:
-            health_data['status'] = 'critical'
+        if usage_percent > 90:
+            health_data['score'] -= 20
+        elif usage_percent > 80:
+            health_data['score'] -= 10
+            
+    except Exception:
+        health_data['components']['disk'] = {
+            'status': 'unknown',
+            'error': 'Unable to check disk usage'
+        }
+    
+    # Ağ sağlığı
+    active_networks = ProducerNetwork.objects.filter(status='active').count()
+    total_networks = ProducerNetwork.objects.count()
+    
+    if total_networks > 0:
+        network_health_percent = (active_networks / total_networks) * 100
+        health_data['components']['network'] = {
+            'status': 'healthy' if network_health_percent > 70 else 'warning',
+            'active_networks': active_networks,
+            'total_networks': total_networks,
+            'health_percent': round(network_health_percent, 1)
+        }
         
-        return JsonResponse(health_data)
+        if network_health_percent < 50:
+            health_data['score'] -= 15
+        elif network_health_percent < 70:
+            health_data['score'] -= 5
+    else:
+        health_data['components']['network'] = {
+            'status': 'healthy',
+            'active_networks': 0,
+            'total_networks': 0
+        }
+    
+    # Kritik uyarılar
+    critical_alerts = []
+    
+    # Geciken siparişler
+    overdue_orders = ProducerOrder.objects.filter(
+        estimated_delivery__lt=timezone.now(),
+        status__in=['received', 'designing', 'production', 'quality_check']
+    ).count()
+    
+    if overdue_orders > 10:
+        critical_alerts.append({
+            'type': 'overdue_orders',
+            'message': f'{overdue_orders} sipariş gecikmiş',
+            'severity': 'high'
+        })
+        health_data['score'] -= 10
+    
+    # Güvenlik riskleri
+    risky_producers = Producer.objects.filter(
+        user__is_staff=True
+    ) | Producer.objects.filter(
+        user__is_superuser=True
+    )
+    
+    if risky_producers.exists():
+        critical_alerts.append({
+            'type': 'security_risk',
+            'message': f'{risky_producers.count()} üretici hesabının admin yetkisi var',
+            'severity': 'critical'
+        })
+        health_data['score'] -= 25
+    
+    health_data['critical_alerts'] = critical_alerts
+    health_data['last_check'] = timezone.now()
+    
+    # Genel durum belirleme
+    if health_data['score'] >= 90:
+        health_data['status'] = 'excellent'
+    elif health_data['score'] >= 70:
+        health_data['status'] = 'good'
+    elif health_data['score'] >= 50:
+        health_data['status'] = 'warning'
+    else:
+        health_data['status'] = 'critical'
+    
+    return health_data
+
+
+@require_http_methods(["GET"])
+@login_required
+def system_health_api(request):
+    """Sistem sağlık durumu API"""
+    try:
+        snapshot = get_snapshot('system_health', build_system_health)
+        return snapshot_response(request, snapshot)
         
     except Exception as e:
         return JsonResponse({
@@ -608,108 +637,116 @@ def trigger_smart_notifications_api(request):
         }, status=500)
 
 
-@require_http_methods(["GET"])
-@login_required
-def performance_insights_api(request):
-    """Performans içgörüleri API"""
-    try:
-        insights = {
-            'timestamp': timezone.now().isoformat(),
-            'user_insights': {},
-            'system_insights': {}
-        }
+def build_performance_insights(user):
+    """Kullanıcıya özel performans içgörüleri belgesi"""
+    insights = {
+        'timestamp': timezone.now().isoformat(),
+        'user_insights': {},
+        'system_insights': {}
+    }
+    
+    # Kullanıcı spesifik içgörüler
+    if hasattr(user, 'center'):
+        center = user.center
+        
+        # Son 30 günün analizi
+        last_month = timezone.now() - timedelta(days=30)
+        recent_orders = ProducerOrder.objects.filter(
+            center=center,
+            created_at__gte=last_month
+        )
         
-        # Kullanıcı spesifik içgörüler
-        if hasattr(request.user, 'center'):
-            center = request.user.center
-            
-            # Son 30 günün analizi
-            last_month = timezone.now() - timedelta(days=30)
-            recent_orders = ProducerOrder.objects.filter(
-                center=center,
-                created_at__gte=last_month
+        if recent_orders.exists():
+            # Ortalama teslimat süresi
+            completed_orders = recent_orders.filter(
+                actual_delivery__isnull=False
             )
             
-            if recent_orders.exists():
-                # Ortalama teslimat süresi
-                completed_orders = recent_orders.filter(
-                    actual_delivery__isnull=False
-                )
-                
-                if completed_orders.exists():
-                    avg_delivery_days = sum([
-                        (order.actual_delivery - order.created_at).days
-                        for order in completed_orders
-                    ]) / completed_orders.count()
-                    
-                    insights['user_insights']['avg_delivery_days'] = round(avg_delivery_days, 1)
-                
-                # Sipariş başarı oranı
-                success_rate = (completed_orders.count() / recent_orders.count()) * 100
-                insights['user_insights']['success_rate'] = round(success_rate, 1)
-                
-                # Popüler kalıp tipleri
-                mold_types = center.molds.filter(
-                    created_at__gte=last_month
-                ).values('mold_type').annotate(
-                    count=Count('mold_type')
-                ).order_by('-count')[:3]
-                
-                insights['user_insights']['popular_mold_types'] = list(mold_types)
-        
-        elif hasattr(request.user, 'producer'):
-            producer = request.user.producer
+            lead_time = summarize(
+                completed_orders.annotate(lead_time=LEAD_TIME).values_list('lead_time', flat=True)
+            )
+            if lead_time['count']:
+                insights['user_insights']['avg_delivery_days'] = lead_time['mean']
+                insights['user_insights']['median_delivery_days'] = lead_time['median']
             
-            # Üretici performans metrikleri
-            last_month = timezone.now() - timedelta(days=30)
-            recent_orders = producer.orders.filter(created_at__gte=last_month)
+            # Sipariş başarı oranı
+            success_rate = (completed_orders.count() / recent_orders.count()) * 100
+            insights['user_insights']['success_rate'] = round(success_rate, 1)
             
-            if recent_orders.exists():
-                # Zamanında teslimat oranı
-                on_time_orders = recent_orders.filter(
-                    actual_delivery__lte=F('estimated_delivery'),
-                    actual_delivery__isnull=False
-                ).count()
-                
-                on_time_rate = (on_time_orders / recent_orders.count()) * 100
-                insights['user_insights']['on_time_delivery_rate'] = round(on_time_rate, 1)
-                
-                # Kapasite kullanımı
-                current_month_orders = producer.get_current_month_orders()
-                capacity_usage = (current_month_orders / producer.mold_limit) * 100
-                insights['user_insights']['capacity_usage'] = round(capacity_usage, 1)
-        
-        # Admin ise sistem geneli içgörüler
-        if request.user.is_superuser:
-            # Sistem performans metrikleri
-            last_week = timezone.now() - timedelta(days=7)
+            # Popüler kalıp tipleri
+            mold_types = center.molds.filter(
+                created_at__gte=last_month
+            ).values('mold_type').annotate(
+                count=Count('mold_type')
+            ).order_by('-count')[:3]
             
-            # Haftalık büyüme
-            this_week_orders = ProducerOrder.objects.filter(created_at__gte=last_week).count()
-            last_week_orders = ProducerOrder.objects.filter(
-                created_at__gte=last_week - timedelta(days=7),
-                created_at__lt=last_week
+            insights['user_insights']['popular_mold_types'] = list(mold_types)
+    
+    elif hasattr(user, 'producer'):
+        producer = user.producer
+        
+        # Üretici performans metrikleri
+        last_month = timezone.now() - timedelta(days=30)
+        recent_orders = producer.orders.filter(created_at__gte=last_month)
+        
+        if recent_orders.exists():
+            # Zamanında teslimat oranı
+            on_time_orders = recent_orders.filter(
+                actual_delivery__lte=F('estimated_delivery'),
+                actual_delivery__isnull=False
             ).count()
             
-            if last_week_orders > 0:
-                growth_rate = ((this_week_orders - last_week_orders) / last_week_orders) * 100
-                insights['system_insights']['weekly_growth_rate'] = round(growth_rate, 1)
+            on_time_rate = (on_time_orders / recent_orders.count()) * 100
+            insights['user_insights']['on_time_delivery_rate'] = round(on_time_rate, 1)
             
-            # En aktif üreticiler
-            top_producers = Producer.objects.filter(
-                orders__created_at__gte=last_week
-            ).annotate(
-                order_count=Count('orders')
-            ).order_by('-order_count')[:5]
-            
-            insights['system_insights']['top_producers'] = [
-                {
-                    'name': p.company_name,
-                    'order_count': p.order_count
-                } for p in top_producers
-            ]
-        
-        return JsonResponse(insights)
+            # Kapasite kullanımı
+            current_month_orders = producer.get_current_month_orders()
+            capacity_usage = (current_month_orders / producer.mold_limit) * 100
+            insights['user_insights']['capacity_usage'] = round(capacity_usage, 1)
+    
+    # Admin ise sistem geneli içgörüler
+    if user.is_superuser:
+        # Sistem performans metrikleri
+        last_week = timezone.now() - timedelta(days=7)
+        
+        # Haftalık büyüme
+        this_week_orders = ProducerOrder.objects.filter(created_at__gte=last_week).count()
+        last_week_orders = ProducerOrder.objects.filter(
+            created_at__gte=last_week - timedelta(days=7),
+            created_at__lt=last_week
+        ).count()
+        
+        if last_week_orders > 0:
+            growth_rate = ((this_week_orders - last_week_orders) / last_week_orders) * 100
+            insights['system_insights']['weekly_growth_rate'] = round(growth_rate, 1)
+        
+        # En aktif üreticiler
+        top_producers = Producer.objects.filter(
+            orders__created_at__gte=last_week
+        ).annotate(
+            order_count=Count('orders')
+        ).order_by('-order_count')[:5]
+        
+        insights['system_insights']['top_producers'] = [
+            {
+                'name': p.company_name,
+                'order_count': p.order_count
+            } for p in top_producers
+        ]
+    
+    return insights
+
+
+@require_http_methods(["GET"])
+@login_required
+def performance_insights_api(request):
+    """Performans içgörüleri API"""
+    try:
+        snapshot = get_snapshot(
+            f'performance_insights:{request.user.pk}',
+            lambda: build_performance_insights(request.user),
+        )
+        return snapshot_response(request, snapshot)
         
     except Exception as e:
         return JsonResponse({
@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        # Önbellek geçersiz kılma signal'larını yükle
+        from core import signals  # noqa
+
+        from django.conf import settings
+        if getattr(settings, 'METRICS_ENABLED', False):
+            from core.metrics import install_template_timer
+            install_template_timer()
@@ -0,0 +1,109 @@
+"""
+Rozet Sayaçları Servisi
+Menüdeki okunmamış mesaj, bildirim ve bekleyen revizyon rozetlerini kullanıcı
+başına önbellekten okur. Önbellek UserBadgeCounter satırından doldurulur;
+sayaçlar yazım yollarında F() ile güncellenir ve önbellek transaction
+tamamlandığında silinir. Böylece önbellek isabetinde sorgu çalışmaz,
+eşzamanlı güncellemelerde de sayılar veritabanındaki satırdan doğru okunur.
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+
+from . import cache_versions
+from .models import UserBadgeCounter
+
+
+CACHE_KEY = 'badge_counts:{}'
+CACHE_TIMEOUT = 60 * 60  # 1 saat
+
+# Toplu mesajlar çok kullanıcıya gider; sayım kullanıcı başına önbelleklenir,
+# yeni / silinen toplu mesajda ortak sürüm artırılır
+BROADCAST_KEY = 'badge_broadcasts:{user}:{version}'
+BROADCAST_VERSION_KEY = 'badge_broadcasts:version'
+
+
+def get_badge_counts(user_id):
+    """Kullanıcının rozet sayaçları - {'unread_messages', 'unread_notifications', 'pending_revisions'}"""
+    key = CACHE_KEY.format(user_id)
+    counts = cache.get(key)
+    if counts is None:
+        counts = UserBadgeCounter.objects.filter(user_id=user_id).values(*UserBadgeCounter.COUNTER_FIELDS).first()
+        if counts is None:
+            counts = UserBadgeCounter.rebuild(user_id)
+        # Kayıtlar sayaçları atlayarak güncellenmişse eksiye düşmesin
+        counts = {field: max(0, value) for field, value in counts.items()}
+        cache.set(key, counts, CACHE_TIMEOUT)
+    return counts
+
+
+def get_unread_broadcasts(user):
+    """Kullanıcının okuma kaydı olmayan toplu mesaj sayısı - gelen kutusu ile aynı filtre"""
+    from .models import Message
+
+    key = BROADCAST_KEY.format(user=user.pk, version=cache_versions.get_version(BROADCAST_VERSION_KEY))
+    count = cache.get(key)
+    if count is None:
+        count = Message.objects.filter(
+            Message.received_filter(user) & Message.unread_filter(user) & Q(is_broadcast=True)
+        ).count()
+        cache.set(key, count, CACHE_TIMEOUT)
+    return count
+
+
+def invalidate_broadcasts(user_ids=None):
+    """Toplu mesaj sayımlarını transaction sonunda geçersiz kıl - user_ids yoksa herkes için"""
+    if user_ids is None:
+        transaction.on_commit(lambda: cache_versions.bump_version(BROADCAST_VERSION_KEY))
+        return
+    user_ids = {user_id for user_id in user_ids if user_id}
+    if user_ids:
+        def delete():
+            version = cache_versions.get_version(BROADCAST_VERSION_KEY)
+            cache.delete_many([BROADCAST_KEY.format(user=user_id, version=version) for user_id in user_ids])
+        transaction.on_commit(delete)
+
+
+def invalidate(user_ids):
+    """Kullanıcıların önbellekteki rozetlerini transaction sonunda sil"""
+    keys = [CACHE_KEY.format(user_id) for user_id in set(user_ids) if user_id]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def adjust(user_ids, field, delta):
+    """Sayaçlara fark uygula ve önbelleği geçersiz kıl"""
+    user_ids = [user_id for user_id in user_ids if user_id]
+    if not user_ids or not delta:
+        return
+    UserBadgeCounter.apply_delta(user_ids, field, delta)
+    invalidate(user_ids)
+
+
+def revision_user_ids(modeled_mold_id):
+    """Revizyon talebinin kalıbına siparişi olan üreticilerin kullanıcıları"""
+    from producer.models import ProducerOrder
+
+    if not modeled_mold_id:
+        return []
+    return list(
+        ProducerOrder.objects.filter(ear_mold__modeled_files=modeled_mold_id)
+        .values_list('producer__user_id', flat=True).distinct()
+    )
+
+
+def apply_state_change(field, before, after, users_for=lambda key: [key]):
+    """
+    Önceki ve yeni (anahtar, sayılıyor mu) durumuna göre sayacı güncelle
+
+    Args:
+        field: UserBadgeCounter alanı
+        before / after: (anahtar, sayılıyor_mu) ya da kayıt yoksa None
+        users_for: Anahtardan etkilenen kullanıcıları bulan fonksiyon
+    """
+    if before == after:
+        return
+    if before and before[1]:
+        adjust(users_for(before[0]), field, -1)
+    if after and after[1]:
+        adjust(users_for(after[0]), field, 1)
@@ -0,0 +1,269 @@
+"""
+Uç Nokta Benchmark Servisi
+En sık kullanılan view'ları `seed_scale` ile üretilmiş veri üzerinde Django
+test istemcisi ile çalıştırır. Her uç nokta için duvar saati süresi
+yüzdelikleri (p50 / p95 / maks.), istek başına sorgu sayısı ve en yüksek
+bellek kullanımı ölçülür; sonuçlar depoda tutulan JSON taban çizgisi ile
+karşılaştırılır. `manage.py bench` bu modülü kullanır.
+
+Her istek geri alınan bir transaction içinde çalışır; etiket üretimi gibi
+yazan uç noktalar veri setini değiştirmez. Üretilen dosyalar geçici bir
+MEDIA_ROOT altına yazılır ve çalıştırma sonunda silinir.
+"""
+import json
+import platform
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from center.models import Center
+from core.lead_time import percentile
+from core.models import CargoShipment, Invoice
+from core.status_snapshot import SNAPSHOT_KEY
+from producer.models import Producer
+
+
+DEFAULT_ITERATIONS = 20
+DEFAULT_WARMUP = 2
+DEFAULT_THRESHOLD = 0.25
+# Çok hızlı view'larda ölçüm gürültüsünün gerileme sayılmaması için mutlak pay
+MIN_TIME_SLACK_MS = 5.0
+
+# Taban çizgisi ile karşılaştırılan metrikler
+COMPARED_METRICS = ('p50_ms', 'p95_ms', 'queries', 'peak_kb')
+
+
+def _clear_status_snapshot():
+    # Sistem durumu belgesi önbellekten sunulur; hesaplama maliyetini ölçmek için silinir
+    cache.delete(SNAPSHOT_KEY.format('system_status'))
+
+
+# name: rapordaki ad, url: URL adı, role: isteği yapan kullanıcı,
+# args: URL argümanını veri setinden seçen fikstür adı, before: her istekten önce
+ENDPOINTS = [
+    {'name': 'center_dashboard', 'url': 'center:dashboard', 'role': 'center'},
+    {'name': 'center_my_usage', 'url': 'center:my_usage', 'role': 'center'},
+    {'name': 'producer_mold_list', 'url': 'producer:mold_list', 'role': 'producer'},
+    {'name': 'producer_payments', 'url': 'producer:payments', 'role': 'producer'},
+    {'name': 'financial_dashboard', 'url': 'core:financial_dashboard', 'role': 'admin'},
+    {'name': 'admin_financial_control_panel', 'url': 'core:admin_financial_control_panel', 'role': 'admin'},
+    {'name': 'message_list', 'url': 'core:message_list', 'role': 'center'},
+    {'name': 'api_system_status', 'url': 'core:api_system_status', 'role': 'admin', 'before': _clear_status_snapshot},
+    {'name': 'invoice_pdf', 'url': 'core:download_invoice_pdf', 'role': 'center', 'args': 'invoice'},
+    {
+        'name': 'cargo_label', 'url': 'core:generate_cargo_label', 'role': 'center', 'args': 'shipment',
+        'method': 'post', 'data': {'label_type': 'pdf'},
+    },
+]
+
+
+class BenchmarkError(Exception):
+    """Benchmark veri seti ya da uç nokta hatası"""
+
+
+class BenchmarkRunner:
+    """
+    Uç noktaları ölçer
+
+    Args:
+        prefix: `seed_scale` önekidir; ölçüm bu önekli en yoğun merkez ve üretici ile yapılır
+        iterations: Uç nokta başına ölçülen istek sayısı
+        warmup: Ölçüme dahil edilmeyen ısınma isteği sayısı
+        only: Sadece bu adlardaki uç noktaları çalıştır (boşsa hepsi)
+        log: İlerleme mesajları için çağrılabilir (ör. self.stdout.write)
+    """
+
+    def __init__(self, prefix='seed', iterations=DEFAULT_ITERATIONS, warmup=DEFAULT_WARMUP, only=None, log=None):
+        self.prefix = prefix
+        self.iterations = iterations
+        self.warmup = warmup
+        self.endpoints = [endpoint for endpoint in ENDPOINTS if not only or endpoint['name'] in only]
+        self.log = log or (lambda message: None)
+
+        unknown = set(only or ()) - {endpoint['name'] for endpoint in ENDPOINTS}
+        if unknown:
+            raise BenchmarkError(f'Bilinmeyen uç nokta: {", ".join(sorted(unknown))}')
+
+    def load_fixtures(self):
+        """Ölçümde kullanılacak kullanıcıları ve kayıtları veri setinden seç"""
+        center = (
+            Center.objects.filter(user__username__startswith=f'{self.prefix}_')
+            .annotate(mold_count=Count('molds'))
+            .order_by('-mold_count', 'pk')
+            .select_related('user')
+            .first()
+        )
+        producer = (
+            Producer.objects.filter(user__username__startswith=f'{self.prefix}_')
+            .annotate(order_count=Count('orders'))
+            .order_by('-order_count', 'pk')
+            .select_related('user')
+            .first()
+        )
+        if center is None or producer is None:
+            raise BenchmarkError(
+                f'"{self.prefix}" önekli veri bulunamadı. Önce `python manage.py seed_scale` çalıştırın.'
+            )
+
+        from django.contrib.auth.models import User
+        admin = User.objects.filter(is_superuser=True, is_active=True).order_by('pk').first()
+        if admin is None:
+            raise BenchmarkError('Aktif süper kullanıcı bulunamadı')
+
+        invoice = Invoice.objects.filter(user=center.user).order_by('-issue_date').first()
+        shipment = CargoShipment.objects.filter(sender_name=center.name).order_by('-pk').first()
+
+        self.users = {'center': center.user, 'producer': producer.user, 'admin': admin}
+        self.args = {'invoice': invoice, 'shipment': shipment}
+        self.dataset = {
+            'prefix': self.prefix,
+            'center': center.user.username,
+            'center_molds': center.mold_count,
+            'producer': producer.user.username,
+            'producer_orders': producer.order_count,
+        }
+
+    def run(self):
+        """Tüm uç noktaları ölç - {'meta': ..., 'endpoints': {ad: metrikler}}"""
+        self.load_fixtures()
+        media_root = tempfile.mkdtemp(prefix='moldpark-bench-')
+        # testserver host'una izin verir ve e-postaları bellekte tutar
+        try:
+            setup_test_environment()
+            own_environment = True
+        except RuntimeError:
+            # Test çalıştırıcısı içinden çağrıldı - ortam zaten kurulu
+            own_environment = False
+        try:
+            with override_settings(MEDIA_ROOT=media_root):
+                clients = {}
+                for role, user in self.users.items():
+                    clients[role] = Client()
+                    clients[role].force_login(user)
+
+                results = {}
+                for endpoint in self.endpoints:
+                    url = self.url_for(endpoint)
+                    if url is None:
+                        self.log(f'  {endpoint["name"]}: veri setinde uygun kayıt yok, atlandı')
+                        continue
+                    results[endpoint['name']] = self.measure(endpoint, clients[endpoint['role']], url)
+                    self.log(f'  {endpoint["name"]}: {results[endpoint["name"]]["p50_ms"]} ms (p50)')
+        finally:
+            if own_environment:
+                teardown_test_environment()
+            shutil.rmtree(media_root, ignore_errors=True)
+
+        return {
+            'meta': {
+                'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'database': connection.vendor,
+                'iterations': self.iterations,
+                'dataset': self.dataset,
+            },
+            'endpoints': results,
+        }
+
+    def url_for(self, endpoint):
+        if 'args' not in endpoint:
+            return reverse(endpoint['url'])
+        obj = self.args[endpoint['args']]
+        return reverse(endpoint['url'], args=[obj.pk]) if obj is not None else None
+
+    def request(self, endpoint, client, url):
+        """İsteği geri alınan transaction içinde yap"""
+        if 'before' in endpoint:
+            endpoint['before']()
+        with transaction.atomic():
+            method = getattr(client, endpoint.get('method', 'get'))
+            response = method(url, endpoint.get('data'))
+            transaction.set_rollback(True)
+        # Yönlendirme (ör. giriş sayfası) ya da hata yanıtı ölçümü anlamsız kılar
+        if response.status_code != 200:
+            raise BenchmarkError(f'{endpoint["name"]}: {url} HTTP {response.status_code} döndü')
+        if response.get('Content-Type', '').startswith('application/json') and response.json().get('success') is False:
+            raise BenchmarkError(f'{endpoint["name"]}: {url} başarısız yanıt döndü: {response.json()}')
+        # Akış yanıtları (PDF) tamamen okunmalı ki üretim süresi ölçüme girsin
+        if getattr(response, 'streaming', False):
+            b''.join(response.streaming_content)
+        return response
+
+    def measure(self, endpoint, client, url):
+        for _ in range(self.warmup):
+            self.request(endpoint, client, url)
+
+        # Süre ölçümü sorgu kaydı ve tracemalloc yükü olmadan yapılır
+        timings = []
+        for _ in range(self.iterations):
+            start = time.perf_counter()
+            self.request(endpoint, client, url)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+
+        # Sorgu sayısı ve bellek tepe değeri ayrı bir profil isteğinde ölçülür
+        tracemalloc.start()
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                self.request(endpoint, client, url)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return {
+            'p50_ms': round(percentile(timings, 50), 2),
+            'p95_ms': round(percentile(timings, 95), 2),
+            'max_ms': round(timings[-1], 2),
+            'queries': len(queries),
+            'peak_kb': round(peak / 1024, 1),
+        }
+
+
+def load_baseline(path):
+    with open(path, encoding='utf-8') as baseline_file:
+        return json.load(baseline_file)
+
+
+def save_baseline(path, report):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as baseline_file:
+        json.dump(report, baseline_file, ensure_ascii=False, indent=2, sort_keys=True)
+        baseline_file.write('\n')
+
+
+def compare(report, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Sonuçları taban çizgisi ile karşılaştır
+
+    Returns:
+        list: Eşiği aşan gerilemeler - (uç nokta, metrik, taban, güncel, oran)
+    """
+    regressions = []
+    for name, current in report['endpoints'].items():
+        reference = baseline.get('endpoints', {}).get(name)
+        if not reference:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = reference.get(metric), current[metric]
+            if old is None:
+                continue
+            limit = old * (1 + threshold)
+            if metric.endswith('_ms'):
+                limit = max(limit, old + MIN_TIME_SLACK_MS)
+            if new > limit:
+                ratio = new / old - 1 if old else float('inf')
+                regressions.append((name, metric, old, new, ratio))
+    return regressions
+
+
+def default_baseline_path():
+    return settings.BASE_DIR / 'benchmarks' / 'baseline.json'
@@ -0,0 +1,36 @@
+"""
+Ölçümlü Önbellek Backend'leri
+Django'nun Redis ve LocMem backend'lerini okuma isabet / ıskalama sayılarını
+Prometheus metriklerine (core.metrics) yazacak şekilde genişletir.
+"""
+from django.core.cache.backends.locmem import LocMemCache as BaseLocMemCache
+from django.core.cache.backends.redis import RedisCache as BaseRedisCache
+
+from .metrics import record_cache
+
+
+_MISSING = object()
+
+
+class InstrumentedCacheMixin:
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version)
+        if value is _MISSING:
+            record_cache(0, 1)
+            return default
+        record_cache(1, 0)
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        found = super().get_many(keys, version)
+        record_cache(len(found), len(keys) - len(found))
+        return found
+
+
+class RedisCache(InstrumentedCacheMixin, BaseRedisCache):
+    pass
+
+
+class LocMemCache(InstrumentedCacheMixin, BaseLocMemCache):
+    pass
@@ -0,0 +1,48 @@
+"""
+Sürümlü Önbellek Anahtarları
+Önbelleğe alınan veri, anahtarına bağlı olduğu kaynağın sürüm numarası
+eklenerek saklanır; kaynak değiştiğinde sürüm artırılır ve eski anahtarlar
+okunmaz hale gelip TTL ile düşer. Sürümler süresiz saklanır ve ilk okunduğunda
+zaman damgası ile başlatılır - önbellek temizlense bile yeni sürüm eski
+değerlerle çakışmaz.
+
+Widget, finansal rapor, merkez paneli ve fiyatlandırma önbellekleri bu
+yardımcıları kullanır.
+"""
+import time
+
+from django.core.cache import cache
+
+
+def _initial_version():
+    return int(time.time() * 1000)
+
+
+def get_versions(keys):
+    """
+    Sürüm anahtarlarının değerleri - tek get_many, olmayanlar başlatılır
+
+    Returns:
+        dict: anahtar -> sürüm
+    """
+    keys = list(keys)
+    versions = cache.get_many(keys)
+    for key in keys:
+        if versions.get(key) is None:
+            # Eşzamanlı başlatmada add() kazananın değeri okunur
+            cache.add(key, _initial_version(), None)
+            versions[key] = cache.get(key)
+    return versions
+
+
+def get_version(key):
+    """Tek sürüm anahtarının değeri"""
+    return get_versions([key])[key]
+
+
+def bump_version(key):
+    """Sürümü artır - anahtara bağlı tüm önbellek girdileri geçersiz olur"""
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _initial_version(), None)
@@ -1,48 +1,27 @@
-from django.db.models import Q
-from .models import Message, SimpleNotification, PricingConfiguration
-from mold.models import RevisionRequest
+from .badge_counters import get_badge_counts, get_unread_broadcasts
+from .pricing_cache import get_pricing_summary
+from .models import PricingConfiguration
 
 
 def unread_messages(request):
-    """Okunmamış mesaj sayısını context'e ekler"""
+    """
+    Okunmamış mesaj, bildirim ve bekleyen revizyon sayılarını context'e ekler
+    Sayılar kullanıcı rozet sayacı önbelleğinden okunur - isabette sorgu çalışmaz
+    """
     if not request.user.is_authenticated:
         return {'unread_message_count': 0}
     
     try:
-        # Direkt gelen okunmamış mesajlar
-        unread_direct = Message.objects.filter(
-            recipient=request.user,
-            is_read=False
-        ).count()
-        
-        # MessageRecipient tablosu kaldırıldığı için broadcast mesajları saymıyoruz
-        unread_broadcast = 0
-        
-        total_unread = unread_direct + unread_broadcast
-        
-        # Üretici için bekleyen revizyon talepleri
-        pending_revision_requests = 0
-        if hasattr(request.user, 'producer'):
-            try:
-                pending_revision_requests = RevisionRequest.objects.filter(
-                    modeled_mold__ear_mold__producer_orders__producer=request.user.producer,
-                    status='pending'
-                ).count()
-            except:
-                pending_revision_requests = 0
-        
-        # Basit bildirim sayısı
-        unread_notifications = SimpleNotification.objects.filter(
-            user=request.user,
-            is_read=False
-        ).count()
+        counts = get_badge_counts(request.user.id)
+        unread_broadcast = get_unread_broadcasts(request.user)
         
         return {
-            'unread_message_count': total_unread,
-            'unread_direct_count': unread_direct,
+            'unread_message_count': counts['unread_messages'] + unread_broadcast,
+            'unread_direct_count': counts['unread_messages'],
             'unread_broadcast_count': unread_broadcast,
-            'pending_revision_requests': pending_revision_requests,
-            'unread_notifications': unread_notifications,
+            # Sadece üreticilerin kalıplarına ait revizyonlar sayılır
+            'pending_revision_requests': counts['pending_revisions'],
+            'unread_notifications': counts['unread_notifications'],
         }
     except Exception as e:
         # Hata durumunda sıfır döndür
@@ -59,10 +38,10 @@ def pricing_config(request):
     Kullanım: {{ pricing.physical_mold_price }}
     """
     try:
-        pricing = PricingConfiguration.get_active()
+        # Süreç içi önbellekten - sürüm değişmedikçe veritabanına gidilmez
         return {
-            'pricing': pricing,
-            'pricing_summary': pricing.get_pricing_summary() if pricing else None,
+            'pricing': PricingConfiguration.get_active(),
+            'pricing_summary': get_pricing_summary(),
         }
     except Exception as e:
         # Hata durumunda boş döndür
@@ -0,0 +1,305 @@
+"""
+Rapor Dışa Aktarma Servisi
+Fatura, sipariş, kargo ve finansal işlem kayıtlarını tarih aralığı, sütun seçimi
+ve sunucu tarafı filtrelerle CSV veya XLSX olarak dışa aktarır.
+
+Kayıtlar `values_list(...).iterator(chunk_size=...)` ile parça parça okunur;
+CSV satır satır akıtılır, XLSX write-only modunda geçici dosyaya yazılır.
+Böylece bir yıllık veri için bile bellek kullanımı sabit kalır.
+"""
+import csv
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from producer.models import ProducerOrder
+
+from .models import CargoShipment, Invoice, Transaction
+
+
+CHUNK_SIZE = 2000
+
+
+class ExportError(Exception):
+    """Geçersiz dışa aktarma isteği"""
+
+
+EXPORT_DATASETS = {
+    'invoices': {
+        'title': 'Faturalar',
+        'model': Invoice,
+        'date_field': 'issue_date',
+        'ordering': ('issue_date', 'id'),
+        'superuser_only': True,
+        'columns': [
+            ('invoice_number', 'Fatura No'),
+            ('invoice_type', 'Fatura Türü'),
+            ('status', 'Durum'),
+            ('issue_date', 'Kesim Tarihi'),
+            ('due_date', 'Vade Tarihi'),
+            ('payment_date', 'Ödeme Tarihi'),
+            ('user__username', 'Kullanıcı'),
+            ('issued_by_center__name', 'Merkez'),
+            ('producer__company_name', 'Üretici'),
+            ('physical_mold_count', 'Fiziksel Kalıp'),
+            ('digital_scan_count', 'Dijital Tarama'),
+            ('subtotal', 'Ara Toplam'),
+            ('vat_amount', 'KDV Tutarı'),
+            ('total_amount', 'Toplam Tutar'),
+            ('moldpark_service_fee', 'MoldPark Hizmet Bedeli'),
+            ('credit_card_fee', 'Kredi Kartı Komisyonu'),
+            ('net_amount', 'Net Tutar'),
+        ],
+        'filters': {
+            'status': 'status',
+            'invoice_type': 'invoice_type',
+            'center': 'issued_by_center_id',
+            'producer': 'producer_id',
+        },
+    },
+    'orders': {
+        'title': 'Üretici Siparişleri',
+        'model': ProducerOrder,
+        'date_field': 'created_at',
+        'ordering': ('created_at', 'id'),
+        'superuser_only': True,
+        'columns': [
+            ('order_number', 'Sipariş No'),
+            ('status', 'Durum'),
+            ('priority', 'Öncelik'),
+            ('producer__company_name', 'Üretici'),
+            ('center__name', 'Merkez'),
+            ('ear_mold_id', 'Kalıp ID'),
+            ('ear_mold__is_physical_shipment', 'Fiziksel Gönderim'),
+            ('price', 'Sipariş Tutarı'),
+            ('shipping_cost', 'Kargo Ücreti'),
+            ('created_at', 'Oluşturulma Tarihi'),
+            ('estimated_delivery', 'Tahmini Teslimat'),
+            ('actual_delivery', 'Gerçek Teslimat'),
+        ],
+        'filters': {
+            'status': 'status',
+            'priority': 'priority',
+            'center': 'center_id',
+            'producer': 'producer_id',
+        },
+    },
+    'shipments': {
+        'title': 'Kargo Gönderileri',
+        'model': CargoShipment,
+        'date_field': 'created_at',
+        'ordering': ('created_at', 'id'),
+        'superuser_only': False,
+        'columns': [
+            ('tracking_number', 'Takip Numarası'),
+            ('cargo_company__display_name', 'Kargo Firması'),
+            ('status', 'Durum'),
+            ('invoice__invoice_number', 'Fatura No'),
+            ('sender_name', 'Gönderen'),
+            ('recipient_name', 'Alıcı'),
+            ('package_count', 'Paket Adedi'),
+            ('weight_kg', 'Ağırlık (KG)'),
+            ('shipping_cost', 'Kargo Ücreti'),
+            ('declared_value', 'Beyan Değeri'),
+            ('created_at', 'Oluşturulma'),
+            ('shipped_at', 'Gönderilme Tarihi'),
+            ('delivered_at', 'Teslim Tarihi'),
+        ],
+        'filters': {
+            'status': 'status',
+            'cargo_company': 'cargo_company_id',
+        },
+    },
+    'transactions': {
+        'title': 'Finansal İşlemler',
+        'model': Transaction,
+        'date_field': 'transaction_date',
+        'ordering': ('transaction_date', 'id'),
+        'superuser_only': True,
+        'columns': [
+            ('transaction_date', 'İşlem Tarihi'),
+            ('transaction_type', 'İşlem Türü'),
+            ('status', 'Durum'),
+            ('amount', 'Tutar'),
+            ('currency', 'Para Birimi'),
+            ('moldpark_fee_amount', 'MoldPark Ücreti'),
+            ('credit_card_fee_amount', 'KK Komisyonu'),
+            ('user__username', 'Kullanıcı'),
+            ('center__name', 'Merkez'),
+            ('producer__company_name', 'Üretici'),
+            ('invoice__invoice_number', 'Fatura No'),
+            ('service_provider', 'Hizmet Veren'),
+            ('amount_source', 'Tutar Kaynağı'),
+            ('description', 'Açıklama'),
+        ],
+        'filters': {
+            'status': 'status',
+            'transaction_type': 'transaction_type',
+            'center': 'center_id',
+            'producer': 'producer_id',
+        },
+    },
+}
+
+
+def get_dataset(name):
+    """Veri seti tanımını döndür"""
+    try:
+        return EXPORT_DATASETS[name]
+    except KeyError:
+        raise ExportError(f'Bilinmeyen veri seti: {name}')
+
+
+def _parse_date(value, label):
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ExportError(f'Geçersiz {label}: {value} (YYYY-MM-DD bekleniyor)')
+    return parsed
+
+
+def _day_start(day):
+    """Günün başlangıcı - aktif saat dilimine göre aware datetime"""
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _field(model, path):
+    """'a__b__c' yolunun son model alanını döndür"""
+    field = None
+    for part in path.split('__'):
+        field = model._meta.get_field(part)
+        if field.is_relation and field.related_model is not None:
+            model = field.related_model
+    return field
+
+
+def select_columns(dataset, requested=None):
+    """
+    İstenen sütunları doğrula
+
+    Args:
+        dataset: get_dataset() çıktısı
+        requested: Sütun adları listesi (boşsa tüm sütunlar)
+
+    Returns:
+        list: (alan, başlık) çiftleri
+    """
+    available = dict(dataset['columns'])
+    if not requested:
+        return list(dataset['columns'])
+
+    unknown = [name for name in requested if name not in available]
+    if unknown:
+        raise ExportError(f'Bilinmeyen sütun(lar): {", ".join(unknown)}')
+    return [(name, available[name]) for name in requested]
+
+
+def build_queryset(dataset, start_date=None, end_date=None, filters=None):
+    """
+    Tarih aralığı ve filtrelerle sorguyu oluştur
+
+    Args:
+        dataset: get_dataset() çıktısı
+        start_date / end_date: 'YYYY-MM-DD' (dahil)
+        filters: {filtre adı: değer} - sadece tanımlı filtreler kabul edilir
+
+    DateTimeField için aralık gün sınırlarından aware datetime'a çevrilir
+    (`>= başlangıç günü 00:00`, `< bitiş gününden sonraki gün 00:00`); sütun
+    fonksiyona sarılmadığı için tarih indeksi kullanılabilir.
+    """
+    model = dataset['model']
+    date_field = dataset['date_field']
+    is_datetime = model._meta.get_field(date_field).get_internal_type() == 'DateTimeField'
+
+    queryset = model.objects.all()
+    if start_date:
+        start = _parse_date(start_date, 'başlangıç tarihi')
+        queryset = queryset.filter(**{f'{date_field}__gte': _day_start(start) if is_datetime else start})
+    if end_date:
+        end = _parse_date(end_date, 'bitiş tarihi')
+        if is_datetime:
+            queryset = queryset.filter(**{f'{date_field}__lt': _day_start(end + timedelta(days=1))})
+        else:
+            queryset = queryset.filter(**{f'{date_field}__lte': end})
+
+    for name, value in (filters or {}).items():
+        if value in (None, ''):
+            continue
+        if name not in dataset['filters']:
+            raise ExportError(f'Bilinmeyen filtre: {name}')
+        path = dataset['filters'][name]
+        try:
+            value = model._meta.get_field(path).to_python(value)
+        except ValidationError:
+            raise ExportError(f'Geçersiz filtre değeri: {name}={value}')
+        queryset = queryset.filter(**{path: value})
+
+    return queryset.order_by(*dataset['ordering'])
+
+
+def _formatter(model, path, keep_numbers=False):
+    """Alan tipine göre hücre biçimlendirici - keep_numbers ile tutarlar sayı olarak kalır (XLSX)"""
+    field = _field(model, path)
+    choices = dict(field.flatchoices) if getattr(field, 'flatchoices', None) else None
+
+    def format_value(value):
+        if value is None:
+            return ''
+        if choices is not None:
+            return str(choices.get(value, value))
+        if isinstance(value, bool):
+            return 'Evet' if value else 'Hayır'
+        if isinstance(value, datetime):
+            if timezone.is_aware(value):
+                value = timezone.localtime(value)
+            return value.strftime('%Y-%m-%d %H:%M')
+        if isinstance(value, date):
+            return value.isoformat()
+        if isinstance(value, Decimal) and not keep_numbers:
+            return f'{value:.2f}'
+        return value
+
+    return format_value
+
+
+def iter_rows(dataset, queryset, columns, chunk_size=CHUNK_SIZE, keep_numbers=False):
+    """Sorgu satırlarını parça parça okuyup biçimlendirerek üret"""
+    fields = [name for name, _ in columns]
+    formatters = [_formatter(dataset['model'], name, keep_numbers) for name in fields]
+    for values in queryset.values_list(*fields).iterator(chunk_size=chunk_size):
+        yield [format_value(value) for format_value, value in zip(formatters, values)]
+
+
+class _Echo:
+    """csv.writer için sadece yazılan satırı döndüren tampon"""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(headers, rows):
+    """CSV satırlarını tek tek üret - Excel uyumu için UTF-8 BOM ile başlar"""
+    writer = csv.writer(_Echo())
+    yield '\ufeff' + writer.writerow(headers)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def write_xlsx(headers, rows, fileobj, title='Rapor'):
+    """Satırları write-only XLSX çalışma kitabına yaz"""
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise ExportError('XLSX dışa aktarma için openpyxl kurulu olmalı')
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=title[:31])
+    sheet.append(headers)
+    for row in rows:
+        sheet.append(row)
+    workbook.save(fileobj)
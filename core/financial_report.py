@@ -0,0 +1,391 @@
+"""
+Finansal Kontrol Paneli Rapor Oluşturucu
+İşitme merkezlerinden tahsilat satırlarını merkez başına sorgu çalıştırmadan,
+toplu sorgularla hazırlar ve (dönem, fiyatlandırma sürümü) bazında önbelleğe alır.
+Fatura, kalıp veya abonelik değiştiğinde sadece ilgili merkezin satırı yenilenir.
+"""
+from datetime import datetime, timedelta
+from datetime import time as dt_time
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .cache_versions import bump_version, get_versions
+from .models import Invoice, PricingPlan, UserSubscription
+
+
+CACHE_TIMEOUT = 60 * 15  # 15 dakika
+CENTER_VERSION_KEY = 'financial_report:center:{}:version'
+ROW_KEY = 'financial_report:row:{period}:{pricing}:{center}:{version}'
+
+PHYSICAL_STATUSES = ['completed', 'delivered', 'shipped_to_center']
+DIGITAL_STATUSES = ['completed', 'delivered']
+
+STANDART_PLAN_NAME = 'Standart Abonelik'
+PRO_PLAN_NAME = 'Pro Abonelik'
+
+ZERO = Decimal('0.00')
+
+
+def _as_date(value):
+    """DateField filtresi gibi datetime değerini tarihe çevir"""
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            value = timezone.make_naive(value, timezone.get_default_timezone())
+        return value.date()
+    return value
+
+
+def _day_start(value):
+    """Tarihi gün başlangıcı olarak aware datetime'a çevir"""
+    if isinstance(value, datetime):
+        return value
+    return timezone.make_aware(datetime.combine(value, dt_time.min))
+
+
+# ==========================================
+# MERKEZ SÜRÜMLERİ - Artımlı yenileme
+# ==========================================
+
+def get_center_versions(center_ids):
+    """Merkezlerin rapor sürümlerini döndür - olmayanlar zaman damgası ile başlatılır"""
+    keys = {center_id: CENTER_VERSION_KEY.format(center_id) for center_id in center_ids}
+    versions = get_versions(keys.values())
+    return {center_id: versions[key] for center_id, key in keys.items()}
+
+
+def invalidate_center(center_id):
+    """Merkezin önbellekteki rapor satırlarını geçersiz kıl"""
+    if not center_id:
+        return
+    bump_version(CENTER_VERSION_KEY.format(center_id))
+
+
+def get_pricing_version(pricing, plans):
+    """Fiyatlandırma ve plan fiyatlarını temsil eden sürüm anahtarı"""
+    parts = [f'{pricing.pk}-{int(pricing.updated_at.timestamp())}' if pricing.updated_at else str(pricing.pk)]
+    for name in (STANDART_PLAN_NAME, PRO_PLAN_NAME):
+        plan = plans.get(name)
+        parts.append(f'{plan.pk}-{int(plan.updated_at.timestamp())}' if plan else '0')
+    return '.'.join(parts)
+
+
+def get_plans():
+    """Standart ve Pro planlarını tek sorguda al - {ad: plan}"""
+    plans = {}
+    for plan in PricingPlan.objects.filter(name__in=[STANDART_PLAN_NAME, PRO_PLAN_NAME], is_active=True):
+        plans.setdefault(plan.name, plan)
+    return plans
+
+
+class CenterCollectionsReport:
+    """İşitme merkezlerinden tahsilat satırları"""
+
+    def __init__(self, period, start_date, end_date, pricing):
+        self.period = period
+        self.start_date = start_date
+        self.end_date = end_date
+        self.pricing = pricing
+        self.plans = get_plans()
+
+        standart_plan = self.plans.get(STANDART_PLAN_NAME)
+        pro_plan = self.plans.get(PRO_PLAN_NAME)
+        self.standart_prices = {
+            True: Decimal(str(float(standart_plan.per_mold_price_try) if standart_plan else 450.00)),
+            False: Decimal(str(float(standart_plan.modeling_service_fee_try) if standart_plan else 19.00)),
+        }
+        self.pro_prices = {
+            True: Decimal(str(float(pro_plan.per_mold_price_try) if pro_plan else 399.00)),
+            False: Decimal(str(float(pro_plan.modeling_service_fee_try) if pro_plan else 15.00)),
+        }
+
+        self.period_key = f'{period}:{_as_date(start_date)}:{_as_date(end_date)}'
+        self.pricing_version = get_pricing_version(pricing, self.plans)
+
+    def build(self, centers):
+        """
+        Merkez satırlarını döndür - önbellekte olmayanlar toplu olarak hesaplanır
+
+        Args:
+            centers: select_related('user') ile alınmış Center listesi
+
+        Returns:
+            list: Merkez sırasına göre satırlar ('center' nesnesi eklenmiş)
+        """
+        centers = list(centers)
+        versions = get_center_versions([center.id for center in centers])
+        keys = {
+            center.id: ROW_KEY.format(
+                period=self.period_key,
+                pricing=self.pricing_version,
+                center=center.id,
+                version=versions[center.id],
+            )
+            for center in centers
+        }
+        cached = cache.get_many(keys.values())
+
+        missing = [center for center in centers if keys[center.id] not in cached]
+        if missing:
+            computed = self.compute_rows(missing)
+            cache.set_many(
+                {keys[center_id]: row for center_id, row in computed.items()},
+                CACHE_TIMEOUT
+            )
+            for center_id, row in computed.items():
+                cached[keys[center_id]] = row
+
+        rows = []
+        for center in centers:
+            row = dict(cached[keys[center.id]])
+            row['center'] = center
+            rows.append(row)
+        return rows
+
+    def compute_rows(self, centers):
+        """Verilen merkezlerin satırlarını toplu sorgularla hesapla - {center_id: satır}"""
+        from mold.models import EarMold, ModeledMold
+
+        center_ids = [center.id for center in centers]
+        user_ids = [center.user_id for center in centers]
+        start_date_only = self.start_date.date() if hasattr(self.start_date, 'date') else self.start_date
+        end_date_only = self.end_date.date() if hasattr(self.end_date, 'date') else self.end_date
+
+        # Dönemdeki normal faturalar (PKG- prefix'i olmayan) - merkez başına en sonuncusu
+        latest_invoices = {}
+        regular_invoices = Invoice.objects.filter(
+            issued_by_center_id__in=center_ids,
+            invoice_type='center_admin_invoice',
+            issue_date__gte=start_date_only,
+            issue_date__lte=end_date_only
+        ).exclude(invoice_number__startswith='PKG-').order_by('-issue_date').values(
+            'id', 'issued_by_center_id', 'invoice_number', 'issue_date'
+        )
+        for invoice in regular_invoices:
+            latest_invoices.setdefault(invoice['issued_by_center_id'], invoice)
+
+        # Paket faturaları (PKG- prefix'li) - kullanıcı bazında, yeniden eskiye
+        package_invoices = {}
+        for invoice in Invoice.objects.filter(
+            user_id__in=user_ids,
+            invoice_type='center_admin_invoice',
+            invoice_number__startswith='PKG-'
+        ).order_by('-issue_date').values('user_id', 'invoice_number', 'issue_date', 'total_amount', 'breakdown_data'):
+            package_invoices.setdefault(invoice['user_id'], []).append(invoice)
+
+        # Abonelikler - kullanıcı başına tek kayıt
+        subscriptions = {
+            subscription.user_id: subscription
+            for subscription in UserSubscription.objects.filter(user_id__in=user_ids).select_related('plan')
+        }
+
+        # Dönemdeki kalıplar - merkez bazında
+        molds = {}
+        mold_rows = EarMold.objects.filter(
+            center_id__in=center_ids,
+            created_at__gte=self.start_date,
+            created_at__lte=self.end_date,
+            status__in=PHYSICAL_STATUSES
+        ).annotate(
+            has_models=Exists(ModeledMold.objects.filter(ear_mold=OuterRef('pk')))
+        ).order_by().values_list(
+            'center_id', 'created_at', 'is_physical_shipment', 'status',
+            'unit_price', 'digital_modeling_price', 'has_models'
+        )
+        for row in mold_rows.iterator(chunk_size=2000):
+            molds.setdefault(row[0], []).append(row)
+
+        return {
+            center.id: self.build_row(
+                center,
+                latest_invoices.get(center.id),
+                package_invoices.get(center.user_id, []),
+                subscriptions.get(center.user_id),
+                molds.get(center.id, []),
+            )
+            for center in centers
+        }
+
+    def get_pro_start(self, subscription):
+        """Pro abonelik başlangıç zamanı"""
+        if (
+            subscription and subscription.plan and subscription.plan.name == PRO_PLAN_NAME
+            and subscription.status in ['active', 'cancelled'] and subscription.start_date
+        ):
+            return _day_start(subscription.start_date)
+        return None
+
+    def get_mold_price(self, is_physical, created_at, pro_start):
+        """Kalıbın oluşturulduğu tarihteki abonelik planına göre fiyat"""
+        if pro_start and created_at >= pro_start:
+            return self.pro_prices[is_physical]
+        return self.standart_prices[is_physical]
+
+    def build_row(self, center, latest_invoice, package_invoices, subscription, molds):
+        """Tek merkezin tahsilat satırı - bellekteki verilerden"""
+        pricing = self.pricing
+
+        # Fatura kesilmişse, fatura tarihinden SONRA oluşturulan hizmetler gösterilir
+        latest_invoice_date = latest_invoice['issue_date'] if latest_invoice else None
+        has_existing_invoice = latest_invoice is not None
+        effective_start_date = self.start_date
+        if timezone.is_naive(effective_start_date):
+            effective_start_date = timezone.make_aware(effective_start_date)
+        if has_existing_invoice and latest_invoice_date:
+            effective_start_date = _day_start(latest_invoice_date + timedelta(days=1))
+
+        # Seçili tarih aralığındaki paket faturaları
+        period_start = _as_date(self.start_date)
+        period_end = _as_date(self.end_date)
+        package_invoices_in_period = [
+            invoice for invoice in package_invoices
+            if period_start <= invoice['issue_date'] <= period_end
+        ]
+
+        package_subscription = None
+        if (
+            subscription and subscription.status == 'active'
+            and subscription.plan and subscription.plan.plan_type == 'package'
+        ):
+            package_subscription = subscription
+
+        package_amount = ZERO
+        package_info = None
+        package_invoice_numbers = []
+
+        if package_invoices_in_period:
+            for invoice in package_invoices_in_period:
+                package_amount += invoice['total_amount']
+                package_invoice_numbers.append(invoice['invoice_number'])
+                if not package_info and invoice['breakdown_data']:
+                    package_info = invoice['breakdown_data'].get('package_name', 'Paket')
+        elif package_invoices:
+            # Seçili aralıkta yoksa en son paket faturası gösterilir
+            latest_package_invoice = package_invoices[0]
+            package_amount = latest_package_invoice['total_amount']
+            package_invoice_numbers.append(latest_package_invoice['invoice_number'])
+            if latest_package_invoice['breakdown_data']:
+                package_info = latest_package_invoice['breakdown_data'].get('package_name', 'Paket')
+        elif package_subscription:
+            package_amount = package_subscription.plan.price_try
+            package_info = package_subscription.plan.name
+            package_invoice_numbers = ['Fatura Oluşturulmamış']
+
+        active_subscription = subscription if subscription and subscription.status == 'active' else None
+        has_package_invoice = bool(package_invoices_in_period)
+
+        counts = {
+            'physical_before_pro_count': 0,
+            'physical_after_pro_count': 0,
+            'digital_before_pro_count': 0,
+            'digital_after_pro_count': 0,
+        }
+        amounts = {
+            'physical_before_pro_amount': ZERO,
+            'physical_after_pro_amount': ZERO,
+            'digital_before_pro_amount': ZERO,
+            'digital_after_pro_amount': ZERO,
+        }
+        physical_count = 0
+        digital_count = 0
+        physical_amount_with_vat = ZERO
+        digital_amount_with_vat = ZERO
+        pro_subscription_start = None
+
+        if not has_package_invoice:
+            pro_subscription_start = self.get_pro_start(subscription)
+
+            for _, created_at, is_physical, status, unit_price, digital_price, has_models in molds:
+                if created_at < effective_start_date:
+                    continue
+                side = 'after_pro' if pro_subscription_start and created_at >= pro_subscription_start else 'before_pro'
+
+                # Fiziksel kalıplar
+                if is_physical:
+                    price = unit_price if unit_price is not None else self.get_mold_price(
+                        is_physical, created_at, pro_subscription_start
+                    )
+                    physical_count += 1
+                    physical_amount_with_vat += price
+                    counts[f'physical_{side}_count'] += 1
+                    amounts[f'physical_{side}_amount'] += price
+
+                # 3D modelleme hizmeti: dijital kalıplar veya model dosyası olanlar
+                if status in DIGITAL_STATUSES and (not is_physical or has_models):
+                    price = digital_price if digital_price is not None else self.get_mold_price(
+                        is_physical, created_at, pro_subscription_start
+                    )
+                    digital_count += 1
+                    digital_amount_with_vat += price
+                    counts[f'digital_{side}_count'] += 1
+                    amounts[f'digital_{side}_amount'] += price
+
+        # Aylık ücret: abonelik varsa abonelik fiyatı, yoksa sistem varsayılanı
+        if (
+            active_subscription and active_subscription.plan
+            and active_subscription.plan.plan_type in ['package', 'standard']
+        ):
+            monthly_fee = active_subscription.plan.monthly_fee_try
+        else:
+            monthly_fee = pricing.monthly_system_fee
+
+        gross_amount_with_vat = ZERO
+        gross_amount_without_vat = ZERO
+        vat_amount = ZERO
+        moldpark_fee = ZERO
+        net_to_producer = ZERO
+        amount_after_monthly_fee = ZERO
+
+        if has_package_invoice or physical_count > 0 or digital_count > 0 or monthly_fee > 0:
+            if has_package_invoice:
+                # Paket faturası zaten KDV dahil tutarı içerir, aylık ücret içermez
+                amount_after_monthly_fee = package_amount
+            else:
+                amount_after_monthly_fee = physical_amount_with_vat + digital_amount_with_vat
+            gross_amount_with_vat = amount_after_monthly_fee + monthly_fee
+
+            vat_multiplier = Decimal('1') + (pricing.vat_rate / Decimal('100'))
+            gross_amount_without_vat = gross_amount_with_vat / vat_multiplier
+            vat_amount = gross_amount_with_vat - gross_amount_without_vat
+
+            # MoldPark hizmet bedeli: (Brüt - Aylık ücret) üzerinden
+            moldpark_fee = pricing.calculate_moldpark_fee(amount_after_monthly_fee)
+            net_to_producer = amount_after_monthly_fee - moldpark_fee
+
+        # Fatura kesilmiş ama yeni hizmet yoksa sadece gösterim için sıfır değerler
+        if has_existing_invoice and physical_count == 0 and digital_count == 0 and not has_package_invoice:
+            gross_amount_with_vat = ZERO
+            gross_amount_without_vat = ZERO
+            vat_amount = ZERO
+            moldpark_fee = ZERO
+            net_to_producer = ZERO
+            amount_after_monthly_fee = ZERO
+
+        row = {
+            'center_id': center.id,
+            'physical_count': physical_count,
+            'digital_count': digital_count,
+            'physical_amount': physical_amount_with_vat,
+            'digital_amount': digital_amount_with_vat,
+            'has_existing_invoice': has_existing_invoice,
+            'latest_invoice': latest_invoice,
+            'latest_invoice_number': latest_invoice['invoice_number'] if latest_invoice else None,
+            'latest_invoice_date': latest_invoice_date,
+            'has_pro_subscription': pro_subscription_start is not None,
+            'package_amount': package_amount if has_package_invoice else ZERO,
+            'package_info': package_info,
+            'package_invoice_numbers': package_invoice_numbers,
+            'has_package_invoice': has_package_invoice,
+            'monthly_system_fee': monthly_fee,
+            'gross_amount': gross_amount_with_vat,
+            'gross_amount_without_vat': gross_amount_without_vat,
+            'vat_amount': vat_amount,
+            'moldpark_fee': moldpark_fee,
+            'net_to_producer': net_to_producer,
+            'amount_after_monthly_fee': amount_after_monthly_fee,
+        }
+        row.update(counts)
+        row.update(amounts)
+        return row
@@ -0,0 +1,124 @@
+"""
+Sık Çalışan Sorgu Şekilleri
+Panellerin ve uyarıların kullandığı filtrelerin kanonik halleri ve onları
+karşılaması beklenen indeksler. explain_hot_queries komutu bu sorguların
+planını (SQLite: EXPLAIN QUERY PLAN, PostgreSQL: EXPLAIN) yazdırır ve
+beklenen indeksin planda geçip geçmediğini kontrol eder.
+"""
+from collections import namedtuple
+from datetime import timedelta
+
+from django.db.models import Count
+from django.utils import timezone
+
+from center.models import Center
+from mold.models import EarMold
+from producer.models import Producer, ProducerOrder
+
+from .models import Invoice, SimpleNotification
+
+
+HotQuery = namedtuple('HotQuery', 'name index description build')
+
+# Uyarı widget'ı ve API'lerdeki aktif sipariş durumları
+ACTIVE_ORDER_STATUSES = ['received', 'designing', 'production', 'quality_check']
+
+
+def sample_params():
+    """Sorgularda kullanılacak örnek kimlikler - en çok kaydı olan merkez / üretici"""
+    center_id = (
+        Center.objects.annotate(mold_count=Count('molds')).order_by('-mold_count')
+        .values_list('id', flat=True).first()
+    )
+    producer_id = (
+        Producer.objects.annotate(order_count=Count('orders')).order_by('-order_count')
+        .values_list('id', flat=True).first()
+    )
+    user_id = (
+        SimpleNotification.objects.filter(is_read=False).values('user_id')
+        .annotate(n=Count('id')).order_by('-n').values_list('user_id', flat=True).first()
+    )
+    now = timezone.now()
+    return {
+        'center_id': center_id or 0,
+        'producer_id': producer_id or 0,
+        'user_id': user_id or 0,
+        'now': now,
+        'month_start': now.replace(day=1, hour=0, minute=0, second=0, microsecond=0),
+        'year_ago': (now - timedelta(days=365)).date(),
+    }
+
+
+HOT_QUERIES = [
+    HotQuery(
+        'mold_status_counts', 'mold_center_status_idx',
+        'Merkez paneli: kalıp durum sayımları',
+        lambda p: EarMold.objects.filter(center_id=p['center_id']).order_by()
+        .values('status').annotate(count=Count('id')),
+    ),
+    HotQuery(
+        'mold_monthly_usage', 'mold_center_created_idx',
+        'Merkez kullanımı: bu ayki kalıplar',
+        lambda p: EarMold.objects.filter(center_id=p['center_id'], created_at__gte=p['month_start'])
+        .order_by('-created_at'),
+    ),
+    HotQuery(
+        'mold_physical_shipments', 'mold_center_physical_idx',
+        'Merkez kullanımı: fiziksel gönderimler',
+        lambda p: EarMold.objects.filter(
+            center_id=p['center_id'], is_physical_shipment=True, created_at__gte=p['month_start'],
+        ).order_by('-created_at'),
+    ),
+    HotQuery(
+        'order_status_tab', 'order_producer_status_idx',
+        'Üretici sipariş listesi: durum sekmesi',
+        lambda p: ProducerOrder.objects.filter(producer_id=p['producer_id'], status='received')
+        .order_by('-created_at'),
+    ),
+    HotQuery(
+        'order_overdue', 'order_status_delivery_idx',
+        'Sistem uyarıları: geciken siparişler',
+        lambda p: ProducerOrder.objects.filter(
+            status__in=ACTIVE_ORDER_STATUSES, estimated_delivery__lt=p['now'],
+        ).order_by(),
+    ),
+    HotQuery(
+        'invoice_center_admin', 'invoice_center_type_date_idx',
+        'Merkez faturaları: merkezin kestiği admin faturaları',
+        lambda p: Invoice.objects.filter(
+            issued_by_center_id=p['center_id'], invoice_type='center_admin_invoice',
+            issue_date__gte=p['year_ago'],
+        ).order_by('-issue_date'),
+    ),
+    HotQuery(
+        'notification_unread', 'notif_user_unread_idx',
+        'Bildirimler: okunmamışlar',
+        lambda p: SimpleNotification.objects.filter(user_id=p['user_id'], is_read=False)
+        .order_by('-created_at'),
+    ),
+]
+
+
+def explain_all(names=None, params=None):
+    """
+    Sorgu planlarını üret
+
+    Returns:
+        list[dict]: name, index, description, sql, plan, uses_index
+    """
+    params = params or sample_params()
+    results = []
+    for query in HOT_QUERIES:
+        if names and query.name not in names:
+            continue
+        queryset = query.build(params)
+        plan = queryset.explain()
+        results.append({
+            'name': query.name,
+            'index': query.index,
+            'description': query.description,
+            'sql': str(queryset.query),
+            'plan': plan,
+            'uses_index': query.index in plan,
+        })
+    return results
@@ -0,0 +1,161 @@
+"""
+Keyset (Seek) Sayfalama
+Büyük sipariş / kalıp listeleri OFFSET yerine son görülen satırın
+(created_at, id) değerinden devam eder; böylece sayfa maliyeti geçmişin
+derinliğinden bağımsız kalır. İmleç URL'de `after` / `before` parametresi
+olarak taşınır.
+
+Filtre sekmelerinin sayıları tek bir GROUP BY sorgusundan gelir. Çok büyük
+sonuç kümelerinde bu sayılar kısa süre önbellekte tutulur ve yaklaşık
+olarak işaretlenir.
+"""
+import base64
+import hashlib
+from datetime import datetime
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+
+DEFAULT_PER_PAGE = 25
+MAX_PER_PAGE = 100
+
+# Bu kadar satırın üzerindeki sonuç kümelerinin sayıları önbellekten sunulur
+LARGE_RESULT_THRESHOLD = 10000
+COUNTS_TIMEOUT = 60
+COUNTS_KEY = 'list_counts:{name}:{digest}'
+
+
+def encode_cursor(created_at, pk):
+    """(created_at, id) -> URL güvenli imleç"""
+    raw = f'{created_at.isoformat()}|{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """İmleci çöz - geçersizse None (liste başından başlanır)"""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode()
+        created_at, pk = raw.rsplit('|', 1)
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+class KeysetPage:
+    """Tek sayfa sonuç ve komşu sayfaların sorgu dizeleri"""
+
+    def __init__(self, object_list, has_next, has_previous, next_query, previous_query, first_query):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.next_query = next_query
+        self.previous_query = previous_query
+        self.first_query = first_query
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+
+def _query_string(params, **cursor):
+    params = params.copy()
+    for key in ('after', 'before', 'page'):
+        params.pop(key, None)
+    for key, value in cursor.items():
+        params[key] = value
+    return params.urlencode()
+
+
+def keyset_paginate(request, queryset, per_page=DEFAULT_PER_PAGE, field='created_at'):
+    """
+    Sorgu kümesini (field, id) azalan sırasında sayfala
+
+    Args:
+        request: `after` / `before` imleçleri ve korunacak filtre parametreleri
+        queryset: Filtrelenmiş sorgu kümesi (sıralaması burada belirlenir)
+        per_page: Sayfa boyutu
+        field: Zaman damgası alanı (eşitlikte id belirleyicidir)
+    """
+    try:
+        per_page = min(max(int(request.GET.get('per_page', per_page)), 1), MAX_PER_PAGE)
+    except ValueError:
+        pass
+
+    after = decode_cursor(request.GET.get('after'))
+    before = None if after else decode_cursor(request.GET.get('before'))
+
+    if before:
+        # Önceki sayfa: artan sırada ilerle, sonucu ters çevir
+        value, pk = before
+        rows = list(
+            queryset.filter(Q(**{f'{field}__gt': value}) | Q(**{field: value, 'pk__gt': pk}))
+            .order_by(field, 'pk')[:per_page + 1]
+        )
+        has_previous = len(rows) > per_page
+        rows = rows[:per_page][::-1]
+        has_next = True
+    else:
+        if after:
+            value, pk = after
+            queryset = queryset.filter(Q(**{f'{field}__lt': value}) | Q(**{field: value, 'pk__lt': pk}))
+        rows = list(queryset.order_by(f'-{field}', '-pk')[:per_page + 1])
+        has_next = len(rows) > per_page
+        rows = rows[:per_page]
+        has_previous = after is not None
+
+    next_query = previous_query = None
+    if rows:
+        if has_next:
+            next_query = _query_string(request.GET, after=encode_cursor(getattr(rows[-1], field), rows[-1].pk))
+        if has_previous:
+            previous_query = _query_string(request.GET, before=encode_cursor(getattr(rows[0], field), rows[0].pk))
+    elif before or after:
+        # İmleç artık sonuç döndürmüyor (ör. kayıtlar silindi) - başa dönüş bağlantısı kalsın
+        has_previous = True
+    first_query = _query_string(request.GET)
+    return KeysetPage(rows, has_next, has_previous, next_query, previous_query, first_query)
+
+
+def grouped_counts(queryset, field, name=None, params=None):
+    """
+    Filtrelenmiş kümedeki satırları `field` değerine göre tek sorguda say
+
+    Args:
+        queryset: Filtrelenmiş sorgu kümesi
+        field: Gruplanacak alan (ör. 'status')
+        name: Önbellek adı - verilirse büyük kümelerin sayıları önbelleğe alınır
+        params: Önbellek anahtarına giren filtre değerleri (kullanıcı, arama vb.)
+
+    Returns:
+        (dict, bool): {değer: adet} ve sayıların önbellekten (yaklaşık) gelip gelmediği
+    """
+    key = None
+    if name:
+        digest = hashlib.md5(repr(sorted((params or {}).items())).encode()).hexdigest()
+        key = COUNTS_KEY.format(name=name, digest=digest)
+        counts = cache.get(key)
+        if counts is not None:
+            return counts, True
+
+    counts = {
+        row[field]: row['count']
+        for row in queryset.order_by().values(field).annotate(count=Count('pk'))
+    }
+    if key and sum(counts.values()) >= LARGE_RESULT_THRESHOLD:
+        cache.set(key, counts, COUNTS_TIMEOUT)
+    return counts, False
+
+
+def sum_counts(counts, values=None):
+    """Grup sayılarından seçili değerlerin toplamı (values yoksa hepsi)"""
+    if values is None:
+        return sum(counts.values())
+    return sum(counts.get(value, 0) for value in values)
@@ -0,0 +1,148 @@
+"""
+Teslimat Süresi Analitiği
+Sipariş teslimat süresini (`actual_delivery - created_at`) veritabanında
+`ExpressionWrapper` ile hesaplar ve tek bir `values_list` sorgusu ile okur.
+Ortalama, medyan, p90 ve p99 değerleri genel, üretici, öncelik ve ay bazında
+bu tek sonuç kümesinden çıkarılır; sonuç ProducerOrder sürümüne bağlı olarak
+önbelleğe alınır.
+"""
+import math
+from datetime import timedelta
+
+from django.db.models import DurationField, ExpressionWrapper, F
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from producer.earnings_service import MONTH_NAMES
+from producer.models import Producer, ProducerNetwork, ProducerOrder
+
+from .widget_cache import cached_widget
+
+
+MAX_DAYS = 365
+SECONDS_PER_DAY = 86400
+
+LEAD_TIME = ExpressionWrapper(F('actual_delivery') - F('created_at'), output_field=DurationField())
+
+PERCENTILES = (('median', 50), ('p90', 90), ('p99', 99))
+
+
+def delivered_orders(since=None):
+    """Teslim edilmiş ve gerçek teslimat tarihi olan siparişler - lead_time ile"""
+    orders = ProducerOrder.objects.filter(status='delivered', actual_delivery__isnull=False)
+    if since is not None:
+        orders = orders.filter(created_at__gte=since)
+    return orders.annotate(lead_time=LEAD_TIME)
+
+
+def percentile(values, pct):
+    """Sıralı listede doğrusal aralıklı yüzdelik değeri"""
+    if not values:
+        return None
+    position = (len(values) - 1) * pct / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def _days(seconds):
+    return round(seconds / SECONDS_PER_DAY, 1) if seconds is not None else 0
+
+
+def summarize(durations):
+    """
+    Süre listesinin özeti (gün cinsinden)
+
+    Returns:
+        dict: {'count', 'mean', 'median', 'p90', 'p99'}
+    """
+    values = sorted(duration.total_seconds() for duration in durations)
+    summary = {
+        'count': len(values),
+        'mean': _days(sum(values) / len(values)) if values else 0,
+    }
+    for name, pct in PERCENTILES:
+        summary[name] = _days(percentile(values, pct))
+    return summary
+
+
+def compute_lead_times(since=None):
+    """
+    Teslimat süresi istatistiklerini hesapla - sipariş sayısından bağımsız olarak tek sorgu
+
+    Returns:
+        dict: {'overall', 'by_producer', 'by_priority', 'by_period'}
+    """
+    rows = (
+        delivered_orders(since)
+        .annotate(period=TruncMonth('created_at', tzinfo=timezone.get_current_timezone()))
+        .order_by()
+        .values_list('producer_id', 'producer__company_name', 'priority', 'period', 'lead_time')
+    )
+
+    overall = []
+    producers = {}
+    priorities = {}
+    periods = {}
+    for producer_id, company_name, priority, period, lead_time in rows:
+        overall.append(lead_time)
+        producers.setdefault((producer_id, company_name), []).append(lead_time)
+        priorities.setdefault(priority, []).append(lead_time)
+        period = timezone.localtime(period) if timezone.is_aware(period) else period
+        periods.setdefault((period.year, period.month), []).append(lead_time)
+
+    by_producer = [
+        {'producer_id': producer_id, 'name': company_name, **summarize(durations)}
+        for (producer_id, company_name), durations in producers.items()
+    ]
+    by_producer.sort(key=lambda row: (-row['count'], row['name']))
+
+    return {
+        'overall': summarize(overall),
+        'by_producer': by_producer,
+        'by_priority': [
+            {'priority': priority, 'label': label, **summarize(priorities[priority])}
+            for priority, label in ProducerOrder.PRIORITY_CHOICES
+            if priority in priorities
+        ],
+        'by_period': [
+            {
+                'year': year,
+                'month_number': month,
+                'month': MONTH_NAMES[month],
+                **summarize(periods[(year, month)]),
+            }
+            for year, month in sorted(periods)
+        ],
+    }
+
+
+def visible_producer_ids(user):
+    """
+    by_producer satırlarından kullanıcının görebileceği üreticiler
+
+    Staff tüm üreticileri, üretici sadece kendisini, merkez aktif ağındaki
+    üreticileri görür - rakip firmaların süreleri paylaşılmaz.
+
+    Returns:
+        set veya None (hepsi)
+    """
+    if user.is_staff:
+        return None
+    if hasattr(user, 'producer'):
+        return {user.producer.pk}
+    if hasattr(user, 'center'):
+        return set(
+            ProducerNetwork.objects.filter(center=user.center, status='active')
+            .values_list('producer_id', flat=True)
+        )
+    return set()
+
+
+@cached_widget('lead_time', models=(ProducerOrder, Producer))
+def get_lead_time_stats(days=30):
+    """Son `days` günde oluşturulan siparişlerin önbellekli teslimat süresi istatistikleri"""
+    days = max(1, min(int(days), MAX_DAYS))
+    stats = compute_lead_times(timezone.now() - timedelta(days=days))
+    stats['days'] = days
+    return stats
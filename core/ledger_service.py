@@ -0,0 +1,337 @@
+"""
+Mali Dönem Kapanış Servisi
+Bir ayın merkez ve üretici defter kayıtlarını (adet, tutar, KDV, kesinti) yazar
+ve dönemi kilitler. Kapatılmış aylar için raporlar canlı Invoice / EarMold /
+ProducerOrder kayıtları yerine sadece bu defter kayıtlarını okur; böylece
+çok yıllık raporların maliyeti kalıp sayısıyla değil ay sayısıyla büyür.
+
+Dönemler sırayla kapatılır: kapatılmış aylar her zaman geçmişin başından
+itibaren kesintisiz bir aralık oluşturur ve canlı sorgular sadece son
+kapatılan aydan sonrasına bakar.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count, Min, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from center.models import Center
+from producer.earnings_service import EARNED_AT, EARNED_ORDER_FILTER, MONEY, ZERO, month_bounds
+from producer.models import Producer, ProducerOrder
+
+from .financial_report import CenterCollectionsReport
+from .models import (
+    CenterLedgerSnapshot, Invoice, LedgerPeriod, PricingConfiguration, ProducerLedgerSnapshot,
+)
+
+
+def next_month(year, month):
+    if month == 12:
+        return year + 1, 1
+    return year, month + 1
+
+
+def get_closed_until():
+    """Son kapatılan ayın bitişi (sonraki ayın başlangıcı) - kapatılmış ay yoksa None"""
+    last = LedgerPeriod.objects.filter(status='closed').order_by('-year', '-month').values_list('year', 'month').first()
+    if not last:
+        return None
+    return month_bounds(*last)[1]
+
+
+def get_first_activity_month():
+    """Kalıp, sipariş veya faturası olan ilk ay"""
+    from mold.models import EarMold
+
+    candidates = [
+        EarMold.objects.aggregate(first=Min('created_at'))['first'],
+        ProducerOrder.objects.aggregate(first=Min('created_at'))['first'],
+    ]
+    candidates = [timezone.localtime(value).date() for value in candidates if value]
+    first_invoice = Invoice.objects.aggregate(first=Min('issue_date'))['first']
+    if first_invoice:
+        candidates.append(first_invoice)
+    if not candidates:
+        return None
+    first = min(candidates)
+    return first.year, first.month
+
+
+def get_pending_months(year, month):
+    """Belirtilen aya kadar (dahil) kapatılması gereken aylar - sırayla"""
+    last = LedgerPeriod.objects.filter(status='closed').order_by('-year', '-month').values_list('year', 'month').first()
+    if last:
+        current = next_month(*last)
+    else:
+        current = get_first_activity_month() or (year, month)
+
+    months = []
+    while current <= (year, month):
+        months.append(current)
+        current = next_month(*current)
+    return months
+
+
+def _pricing_snapshot(pricing):
+    return {
+        'name': pricing.name,
+        'physical_mold_price': str(pricing.physical_mold_price),
+        'digital_modeling_price': str(pricing.digital_modeling_price),
+        'monthly_system_fee': str(pricing.monthly_system_fee),
+        'moldpark_commission_rate': str(pricing.moldpark_commission_rate),
+        'credit_card_commission_rate': str(pricing.credit_card_commission_rate),
+        'vat_rate': str(pricing.vat_rate),
+    }
+
+
+def build_center_rows(period, start, end, pricing):
+    """Merkez defter kayıtlarını hazırla (kaydetmeden)"""
+    centers = list(Center.objects.filter(is_active=True).select_related('user'))
+    report = CenterCollectionsReport('ledger', start, end - timedelta(microseconds=1), pricing)
+    rows = report.compute_rows(centers)
+
+    invoice_totals = {
+        row['issued_by_center_id']: row
+        for row in Invoice.objects.filter(
+            issued_by_center__in=centers,
+            invoice_type='center_admin_invoice',
+            issue_date__gte=timezone.localtime(start).date(),
+            issue_date__lt=timezone.localtime(end).date(),
+        ).order_by().values('issued_by_center_id').annotate(
+            invoice_count=Count('id'),
+            invoiced_amount=Coalesce(Sum('total_amount'), Value(ZERO), output_field=MONEY),
+            paid_amount=Coalesce(Sum('total_amount', filter=Q(status='paid')), Value(ZERO), output_field=MONEY),
+        )
+    }
+
+    snapshots = []
+    for center in centers:
+        row = rows[center.id]
+        invoices = invoice_totals.get(center.id, {})
+        latest_invoice = row['latest_invoice']
+        snapshots.append(CenterLedgerSnapshot(
+            period=period,
+            center=center,
+            center_name=center.name,
+            physical_count=row['physical_count'],
+            digital_count=row['digital_count'],
+            physical_amount=row['physical_amount'],
+            digital_amount=row['digital_amount'],
+            package_amount=row['package_amount'],
+            monthly_system_fee=row['monthly_system_fee'],
+            gross_amount=row['gross_amount'],
+            gross_amount_without_vat=row['gross_amount_without_vat'],
+            vat_amount=row['vat_amount'],
+            moldpark_fee=row['moldpark_fee'],
+            net_to_producer=row['net_to_producer'],
+            amount_after_monthly_fee=row['amount_after_monthly_fee'],
+            has_existing_invoice=row['has_existing_invoice'],
+            has_package_invoice=row['has_package_invoice'],
+            latest_invoice_id=latest_invoice['id'] if latest_invoice else None,
+            latest_invoice_number=row['latest_invoice_number'] or '',
+            latest_invoice_date=row['latest_invoice_date'],
+            package_info=row['package_info'] or '',
+            package_invoice_numbers=row['package_invoice_numbers'],
+            invoice_count=invoices.get('invoice_count', 0),
+            invoiced_amount=invoices.get('invoiced_amount', ZERO),
+            paid_amount=invoices.get('paid_amount', ZERO),
+        ))
+    return snapshots
+
+
+def build_producer_rows(period, start, end, pricing):
+    """Üretici defter kayıtlarını hazırla (kaydetmeden) - sipariş fiyatları üzerinden"""
+    physical = Q(ear_mold__is_physical_shipment=True)
+    moldpark_rate = Decimal(str(pricing.moldpark_commission_rate)) / Decimal('100')
+    credit_card_rate = Decimal(str(pricing.credit_card_commission_rate)) / Decimal('100')
+    vat_multiplier = Decimal('1') + Decimal(str(pricing.vat_rate)) / Decimal('100')
+
+    earnings = {
+        row['producer_id']: row
+        for row in ProducerOrder.objects.filter(EARNED_ORDER_FILTER).annotate(earned_at=EARNED_AT).filter(
+            earned_at__gte=start, earned_at__lt=end
+        ).order_by().values('producer_id').annotate(
+            physical_count=Count('id', filter=physical),
+            digital_count=Count('id', filter=~physical),
+            physical_gross=Coalesce(Sum('price', filter=physical), Value(ZERO), output_field=MONEY),
+            digital_gross=Coalesce(Sum('price', filter=~physical), Value(ZERO), output_field=MONEY),
+        )
+    }
+
+    invoices = {
+        row['producer_id']: row
+        for row in Invoice.objects.filter(
+            producer_id__isnull=False,
+            invoice_type__startswith='producer',
+            issue_date__gte=timezone.localtime(start).date(),
+            issue_date__lt=timezone.localtime(end).date(),
+        ).order_by().values('producer_id').annotate(
+            invoice_count=Count('id'),
+            paid_amount=Coalesce(Sum('net_amount', filter=Q(status='paid')), Value(ZERO), output_field=MONEY),
+            pending_amount=Coalesce(
+                Sum('net_amount', filter=Q(status__in=['issued', 'sent'])), Value(ZERO), output_field=MONEY
+            ),
+        )
+    }
+
+    producer_ids = set(earnings) | set(invoices)
+    snapshots = []
+    for producer in Producer.objects.filter(Q(is_active=True) | Q(pk__in=producer_ids)):
+        row = earnings.get(producer.id)
+        invoice_row = invoices.get(producer.id, {})
+        physical_gross = row['physical_gross'] if row else ZERO
+        digital_gross = row['digital_gross'] if row else ZERO
+        gross = physical_gross + digital_gross
+        gross_without_vat = gross / vat_multiplier
+        moldpark_fee = gross * moldpark_rate
+        snapshots.append(ProducerLedgerSnapshot(
+            period=period,
+            producer=producer,
+            producer_name=producer.company_name,
+            physical_count=row['physical_count'] if row else 0,
+            digital_count=row['digital_count'] if row else 0,
+            total_orders=(row['physical_count'] + row['digital_count']) if row else 0,
+            physical_gross=physical_gross,
+            digital_gross=digital_gross,
+            gross_revenue=gross,
+            gross_revenue_without_vat=gross_without_vat,
+            vat_amount=gross - gross_without_vat,
+            moldpark_fee=moldpark_fee,
+            credit_card_fee=gross * credit_card_rate,
+            net_earnings=gross - moldpark_fee,
+            invoice_count=invoice_row.get('invoice_count', 0),
+            paid_amount=invoice_row.get('paid_amount', ZERO),
+            pending_amount=invoice_row.get('pending_amount', ZERO),
+        ))
+    return snapshots
+
+
+def close_period(year, month, user=None):
+    """
+    Tek bir ayı kapat - defter kayıtlarını yaz ve dönemi kilitle
+
+    Raises:
+        ValidationError: Ay bitmemişse, zaten kapatılmışsa veya önceki ay açıksa
+    """
+    start, end = month_bounds(year, month)
+    if end > timezone.now():
+        raise ValidationError(f'{year}/{month:02d} henüz bitmedi, kapatılamaz.')
+
+    with transaction.atomic():
+        period, _ = LedgerPeriod.objects.select_for_update().get_or_create(year=year, month=month)
+        if period.is_closed:
+            raise ValidationError(f'{year}/{month:02d} zaten kapatılmış.')
+
+        previous = LedgerPeriod.objects.filter(status='closed').exclude(pk=period.pk).order_by('-year', '-month').first()
+        if previous and next_month(previous.year, previous.month) != (year, month):
+            raise ValidationError('Dönemler sırayla kapatılmalıdır.')
+
+        pricing = PricingConfiguration.get_active()
+        CenterLedgerSnapshot.objects.bulk_create(build_center_rows(period, start, end, pricing))
+        ProducerLedgerSnapshot.objects.bulk_create(build_producer_rows(period, start, end, pricing))
+
+        period.status = 'closed'
+        period.closed_at = timezone.now()
+        period.closed_by = user
+        period.pricing_snapshot = _pricing_snapshot(pricing)
+        period.save()
+    return period
+
+
+def close_through(year, month, user=None):
+    """Belirtilen aya kadar kapatılmamış tüm ayları sırayla kapat"""
+    return [close_period(y, m, user=user) for y, m in get_pending_months(year, month)]
+
+
+# ==========================================
+# OKUMA - Kapatılmış dönemler
+# ==========================================
+
+def get_closed_period(year, month):
+    return LedgerPeriod.objects.filter(year=year, month=month, status='closed').first()
+
+
+def get_center_rows(period):
+    """Merkez defter kayıtlarını kontrol paneli satırı olarak döndür"""
+    rows = []
+    for snapshot in period.center_rows.select_related('center'):
+        rows.append({
+            'center': snapshot.center or Center(name=snapshot.center_name),
+            'physical_count': snapshot.physical_count,
+            'digital_count': snapshot.digital_count,
+            'physical_amount': snapshot.physical_amount,
+            'digital_amount': snapshot.digital_amount,
+            'has_existing_invoice': snapshot.has_existing_invoice and snapshot.latest_invoice_id is not None,
+            'latest_invoice': {'id': snapshot.latest_invoice_id} if snapshot.latest_invoice_id else None,
+            'latest_invoice_number': snapshot.latest_invoice_number,
+            'latest_invoice_date': snapshot.latest_invoice_date,
+            'package_amount': snapshot.package_amount,
+            'package_info': snapshot.package_info,
+            'package_invoice_numbers': snapshot.package_invoice_numbers,
+            'has_package_invoice': snapshot.has_package_invoice,
+            'monthly_system_fee': snapshot.monthly_system_fee,
+            'gross_amount': snapshot.gross_amount,
+            'gross_amount_without_vat': snapshot.gross_amount_without_vat,
+            'vat_amount': snapshot.vat_amount,
+            'moldpark_fee': snapshot.moldpark_fee,
+            'net_to_producer': snapshot.net_to_producer,
+            'amount_after_monthly_fee': snapshot.amount_after_monthly_fee,
+        })
+    return rows
+
+
+def get_producer_rows(period):
+    """Üretici defter kayıtlarını kontrol paneli satırı olarak döndür - işi olmayan üreticiler hariç"""
+    rows = []
+    for snapshot in period.producer_rows.select_related('producer').filter(Q(total_orders__gt=0) | Q(gross_revenue__gt=0)):
+        rows.append({
+            'producer': snapshot.producer or Producer(company_name=snapshot.producer_name),
+            'physical_count': snapshot.physical_count,
+            'digital_count': snapshot.digital_count,
+            'total_orders': snapshot.total_orders,
+            'gross_revenue': snapshot.gross_revenue,
+            'gross_revenue_without_vat': snapshot.gross_revenue_without_vat,
+            'vat_amount': snapshot.vat_amount,
+            'moldpark_cut': snapshot.moldpark_fee,
+            'net_payment': snapshot.net_earnings,
+            'has_package_invoice': False,
+        })
+    return rows
+
+
+def get_period_totals(limit=None):
+    """Kapatılmış dönemlerin toplamları - dönem başına bir satır, tek gruplu sorgu"""
+    periods = LedgerPeriod.objects.filter(status='closed').order_by('-year', '-month')
+    if limit:
+        periods = periods[:limit]
+    periods = list(periods)
+
+    center_totals = {
+        row['period_id']: row
+        for row in CenterLedgerSnapshot.objects.filter(period__in=periods).order_by().values('period_id').annotate(
+            physical_count=Coalesce(Sum('physical_count'), 0),
+            digital_count=Coalesce(Sum('digital_count'), 0),
+            gross_amount=Coalesce(Sum('gross_amount'), Value(ZERO), output_field=MONEY),
+            vat_amount=Coalesce(Sum('vat_amount'), Value(ZERO), output_field=MONEY),
+            moldpark_fee=Coalesce(Sum('moldpark_fee'), Value(ZERO), output_field=MONEY),
+            monthly_system_fee=Coalesce(Sum('monthly_system_fee'), Value(ZERO), output_field=MONEY),
+        )
+    }
+    producer_totals = {
+        row['period_id']: row
+        for row in ProducerLedgerSnapshot.objects.filter(period__in=periods).order_by().values('period_id').annotate(
+            producer_gross=Coalesce(Sum('gross_revenue'), Value(ZERO), output_field=MONEY),
+            producer_net=Coalesce(Sum('net_earnings'), Value(ZERO), output_field=MONEY),
+        )
+    }
+
+    results = []
+    for period in periods:
+        totals = {'period': period}
+        totals.update(center_totals.get(period.id, {}))
+        totals.update(producer_totals.get(period.id, {}))
+        results.append(totals)
+    return results
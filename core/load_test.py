@@ -0,0 +1,490 @@
+"""
+Yük Testi Sürücüsü
+Yerelde çalışan bir sunucuya (ör. 4 worker'lı gunicorn) karşı gerçekçi merkez
+ve üretici trafiği üretir. Her sanal kullanıcı ayrı bir thread'dir: önce
+giriş yapar, ardından ağırlıklı rastgele adımlardan oluşan yolculuğunu
+düşünme süreleri ile tekrarlar. Merkezler kalıp oluşturur (STL yüklemesi ile),
+mesaj listesine ve panele bakar; üreticiler tarama dosyası indirir, sipariş
+durumunu ilerletir ve panellerini yoklar. Her adım için verim, gecikme
+yüzdelikleri ve hata oranı raporlanır. `manage.py load_test` bu modülü kullanır.
+
+Kullanıcılar ve sipariş kimlikleri `seed_scale` ile üretilmiş veri setinden
+okunur; bu yüzden sürücü, sunucu ile aynı veritabanına bağlı ayarlarla
+çalıştırılmalıdır. İstekler yalnızca HTTP üzerinden yapılır.
+"""
+import http.client
+import json
+import random
+import threading
+import time
+import uuid
+from collections import defaultdict
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode, urlsplit
+
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+
+from center.models import Center
+from core.lead_time import percentile
+from core.scale_seed import DEFAULT_PASSWORD, binary_stl, ear_mesh
+from producer.models import Producer, ProducerOrder
+
+
+DEFAULT_THINK_TIME = 1.0  # saniye (üstel dağılımın ortalaması)
+DEFAULT_DURATION = 60
+REQUEST_TIMEOUT = 30
+ORDERS_PER_PRODUCER = 200
+
+# Yolculuk adımlarının ağırlıkları - --weights ile değiştirilebilir
+CENTER_WEIGHTS = {
+    'center_dashboard': 3,
+    'mold_create': 2,
+    'center_mold_list': 2,
+    'message_list': 2,
+}
+PRODUCER_WEIGHTS = {
+    'producer_dashboard': 3,
+    'producer_mold_list': 2,
+    'mold_download': 3,
+    'status_update': 2,
+    'message_list': 1,
+}
+
+# Siparişin ilerletildiği durum sırası
+STATUS_FLOW = ['received', 'designing', 'production', 'quality_check', 'packaging', 'shipping', 'delivered']
+
+
+class LoadTestError(Exception):
+    """Yük testi yapılandırma ya da veri seti hatası"""
+
+
+class StepFailed(Exception):
+    """Adım beklenmeyen bir yanıt aldı"""
+
+
+class HttpSession:
+    """
+    Tek bir sanal kullanıcının kalıcı HTTP bağlantısı ve çerezleri
+
+    Yönlendirmeler izlenmez; form gönderimlerinin sonucu Location başlığından
+    anlaşılır.
+    """
+
+    def __init__(self, base_url, timeout=REQUEST_TIMEOUT):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme or 'http'
+        self.host = parts.netloc
+        self.timeout = timeout
+        self.cookies = {}
+        self.connection = None
+
+    def _connect(self):
+        connection_class = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+        self.connection = connection_class(self.host, timeout=self.timeout)
+
+    def request(self, method, path, fields=None, files=None):
+        """İstek gönder - (durum kodu, başlıklar, gövde)"""
+        headers = {'Host': self.host, 'User-Agent': 'moldpark-load-test'}
+        body = None
+        if method == 'POST':
+            headers['X-CSRFToken'] = self.cookies.get('csrftoken', '')
+            headers['Referer'] = f'{self.scheme}://{self.host}{path}'
+            if files:
+                body, content_type = encode_multipart(fields or {}, files)
+            else:
+                body, content_type = urlencode(fields or {}).encode(), 'application/x-www-form-urlencoded'
+            headers['Content-Type'] = content_type
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f'{name}={value}' for name, value in self.cookies.items())
+
+        # Sunucu boştaki bağlantıyı kapatmışsa bir kez yeniden bağlan
+        for attempt in range(2):
+            if self.connection is None:
+                self._connect()
+            try:
+                self.connection.request(method, path, body=body, headers=headers)
+                response = self.connection.getresponse()
+                content = response.read()
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                self.close()
+                if attempt:
+                    raise
+
+        for header in response.headers.get_all('Set-Cookie') or []:
+            cookie = SimpleCookie()
+            cookie.load(header)
+            for name, morsel in cookie.items():
+                if morsel['max-age'] == '0' or not morsel.value:
+                    self.cookies.pop(name, None)
+                else:
+                    self.cookies[name] = morsel.value
+        if response.getheader('Connection', '').lower() == 'close':
+            self.close()
+        return response.status, response.headers, content
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+def encode_multipart(fields, files):
+    """multipart/form-data gövdesi - files: {alan: (dosya adı, içerik)}"""
+    boundary = uuid.uuid4().hex
+    lines = []
+    for name, value in fields.items():
+        lines.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        )
+    for name, (filename, content) in files.items():
+        lines.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+            f'Content-Type: application/octet-stream\r\n\r\n'.encode() + content + b'\r\n'
+        )
+    lines.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(lines), f'multipart/form-data; boundary={boundary}'
+
+
+class LoadStats:
+    """Adım bazında gecikme ve hata sayaçları - thread güvenli"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.error_samples = {}
+        self.started = time.monotonic()
+        self.finished = None
+
+    def record(self, step, elapsed, error=None):
+        with self.lock:
+            self.latencies[step].append(elapsed * 1000)
+            if error is not None:
+                self.errors[step] += 1
+                self.error_samples.setdefault(step, error)
+
+    def report(self):
+        """Adım bazında özet - {'duration': s, 'steps': {adım: metrikler}, 'total': metrikler}"""
+        duration = (self.finished or time.monotonic()) - self.started
+        with self.lock:
+            steps = {step: self._summary(values, self.errors[step], duration) for step, values in self.latencies.items()}
+            all_values = [value for values in self.latencies.values() for value in values]
+            total = self._summary(all_values, sum(self.errors.values()), duration)
+            samples = dict(self.error_samples)
+        return {'duration': round(duration, 1), 'steps': steps, 'total': total, 'error_samples': samples}
+
+    @staticmethod
+    def _summary(values, errors, duration):
+        values = sorted(values)
+        count = len(values)
+        return {
+            'requests': count,
+            'errors': errors,
+            'error_rate': round(errors / count, 4) if count else 0,
+            'rps': round(count / duration, 2) if duration else 0,
+            'p50_ms': round(percentile(values, 50), 1) if values else None,
+            'p95_ms': round(percentile(values, 95), 1) if values else None,
+            'p99_ms': round(percentile(values, 99), 1) if values else None,
+            'max_ms': round(values[-1], 1) if values else None,
+        }
+
+
+class VirtualUser(threading.Thread):
+    """Giriş yapıp ağırlıklı adımları düşünme süresi ile tekrarlayan sanal kullanıcı"""
+
+    login_step = 'login'
+
+    def __init__(self, driver, index, weights, email):
+        super().__init__(name=f'{self.__class__.__name__}-{index}', daemon=True)
+        self.driver = driver
+        self.email = email
+        self.rng = random.Random(driver.seed * 100003 + index)
+        self.session = HttpSession(driver.base_url)
+        self.steps = [step for step, weight in weights.items() if weight > 0]
+        self.step_weights = [weights[step] for step in self.steps]
+
+    def run(self):
+        stop = self.driver.stop_event
+        try:
+            # Başlangıçlar yayılır ki tüm kullanıcılar aynı anda giriş yapmasın
+            if stop.wait(self.rng.uniform(0, self.driver.ramp_up)):
+                return
+            if not self.execute(self.login_step, self.login):
+                return
+            while not stop.is_set():
+                step = self.rng.choices(self.steps, self.step_weights)[0]
+                self.execute(step, getattr(self, step))
+                think = self.rng.expovariate(1 / self.driver.think_time) if self.driver.think_time else 0
+                if stop.wait(think):
+                    break
+        finally:
+            self.session.close()
+
+    def execute(self, step, action):
+        """Adımı çalıştır ve ölç - başarılıysa True"""
+        start = time.perf_counter()
+        try:
+            action()
+        except StepFailed as e:
+            self.driver.stats.record(step, time.perf_counter() - start, str(e))
+            return False
+        except (OSError, http.client.HTTPException) as e:
+            self.driver.stats.record(step, time.perf_counter() - start, f'{e.__class__.__name__}: {e}')
+            # Bozuk bağlantı bir sonraki adımda yeniden kurulur
+            self.session.close()
+            return False
+        self.driver.stats.record(step, time.perf_counter() - start)
+        return True
+
+    def get(self, path, expected=200):
+        status, headers, content = self.session.request('GET', path)
+        if status != expected:
+            raise StepFailed(f'GET {path} -> HTTP {status} {headers.get("Location", "")}'.strip())
+        return content
+
+    def post(self, path, fields, files=None, location=None):
+        """Form gönder - başarı, beklenen yere yönlendirme ile anlaşılır"""
+        status, headers, _ = self.session.request('POST', path, fields, files)
+        target = headers.get('Location', '')
+        if status != 302 or (location and location not in target):
+            raise StepFailed(f'POST {path} -> HTTP {status} {target}'.strip())
+        return target
+
+    def message_list(self):
+        self.get(self.driver.urls['message_list'])
+
+
+class CenterUser(VirtualUser):
+    def login(self):
+        urls = self.driver.urls
+        self.get(urls['center_login'])
+        self.post(urls['center_login'], {'login': self.email, 'password': self.driver.password})
+
+    def center_dashboard(self):
+        self.get(self.driver.urls['center_dashboard'])
+
+    def center_mold_list(self):
+        self.get(self.driver.urls['center_mold_list'])
+
+    def mold_create(self):
+        urls = self.driver.urls
+        self.get(urls['mold_create'])
+        fields = {
+            'order_type': 'digital',
+            'patient_name': self.rng.choice(['Ayşe', 'Mehmet', 'Zeynep', 'Mustafa', 'Elif']),
+            'patient_surname': self.rng.choice(['Yılmaz', 'Kaya', 'Demir', 'Şahin', 'Çelik']),
+            'patient_age': self.rng.randint(8, 90),
+            'patient_gender': self.rng.choice(['M', 'F']),
+            'ear_side': self.rng.choice(['right', 'left']),
+            'mold_type': self.rng.choice(['full', 'half', 'skeleton', 'cic', 'ite']),
+            'vent_diameter': self.rng.choice(['0.8', '1.0', '1.5', '2.0']),
+            'priority': self.rng.choice(['normal', 'normal', 'high', 'urgent']),
+            'notes': 'Yük testi',
+        }
+        files = {'scan_file': (f'scan_{uuid.uuid4().hex[:8]}.stl', self.driver.scan_content)}
+        self.post(urls['mold_create'], fields, files, location='/mold/')
+
+
+class ProducerUser(VirtualUser):
+
+    def __init__(self, driver, index, weights, email, orders):
+        super().__init__(driver, index, weights, email)
+        self.orders = orders
+
+    def login(self):
+        urls = self.driver.urls
+        self.get(urls['producer_login'])
+        self.post(urls['producer_login'], {'email': self.email, 'password': self.driver.password})
+
+    def producer_dashboard(self):
+        self.get(self.driver.urls['producer_dashboard'])
+
+    def producer_mold_list(self):
+        self.get(self.driver.urls['producer_mold_list'])
+
+    def mold_download(self):
+        order = self.rng.choice(self.orders)
+        self.get(reverse('producer:mold_download', args=[order['pk']]))
+
+    def status_update(self):
+        # Teslim edilmemiş bir siparişi bir sonraki duruma ilerlet
+        pending = [order for order in self.orders if order['status'] in STATUS_FLOW[:-1]]
+        if not pending:
+            raise StepFailed('İlerletilecek sipariş kalmadı')
+        order = self.rng.choice(pending)
+        next_status = STATUS_FLOW[STATUS_FLOW.index(order['status']) + 1]
+        estimated = order['estimated_delivery']
+        fields = {
+            'status': next_status,
+            'priority': order['priority'],
+            'estimated_delivery': timezone.localtime(estimated).strftime('%Y-%m-%dT%H:%M') if estimated else '',
+            'actual_delivery': '',
+            'shipping_company': order['shipping_company'],
+            'tracking_number': order['tracking_number'],
+            'shipping_cost': order['shipping_cost'] if order['shipping_cost'] is not None else '',
+            'producer_notes': order['producer_notes'],
+        }
+        self.post(reverse('producer:order_update', args=[order['pk']]), fields, location='/producer/orders/')
+        order['status'] = next_status
+
+
+class LoadTestDriver:
+    """
+    Sanal kullanıcıları başlatır, süre dolunca durdurur ve sonuçları toplar
+
+    Args:
+        base_url: Hedef sunucu (ör. http://127.0.0.1:8000)
+        centers: Eşzamanlı merkez kullanıcısı sayısı
+        producers: Eşzamanlı üretici kullanıcısı sayısı
+        duration: Test süresi (saniye, ısınma dahil)
+        think_time: Adımlar arası ortalama bekleme (saniye)
+        ramp_up: Kullanıcı başlangıçlarının yayıldığı süre (saniye)
+        prefix: `seed_scale` öneki - hesaplar bu önekli kullanıcılardan seçilir
+        weights: Adım ağırlıklarını ezen {adım: ağırlık}
+    """
+
+    def __init__(self, base_url, centers=200, producers=30, duration=DEFAULT_DURATION,
+                 think_time=DEFAULT_THINK_TIME, ramp_up=10, prefix='seed', password=DEFAULT_PASSWORD,
+                 weights=None, seed=42, log=None):
+        self.base_url = base_url.rstrip('/')
+        self.center_count = centers
+        self.producer_count = producers
+        self.duration = duration
+        self.think_time = think_time
+        self.ramp_up = ramp_up
+        self.prefix = prefix
+        self.password = password
+        self.seed = seed
+        self.log = log or (lambda message: None)
+        self.stop_event = threading.Event()
+        self.stats = LoadStats()
+
+        weights = weights or {}
+        unknown = set(weights) - set(CENTER_WEIGHTS) - set(PRODUCER_WEIGHTS)
+        if unknown:
+            raise LoadTestError(f'Bilinmeyen adım: {", ".join(sorted(unknown))}')
+        self.center_weights = {step: weights.get(step, weight) for step, weight in CENTER_WEIGHTS.items()}
+        self.producer_weights = {step: weights.get(step, weight) for step, weight in PRODUCER_WEIGHTS.items()}
+
+        self.urls = {
+            'center_login': reverse('account_center_login'),
+            'producer_login': reverse('producer:login'),
+            'center_dashboard': reverse('center:dashboard'),
+            'center_mold_list': reverse('mold:mold_list'),
+            'mold_create': reverse('mold:mold_create'),
+            'message_list': reverse('core:message_list'),
+            'producer_dashboard': reverse('producer:dashboard'),
+            'producer_mold_list': reverse('producer:mold_list'),
+        }
+        rng = random.Random(seed)
+        self.scan_content = binary_stl(ear_mesh(24, 12, 0.05, rng))
+
+    def load_accounts(self):
+        """Veri setinden merkez hesaplarını ve üreticilerin siparişlerini oku"""
+        center_emails = list(
+            Center.objects.filter(user__username__startswith=f'{self.prefix}_', is_active=True,
+                                  producer_networks__status='active')
+            .distinct().order_by('pk').values_list('user__email', flat=True)
+        )
+        producers = list(
+            Producer.objects.filter(user__username__startswith=f'{self.prefix}_', is_active=True, is_verified=True)
+            .order_by('pk').select_related('user')
+        )
+        if (self.center_count and not center_emails) or (self.producer_count and not producers):
+            raise LoadTestError(
+                f'"{self.prefix}" önekli veri bulunamadı. Önce `python manage.py seed_scale` çalıştırın.'
+            )
+
+        producer_orders = {}
+        for producer in producers:
+            orders = list(
+                ProducerOrder.objects.filter(producer=producer)
+                .exclude(Q(ear_mold__scan_file='') | Q(ear_mold__scan_file__isnull=True))
+                .order_by('-created_at')
+                .values('pk', 'status', 'priority', 'estimated_delivery', 'shipping_company',
+                        'tracking_number', 'shipping_cost', 'producer_notes')[:ORDERS_PER_PRODUCER]
+            )
+            if orders:
+                producer_orders[producer.user.email] = orders
+        if self.producer_count and not producer_orders:
+            raise LoadTestError('Üreticilerin tarama dosyalı siparişi yok')
+        return center_emails, producer_orders
+
+    def build_users(self):
+        center_emails, producer_orders = self.load_accounts()
+        users = []
+        # Sanal kullanıcı sayısı hesap sayısından fazlaysa hesaplar paylaşılır
+        for index in range(self.center_count):
+            users.append(CenterUser(self, index, self.center_weights, center_emails[index % len(center_emails)]))
+        producer_accounts = list(producer_orders.items())
+        for index in range(self.producer_count):
+            email, orders = producer_accounts[index % len(producer_accounts)]
+            # Aynı hesabı paylaşan kullanıcılar sipariş durumlarını ayrı izler
+            users.append(ProducerUser(
+                self, self.center_count + index, self.producer_weights, email, [dict(order) for order in orders]
+            ))
+        return users
+
+    def check_server(self):
+        host = urlsplit(self.base_url).netloc
+        session = HttpSession(self.base_url, timeout=5)
+        try:
+            session.request('GET', self.urls['center_login'])
+        except (OSError, http.client.HTTPException) as e:
+            raise LoadTestError(f'Sunucuya ulaşılamadı ({host}): {e}')
+        finally:
+            session.close()
+
+    def run(self, progress_interval=10):
+        """Testi çalıştır ve raporu döndür"""
+        users = self.build_users()
+        self.check_server()
+        self.log(f'{self.center_count} merkez ve {self.producer_count} üretici kullanıcısı, {self.duration} saniye...')
+
+        self.stats = LoadStats()
+        for user in users:
+            user.start()
+        deadline = time.monotonic() + self.duration
+        try:
+            while not self.stop_event.wait(min(progress_interval, max(0, deadline - time.monotonic()))):
+                if time.monotonic() >= deadline:
+                    break
+                total = self.stats.report()['total']
+                self.log(f'  {total["requests"]} istek, {total["errors"]} hata, {total["rps"]} istek/sn')
+        finally:
+            self.stop_event.set()
+            # Devam eden istekler zaman aşımına kadar bitebilir
+            for user in users:
+                user.join(REQUEST_TIMEOUT)
+            self.stats.finished = time.monotonic()
+
+        report = self.stats.report()
+        report['config'] = {
+            'base_url': self.base_url,
+            'centers': self.center_count,
+            'producers': self.producer_count,
+            'duration': self.duration,
+            'think_time': self.think_time,
+            'weights': {**self.center_weights, **self.producer_weights},
+        }
+        return report
+
+
+def save_report(path, report):
+    with open(path, 'w', encoding='utf-8') as report_file:
+        json.dump(report, report_file, ensure_ascii=False, indent=2)
+
+
+def parse_weights(value):
+    """'mold_create=5,mold_download=1' -> {'mold_create': 5, 'mold_download': 1}"""
+    weights = {}
+    for item in filter(None, (part.strip() for part in value.split(','))):
+        step, _, weight = item.partition('=')
+        try:
+            weights[step.strip()] = float(weight)
+        except ValueError:
+            raise LoadTestError(f'Geçersiz ağırlık: {item}')
+    return weights
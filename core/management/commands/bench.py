@@ -0,0 +1,105 @@
+"""
+En sık kullanılan view'ları ölçer ve depodaki taban çizgisi ile karşılaştırır
+Eşiği aşan gerilemede sıfırdan farklı kodla çıkar (CI için).
+Depodaki taban çizgisi (benchmarks/baseline.json) aşağıdaki referans veri
+seti ile üretilmiştir; karşılaştırma aynı veri seti üzerinde yapılmalıdır:
+    python manage.py seed_scale --centers 20 --producers 5 --molds 5000 --months 12
+    python manage.py bench
+    python manage.py bench --save-baseline
+"""
+import sys
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark import (
+    DEFAULT_ITERATIONS, DEFAULT_THRESHOLD, DEFAULT_WARMUP, BenchmarkError, BenchmarkRunner,
+    compare, default_baseline_path, load_baseline, save_baseline,
+)
+
+
+class Command(BaseCommand):
+    help = 'Uç nokta benchmark\'ı: süre yüzdelikleri, sorgu sayısı ve bellek tepe değerini taban çizgisi ile karşılaştırır'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--prefix', default='seed', help='seed_scale veri öneki (varsayılan: seed)')
+        parser.add_argument(
+            '--iterations', type=int, default=DEFAULT_ITERATIONS,
+            help=f'Uç nokta başına ölçülen istek sayısı (varsayılan: {DEFAULT_ITERATIONS})',
+        )
+        parser.add_argument(
+            '--warmup', type=int, default=DEFAULT_WARMUP,
+            help=f'Ölçülmeyen ısınma isteği sayısı (varsayılan: {DEFAULT_WARMUP})',
+        )
+        parser.add_argument('--only', nargs='+', metavar='AD', help='Sadece belirtilen uç noktaları çalıştır')
+        parser.add_argument('--baseline', help='Taban çizgisi dosyası (varsayılan: benchmarks/baseline.json)')
+        parser.add_argument(
+            '--threshold', type=float, default=DEFAULT_THRESHOLD,
+            help=f'Gerileme sayılacak artış oranı (varsayılan: {DEFAULT_THRESHOLD})',
+        )
+        parser.add_argument(
+            '--save-baseline', action='store_true',
+            help='Karşılaştırma yerine sonuçları taban çizgisi olarak kaydet',
+        )
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError('--iterations en az 1 olmalıdır')
+        if options['warmup'] < 0 or options['threshold'] < 0:
+            raise CommandError('--warmup ve --threshold negatif olamaz')
+
+        baseline_path = Path(options['baseline']) if options['baseline'] else default_baseline_path()
+
+        try:
+            runner = BenchmarkRunner(
+                prefix=options['prefix'],
+                iterations=options['iterations'],
+                warmup=options['warmup'],
+                only=options['only'],
+                log=self.stdout.write,
+            )
+            self.stdout.write(self.style.MIGRATE_HEADING('Uç noktalar ölçülüyor...'))
+            report = runner.run()
+        except BenchmarkError as e:
+            raise CommandError(str(e))
+
+        self.print_report(report)
+
+        if options['save_baseline']:
+            save_baseline(baseline_path, report)
+            self.stdout.write(self.style.SUCCESS(f'Taban çizgisi kaydedildi: {baseline_path}'))
+            return
+
+        if not baseline_path.is_file():
+            self.stdout.write(self.style.WARNING(
+                f'Taban çizgisi bulunamadı: {baseline_path} - --save-baseline ile oluşturun.'
+            ))
+            return
+
+        baseline = load_baseline(baseline_path)
+        if baseline.get('meta', {}).get('dataset', {}).get('center_molds') != report['meta']['dataset']['center_molds']:
+            self.stdout.write(self.style.WARNING(
+                'Veri seti taban çizgisindekinden farklı; sonuçlar doğrudan karşılaştırılamayabilir.'
+            ))
+
+        regressions = compare(report, baseline, options['threshold'])
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS(
+                f'Gerileme yok (eşik: %{options["threshold"] * 100:.0f}).'
+            ))
+            return
+
+        self.stdout.write(self.style.ERROR(f'{len(regressions)} gerileme bulundu:'))
+        for name, metric, old, new, ratio in regressions:
+            self.stdout.write(self.style.ERROR(f'  {name} {metric}: {old} -> {new} (+%{ratio * 100:.0f})'))
+        sys.exit(1)
+
+    def print_report(self, report):
+        self.stdout.write('')
+        self.stdout.write(f'{"Uç nokta":<32} {"p50 ms":>9} {"p95 ms":>9} {"maks. ms":>9} {"Sorgu":>6} {"Bellek KB":>10}')
+        for name, result in report['endpoints'].items():
+            self.stdout.write(
+                f'{name:<32} {result["p50_ms"]:>9.1f} {result["p95_ms"]:>9.1f} {result["max_ms"]:>9.1f} '
+                f'{result["queries"]:>6} {result["peak_kb"]:>10.1f}'
+            )
+        self.stdout.write('')
@@ -0,0 +1,54 @@
+"""
+Mali dönemleri kapatır - merkez ve üretici defter kayıtlarını yazar ve ayı kilitler
+Örnek: python manage.py close_ledger_period --year 2025 --month 9
+Ay verilmezse önceki ay kapatılır. Arada kapatılmamış aylar varsa sırayla kapatılır.
+"""
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.ledger_service import close_through, get_pending_months
+
+
+class Command(BaseCommand):
+    help = 'Belirtilen aya kadar kapatılmamış mali dönemleri kapatır'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--year', type=int, help='Kapatılacak yıl (varsayılan: önceki ay)')
+        parser.add_argument('--month', type=int, help='Kapatılacak ay (1-12)')
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Sadece kapatılacak ayları listele',
+        )
+
+    def handle(self, *args, **options):
+        year, month = options['year'], options['month']
+        if (year is None) != (month is None):
+            raise CommandError('--year ve --month birlikte verilmelidir')
+        if year is None:
+            today = timezone.localdate()
+            year, month = (today.year - 1, 12) if today.month == 1 else (today.year, today.month - 1)
+        if not 1 <= month <= 12:
+            raise CommandError(f'Geçersiz ay: {month}')
+
+        pending = get_pending_months(year, month)
+        if not pending:
+            self.stdout.write(f'{year}/{month:02d} dahil tüm dönemler zaten kapatılmış.')
+            return
+
+        if options['dry_run']:
+            for y, m in pending:
+                self.stdout.write(f'Kapatılacak: {y}/{m:02d}')
+            return
+
+        try:
+            periods = close_through(year, month)
+        except ValidationError as e:
+            raise CommandError(' '.join(e.messages))
+
+        for period in periods:
+            self.stdout.write(self.style.SUCCESS(
+                f'{period.year}/{period.month:02d} kapatıldı: '
+                f'{period.center_rows.count()} merkez, {period.producer_rows.count()} üretici kaydı'
+            ))
@@ -0,0 +1,52 @@
+"""
+Sık çalışan sorguların planlarını yazdırır ve beklenen indeksin kullanıldığını doğrular
+SQLite'ta EXPLAIN QUERY PLAN, PostgreSQL'de EXPLAIN çıktısı kullanılır.
+Planlayıcı küçük tablolarda tam taramayı seçebilir; sonuçlar gerçekçi veri
+üzerinde anlamlıdır (ör. seed_scale sonrası, PostgreSQL'de ANALYZE ile):
+    python manage.py explain_hot_queries
+    python manage.py explain_hot_queries --only order_overdue --check
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from core.hot_queries import HOT_QUERIES, explain_all
+
+
+class Command(BaseCommand):
+    help = 'Sık çalışan sorguların planlarını yazdırır ve beklenen indeksin kullanılıp kullanılmadığını gösterir'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--only', nargs='+', metavar='AD', choices=[query.name for query in HOT_QUERIES],
+            help='Sadece belirtilen sorguları açıkla'
+        )
+        parser.add_argument('--sql', action='store_true', help='Sorgu SQL\'ini de yazdır')
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Beklenen indeksi kullanmayan sorgu varsa hata ver (sıfırdan farklı çıkış kodu)'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.MIGRATE_HEADING(f'Sorgu planları ({connection.vendor})'))
+
+        results = explain_all(options['only'])
+        for result in results:
+            self.stdout.write('')
+            status = self.style.SUCCESS('indeks kullanılıyor') if result['uses_index'] else self.style.ERROR('indeks kullanılmıyor')
+            self.stdout.write(f'{result["name"]} - {result["description"]}')
+            self.stdout.write(f'  beklenen: {result["index"]} ({status})')
+            if options['sql']:
+                self.stdout.write(f'  SQL: {result["sql"]}')
+            for line in result['plan'].splitlines():
+                self.stdout.write(f'    {line}')
+
+        missing = [result['name'] for result in results if not result['uses_index']]
+        self.stdout.write('')
+        if not missing:
+            self.stdout.write(self.style.SUCCESS(f'{len(results)} sorgunun hepsi beklenen indeksi kullanıyor.'))
+            return
+
+        message = f'Beklenen indeksi kullanmayan sorgular: {", ".join(missing)}'
+        if options['check']:
+            raise CommandError(message)
+        self.stdout.write(self.style.WARNING(message))
@@ -0,0 +1,95 @@
+"""
+Rapor verilerini CSV veya XLSX dosyasına dışa aktarır
+Örnek: python manage.py export_report invoices --start-date 2025-01-01 --end-date 2025-12-31 --output faturalar.csv
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from core.exports import (
+    EXPORT_DATASETS, ExportError, build_queryset, get_dataset, iter_rows, select_columns, stream_csv, write_xlsx,
+)
+
+
+class Command(BaseCommand):
+    help = 'Fatura, sipariş, kargo ve işlem kayıtlarını CSV/XLSX olarak dışa aktarır'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'dataset',
+            choices=sorted(EXPORT_DATASETS),
+            help='Dışa aktarılacak veri seti',
+        )
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'xlsx'],
+            default='csv',
+            help='Çıktı formatı (varsayılan: csv)',
+        )
+        parser.add_argument(
+            '--start-date',
+            help='Başlangıç tarihi (YYYY-MM-DD, dahil)',
+        )
+        parser.add_argument(
+            '--end-date',
+            help='Bitiş tarihi (YYYY-MM-DD, dahil)',
+        )
+        parser.add_argument(
+            '--columns',
+            help='Virgülle ayrılmış sütun listesi (varsayılan: tümü)',
+        )
+        parser.add_argument(
+            '--filter',
+            action='append',
+            default=[],
+            metavar='AD=DEĞER',
+            help='Sunucu tarafı filtre, birden fazla verilebilir (ör. --filter status=paid)',
+        )
+        parser.add_argument(
+            '--output',
+            help='Çıktı dosyası (csv için verilmezse standart çıktıya yazılır)',
+        )
+
+    def handle(self, *args, **options):
+        filters = {}
+        for item in options['filter']:
+            name, sep, value = item.partition('=')
+            if not sep:
+                raise CommandError(f'Geçersiz filtre: {item} (AD=DEĞER bekleniyor)')
+            filters[name.strip()] = value.strip()
+
+        requested_columns = [
+            name.strip() for name in (options['columns'] or '').split(',') if name.strip()
+        ]
+
+        try:
+            dataset = get_dataset(options['dataset'])
+            columns = select_columns(dataset, requested_columns)
+            queryset = build_queryset(
+                dataset,
+                start_date=options['start_date'],
+                end_date=options['end_date'],
+                filters=filters,
+            )
+        except ExportError as e:
+            raise CommandError(str(e))
+
+        headers = [header for _, header in columns]
+        rows = iter_rows(dataset, queryset, columns, keep_numbers=(options['format'] == 'xlsx'))
+
+        if options['format'] == 'xlsx':
+            if not options['output']:
+                raise CommandError('XLSX için --output gerekli')
+            try:
+                with open(options['output'], 'wb') as output:
+                    write_xlsx(headers, rows, output, title=dataset['title'])
+            except ExportError as e:
+                raise CommandError(str(e))
+        elif options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+                for line in stream_csv(headers, rows):
+                    output.write(line)
+        else:
+            for line in stream_csv(headers, rows):
+                self.stdout.write(line, ending='')
+            return
+
+        self.stdout.write(self.style.SUCCESS(f'{dataset["title"]} dışa aktarıldı: {options["output"]}'))
@@ -0,0 +1,115 @@
+"""
+CSV dosyasından toplu kalıp siparişi alır
+Örnek: python manage.py import_molds siparisler.csv --center merkez_kullanici --no-notify
+
+Başlık satırı kalıp formunun alan adlarını kullanır (patient_name, patient_surname,
+patient_age, patient_gender, ear_side, mold_type, vent_diameter, priority, notes,
+special_instructions, order_type, scan_file). scan_file CSV dosyasına göreli ya da
+mutlak bir dosya yoludur; verilmezse order_type varsayılanı 'physical' olur.
+
+Her satır ayrı bir transaction'dır: hatalı satır raporlanır, diğerleri işlenir.
+"""
+import csv
+import os
+
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+
+from center.models import Center
+from core.order_intake import IntakeError, check_intake, create_mold_order
+from mold.forms import EarMoldForm
+
+
+class Command(BaseCommand):
+    help = 'CSV dosyasındaki kalıp siparişlerini sipariş alma servisiyle oluşturur'
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file', help='İçe aktarılacak CSV dosyası (UTF-8)')
+        parser.add_argument(
+            '--center',
+            required=True,
+            help='Siparişi veren merkez (merkez id veya kullanıcı adı)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Sadece doğrula, kayıt oluşturma',
+        )
+        parser.add_argument(
+            '--no-notify',
+            action='store_true',
+            help='Üretici, merkez ve yönetici bildirimlerini gönderme',
+        )
+
+    def get_center(self, value):
+        centers = Center.objects.select_related('user')
+        center = centers.filter(pk=value).first() if value.isdigit() else None
+        center = center or centers.filter(user__username=value).first()
+        if center is None:
+            raise CommandError(f'Merkez bulunamadı: {value}')
+        return center
+
+    def handle(self, *args, **options):
+        path = options['csv_file']
+        if not os.path.exists(path):
+            raise CommandError(f'Dosya bulunamadı: {path}')
+        center = self.get_center(options['center'])
+
+        try:
+            subscription, network = check_intake(center)
+        except IntakeError as e:
+            raise CommandError(str(e))
+
+        base_dir = os.path.dirname(os.path.abspath(path))
+        created = 0
+        failed = 0
+        with open(path, newline='', encoding='utf-8-sig') as handle:
+            for line, row in enumerate(csv.DictReader(handle), start=2):
+                row = {key.strip(): (value or '').strip() for key, value in row.items() if key}
+                scan_path = row.pop('scan_file', '')
+                # Boş bırakılan sütunlar DictReader'dan '' olarak gelir
+                if not row.get('order_type'):
+                    row['order_type'] = 'digital' if scan_path else 'physical'
+                if not row.get('priority'):
+                    row['priority'] = 'normal'
+
+                scan_file = None
+                if scan_path:
+                    scan_path = os.path.join(base_dir, scan_path)
+                    if not os.path.exists(scan_path):
+                        self.stderr.write(f'Satır {line}: tarama dosyası bulunamadı: {scan_path}')
+                        failed += 1
+                        continue
+                    scan_file = File(open(scan_path, 'rb'), name=os.path.basename(scan_path))
+
+                try:
+                    form = EarMoldForm(row, {'scan_file': scan_file} if scan_file else None, user=center.user)
+                    if not form.is_valid():
+                        errors = '; '.join(
+                            f'{field}: {" ".join(messages)}' for field, messages in form.errors.items()
+                        )
+                        self.stderr.write(f'Satır {line}: {errors}')
+                        failed += 1
+                        continue
+                    if options['dry_run']:
+                        created += 1
+                        continue
+
+                    intake = create_mold_order(
+                        center, form.save(commit=False), subscription, network,
+                        notify=not options['no_notify'],
+                    )
+                    created += 1
+                    self.stdout.write(
+                        f'Satır {line}: {intake.order.order_number} '
+                        f'({intake.mold.patient_name} {intake.mold.patient_surname}, ₺{intake.usage.total_cost})'
+                    )
+                except Exception as e:
+                    self.stderr.write(f'Satır {line}: {e}')
+                    failed += 1
+                finally:
+                    if scan_file:
+                        scan_file.close()
+
+        verb = 'doğrulandı' if options['dry_run'] else 'oluşturuldu'
+        self.stdout.write(self.style.SUCCESS(f'{created} sipariş {verb}, {failed} satır hatalı.'))
@@ -0,0 +1,94 @@
+"""
+Yerel sunucuya karşı çok thread'li yük testi
+Merkezler kalıp oluşturur, üreticiler tarama indirir ve panelleri yoklar;
+adım bazında verim, gecikme yüzdelikleri ve hata oranı raporlanır.
+Örnek:
+    python manage.py seed_scale --centers 200 --producers 30 --molds 50000
+    gunicorn -c deployment/gunicorn.conf.py backend.wsgi:application
+    python manage.py load_test --centers 200 --producers 30 --duration 300
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from core.load_test import (
+    DEFAULT_DURATION, DEFAULT_THINK_TIME, LoadTestDriver, LoadTestError, parse_weights, save_report,
+)
+from core.scale_seed import DEFAULT_PASSWORD
+
+
+class Command(BaseCommand):
+    help = 'Ağırlıklı merkez / üretici yolculukları ile yük testi yapar ve adım bazında rapor üretir'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Hedef sunucu (varsayılan: http://127.0.0.1:8000)')
+        parser.add_argument('--centers', type=int, default=200, help='Eşzamanlı merkez kullanıcısı (varsayılan: 200)')
+        parser.add_argument('--producers', type=int, default=30, help='Eşzamanlı üretici kullanıcısı (varsayılan: 30)')
+        parser.add_argument(
+            '--duration', type=int, default=DEFAULT_DURATION,
+            help=f'Test süresi, saniye (varsayılan: {DEFAULT_DURATION})',
+        )
+        parser.add_argument(
+            '--think-time', type=float, default=DEFAULT_THINK_TIME,
+            help=f'Adımlar arası ortalama bekleme, saniye (varsayılan: {DEFAULT_THINK_TIME})',
+        )
+        parser.add_argument('--ramp-up', type=float, default=10, help='Kullanıcı başlangıçlarının yayıldığı süre (varsayılan: 10)')
+        parser.add_argument(
+            '--weights',
+            help='Adım ağırlıkları, ör. "mold_create=5,mold_download=1,status_update=0"',
+        )
+        parser.add_argument('--prefix', default='seed', help='seed_scale veri öneki (varsayılan: seed)')
+        parser.add_argument('--password', default=DEFAULT_PASSWORD, help='Sanal kullanıcıların şifresi')
+        parser.add_argument('--seed', type=int, default=42, help='Rastgele sayı tohumu (varsayılan: 42)')
+        parser.add_argument('--json', help='Raporu JSON olarak bu dosyaya da yaz')
+
+    def handle(self, *args, **options):
+        if options['centers'] < 0 or options['producers'] < 0 or not options['centers'] + options['producers']:
+            raise CommandError('En az bir merkez ya da üretici kullanıcısı gereklidir')
+        if options['duration'] < 1:
+            raise CommandError('--duration en az 1 olmalıdır')
+        if options['think_time'] < 0 or options['ramp_up'] < 0:
+            raise CommandError('--think-time ve --ramp-up negatif olamaz')
+
+        try:
+            driver = LoadTestDriver(
+                base_url=options['url'],
+                centers=options['centers'],
+                producers=options['producers'],
+                duration=options['duration'],
+                think_time=options['think_time'],
+                ramp_up=options['ramp_up'],
+                prefix=options['prefix'],
+                password=options['password'],
+                weights=parse_weights(options['weights'] or ''),
+                seed=options['seed'],
+                log=self.stdout.write,
+            )
+            report = driver.run()
+        except LoadTestError as e:
+            raise CommandError(str(e))
+
+        self.print_report(report)
+        if options['json']:
+            save_report(options['json'], report)
+            self.stdout.write(self.style.SUCCESS(f'Rapor kaydedildi: {options["json"]}'))
+
+    def print_report(self, report):
+        self.stdout.write('')
+        self.stdout.write(self.style.MIGRATE_HEADING(f'Sonuçlar ({report["duration"]} saniye)'))
+        self.stdout.write(
+            f'{"Adım":<20} {"Sayı":>7} {"Hata":>6} {"Hata %":>7} {"Adım/sn":>8} '
+            f'{"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"maks. ms":>9}'
+        )
+        rows = sorted(report['steps'].items()) + [('TOPLAM', report['total'])]
+        for name, step in rows:
+            line = (
+                f'{name:<20} {step["requests"]:>7} {step["errors"]:>6} {step["error_rate"] * 100:>7.1f} '
+                f'{step["rps"]:>8.2f} {step["p50_ms"] or 0:>8.1f} {step["p95_ms"] or 0:>8.1f} '
+                f'{step["p99_ms"] or 0:>8.1f} {step["max_ms"] or 0:>9.1f}'
+            )
+            self.stdout.write(self.style.ERROR(line) if step['errors'] else line)
+
+        if report['error_samples']:
+            self.stdout.write('')
+            self.stdout.write(self.style.WARNING('Örnek hatalar:'))
+            for step, error in sorted(report['error_samples'].items()):
+                self.stdout.write(f'  {step}: {error}')
@@ -0,0 +1,107 @@
+"""
+Sorgu profilleyicisi kayıtlarını özetler
+View'ları toplam veritabanı süresine göre sıralar ve en çok tekrar eden sorguları listeler.
+Örnek: python manage.py perf_report --limit 20
+"""
+import glob
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Sorgu profilleyicisi logundan view başına DB süresi ve tekrar eden sorgu raporu üretir'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--log',
+            help='Profil log dosyası (varsayılan: QUERY_PROFILER_LOG, döndürülmüş dosyalar dahil)',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=15,
+            help='Her tabloda gösterilecek satır sayısı (varsayılan: 15)',
+        )
+        parser.add_argument(
+            '--view',
+            help='Sadece belirtilen view_name için rapor',
+        )
+
+    def handle(self, *args, **options):
+        log_path = Path(options['log'] or settings.QUERY_PROFILER_LOG)
+        paths = sorted(glob.glob(f'{log_path}.*')) + [str(log_path)]
+        paths = [path for path in paths if Path(path).is_file()]
+        if not paths:
+            raise CommandError(f'Profil kaydı bulunamadı: {log_path}')
+
+        views = {}
+        queries = {}
+        record_count = 0
+        for record in self.read_records(paths):
+            if options['view'] and record['view'] != options['view']:
+                continue
+            record_count += 1
+
+            view = views.setdefault(record['view'], {
+                'requests': 0, 'db_ms': 0.0, 'ms': 0.0, 'queries': 0, 'max_queries': 0,
+            })
+            view['requests'] += 1
+            view['db_ms'] += record['db_ms']
+            view['ms'] += record['ms']
+            view['queries'] += record['queries']
+            view['max_queries'] = max(view['max_queries'], record['queries'])
+
+            for dup in record.get('dups', []):
+                query = queries.setdefault(dup['fp'], {
+                    'sql': dup['sql'], 'requests': 0, 'count': 0, 'ms': 0.0, 'views': set(), 'sites': set(),
+                })
+                query['requests'] += 1
+                query['count'] += dup['count']
+                query['ms'] += dup['ms']
+                query['views'].add(record['view'])
+                query['sites'].update(dup.get('sites', []))
+
+        if not record_count:
+            raise CommandError('Filtreye uyan profil kaydı yok')
+
+        limit = options['limit']
+        self.stdout.write(self.style.SUCCESS(f'{record_count} örneklenmiş istek ({len(paths)} dosya)\n'))
+
+        self.stdout.write(self.style.MIGRATE_HEADING('View\'lar (toplam DB süresine göre)'))
+        self.stdout.write(f'{"View":<45} {"İstek":>7} {"DB ms":>10} {"Ort. DB":>9} {"Ort. süre":>10} {"Ort. sorgu":>10} {"Maks.":>6}')
+        ranked = sorted(views.items(), key=lambda item: item[1]['db_ms'], reverse=True)
+        for name, view in ranked[:limit]:
+            requests = view['requests']
+            self.stdout.write(
+                f'{name[:45]:<45} {requests:>7} {view["db_ms"]:>10.1f} {view["db_ms"] / requests:>9.1f} '
+                f'{view["ms"] / requests:>10.1f} {view["queries"] / requests:>10.1f} {view["max_queries"]:>6}'
+            )
+
+        self.stdout.write('')
+        self.stdout.write(self.style.MIGRATE_HEADING('En kötü tekrar eden sorgular (N+1 şüphesi)'))
+        if not queries:
+            self.stdout.write('Tekrar eden sorgu kaydı yok.')
+            return
+
+        ranked = sorted(queries.items(), key=lambda item: item[1]['ms'], reverse=True)
+        for fp, query in ranked[:limit]:
+            self.stdout.write(self.style.WARNING(
+                f'[{fp}] {query["count"]} çalıştırma / {query["requests"]} istek, '
+                f'toplam {query["ms"]:.1f} ms, istek başına {query["count"] / query["requests"]:.1f} tekrar'
+            ))
+            self.stdout.write(f'  SQL: {query["sql"]}')
+            self.stdout.write(f'  View: {", ".join(sorted(query["views"]))}')
+            for site in sorted(query['sites'])[:3]:
+                self.stdout.write(f'  Çağrı yeri: {site}')
+
+    def read_records(self, paths):
+        for path in paths:
+            with open(path, encoding='utf-8') as log_file:
+                for line in log_file:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
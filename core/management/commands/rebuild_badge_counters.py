@@ -0,0 +1,32 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from core.badge_counters import CACHE_KEY
+from core.models import UserBadgeCounter
+
+
+class Command(BaseCommand):
+    help = 'Kullanıcı rozet sayaçlarını (UserBadgeCounter) mesaj, bildirim ve revizyon kayıtlarından yeniden hesaplar'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            type=int,
+            help='Sadece belirtilen kullanıcı ID için yeniden hesapla'
+        )
+
+    def handle(self, *args, **options):
+        user_ids = User.objects.values_list('id', flat=True)
+        if options.get('user'):
+            user_ids = user_ids.filter(pk=options['user'])
+
+        self.stdout.write(self.style.WARNING('Rozet sayaçları yeniden hesaplanıyor...'))
+
+        updated_count = 0
+        for user_id in user_ids.iterator():
+            UserBadgeCounter.rebuild(user_id)
+            cache.delete(CACHE_KEY.format(user_id))
+            updated_count += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Toplam {updated_count} kullanıcı güncellendi.'))
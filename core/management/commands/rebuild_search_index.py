@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from core.search import SOURCES, backend, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Tam metin arama belgelerini (SearchDocument) kalıp, sipariş, merkez ve mesaj kayıtlarından yeniden üretir'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--kind',
+            nargs='+',
+            choices=sorted(SOURCES),
+            help='Sadece belirtilen türleri yeniden üret'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.WARNING(f'Arama indeksi yeniden üretiliyor ({backend()})...'))
+
+        counts = rebuild_index(options.get('kind'), log=lambda message: self.stdout.write(f'  {message}'))
+
+        self.stdout.write(self.style.SUCCESS(f'Toplam {sum(counts.values())} belge indekslendi.'))
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.api import SystemStatusAPI, build_system_health
+from core.status_snapshot import DEFAULT_INTERVAL, build_snapshot
+
+
+SNAPSHOTS = {
+    'system_status': lambda: SystemStatusAPI().build_status(),
+    'system_health': build_system_health,
+}
+
+
+class Command(BaseCommand):
+    help = 'Sistem durumu ve sağlık API belgelerini yeniden hesaplayıp önbelleğe yazar (cron veya --loop ile sabit aralıkta)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Durdurulana kadar --interval aralıkla yenile'
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=DEFAULT_INTERVAL,
+            help=f'Yenileme aralığı saniye (varsayılan: {DEFAULT_INTERVAL})'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            for name, builder in SNAPSHOTS.items():
+                try:
+                    snapshot = build_snapshot(name, builder)
+                except Exception as e:
+                    self.stderr.write(self.style.ERROR(f'{name}: {e}'))
+                    continue
+                if options['verbosity'] > 1:
+                    self.stdout.write(f'{name}: {snapshot["etag"]}')
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS('Durum belgeleri güncellendi.'))
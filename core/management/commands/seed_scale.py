@@ -0,0 +1,62 @@
+"""
+Benchmark ve yük testleri için üretim ölçeğinde sentetik veri üretir
+Örnek: python manage.py seed_scale --centers 200 --producers 30 --molds 100000 --months 24
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.scale_seed import DEFAULT_PASSWORD, ScaleSeeder
+
+
+class Command(BaseCommand):
+    help = 'Merkez, üretici, kalıp, sipariş, fatura, kargo ve bildirim verisini bulk_create ile toplu üretir'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--centers', type=int, default=50, help='İşitme merkezi sayısı (varsayılan: 50)')
+        parser.add_argument('--producers', type=int, default=10, help='Üretici sayısı (varsayılan: 10)')
+        parser.add_argument('--molds', type=int, default=10000, help='Kalıp sayısı (varsayılan: 10000)')
+        parser.add_argument('--months', type=int, default=12, help='Verinin yayılacağı ay sayısı (varsayılan: 12)')
+        parser.add_argument('--prefix', default='seed', help='Kullanıcı adı ve numara öneki (varsayılan: seed)')
+        parser.add_argument('--seed', type=int, default=42, help='Rastgele sayı tohumu (varsayılan: 42)')
+        parser.add_argument('--chunk-size', type=int, default=5000, help='bulk_create parça boyutu (varsayılan: 5000)')
+        parser.add_argument(
+            '--flush',
+            action='store_true',
+            help='Aynı önekle daha önce üretilmiş veriyi silip yeniden üret',
+        )
+
+    def handle(self, *args, **options):
+        for name in ('centers', 'producers', 'months', 'chunk_size'):
+            if options[name] < 1:
+                raise CommandError(f'--{name.replace("_", "-")} en az 1 olmalıdır')
+        if options['molds'] < 0:
+            raise CommandError('--molds negatif olamaz')
+
+        seeder = ScaleSeeder(
+            centers=options['centers'],
+            producers=options['producers'],
+            molds=options['molds'],
+            months=options['months'],
+            prefix=options['prefix'],
+            seed=options['seed'],
+            chunk_size=options['chunk_size'],
+            log=self.stdout.write,
+        )
+
+        if seeder.exists():
+            if not options['flush']:
+                raise CommandError(
+                    f'"{options["prefix"]}" önekli veri zaten var. --flush ile silin ya da farklı --prefix kullanın.'
+                )
+            self.stdout.write(self.style.WARNING('Önceki ölçek verisi siliniyor...'))
+            seeder.flush()
+
+        started = time.monotonic()
+        counts = seeder.run()
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(self.style.SUCCESS(f'\nVeri üretimi {elapsed:.1f} saniyede tamamlandı:'))
+        for name, count in counts.items():
+            self.stdout.write(f'  {name}: {count}')
+        self.stdout.write(f'Tüm kullanıcıların şifresi: {DEFAULT_PASSWORD}')
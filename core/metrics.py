@@ -0,0 +1,170 @@
+"""
+Prometheus Metrikleri
+İstek süresi, istek başına veritabanı sorgu sayısı / süresi, şablon çizim
+süresi ve önbellek isabet oranını URL adı (view_name) bazında toplar ve
+`/metrics` uç noktasından Prometheus formatında sunar.
+
+Varsayılan olarak kapalıdır (METRICS_ENABLED). Uç noktaya staff kullanıcılar
+veya `Authorization: Bearer <METRICS_TOKEN>` başlığı ile erişilir; nginx
+arkasında tüm istekler 127.0.0.1'den geldiği için IP kontrolü yapılmaz.
+
+Gunicorn gibi çok süreçli çalışmada `PROMETHEUS_MULTIPROC_DIR` ortam
+değişkeni ayarlanmalıdır; her worker değerlerini bu dizindeki dosyalara yazar
+ve `/metrics` tüm worker'ların toplamını döndürür.
+"""
+import hmac
+import os
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess,
+)
+
+
+PROCESS_START = time.time()
+
+UNRESOLVED = '<unresolved>'
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+REQUEST_LATENCY = Histogram(
+    'moldpark_request_latency_seconds', 'İstek süresi (saniye)',
+    ['view', 'method'], buckets=LATENCY_BUCKETS,
+)
+REQUESTS = Counter(
+    'moldpark_requests_total', 'İstek sayısı',
+    ['view', 'method', 'status'],
+)
+DB_QUERIES = Histogram(
+    'moldpark_request_db_queries', 'İstek başına veritabanı sorgu sayısı',
+    ['view'], buckets=QUERY_COUNT_BUCKETS,
+)
+DB_TIME = Histogram(
+    'moldpark_request_db_seconds', 'İstek başına toplam veritabanı süresi (saniye)',
+    ['view'], buckets=LATENCY_BUCKETS,
+)
+TEMPLATE_TIME = Histogram(
+    'moldpark_request_template_seconds', 'İstek başına şablon çizim süresi (saniye)',
+    ['view'], buckets=LATENCY_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    'moldpark_cache_requests_total', 'Önbellek okumaları',
+    ['result'],
+)
+
+# İstek boyunca biriken sorgu / şablon ölçümleri (thread başına)
+_state = threading.local()
+
+
+def process_uptime():
+    """Bu sürecin çalışma süresi (saniye)"""
+    return int(time.time() - PROCESS_START)
+
+
+def record_cache(hits, misses):
+    """Önbellek okuma sonuçlarını say - instrumented cache backend'leri çağırır"""
+    if hits:
+        CACHE_REQUESTS.labels('hit').inc(hits)
+    if misses:
+        CACHE_REQUESTS.labels('miss').inc(misses)
+
+
+def _query_timer(execute, sql, params, many, context):
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats = getattr(_state, 'stats', None)
+        if stats is not None:
+            stats['queries'] += 1
+            stats['db_time'] += time.perf_counter() - start
+
+
+def _timed_template_render(render):
+    def wrapper(self, *args, **kwargs):
+        stats = getattr(_state, 'stats', None)
+        # İç içe çizimler (include / inclusion tag) üst şablonun süresine dahildir
+        if stats is None or stats['rendering']:
+            return render(self, *args, **kwargs)
+        stats['rendering'] = True
+        start = time.perf_counter()
+        try:
+            return render(self, *args, **kwargs)
+        finally:
+            stats['template_time'] += time.perf_counter() - start
+            stats['rendering'] = False
+    return wrapper
+
+
+def install_template_timer():
+    """Django şablon backend'inin render metodunu süre ölçümü ile sar"""
+    from django.template.backends.django import Template
+
+    if not getattr(Template.render, '_moldpark_timed', False):
+        Template.render = _timed_template_render(Template.render)
+        Template.render._moldpark_timed = True
+
+
+class MetricsMiddleware:
+    """İstek süresi, sorgu sayısı / süresi ve şablon süresini view_name bazında ölçer"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = {'queries': 0, 'db_time': 0.0, 'template_time': 0.0, 'rendering': False}
+        _state.stats = stats
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(_query_timer))
+                response = self.get_response(request)
+        finally:
+            _state.stats = None
+
+        elapsed = time.perf_counter() - start
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else UNRESOLVED
+        if view == 'metrics':
+            return response
+
+        REQUEST_LATENCY.labels(view, request.method).observe(elapsed)
+        REQUESTS.labels(view, request.method, str(response.status_code)).inc()
+        DB_QUERIES.labels(view).observe(stats['queries'])
+        DB_TIME.labels(view).observe(stats['db_time'])
+        if stats['template_time']:
+            TEMPLATE_TIME.labels(view).observe(stats['template_time'])
+        return response
+
+
+def _registry():
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def _has_metrics_token(request):
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    if not token or not header.startswith('Bearer '):
+        return False
+    return hmac.compare_digest(header[len('Bearer '):].strip().encode(), token.encode())
+
+
+def metrics_view(request):
+    """Prometheus metrikleri - sadece staff kullanıcılar ve METRICS_TOKEN sahibi"""
+    if not getattr(settings, 'METRICS_ENABLED', False):
+        raise Http404
+    user = getattr(request, 'user', None)
+    if not (user and user.is_staff) and not _has_metrics_token(request):
+        return HttpResponseForbidden('Metriklere erişim izniniz yok.')
+    return HttpResponse(generate_latest(_registry()), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,106 @@
+# Generated by Django 4.2.23 on 2026-10-19 13:20
+
+import core.models
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('center', '0008_deliverynote_recipient_deliverynoteitem_and_more'),
+        ('producer', '0007_producerratingstats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('core', '0026_alter_cargoshipment_invoice'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LedgerPeriod',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField(verbose_name='Yıl')),
+                ('month', models.IntegerField(verbose_name='Ay')),
+                ('status', models.CharField(choices=[('open', 'Açık'), ('closed', 'Kapatıldı')], default='open', max_length=10, verbose_name='Durum')),
+                ('pricing_snapshot', models.JSONField(blank=True, default=dict, verbose_name='Fiyatlandırma Özeti')),
+                ('closed_at', models.DateTimeField(blank=True, null=True, verbose_name='Kapatılma Tarihi')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Oluşturulma')),
+                ('closed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='closed_ledger_periods', to=settings.AUTH_USER_MODEL, verbose_name='Kapatan')),
+            ],
+            options={
+                'verbose_name': 'Mali Dönem',
+                'verbose_name_plural': 'Mali Dönemler',
+                'ordering': ['-year', '-month'],
+                'unique_together': {('year', 'month')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ProducerLedgerSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('producer_name', models.CharField(max_length=200, verbose_name='Üretici Adı')),
+                ('physical_count', models.IntegerField(default=0, verbose_name='Fiziksel Kalıp Sayısı')),
+                ('digital_count', models.IntegerField(default=0, verbose_name='Dijital Sipariş Sayısı')),
+                ('total_orders', models.IntegerField(default=0, verbose_name='Toplam Sipariş')),
+                ('physical_gross', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Fiziksel Brüt')),
+                ('digital_gross', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Dijital Brüt')),
+                ('gross_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Brüt Gelir (KDV Dahil)')),
+                ('gross_revenue_without_vat', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Brüt Gelir (KDV Hariç)')),
+                ('vat_amount', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='KDV Tutarı')),
+                ('moldpark_fee', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='MoldPark Hizmet Bedeli')),
+                ('credit_card_fee', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Kredi Kartı Komisyonu')),
+                ('net_earnings', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Net Kazanç')),
+                ('invoice_count', models.IntegerField(default=0, verbose_name='Fatura Sayısı')),
+                ('paid_amount', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Ödenen Tutar')),
+                ('pending_amount', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Bekleyen Tutar')),
+                ('period', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='producer_rows', to='core.ledgerperiod', verbose_name='Dönem')),
+                ('producer', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ledger_rows', to='producer.producer', verbose_name='Üretici')),
+            ],
+            options={
+                'verbose_name': 'Üretici Defter Kaydı',
+                'verbose_name_plural': 'Üretici Defter Kayıtları',
+                'ordering': ['producer_name'],
+                'unique_together': {('period', 'producer')},
+            },
+            bases=(core.models.LockedLedgerRowMixin, models.Model),
+        ),
+        migrations.CreateModel(
+            name='CenterLedgerSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('center_name', models.CharField(max_length=200, verbose_name='Merkez Adı')),
+                ('physical_count', models.IntegerField(default=0, verbose_name='Fiziksel Kalıp Sayısı')),
+                ('digital_count', models.IntegerField(default=0, verbose_name='3D Modelleme Sayısı')),
+                ('physical_amount', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Fiziksel Kalıp Tutarı')),
+                ('digital_amount', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='3D Modelleme Tutarı')),
+                ('package_amount', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Paket Tutarı')),
+                ('monthly_system_fee', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Aylık Sistem Ücreti')),
+                ('gross_amount', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Brüt Tutar (KDV Dahil)')),
+                ('gross_amount_without_vat', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Brüt Tutar (KDV Hariç)')),
+                ('vat_amount', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='KDV Tutarı')),
+                ('moldpark_fee', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='MoldPark Hizmet Bedeli')),
+                ('net_to_producer', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Üreticiye Net')),
+                ('amount_after_monthly_fee', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Hizmet Tutarı (Aylık Ücret Hariç)')),
+                ('has_existing_invoice', models.BooleanField(default=False, verbose_name='Fatura Kesilmiş')),
+                ('has_package_invoice', models.BooleanField(default=False, verbose_name='Paket Faturası Var')),
+                ('latest_invoice_number', models.CharField(blank=True, max_length=50, verbose_name='Son Fatura No')),
+                ('latest_invoice_date', models.DateField(blank=True, null=True, verbose_name='Son Fatura Tarihi')),
+                ('package_info', models.CharField(blank=True, max_length=200, verbose_name='Paket Bilgisi')),
+                ('package_invoice_numbers', models.JSONField(blank=True, default=list, verbose_name='Paket Fatura Numaraları')),
+                ('invoice_count', models.IntegerField(default=0, verbose_name='Fatura Sayısı')),
+                ('invoiced_amount', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Faturalanan Tutar')),
+                ('paid_amount', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Ödenen Tutar')),
+                ('center', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ledger_rows', to='center.center', verbose_name='Merkez')),
+                ('latest_invoice', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.invoice', verbose_name='Son Fatura')),
+                ('period', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='center_rows', to='core.ledgerperiod', verbose_name='Dönem')),
+            ],
+            options={
+                'verbose_name': 'Merkez Defter Kaydı',
+                'verbose_name_plural': 'Merkez Defter Kayıtları',
+                'ordering': ['center_name'],
+                'unique_together': {('period', 'center')},
+            },
+            bases=(core.models.LockedLedgerRowMixin, models.Model),
+        ),
+    ]
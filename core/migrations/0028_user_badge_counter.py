@@ -0,0 +1,31 @@
+# Generated by Django 4.2.23 on 2026-10-19 13:30
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('core', '0027_ledger_periods'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserBadgeCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unread_messages', models.IntegerField(default=0, verbose_name='Okunmamış Mesaj')),
+                ('unread_notifications', models.IntegerField(default=0, verbose_name='Okunmamış Bildirim')),
+                ('pending_revisions', models.IntegerField(default=0, verbose_name='Bekleyen Revizyon Talebi')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Güncellenme Tarihi')),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='badge_counter', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Rozet Sayacı',
+                'verbose_name_plural': 'Rozet Sayaçları',
+            },
+        ),
+    ]
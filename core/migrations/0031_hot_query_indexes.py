@@ -0,0 +1,21 @@
+# Generated by Django 4.2.23 on 2026-10-19 14:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0030_message_receipt'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(condition=models.Q(('issued_by_center__isnull', False)), fields=['issued_by_center', 'invoice_type', 'issue_date'], name='invoice_center_type_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='simplenotification',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['user', 'created_at'], name='notif_user_unread_idx'),
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 4.2.23 on 2026-10-19 14:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+from decimal import Decimal
+
+from django.utils import timezone
+
+
+def backfill_usage_entries(apps, schema_editor):
+    """Mevcut kalıplar için defter satırları - kalıpta saklanan birim fiyatlardan"""
+    EarMold = apps.get_model('mold', 'EarMold')
+    UserSubscription = apps.get_model('core', 'UserSubscription')
+    UsageLedgerEntry = apps.get_model('core', 'UsageLedgerEntry')
+    # Satırlar kalıbın oluşturulma zamanını taşır
+    UsageLedgerEntry._meta.get_field('created_at').auto_now_add = False
+
+    subscriptions = dict(UserSubscription.objects.values_list('user_id', 'id'))
+    molds = EarMold.objects.order_by('id').values_list(
+        'id', 'center__user_id', 'is_physical_shipment', 'unit_price', 'digital_modeling_price', 'created_at',
+    )
+    entries = []
+    for mold_id, user_id, physical, unit_price, modeling_price, created_at in molds.iterator(chunk_size=2000):
+        if user_id not in subscriptions:
+            continue
+        physical_cost = (unit_price or Decimal('0')) if physical else Decimal('0')
+        digital_cost = Decimal('0') if physical else (modeling_price or Decimal('0'))
+        entries.append(UsageLedgerEntry(
+            subscription_id=subscriptions[user_id],
+            ear_mold_id=mold_id,
+            kind='physical' if physical else 'digital',
+            period=timezone.localtime(created_at).date().replace(day=1),
+            used_package_credit=bool(physical and unit_price == 0),
+            physical_cost=physical_cost,
+            digital_cost=digital_cost,
+            total_cost=physical_cost + digital_cost,
+            created_at=created_at,
+        ))
+        if len(entries) >= 2000:
+            UsageLedgerEntry.objects.bulk_create(entries)
+            entries = []
+    UsageLedgerEntry.objects.bulk_create(entries)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mold', '0017_hot_query_indexes'),
+        ('core', '0031_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UsageLedgerEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('physical', 'Fiziksel Kalıp'), ('digital', 'Dijital Tarama')], max_length=10, verbose_name='Tür')),
+                ('period', models.DateField(help_text='Kullanımın ait olduğu ayın ilk günü', verbose_name='Dönem')),
+                ('used_package_credit', models.BooleanField(default=False, verbose_name='Paket Hakkından')),
+                ('physical_cost', models.DecimalField(decimal_places=2, default=0, max_digits=10, verbose_name='Fiziksel Kalıp Ücreti')),
+                ('digital_cost', models.DecimalField(decimal_places=2, default=0, max_digits=10, verbose_name='Dijital Tarama Ücreti')),
+                ('total_cost', models.DecimalField(decimal_places=2, default=0, max_digits=10, verbose_name='Toplam')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Oluşturulma Tarihi')),
+                ('ear_mold', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='usage_entries', to='mold.earmold', verbose_name='Kalıp')),
+                ('subscription', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='usage_entries', to='core.usersubscription', verbose_name='Abonelik')),
+            ],
+            options={
+                'verbose_name': 'Kullanım Kaydı',
+                'verbose_name_plural': 'Kullanım Kayıtları',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['subscription', 'period'], name='core_usagel_subscri_ea4bd8_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_usage_entries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,80 @@
+from django.db import migrations
+
+from core.search import normalize
+
+
+BATCH_SIZE = 500
+
+
+def _documents(queryset, kind, build):
+    for instance in queryset.order_by('pk').iterator(chunk_size=BATCH_SIZE):
+        title, parts = build(instance)
+        yield kind, instance.pk, str(title)[:255], normalize(' '.join(str(part or '') for part in parts))
+
+
+def backfill_search_documents(apps, schema_editor):
+    """
+    0029'dan önce var olan kayıtların arama belgeleri - core.search.SOURCES ile aynı metin
+
+    Kayıt anında indekslenmiş belgelere dokunulmaz (ignore_conflicts).
+    """
+    SearchDocument = apps.get_model('core', 'SearchDocument')
+    Message = apps.get_model('core', 'Message')
+    Center = apps.get_model('center', 'Center')
+    EarMold = apps.get_model('mold', 'EarMold')
+    ProducerOrder = apps.get_model('producer', 'ProducerOrder')
+
+    sources = (
+        _documents(
+            EarMold.objects.select_related('center'), 'mold',
+            lambda mold: (
+                f'{mold.patient_name} {mold.patient_surname}',
+                (mold.patient_name, mold.patient_surname, mold.center.name),
+            ),
+        ),
+        _documents(
+            ProducerOrder.objects.select_related('center', 'ear_mold'), 'order',
+            lambda order: (
+                f'{order.order_number} - {order.ear_mold.patient_name} {order.ear_mold.patient_surname}',
+                (order.order_number, order.ear_mold.patient_name, order.ear_mold.patient_surname,
+                 order.center.name),
+            ),
+        ),
+        _documents(
+            Center.objects.select_related('user'), 'center',
+            lambda center: (center.name, (center.name, center.address, center.phone, center.user.email)),
+        ),
+        _documents(
+            # Tarihsel modelde User.get_full_name yok
+            Message.objects.select_related('sender'), 'message',
+            lambda message: (
+                message.subject,
+                (message.subject, message.content,
+                 f'{message.sender.first_name} {message.sender.last_name}'.strip(), message.sender.username),
+            ),
+        ),
+    )
+
+    for documents in sources:
+        batch = []
+        for kind, object_id, title, body in documents:
+            batch.append(SearchDocument(kind=kind, object_id=object_id, title=title, body=body))
+            if len(batch) >= BATCH_SIZE:
+                SearchDocument.objects.bulk_create(batch, ignore_conflicts=True)
+                batch = []
+        if batch:
+            SearchDocument.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0032_usage_ledger'),
+        ('center', '0008_deliverynote_recipient_deliverynoteitem_and_more'),
+        ('mold', '0019_revision_events'),
+        ('producer', '0010_drop_legacy_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,60 @@
+from django.db import migrations
+
+
+BATCH_SIZE = 1000
+
+
+def backfill_broadcast_receipts(apps, schema_editor):
+    """
+    0030'dan önce gönderilmiş toplu mesajları görebilen kullanıcılar için okuma kaydı
+
+    Okuma kayıtlarından önce toplu mesajlar herkes için okunmuş sayılıyordu;
+    kayıt açılmazsa eski duyuruların hepsi deploy sonrası okunmamış görünür.
+    Görünürlük Message.received_filter ile aynıdır, gönderen hariç tutulur.
+    """
+    Message = apps.get_model('core', 'Message')
+    MessageReceipt = apps.get_model('core', 'MessageReceipt')
+    User = apps.get_model('auth', 'User')
+
+    audiences = {
+        'superuser': set(User.objects.filter(is_superuser=True).values_list('pk', flat=True)),
+        'all': set(User.objects.values_list('pk', flat=True)),
+        'center': set(User.objects.filter(center__isnull=False).values_list('pk', flat=True)),
+        'producer': set(User.objects.filter(producer__isnull=False).values_list('pk', flat=True)),
+    }
+
+    broadcasts = Message.objects.filter(is_broadcast=True).values_list(
+        'pk', 'sender_id', 'message_type', 'broadcast_to_centers', 'broadcast_to_producers', 'created_at',
+    )
+    batch = []
+    for pk, sender_id, message_type, to_centers, to_producers, created_at in broadcasts.iterator():
+        users = set(audiences['superuser'])
+        if message_type == 'admin_to_all':
+            users |= audiences['all']
+        elif message_type == 'admin_to_center' and to_centers:
+            users |= audiences['center']
+        elif message_type == 'admin_to_producer' and to_producers:
+            users |= audiences['producer']
+        users.discard(sender_id)
+
+        # Mevcut okuma kayıtları korunur (ignore_conflicts)
+        for user_id in users:
+            batch.append(MessageReceipt(message_id=pk, user_id=user_id, read_at=created_at))
+            if len(batch) >= BATCH_SIZE:
+                MessageReceipt.objects.bulk_create(batch, ignore_conflicts=True)
+                batch = []
+    if batch:
+        MessageReceipt.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0033_backfill_search_documents'),
+        ('center', '0008_deliverynote_recipient_deliverynoteitem_and_more'),
+        ('producer', '0010_drop_legacy_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_broadcast_receipts, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from notifications.signals import notify
@@ -105,6 +106,13 @@ class Message(models.Model):
         
         return f'{self.subject} - {sender_name} → {recipient_name}'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Rozet sayaçlarına fark uygulamak için yüklenen durumu sakla
+        instance._badge_state = (instance.__dict__.get('recipient_id'), instance.__dict__.get('is_read'))
+        return instance
+
     def mark_as_read(self):
         """Mesajı okundu olarak işaretle"""
         if not self.is_read:
@@ -112,6 +120,31 @@ class Message(models.Model):
             self.read_at = timezone.now()
             self.save(update_fields=['is_read', 'read_at'])
 
+    @classmethod
+    def received_filter(cls, user):
+        """Kullanıcının gelen kutusuna düşen mesajlar - direkt ve ilgili toplu mesajlar"""
+        if user.is_superuser:
+            # Admin tüm toplu mesajları ve merkez / üretici mesajlarını görür
+            return (
+                models.Q(recipient=user)
+                | models.Q(is_broadcast=True)
+                | models.Q(message_type__in=['center_to_admin', 'producer_to_admin'])
+            )
+        broadcast_filters = models.Q(is_broadcast=True, message_type='admin_to_all')
+        if hasattr(user, 'center'):
+            broadcast_filters |= models.Q(is_broadcast=True, broadcast_to_centers=True, message_type='admin_to_center')
+        if hasattr(user, 'producer'):
+            broadcast_filters |= models.Q(is_broadcast=True, broadcast_to_producers=True, message_type='admin_to_producer')
+        return models.Q(recipient=user) | broadcast_filters
+
+    @classmethod
+    def unread_filter(cls, user):
+        """Kullanıcı için okunmamış - direkt mesajda is_read, toplu mesajda okuma kaydı yok (kendi gönderdikleri hariç)"""
+        return (
+            models.Q(is_broadcast=False, recipient=user, is_read=False)
+            | (models.Q(is_broadcast=True) & ~models.Q(sender=user) & ~MessageReceipt.read_by(user))
+        )
+
     def mark_as_replied(self):
         """Mesajı cevaplandı olarak işaretle"""
         if not self.is_replied:
@@ -156,6 +189,67 @@ class Message(models.Model):
         return False
 
 
+class MessageReceipt(models.Model):
+    """
+    Mesaj Okuma Kaydı - toplu mesajların kullanıcı bazında okunma durumu
+
+    Toplu mesaj gönderilirken alıcılar için satır açılmaz; kullanıcı mesajı
+    okuduğunda satır oluşturulur, satırı olmayan toplu mesaj okunmamıştır.
+    Direkt mesajların tek alıcısı olduğundan okuma durumu Message.is_read'de
+    kalır.
+    """
+
+    message = models.ForeignKey(Message, on_delete=models.CASCADE, related_name='receipts', verbose_name='Mesaj')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='message_receipts', verbose_name='Kullanıcı')
+    read_at = models.DateTimeField('Okunma Tarihi', default=timezone.now)
+
+    class Meta:
+        verbose_name = 'Mesaj Okuma Kaydı'
+        verbose_name_plural = 'Mesaj Okuma Kayıtları'
+        unique_together = ('message', 'user')
+
+    def __str__(self):
+        return f'{self.message_id} - {self.user.username}'
+
+    @classmethod
+    def read_by(cls, user):
+        """Mesaj sorgularında kullanılacak 'kullanıcı okudu' koşulu"""
+        return models.Exists(cls.objects.filter(message=models.OuterRef('pk'), user=user))
+
+    @classmethod
+    def mark_read(cls, user, messages):
+        """
+        Kullanıcının `messages` içindeki okunmamış mesajlarını toplu işaretle
+
+        Direkt mesajlar tek UPDATE ile, toplu mesajların eksik okuma kayıtları
+        tek bulk_create ile yazılır; mesaj sayısından bağımsız birkaç sorgu.
+
+        Returns:
+            int: Okundu işaretlenen mesaj sayısı
+        """
+        from .badge_counters import adjust, invalidate_broadcasts
+
+        now = timezone.now()
+        messages = messages.order_by()
+
+        # update() signal çalıştırmaz - rozet sayacı burada düşülür
+        direct_count = messages.filter(
+            is_broadcast=False, recipient=user, is_read=False
+        ).update(is_read=True, read_at=now)
+        adjust([user.pk], 'unread_messages', -direct_count)
+
+        unread_broadcast_ids = messages.filter(is_broadcast=True).filter(~cls.read_by(user)).values_list('pk', flat=True)
+        receipts = cls.objects.bulk_create(
+            [cls(message_id=message_id, user=user, read_at=now) for message_id in unread_broadcast_ids],
+            batch_size=500,
+            ignore_conflicts=True,
+        )
+        # bulk_create signal çalıştırmaz - toplu mesaj sayımı burada yenilenir
+        if receipts:
+            invalidate_broadcasts([user.pk])
+        return direct_count + len(receipts)
+
+
 class PricingPlan(models.Model):
     """Fiyatlandırma Planları - Basitleştirilmiş Sistem"""
     
@@ -310,73 +404,50 @@ class UserSubscription(models.Model):
     def add_mold_usage(self, ear_mold=None):
         """Kalıp kullanımı ekle ve maliyeti hesapla
 
+        Kullanım defterine satır eklenir, sayaçlar kilitli satırda F() ile
+        artırılır (core.usage_ledger). Eşzamanlı kalıp oluşturmada güncelleme
+        kaybolmaz.
+
         Args:
             ear_mold: EarMold nesnesi (ücret hesaplaması için)
 
         Returns:
-            float: Toplam maliyet (fiziksel + dijital)
+            Decimal: Toplam maliyet (fiziksel + dijital)
         """
-        self.reset_monthly_usage_if_needed()
-
-        physical_cost = 0
-        digital_cost = 0
-
-        if ear_mold:
-            # Fiziksel kalıp gönderimi varsa
-            if ear_mold.is_physical_shipment:
-                # Paket planıysa ve hak varsa hak kullan, yoksa tek kalıp ücreti al
-                if self.plan.plan_type == 'package' and self.package_credits > self.used_credits:
-                    # Paket hakkından kullan
-                    self.used_credits += 1
-                    physical_cost = 0  # Paket hakkından kullanıldığı için ücret yok
-                else:
-                    # Paket hakkı yoksa tek kalıp ücreti al
-                    physical_cost = self.plan.per_mold_price_try  # 450 TL
-                
-                self.models_used_this_month += 1
-
-            # Dijital tarama seçildiyse (3D Modelleme Hizmeti) ücret al
-            if not ear_mold.is_physical_shipment:
-                digital_cost = self.plan.modeling_service_fee_try  # 19 TL
-                self.digital_scans_this_month += 1
-        else:
-            # Geriye uyumluluk için eski davranış
-            if self.plan.plan_type == 'package' and self.package_credits > self.used_credits:
-                self.used_credits += 1
-                physical_cost = 0
-            else:
-                physical_cost = self.plan.per_mold_price_try
-            self.models_used_this_month += 1
-
-        total_cost = physical_cost + digital_cost
-        self.total_mold_cost_this_month += total_cost
-        self.models_used_total += 1
+        from .usage_ledger import record_mold_usage
 
-        self.save()
-        return total_cost
+        entry = record_mold_usage(self, ear_mold)
+        self.refresh_from_db(fields=[
+            'models_used_this_month', 'models_used_total', 'digital_scans_this_month',
+            'total_mold_cost_this_month', 'used_credits', 'monthly_fee_paid', 'last_reset_date',
+        ])
+        return entry.total_cost
     
     def reset_monthly_usage_if_needed(self):
         """Gerekirse aylık kullanımı sıfırla (paket hakları sıfırlanmaz)"""
-        now = timezone.now()
-        if (now.year != self.last_reset_date.year or
-            now.month != self.last_reset_date.month):
-            self.models_used_this_month = 0
-            self.digital_scans_this_month = 0
-            self.total_mold_cost_this_month = 0
-            self.monthly_fee_paid = False
-            self.last_reset_date = now
-            # NOT: used_credits ve package_credits sıfırlanmaz çünkü paket hakları aylık değil
-            self.save()
+        from .usage_ledger import reset_monthly_counters
+
+        if reset_monthly_counters(self.pk):
+            self.refresh_from_db(fields=[
+                'models_used_this_month', 'digital_scans_this_month', 'total_mold_cost_this_month',
+                'monthly_fee_paid', 'last_reset_date',
+            ])
     
     def get_remaining_models(self):
         """Kalan model sayısı - Artık sınırsız"""
         return None  # Sınırsız
     
+    def get_current_month_usage(self):
+        """Bu ayın kullanımı - defter satırlarından, yazma yapmadan"""
+        from .usage_ledger import monthly_usage
+
+        return monthly_usage(self)
+    
     def get_current_month_total(self):
-        """Bu ay toplam maliyet"""
-        self.reset_monthly_usage_if_needed()
-        monthly_fee = self.plan.monthly_fee_try if not self.monthly_fee_paid else 0
-        return monthly_fee + self.total_mold_cost_this_month
+        """Bu ay toplam maliyet - defter satırlarından, yazma yapmadan"""
+        from .usage_ledger import current_month_total
+
+        return current_month_total(self)
     
     # Geriye dönük uyumluluk için eski methodlar
     def use_model_quota(self):
@@ -384,6 +455,47 @@ class UserSubscription(models.Model):
         return self.add_mold_usage()
 
 
+class UsageLedgerEntry(models.Model):
+    """
+    Kullanım Defteri - her kalıp kullanımı için eklenen değişmez satır
+
+    Aylık kullanım ve maliyet toplamları bu satırlardan okunur; abonelik
+    üzerindeki sayaçlar aynı transaction içinde F() ile güncellenen
+    özetlerdir. Satırlar sonradan değiştirilmez.
+    """
+
+    KIND_CHOICES = [
+        ('physical', 'Fiziksel Kalıp'),
+        ('digital', 'Dijital Tarama'),
+    ]
+
+    subscription = models.ForeignKey(UserSubscription, on_delete=models.CASCADE, related_name='usage_entries', verbose_name='Abonelik')
+    ear_mold = models.ForeignKey('mold.EarMold', on_delete=models.SET_NULL, null=True, blank=True, related_name='usage_entries', verbose_name='Kalıp')
+    kind = models.CharField('Tür', max_length=10, choices=KIND_CHOICES)
+    period = models.DateField('Dönem', help_text='Kullanımın ait olduğu ayın ilk günü')
+    used_package_credit = models.BooleanField('Paket Hakkından', default=False)
+    physical_cost = models.DecimalField('Fiziksel Kalıp Ücreti', max_digits=10, decimal_places=2, default=0)
+    digital_cost = models.DecimalField('Dijital Tarama Ücreti', max_digits=10, decimal_places=2, default=0)
+    total_cost = models.DecimalField('Toplam', max_digits=10, decimal_places=2, default=0)
+    created_at = models.DateTimeField('Oluşturulma Tarihi', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Kullanım Kaydı'
+        verbose_name_plural = 'Kullanım Kayıtları'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['subscription', 'period']),
+        ]
+
+    def __str__(self):
+        return f'{self.subscription.user.username} - {self.get_kind_display()} - {self.period:%Y-%m} - {self.total_cost}'
+
+    def save(self, *args, **kwargs):
+        if self.pk:
+            raise ValidationError('Kullanım kayıtları değiştirilemez.')
+        super().save(*args, **kwargs)
+
+
 class PaymentHistory(models.Model):
     """Ödeme Geçmişi"""
     
@@ -546,6 +658,13 @@ class SimpleNotification(models.Model):
     related_url = models.URLField('İlgili Link', blank=True, null=True)
     related_object_id = models.PositiveIntegerField('İlgili Obje ID', blank=True, null=True)
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Rozet sayaçlarına fark uygulamak için yüklenen durumu sakla
+        instance._badge_state = (instance.__dict__.get('user_id'), instance.__dict__.get('is_read'))
+        return instance
+    
     def mark_as_read(self):
         if not self.is_read:
             self.is_read = True
@@ -580,11 +699,109 @@ class SimpleNotification(models.Model):
         verbose_name = 'Basit Bildirim'
         verbose_name_plural = 'Basit Bildirimler'
         ordering = ['-created_at']
+        indexes = [
+            # Okunmamış bildirim sayımı ve listesi - okunmuşlar indekse girmez
+            models.Index(fields=['user', 'created_at'], name='notif_user_unread_idx', condition=models.Q(is_read=False)),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.title}"
 
 
+class UserBadgeCounter(models.Model):
+    """
+    Kullanıcı Rozet Sayaçları - okunmamış mesaj, bildirim ve bekleyen revizyon sayıları
+
+    Message, SimpleNotification ve RevisionRequest yazımlarında F() ifadeleriyle
+    artırılır / azaltılır; satırı olmayan kullanıcılar için ilk ihtiyaçta
+    kayıtlardan hesaplanır.
+    """
+
+    COUNTER_FIELDS = ('unread_messages', 'unread_notifications', 'pending_revisions')
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='badge_counter')
+    unread_messages = models.IntegerField('Okunmamış Mesaj', default=0)
+    unread_notifications = models.IntegerField('Okunmamış Bildirim', default=0)
+    pending_revisions = models.IntegerField('Bekleyen Revizyon Talebi', default=0)
+    updated_at = models.DateTimeField('Güncellenme Tarihi', auto_now=True)
+
+    class Meta:
+        verbose_name = 'Rozet Sayacı'
+        verbose_name_plural = 'Rozet Sayaçları'
+
+    def __str__(self):
+        return f'{self.user.username} - {self.unread_messages}/{self.unread_notifications}/{self.pending_revisions}'
+
+    @classmethod
+    def compute(cls, user_id):
+        """Sayaçları kayıtlardan hesapla"""
+        from mold.models import RevisionRequest
+
+        return {
+            'unread_messages': Message.objects.filter(recipient_id=user_id, is_read=False).count(),
+            'unread_notifications': SimpleNotification.objects.filter(user_id=user_id, is_read=False).count(),
+            'pending_revisions': RevisionRequest.objects.filter(
+                status='pending',
+                modeled_mold__ear_mold__producer_orders__producer__user_id=user_id,
+            ).distinct().count(),
+        }
+
+    @classmethod
+    def rebuild(cls, user_id):
+        """Kullanıcının sayaçlarını yeniden hesapla ve kaydet"""
+        counts = cls.compute(user_id)
+        cls.objects.update_or_create(user_id=user_id, defaults=counts)
+        return counts
+
+    @classmethod
+    def apply_delta(cls, user_ids, field, delta):
+        """
+        Sayaca fark uygula
+
+        Sadece satırı olan kullanıcılar F() ile güncellenir. Satırı olmayanlar
+        ilk okumada kayıtlardan hesaplanır (get_badge_counts); burada satır
+        oluşturulmaz, böylece kullanıcı silinirken zincirleme silinen kayıtlar
+        silinmiş satırı yeniden oluşturmaz.
+        """
+        user_ids = {user_id for user_id in user_ids if user_id}
+        if not user_ids or not delta:
+            return
+        cls.objects.filter(user_id__in=user_ids).update(**{
+            field: models.F(field) + delta,
+            'updated_at': timezone.now(),
+        })
+
+
+class SearchDocument(models.Model):
+    """
+    Tam Metin Arama Belgesi - aranabilir her kayıt için normalize edilmiş metin
+
+    Satırlar core.search tarafından kayıt anında güncellenir. SQLite'ta FTS5
+    tablosu, PostgreSQL'de tsvector sütunu ve GIN indeksi migration ile
+    eklenir; sorgular core.search.search / search_filter üzerinden yapılır.
+    """
+
+    KIND_CHOICES = [
+        ('mold', 'Kalıp / Hasta'),
+        ('order', 'Sipariş'),
+        ('center', 'Merkez'),
+        ('message', 'Mesaj'),
+    ]
+
+    kind = models.CharField('Tür', max_length=20, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField('Kayıt ID')
+    title = models.CharField('Başlık', max_length=255)
+    body = models.TextField('Aranabilir Metin')
+    updated_at = models.DateTimeField('Güncellenme Tarihi', auto_now=True)
+
+    class Meta:
+        verbose_name = 'Arama Belgesi'
+        verbose_name_plural = 'Arama Belgeleri'
+        unique_together = ('kind', 'object_id')
+
+    def __str__(self):
+        return f'{self.get_kind_display()} #{self.object_id} - {self.title}'
+
 # ---------------------------------------------
 # Signals
 # ---------------------------------------------
@@ -852,6 +1069,11 @@ class Invoice(models.Model):
             models.Index(fields=['invoice_number']),
             models.Index(fields=['user', 'status']),
             models.Index(fields=['issue_date']),
+            # Merkezin kestiği faturalar (tür ve döneme göre)
+            models.Index(
+                fields=['issued_by_center', 'invoice_type', 'issue_date'], name='invoice_center_type_date_idx',
+                condition=models.Q(issued_by_center__isnull=False),
+            ),
         ]
     
     def __str__(self):
@@ -1552,6 +1774,153 @@ class FinancialSummary(models.Model):
         return summary
 
 
+class LedgerPeriod(models.Model):
+    """Aylık Mali Dönem - Kapatılan dönemin defter kayıtları değiştirilemez"""
+
+    STATUS_CHOICES = [
+        ('open', 'Açık'),
+        ('closed', 'Kapatıldı'),
+    ]
+
+    year = models.IntegerField('Yıl')
+    month = models.IntegerField('Ay')
+    status = models.CharField('Durum', max_length=10, choices=STATUS_CHOICES, default='open')
+
+    # Kapanış anındaki fiyatlandırma (get_pricing_summary çıktısı)
+    pricing_snapshot = models.JSONField('Fiyatlandırma Özeti', default=dict, blank=True)
+
+    closed_at = models.DateTimeField('Kapatılma Tarihi', null=True, blank=True)
+    closed_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='closed_ledger_periods',
+        verbose_name='Kapatan'
+    )
+    created_at = models.DateTimeField('Oluşturulma', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Mali Dönem'
+        verbose_name_plural = 'Mali Dönemler'
+        unique_together = ['year', 'month']
+        ordering = ['-year', '-month']
+
+    def __str__(self):
+        return f'{self.year}/{self.month:02d} - {self.get_status_display()}'
+
+    @property
+    def is_closed(self):
+        return self.status == 'closed'
+
+    @classmethod
+    def closed_months(cls, months):
+        """Verilen (yıl, ay) listesinden kapatılmış olanları döndür"""
+        if not months:
+            return set()
+        years = {year for year, _ in months}
+        closed = set(
+            cls.objects.filter(status='closed', year__in=years).values_list('year', 'month')
+        )
+        return {month for month in months if month in closed}
+
+
+class LockedLedgerRowMixin:
+    """Kapatılmış döneme ait defter satırlarının değiştirilmesini engeller"""
+
+    def save(self, *args, **kwargs):
+        if self.pk and self.period.is_closed:
+            raise ValidationError('Kapatılmış mali dönemin kayıtları değiştirilemez.')
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        if self.period.is_closed:
+            raise ValidationError('Kapatılmış mali dönemin kayıtları silinemez.')
+        return super().delete(*args, **kwargs)
+
+
+class CenterLedgerSnapshot(LockedLedgerRowMixin, models.Model):
+    """İşitme Merkezi Aylık Defter Kaydı - dönem kapanışında yazılır"""
+
+    period = models.ForeignKey(LedgerPeriod, on_delete=models.PROTECT, related_name='center_rows', verbose_name='Dönem')
+    center = models.ForeignKey('center.Center', on_delete=models.SET_NULL, null=True, related_name='ledger_rows', verbose_name='Merkez')
+    center_name = models.CharField('Merkez Adı', max_length=200)
+
+    # Hizmetler
+    physical_count = models.IntegerField('Fiziksel Kalıp Sayısı', default=0)
+    digital_count = models.IntegerField('3D Modelleme Sayısı', default=0)
+    physical_amount = models.DecimalField('Fiziksel Kalıp Tutarı', max_digits=12, decimal_places=2, default=0)
+    digital_amount = models.DecimalField('3D Modelleme Tutarı', max_digits=12, decimal_places=2, default=0)
+    package_amount = models.DecimalField('Paket Tutarı', max_digits=12, decimal_places=2, default=0)
+    monthly_system_fee = models.DecimalField('Aylık Sistem Ücreti', max_digits=12, decimal_places=2, default=0)
+
+    # Tutarlar
+    gross_amount = models.DecimalField('Brüt Tutar (KDV Dahil)', max_digits=12, decimal_places=2, default=0)
+    gross_amount_without_vat = models.DecimalField('Brüt Tutar (KDV Hariç)', max_digits=12, decimal_places=2, default=0)
+    vat_amount = models.DecimalField('KDV Tutarı', max_digits=12, decimal_places=2, default=0)
+    moldpark_fee = models.DecimalField('MoldPark Hizmet Bedeli', max_digits=12, decimal_places=2, default=0)
+    net_to_producer = models.DecimalField('Üreticiye Net', max_digits=12, decimal_places=2, default=0)
+    amount_after_monthly_fee = models.DecimalField('Hizmet Tutarı (Aylık Ücret Hariç)', max_digits=12, decimal_places=2, default=0)
+
+    # Faturalar
+    has_existing_invoice = models.BooleanField('Fatura Kesilmiş', default=False)
+    has_package_invoice = models.BooleanField('Paket Faturası Var', default=False)
+    latest_invoice = models.ForeignKey('Invoice', on_delete=models.SET_NULL, null=True, blank=True, related_name='+', verbose_name='Son Fatura')
+    latest_invoice_number = models.CharField('Son Fatura No', max_length=50, blank=True)
+    latest_invoice_date = models.DateField('Son Fatura Tarihi', null=True, blank=True)
+    package_info = models.CharField('Paket Bilgisi', max_length=200, blank=True)
+    package_invoice_numbers = models.JSONField('Paket Fatura Numaraları', default=list, blank=True)
+    invoice_count = models.IntegerField('Fatura Sayısı', default=0)
+    invoiced_amount = models.DecimalField('Faturalanan Tutar', max_digits=12, decimal_places=2, default=0)
+    paid_amount = models.DecimalField('Ödenen Tutar', max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        verbose_name = 'Merkez Defter Kaydı'
+        verbose_name_plural = 'Merkez Defter Kayıtları'
+        unique_together = ['period', 'center']
+        ordering = ['center_name']
+
+    def __str__(self):
+        return f'{self.period} - {self.center_name}: ₺{self.gross_amount}'
+
+
+class ProducerLedgerSnapshot(LockedLedgerRowMixin, models.Model):
+    """Üretici Aylık Defter Kaydı - dönem kapanışında yazılır"""
+
+    period = models.ForeignKey(LedgerPeriod, on_delete=models.PROTECT, related_name='producer_rows', verbose_name='Dönem')
+    producer = models.ForeignKey('producer.Producer', on_delete=models.SET_NULL, null=True, related_name='ledger_rows', verbose_name='Üretici')
+    producer_name = models.CharField('Üretici Adı', max_length=200)
+
+    # Siparişler
+    physical_count = models.IntegerField('Fiziksel Kalıp Sayısı', default=0)
+    digital_count = models.IntegerField('Dijital Sipariş Sayısı', default=0)
+    total_orders = models.IntegerField('Toplam Sipariş', default=0)
+
+    # Tutarlar
+    physical_gross = models.DecimalField('Fiziksel Brüt', max_digits=12, decimal_places=2, default=0)
+    digital_gross = models.DecimalField('Dijital Brüt', max_digits=12, decimal_places=2, default=0)
+    gross_revenue = models.DecimalField('Brüt Gelir (KDV Dahil)', max_digits=12, decimal_places=2, default=0)
+    gross_revenue_without_vat = models.DecimalField('Brüt Gelir (KDV Hariç)', max_digits=12, decimal_places=2, default=0)
+    vat_amount = models.DecimalField('KDV Tutarı', max_digits=12, decimal_places=2, default=0)
+    moldpark_fee = models.DecimalField('MoldPark Hizmet Bedeli', max_digits=12, decimal_places=2, default=0)
+    credit_card_fee = models.DecimalField('Kredi Kartı Komisyonu', max_digits=12, decimal_places=2, default=0)
+    net_earnings = models.DecimalField('Net Kazanç', max_digits=12, decimal_places=2, default=0)
+
+    # Faturalar
+    invoice_count = models.IntegerField('Fatura Sayısı', default=0)
+    paid_amount = models.DecimalField('Ödenen Tutar', max_digits=12, decimal_places=2, default=0)
+    pending_amount = models.DecimalField('Bekleyen Tutar', max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        verbose_name = 'Üretici Defter Kaydı'
+        verbose_name_plural = 'Üretici Defter Kayıtları'
+        unique_together = ['period', 'producer']
+        ordering = ['producer_name']
+
+    def __str__(self):
+        return f'{self.period} - {self.producer_name}: ₺{self.net_earnings}'
+
+
 class PricingConfiguration(models.Model):
     """
     Merkezileştirilmiş Fiyatlandırma Yapısı
@@ -1651,13 +2020,33 @@ class PricingConfiguration(models.Model):
     
     def save(self, *args, **kwargs):
         """Aktif yapıldığında diğer tüm fiyatlandırmaları pasif yap"""
+        from .pricing_cache import invalidate
+
         if self.is_active:
             PricingConfiguration.objects.filter(is_active=True).exclude(pk=self.pk).update(is_active=False)
         super().save(*args, **kwargs)
+        invalidate()
+    
+    def delete(self, *args, **kwargs):
+        from .pricing_cache import invalidate
+
+        result = super().delete(*args, **kwargs)
+        invalidate()
+        return result
     
     @classmethod
     def get_active(cls):
-        """Aktif fiyatlandırmayı getir, yoksa default değerlerle yeni bir tane oluştur"""
+        """
+        Aktif fiyatlandırmayı getir - süreç belleğinden, paylaşılan sürüm değişene kadar
+        Dönen nesne bir kopyadır; değiştirip kaydetmek önbelleği de yeniler.
+        """
+        from .pricing_cache import get_active_pricing
+
+        return get_active_pricing()
+    
+    @classmethod
+    def load_active(cls):
+        """Aktif fiyatlandırmayı veritabanından oku, yoksa default değerlerle yeni bir tane oluştur"""
         active = cls.objects.filter(is_active=True).first()
         if not active:
             # Default fiyatlandırma oluştur
@@ -1672,6 +2061,8 @@ class PricingConfiguration(models.Model):
                 vat_rate=20.00,
                 monthly_system_fee=0.00
             )
+            # Alanlar Decimal olarak okunsun
+            active.refresh_from_db()
         return active
     
     def get_physical_price_without_vat(self):
@@ -0,0 +1,181 @@
+"""
+Kalıp Sipariş Alma Servisi
+Merkezin kalıp siparişini tek transaction içinde alır: abonelik ve üretici ağı
+kontrol edilir, kullanım ücretlendirilir (core.usage_ledger), kalıp fiyatları
+ve 'processing' durumu ile tek INSERT'te, sipariş fiyatıyla birlikte tek
+INSERT'te oluşturulur ve defter satırı yazılır. Bir adım başarısız olursa
+kalıp, sipariş ve abonelik sayaçları birlikte geri alınır.
+
+Bildirimler (üretici, merkez, yöneticiler) transaction commit edildikten sonra
+gönderilir; e-posta gönderimi veritabanı kilidini tutmaz ve geri alınan
+siparişler için bildirim çıkmaz.
+
+Kalıp oluşturma formu, toplu içe aktarma komutu (import_molds) ve API aynı
+servisi kullanır.
+"""
+import logging
+import uuid
+from collections import namedtuple
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from producer.models import ProducerNetwork, ProducerOrder
+
+from .models import PricingPlan, UserSubscription
+from .usage_ledger import charge_usage
+from .utils import send_order_notification, send_success_notification, send_system_notification
+
+
+logger = logging.getLogger(__name__)
+
+# Öncelik -> tahmini teslimat süresi (gün); listede olmayanlar için varsayılan
+DELIVERY_DAYS = {'normal': 7, 'high': 4}
+DEFAULT_DELIVERY_DAYS = 2
+
+OrderIntake = namedtuple('OrderIntake', 'mold order usage producer subscription')
+
+
+class IntakeError(Exception):
+    """Sipariş alınamadı - code: 'no_plan', 'no_subscription', 'inactive_subscription' veya 'no_network'"""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+def get_or_create_subscription(user):
+    """
+    Merkezin aboneliği - yoksa aktif standart planla oluşturulur
+
+    Returns:
+        tuple: (UserSubscription, created)
+    """
+    subscription = UserSubscription.objects.select_related('plan').filter(user=user).first()
+    if subscription:
+        return subscription, False
+    plan = PricingPlan.objects.filter(plan_type='standard', is_active=True).first()
+    if not plan:
+        raise IntakeError('no_plan', 'Abonelik planı bulunamadı. Lütfen yönetici ile iletişime geçin.')
+    return UserSubscription.objects.create(user=user, plan=plan, status='active'), True
+
+
+def get_active_network(center):
+    """Siparişin gideceği üretici ağı (şimdilik ilk aktif ağ)"""
+    return (
+        ProducerNetwork.objects.filter(center=center, status='active')
+        .select_related('producer__user').first()
+    )
+
+
+def check_intake(center, subscription=None):
+    """
+    Merkez sipariş verebilir mi
+
+    Returns:
+        tuple: (subscription, network)
+
+    Raises:
+        IntakeError
+    """
+    if subscription is None:
+        subscription = UserSubscription.objects.select_related('plan').filter(user=center.user).first()
+    if subscription is None:
+        raise IntakeError('no_subscription', 'Henüz aboneliğiniz bulunmuyor. Lütfen admin onayı bekleyin.')
+    if not subscription.can_create_model():
+        raise IntakeError('inactive_subscription', 'Aboneliğiniz aktif değil. Lütfen aboneliğinizi kontrol edin.')
+    network = get_active_network(center)
+    if network is None:
+        raise IntakeError('no_network', 'Kalıp siparişi verebilmek için bir üretici ağına katılmanız gerekiyor.')
+    return subscription, network
+
+
+def estimated_delivery(priority, now=None):
+    return (now or timezone.now()) + timedelta(days=DELIVERY_DAYS.get(priority, DEFAULT_DELIVERY_DAYS))
+
+
+def create_mold_order(center, mold, subscription=None, network=None, notify=True):
+    """
+    Kalıbı ve üretici siparişini oluştur, kullanımı deftere yaz
+
+    Args:
+        center: Siparişi veren merkez
+        mold: Kaydedilmemiş EarMold (ör. form.save(commit=False))
+        subscription, network: check_intake sonucu - verilmezse kontrol burada yapılır
+        notify: False ise bildirim gönderilmez (toplu içe aktarma)
+
+    Returns:
+        OrderIntake
+
+    Raises:
+        IntakeError
+    """
+    if subscription is None or network is None:
+        subscription, network = check_intake(center, subscription)
+    producer = network.producer
+
+    with transaction.atomic():
+        usage = charge_usage(subscription, mold.is_physical_shipment)
+
+        mold.center = center
+        mold.unit_price = usage.physical_cost
+        mold.digital_modeling_price = usage.digital_cost
+        mold.status = 'processing'
+        mold.save()
+
+        order = ProducerOrder(
+            producer=producer,
+            center=center,
+            ear_mold=mold,
+            order_number=f'PRD-{uuid.uuid4().hex[:8].upper()}',
+            status='received',
+            priority=mold.priority,
+            producer_notes=mold.special_instructions,
+            estimated_delivery=estimated_delivery(mold.priority),
+        )
+        order.price = order.calculate_price(subscription.plan)
+        order.save()
+
+        usage.ear_mold = mold
+        usage.save()
+
+        if notify:
+            transaction.on_commit(lambda: send_intake_notifications(center, mold, order, producer))
+
+    return OrderIntake(mold, order, usage, producer, subscription)
+
+
+def send_intake_notifications(center, mold, order, producer):
+    """Üreticiye, merkeze ve yöneticilere bildirim - hata siparişi etkilemez"""
+    try:
+        send_order_notification(
+            producer.user,
+            'Yeni Kalıp Siparişi',
+            f'{center.name} merkezinden {mold.patient_name} {mold.patient_surname} '
+            f'hastası için {mold.get_mold_type_display()} kalıbı siparişi aldınız. '
+            f'Sipariş No: {order.order_number}',
+            related_url=f'/producer/orders/{order.id}/',
+            order_id=order.id
+        )
+
+        send_success_notification(
+            center.user,
+            'Kalıp Siparişi Oluşturuldu',
+            f'Kalıbınız {producer.company_name} firmasına gönderildi. '
+            f'Sipariş No: {order.order_number}. '
+            f'Tahmini teslimat: {timezone.localtime(order.estimated_delivery).strftime("%d.%m.%Y")}',
+            related_url=f'/mold/{mold.id}/'
+        )
+
+        for admin in User.objects.filter(is_superuser=True):
+            send_system_notification(
+                admin,
+                'Yeni Kalıp Siparişi',
+                f'{center.name} merkezi tarafından {mold.get_mold_type_display()} '
+                f'kalıbı oluşturuldu ve {producer.company_name} firmasına sipariş verildi.',
+                related_url='/admin-panel/'
+            )
+    except Exception as e:
+        logger.error(f"Notification error: {e}")
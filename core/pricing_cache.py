@@ -0,0 +1,68 @@
+"""
+Fiyatlandırma Önbelleği
+Aktif PricingConfiguration ve fiyat özetini süreç belleğinde tutar. Geçerlilik,
+paylaşılan önbellekteki (Redis) sürüm numarası ile kontrol edilir: fiyatlandırma
+kaydedildiğinde sürüm artırılır ve tüm worker'lar bir sonraki istekte
+veritabanından yeniden okur. Sürüm değişmediği sürece istek başına sadece
+bir önbellek okuması yapılır, veritabanına gidilmez.
+"""
+import copy
+import threading
+
+from django.db import transaction
+
+from . import cache_versions
+
+
+VERSION_KEY = 'pricing_config:version'
+
+_lock = threading.Lock()
+_local = {
+    'version': None,
+    'pricing': None,
+    'summary': None,
+}
+
+
+def get_version():
+    """Paylaşılan fiyatlandırma sürümü - yoksa zaman damgası ile başlatılır"""
+    return cache_versions.get_version(VERSION_KEY)
+
+
+def _bump_version():
+    cache_versions.bump_version(VERSION_KEY)
+
+
+def invalidate():
+    """Bu süreçteki kopyayı hemen, diğer worker'larınkini transaction sonunda geçersiz kıl"""
+    with _lock:
+        _local['version'] = None
+        _local['pricing'] = None
+        _local['summary'] = None
+    transaction.on_commit(_bump_version)
+
+
+def _load():
+    """Sürüm değiştiyse aktif fiyatlandırmayı ve özetini yeniden yükle"""
+    from .models import PricingConfiguration
+
+    version = get_version()
+    with _lock:
+        if _local['version'] == version and _local['pricing'] is not None:
+            return _local['pricing'], _local['summary']
+
+    pricing = PricingConfiguration.load_active()
+    summary = pricing.get_pricing_summary()
+    with _lock:
+        _local.update(version=version, pricing=pricing, summary=summary)
+    return pricing, summary
+
+
+def get_active_pricing():
+    """Aktif fiyatlandırma - çağıranın değişiklikleri paylaşılan kopyayı etkilemesin diye kopyalanır"""
+    return copy.copy(_load()[0])
+
+
+def get_pricing_summary():
+    """Aktif fiyatlandırmanın özeti (get_pricing_summary çıktısı)"""
+    return copy.deepcopy(_load()[1])
@@ -0,0 +1,141 @@
+"""
+Sorgu Bütçesi Profilleyicisi
+İsteğe bağlı (QUERY_PROFILER_ENABLED) middleware; trafiğin
+QUERY_PROFILER_SAMPLE_RATE oranındaki istekleri örnekler. Örneklenen istekte
+her SQL sorgusu parametresiz parmak izine indirgenir; aynı parmak izinin
+tekrarları (N+1 şüphesi) sorguyu tetikleyen proje kodundaki çağrı yeri ile
+birlikte kaydedilir. Kayıtlar `moldpark.query_profile` logger'ı üzerinden
+dönen log dosyasına JSON satırı olarak yazılır; `manage.py perf_report`
+bu dosyayı özetler.
+"""
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import time
+import traceback
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+
+logger = logging.getLogger('moldpark.query_profile')
+
+DEFAULT_SAMPLE_RATE = 0.01
+DEFAULT_DUPLICATE_THRESHOLD = 3
+MAX_SQL_LENGTH = 300
+MAX_DUPLICATES = 10
+
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+_NUMBER = re.compile(r'\b\d+\b')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_SPACES = re.compile(r'\s+')
+
+_THIS_FILE = os.path.abspath(__file__)
+
+
+def fingerprint(sql):
+    """Sorguyu parametre ve IN listesi uzunluğundan bağımsız hale getir - (parmak izi, normalize SQL)"""
+    normalized = _SPACES.sub(' ', sql).strip()
+    normalized = _IN_LIST.sub('IN (...)', normalized)
+    normalized = _STRING.sub('?', normalized)
+    normalized = _NUMBER.sub('?', normalized)
+    return hashlib.md5(normalized.encode()).hexdigest()[:12], normalized
+
+
+def call_site():
+    """Sorguyu tetikleyen en içteki proje kodu satırı - 'dosya:satır fonksiyon'"""
+    base_dir = os.path.abspath(str(settings.BASE_DIR))
+    for frame in reversed(traceback.extract_stack()):
+        filename = os.path.abspath(frame.filename)
+        if filename == _THIS_FILE or not filename.startswith(base_dir):
+            continue
+        if 'site-packages' in filename or os.sep + 'venv' + os.sep in filename:
+            continue
+        return f'{os.path.relpath(filename, base_dir)}:{frame.lineno} {frame.name}'
+    return ''
+
+
+class QueryRecorder:
+    """Execute wrapper - sorguları parmak izine göre sayar ve sürelerini toplar"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.fingerprints = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.total_time += elapsed
+
+            key, normalized = fingerprint(sql)
+            entry = self.fingerprints.get(key)
+            if entry is None:
+                entry = self.fingerprints[key] = {'sql': normalized, 'count': 0, 'time': 0.0, 'sites': {}}
+            entry['count'] += 1
+            entry['time'] += elapsed
+            # Çağrı yeri sadece tekrar eden sorgular için çıkarılır
+            if entry['count'] > 1:
+                site = call_site()
+                entry['sites'][site] = entry['sites'].get(site, 0) + 1
+
+    def duplicates(self, threshold):
+        """Eşik kadar ya da daha çok tekrar eden sorgular - en çok zaman alandan başlayarak"""
+        found = [
+            {
+                'fp': key,
+                'count': entry['count'],
+                'ms': round(entry['time'] * 1000, 2),
+                'sql': entry['sql'][:MAX_SQL_LENGTH],
+                'sites': sorted(entry['sites'], key=entry['sites'].get, reverse=True)[:3],
+            }
+            for key, entry in self.fingerprints.items()
+            if entry['count'] >= threshold
+        ]
+        found.sort(key=lambda item: (-item['ms'], -item['count']))
+        return found[:MAX_DUPLICATES]
+
+
+class QueryProfilerMiddleware:
+    """Örneklenen isteklerin sorgu sayısı, DB süresi ve tekrar eden sorgularını loglar"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'QUERY_PROFILER_SAMPLE_RATE', DEFAULT_SAMPLE_RATE)
+        self.threshold = getattr(settings, 'QUERY_PROFILER_DUPLICATE_THRESHOLD', DEFAULT_DUPLICATE_THRESHOLD)
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        record = {
+            'ts': timezone.now().isoformat(timespec='seconds'),
+            'view': match.view_name if match else '<unresolved>',
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'ms': round(elapsed * 1000, 1),
+            'queries': recorder.count,
+            'db_ms': round(recorder.total_time * 1000, 1),
+            'dups': recorder.duplicates(self.threshold),
+        }
+        logger.info(json.dumps(record, ensure_ascii=False))
+        return response
@@ -0,0 +1,637 @@
+"""
+Ölçek Testi Veri Üreticisi
+Benchmark ve yük testleri için üretim ölçeğinde, birbirine bağlı sentetik veri
+üretir: merkezler, üreticiler, ağlar, abonelikler, kalıplar, siparişler,
+model dosyaları (küçük sentetik STL mesh'leri), revizyonlar, değerlendirmeler,
+faturalar, kargo gönderileri, mesajlar ve bildirimler.
+
+Kayıtlar `bulk_create` ile parçalar halinde yazılır; kalıplar ve bağlı kayıtları
+parça parça üretildiği için bellek kullanımı kalıp sayısından bağımsızdır.
+`bulk_create` signal çalıştırmaz; türetilmiş özetler (üretici puanları, widget
+önbellekleri) üretim sonunda yeniden hesaplanır.
+"""
+import math
+import os
+import random
+import struct
+from contextlib import contextmanager
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from center.models import Center
+from mold.models import EarMold, ModeledMold, MoldEvaluation, RevisionEvent, RevisionRequest
+from producer.models import Producer, ProducerNetwork, ProducerOrder, ProducerRatingStats
+
+from .models import (
+    CargoCompany, CargoShipment, Invoice, Message, PricingPlan, SimpleNotification, UsageLedgerEntry,
+    UserSubscription,
+)
+from .search import rebuild_index
+from .widget_cache import bump_model_version
+
+
+DEFAULT_PASSWORD = 'moldpark123'
+CHUNK_SIZE = 5000
+MESH_VARIANTS = 16
+MESH_DIR = 'seed'
+
+PHYSICAL_RATIO = 0.35
+MODELED_RATIO = 0.9
+REVISION_RATIO = 0.05
+EVALUATION_RATIO = 0.3
+NOTIFICATION_RATIO = 0.3
+MESSAGE_RATIO = 0.02
+
+# Son bir haftadan eski kalıpların durum dağılımı
+MOLD_STATUS_WEIGHTS = (
+    ('delivered', 70), ('completed', 10), ('processing', 8), ('shipped_to_center', 4),
+    ('delivered_pending_approval', 3), ('revision', 3), ('rejected', 2),
+)
+RECENT_STATUS_WEIGHTS = (('waiting', 50), ('processing', 40), ('completed', 10))
+
+# Kalıp durumu -> sipariş durumu (bekleyen kalıpların bir kısmının siparişi yok)
+ORDER_STATUS = {
+    'waiting': 'received',
+    'processing': 'production',
+    'completed': 'packaging',
+    'revision': 'designing',
+    'rejected': 'cancelled',
+    'shipped_to_center': 'shipping',
+    'delivered_pending_approval': 'delivered',
+    'delivered': 'delivered',
+}
+MODELED_STATUSES = {'completed', 'revision', 'shipped_to_center', 'delivered_pending_approval', 'delivered'}
+
+PRIORITY_WEIGHTS = (('normal', 80), ('high', 15), ('urgent', 5))
+ORDER_PRIORITY_WEIGHTS = (('low', 5), ('normal', 75), ('high', 15), ('urgent', 5))
+
+FIRST_NAMES = ['Ahmet', 'Mehmet', 'Ayşe', 'Fatma', 'Ali', 'Zeynep', 'Mustafa', 'Emine', 'Hasan', 'Elif', 'Hüseyin', 'Hatice']
+LAST_NAMES = ['Yılmaz', 'Kaya', 'Demir', 'Şahin', 'Çelik', 'Yıldız', 'Aydın', 'Öztürk', 'Arslan', 'Doğan', 'Kılıç', 'Aslan']
+CITIES = ['İstanbul', 'Ankara', 'İzmir', 'Bursa', 'Antalya', 'Konya', 'Adana', 'Kayseri', 'Eskişehir', 'Samsun']
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """auto_now_add alanlarını geçici olarak kapat - geçmiş tarihli kayıt üretmek için"""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def ear_mesh(segments, rings, jitter, rng):
+    """Kulak kalıbını andıran, hafif düzensiz bir elipsoid - üçgen listesi"""
+    points = []
+    for ring in range(rings + 1):
+        phi = math.pi * ring / rings
+        row = []
+        for segment in range(segments):
+            theta = 2 * math.pi * segment / segments
+            noise = 1 + rng.uniform(-jitter, jitter)
+            row.append((
+                9.0 * math.sin(phi) * math.cos(theta) * noise,
+                7.0 * math.sin(phi) * math.sin(theta) * noise,
+                14.0 * math.cos(phi) * (1 + 0.15 * math.sin(theta)),
+            ))
+        points.append(row)
+
+    triangles = []
+    for ring in range(rings):
+        for segment in range(segments):
+            a = points[ring][segment]
+            b = points[ring][(segment + 1) % segments]
+            c = points[ring + 1][segment]
+            d = points[ring + 1][(segment + 1) % segments]
+            triangles.append((a, c, b))
+            triangles.append((b, c, d))
+    return triangles
+
+
+def binary_stl(triangles):
+    """Üçgen listesinden binary STL içeriği"""
+    chunks = [b'MoldPark synthetic ear mold'.ljust(80, b' '), struct.pack('<I', len(triangles))]
+    for a, b, c in triangles:
+        u = [b[i] - a[i] for i in range(3)]
+        v = [c[i] - a[i] for i in range(3)]
+        normal = (u[1] * v[2] - u[2] * v[1], u[2] * v[0] - u[0] * v[2], u[0] * v[1] - u[1] * v[0])
+        length = math.sqrt(sum(n * n for n in normal)) or 1.0
+        chunks.append(struct.pack('<12fH', *(n / length for n in normal), *a, *b, *c, 0))
+    return b''.join(chunks)
+
+
+def weighted(rng, choices, k):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights=weights, k=k)
+
+
+class ScaleSeeder:
+    """
+    Parametrelere göre bağlı sentetik veri üretir
+
+    Args:
+        centers / producers / molds: Üretilecek kayıt sayıları
+        months: Kalıp oluşturma tarihlerinin yayılacağı ay sayısı
+        prefix: Kullanıcı adı, sipariş ve fatura numaralarının öneki
+        seed: Tekrarlanabilir üretim için rastgele sayı tohumu
+        log: İlerleme mesajlarını yazan fonksiyon
+    """
+
+    def __init__(self, centers, producers, molds, months=12, prefix='seed', seed=42, chunk_size=CHUNK_SIZE, log=None):
+        self.center_count = centers
+        self.producer_count = producers
+        self.mold_count = molds
+        self.months = months
+        self.prefix = prefix
+        self.chunk_size = chunk_size
+        self.rng = random.Random(seed)
+        self.log = log or (lambda message: None)
+
+        self.now = timezone.now()
+        self.start = self.now - timedelta(days=30 * months)
+        self.password = make_password(DEFAULT_PASSWORD)
+        self.counts = {}
+        self.shipment_sequence = 0
+
+    def exists(self):
+        return User.objects.filter(username__startswith=f'{self.prefix}_').exists()
+
+    def flush(self):
+        """Aynı önekle üretilmiş önceki veriyi sil"""
+        CargoShipment.objects.filter(tracking_number__startswith=f'{self.prefix.upper()}T').delete()
+        User.objects.filter(username__startswith=f'{self.prefix}_').delete()
+
+    def _count(self, name, number):
+        self.counts[name] = self.counts.get(name, 0) + number
+
+    def run(self):
+        self.write_meshes()
+        with explicit_timestamps(
+            Center, Producer, EarMold, ProducerOrder, ModeledMold, RevisionRequest,
+            MoldEvaluation, CargoShipment, SimpleNotification, Message, UsageLedgerEntry,
+        ):
+            self.create_accounts()
+            self.create_molds()
+            self.create_invoices()
+        self.refresh_derived()
+        return self.counts
+
+    # ------------------------------------------------------------------
+    # Dosyalar
+    # ------------------------------------------------------------------
+
+    def write_meshes(self):
+        """Kalıp ve tarama kayıtlarının paylaştığı küçük STL dosyaları"""
+        self.model_files = []
+        self.scan_files = []
+        rng = random.Random(0)
+        for index in range(MESH_VARIANTS):
+            content = None
+            for folder, target in (('modeled', self.model_files), ('scans', self.scan_files)):
+                name = f'{folder}/{MESH_DIR}/ear_{index:02d}.stl'
+                path = os.path.join(settings.MEDIA_ROOT, name)
+                if not os.path.exists(path):
+                    if content is None:
+                        segments = 16 + index * 2
+                        content = binary_stl(ear_mesh(segments, segments // 2, 0.05, rng))
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    with open(path, 'wb') as mesh_file:
+                        mesh_file.write(content)
+                target.append(name)
+
+    # ------------------------------------------------------------------
+    # Hesaplar
+    # ------------------------------------------------------------------
+
+    def _users(self, kind, count):
+        users = [
+            User(
+                username=f'{self.prefix}_{kind}{index}',
+                email=f'{self.prefix}_{kind}{index}@example.com',
+                password=self.password,
+                first_name=self.rng.choice(FIRST_NAMES),
+                last_name=self.rng.choice(LAST_NAMES),
+            )
+            for index in range(count)
+        ]
+        users = User.objects.bulk_create(users, batch_size=self.chunk_size)
+        self._count('users', len(users))
+        return users
+
+    def _joined_at(self):
+        return self.start - timedelta(days=self.rng.randint(0, 180))
+
+    @transaction.atomic
+    def create_accounts(self):
+        self.log('Merkezler, üreticiler ve ağlar oluşturuluyor...')
+        self.admin = User.objects.filter(is_superuser=True).first() or User.objects.create_superuser(
+            f'{self.prefix}_admin', f'{self.prefix}_admin@example.com', DEFAULT_PASSWORD
+        )
+
+        self.plan = PricingPlan.objects.filter(plan_type='standard', is_active=True).first()
+        if self.plan is None:
+            self.plan = PricingPlan.objects.create(name='Standart Abonelik', plan_type='standard', description='Ölçek testi planı')
+            self.plan.refresh_from_db()
+        self.physical_price = self.plan.per_mold_price_try
+        self.digital_price = self.plan.modeling_service_fee_try
+
+        self.cargo_company = CargoCompany.objects.filter(is_active=True).first() or CargoCompany.objects.create(
+            name='aras', display_name='Aras Kargo', base_price=Decimal('50.00'), kg_price=Decimal('10.00')
+        )
+
+        producer_users = self._users('producer', self.producer_count)
+        producers = Producer.objects.bulk_create([
+            Producer(
+                user=user,
+                company_name=f'{user.last_name} Kalıp Lab. {index}',
+                producer_type=self.rng.choice(['manufacturer', 'laboratory', 'hybrid']),
+                address=f'{self.rng.choice(CITIES)} Sanayi Sitesi No:{index}',
+                phone=f'0212{index:07d}',
+                tax_number=f'{self.prefix[:4].upper()}{index:09d}',
+                is_verified=True,
+                verification_date=self._joined_at(),
+                created_at=self._joined_at(),
+            )
+            for index, user in enumerate(producer_users)
+        ], batch_size=self.chunk_size)
+        self._count('producers', len(producers))
+
+        center_users = self._users('center', self.center_count)
+        centers = Center.objects.bulk_create([
+            Center(
+                user=user,
+                name=f'{self.rng.choice(CITIES)} İşitme Merkezi {index}',
+                address=f'{self.rng.choice(CITIES)} Merkez Mah. No:{index}',
+                phone=f'0312{index:07d}',
+                mold_limit=100000,
+                monthly_limit=100000,
+                created_at=self._joined_at(),
+            )
+            for index, user in enumerate(center_users)
+        ], batch_size=self.chunk_size)
+        self._count('centers', len(centers))
+
+        self.producers = {producer.pk: producer for producer in producers}
+        self.centers = {center.pk: center for center in centers}
+
+        # Her merkez bir üreticiye bağlı; bazı merkezler ek bir ağda bekliyor
+        networks = []
+        self.center_producer = {}
+        for index, center in enumerate(centers):
+            producer = producers[index % len(producers)]
+            self.center_producer[center.pk] = producer.pk
+            networks.append(ProducerNetwork(
+                producer=producer, center=center, status='active', activated_at=center.created_at,
+            ))
+            if len(producers) > 1 and self.rng.random() < 0.1:
+                networks.append(ProducerNetwork(
+                    producer=producers[(index + 1) % len(producers)], center=center,
+                    status=self.rng.choice(['pending', 'suspended']),
+                ))
+        ProducerNetwork.objects.bulk_create(networks, batch_size=self.chunk_size)
+        self._count('networks', len(networks))
+
+        subscriptions = UserSubscription.objects.bulk_create([
+            UserSubscription(
+                user_id=center.user_id, plan=self.plan, status='active', start_date=center.created_at,
+                last_reset_date=self.now,
+            )
+            for center in centers
+        ], batch_size=self.chunk_size)
+        self.subscriptions = {
+            subscription.user_id: subscription.pk for subscription in subscriptions
+        }
+        self._count('subscriptions', len(centers))
+
+        # Büyük merkezler daha çok kalıp üretir (uzun kuyruklu dağılım)
+        self.center_ids = list(self.centers)
+        self.center_weights = [1 / (rank + 1) ** 0.8 for rank in range(len(self.center_ids))]
+        self.rng.shuffle(self.center_weights)
+
+    # ------------------------------------------------------------------
+    # Kalıplar ve bağlı kayıtlar
+    # ------------------------------------------------------------------
+
+    def create_molds(self):
+        self.monthly_usage = {}
+        self.monthly_earnings = {}
+        created = 0
+        while created < self.mold_count:
+            size = min(self.chunk_size, self.mold_count - created)
+            with transaction.atomic():
+                self._create_mold_chunk(size)
+            created += size
+            self.log(f'  {created}/{self.mold_count} kalıp')
+
+    def _mold_status(self, created_at):
+        if self.now - created_at < timedelta(days=7):
+            return weighted(self.rng, RECENT_STATUS_WEIGHTS, 1)[0]
+        return weighted(self.rng, MOLD_STATUS_WEIGHTS, 1)[0]
+
+    def _create_mold_chunk(self, size):
+        rng = self.rng
+        span = (self.now - self.start).total_seconds()
+        center_ids = rng.choices(self.center_ids, weights=self.center_weights, k=size)
+        priorities = weighted(rng, PRIORITY_WEIGHTS, size)
+
+        molds = []
+        for center_id, priority in zip(center_ids, priorities):
+            created_at = self.start + timedelta(seconds=rng.random() * span)
+            physical = rng.random() < PHYSICAL_RATIO
+            status = self._mold_status(created_at)
+            shipped = physical and status != 'waiting'
+            molds.append(EarMold(
+                center_id=center_id,
+                patient_name=rng.choice(FIRST_NAMES),
+                patient_surname=rng.choice(LAST_NAMES),
+                patient_age=rng.randint(3, 95),
+                patient_gender=rng.choice('MF'),
+                ear_side=rng.choice(['right', 'left']),
+                mold_type=rng.choice(EarMold.MOLD_TYPE_CHOICES)[0],
+                vent_diameter=rng.choice([0.8, 1.0, 1.5, 2.0, 2.5]),
+                scan_file=None if physical else rng.choice(self.scan_files),
+                status=status,
+                priority=priority,
+                is_physical_shipment=physical,
+                shipment_status='delivered_to_producer' if shipped else 'not_shipped',
+                carrier_company='aras' if shipped else None,
+                tracking_number=self._tracking_number() if shipped else None,
+                shipment_date=created_at + timedelta(hours=rng.randint(2, 48)) if shipped else None,
+                quality_score=rng.randint(70, 100) if status == 'delivered' else None,
+                created_at=created_at,
+            ))
+        molds = EarMold.objects.bulk_create(molds, batch_size=self.chunk_size)
+        self._count('molds', len(molds))
+
+        orders = []
+        modeled = []
+        evaluations = []
+        shipments = []
+        notifications = []
+        messages = []
+        usage_entries = []
+        for mold in molds:
+            physical = mold.is_physical_shipment
+            month = (mold.created_at.year, mold.created_at.month)
+            usage = self.monthly_usage.setdefault((mold.center_id, month), [0, 0])
+            usage[0 if physical else 1] += 1
+            usage_entries.append(self._usage_entry(mold))
+
+            if mold.tracking_number:
+                shipments.append(self._shipment(mold))
+
+            if mold.status != 'waiting' or rng.random() < 0.5:
+                orders.append(self._order(mold))
+
+            if not physical and mold.status in MODELED_STATUSES and rng.random() < MODELED_RATIO:
+                modeled.append(ModeledMold(
+                    ear_mold=mold,
+                    file=rng.choice(self.model_files),
+                    status='approved' if mold.status != 'revision' else 'pending',
+                    vertex_count=rng.randint(2000, 40000),
+                    polygon_count=rng.randint(4000, 80000),
+                    created_at=mold.created_at + timedelta(days=rng.uniform(0.5, 4)),
+                ))
+
+            if mold.status == 'delivered' and rng.random() < EVALUATION_RATIO:
+                evaluations.append(MoldEvaluation(
+                    mold=mold, center_id=mold.center_id,
+                    quality_score=rng.randint(6, 10), speed_score=rng.randint(5, 10),
+                    communication_score=rng.randint(6, 10), packaging_score=rng.randint(6, 10),
+                    overall_satisfaction=rng.randint(6, 10),
+                    created_at=mold.created_at + timedelta(days=rng.uniform(5, 20)),
+                ))
+
+            if rng.random() < NOTIFICATION_RATIO:
+                notifications.append(SimpleNotification(
+                    user_id=self.centers[mold.center_id].user_id,
+                    title='Kalıp durumu güncellendi',
+                    message=f'{mold.patient_name} {mold.patient_surname} kalıbı: {mold.get_status_display()}',
+                    notification_type='order',
+                    is_read=rng.random() < 0.7,
+                    related_object_id=mold.pk,
+                    created_at=mold.created_at + timedelta(hours=rng.randint(1, 72)),
+                ))
+
+            if rng.random() < MESSAGE_RATIO:
+                messages.append(Message(
+                    sender=self.admin,
+                    recipient_id=self.centers[mold.center_id].user_id,
+                    message_type='admin_to_center',
+                    subject=f'{mold.patient_name} {mold.patient_surname} kalıbı hakkında',
+                    content='Kalıp ile ilgili ek bilgi rica ediyoruz.',
+                    is_read=rng.random() < 0.6,
+                    created_at=mold.created_at + timedelta(hours=rng.randint(1, 96)),
+                ))
+
+        for model, rows, name in (
+            (ProducerOrder, orders, 'orders'),
+            (ModeledMold, modeled, 'modeled_molds'),
+            (MoldEvaluation, evaluations, 'evaluations'),
+            (CargoShipment, shipments, 'shipments'),
+            (SimpleNotification, notifications, 'notifications'),
+            (Message, messages, 'messages'),
+            (UsageLedgerEntry, usage_entries, 'usage_entries'),
+        ):
+            created = model.objects.bulk_create(rows, batch_size=self.chunk_size)
+            self._count(name, len(created))
+            if model is ModeledMold:
+                modeled = created
+
+        revisions = [
+            RevisionRequest(
+                modeled_mold=modeled_mold,
+                center_id=modeled_mold.ear_mold.center_id,
+                revision_type=rng.choice(RevisionRequest.REVISION_TYPE_CHOICES)[0],
+                title='Oturma sorunu',
+                description='Hasta kalıbın sıktığını belirtiyor, kanal kısmı düzeltilmeli.',
+                priority=weighted(rng, ORDER_PRIORITY_WEIGHTS, 1)[0],
+                status=rng.choice(['pending', 'producer_review', 'in_progress', 'completed', 'completed']),
+                created_at=modeled_mold.created_at + timedelta(days=rng.uniform(1, 10)),
+            )
+            for modeled_mold in modeled
+            if rng.random() < REVISION_RATIO
+        ]
+        revisions = RevisionRequest.objects.bulk_create(revisions, batch_size=self.chunk_size)
+        self._count('revisions', len(revisions))
+
+        # bulk_create save() çağırmaz - oluşturma ve son durum olayları
+        events = []
+        for revision in revisions:
+            events.append(RevisionEvent(
+                revision=revision, event_type='created', step='Revizyon talebi oluşturuldu',
+                to_status='pending', created_at=revision.created_at,
+            ))
+            if revision.status != 'pending':
+                events.append(RevisionEvent(
+                    revision=revision, event_type='status', from_status='pending', to_status=revision.status,
+                    step=f'Status Beklemede → {revision.get_status_display()}',
+                    created_at=revision.created_at + timedelta(days=rng.uniform(0.5, 6)),
+                ))
+        RevisionEvent.objects.bulk_create(events, batch_size=self.chunk_size)
+        self._count('revision_events', len(events))
+
+    def _usage_entry(self, mold):
+        physical = mold.is_physical_shipment
+        physical_cost = self.physical_price if physical else Decimal('0')
+        digital_cost = Decimal('0') if physical else self.digital_price
+        return UsageLedgerEntry(
+            subscription_id=self.subscriptions[self.centers[mold.center_id].user_id],
+            ear_mold=mold,
+            kind='physical' if physical else 'digital',
+            period=timezone.localtime(mold.created_at).date().replace(day=1),
+            physical_cost=physical_cost,
+            digital_cost=digital_cost,
+            total_cost=physical_cost + digital_cost,
+            created_at=mold.created_at,
+        )
+
+    def _tracking_number(self):
+        self.shipment_sequence += 1
+        return f'{self.prefix.upper()}T{self.shipment_sequence:09d}'
+
+    def _order(self, mold):
+        rng = self.rng
+        producer_id = self.center_producer[mold.center_id]
+        status = ORDER_STATUS[mold.status]
+        created_at = mold.created_at + timedelta(minutes=rng.randint(1, 120))
+        price = self.physical_price if mold.is_physical_shipment else self.digital_price
+
+        actual_delivery = None
+        if status == 'delivered':
+            # Teslimat süresi: çoğu birkaç gün, uzun kuyruk
+            actual_delivery = created_at + timedelta(days=min(rng.lognormvariate(1.5, 0.5), 45))
+            month = (created_at.year, created_at.month)
+            earnings = self.monthly_earnings.setdefault((producer_id, month), [0, Decimal('0')])
+            earnings[0] += 1
+            earnings[1] += price
+
+        return ProducerOrder(
+            producer_id=producer_id,
+            center_id=mold.center_id,
+            ear_mold=mold,
+            order_number=f'{self.prefix.upper()}-{mold.pk}',
+            status=status,
+            priority=weighted(rng, ORDER_PRIORITY_WEIGHTS, 1)[0],
+            estimated_delivery=created_at + timedelta(days=7),
+            actual_delivery=actual_delivery,
+            price=price,
+            created_at=created_at,
+        )
+
+    def _shipment(self, mold):
+        center = self.centers[mold.center_id]
+        producer = self.producers[self.center_producer[mold.center_id]]
+        return CargoShipment(
+            cargo_company=self.cargo_company,
+            tracking_number=mold.tracking_number,
+            sender_name=center.name,
+            sender_address=center.address,
+            sender_phone=center.phone,
+            recipient_name=producer.company_name,
+            recipient_address=producer.address,
+            recipient_phone=producer.phone,
+            description=f'Kalıp: {mold.patient_name} {mold.patient_surname}',
+            shipping_cost=Decimal('65.00'),
+            status='delivered',
+            shipped_at=mold.shipment_date,
+            delivered_at=mold.shipment_date + timedelta(days=2),
+            created_at=mold.created_at,
+        )
+
+    # ------------------------------------------------------------------
+    # Faturalar
+    # ------------------------------------------------------------------
+
+    @transaction.atomic
+    def create_invoices(self):
+        """Geçmiş aylar için merkez aylık ve üretici kazanç faturaları"""
+        self.log('Faturalar oluşturuluyor...')
+        current = (self.now.year, self.now.month)
+        invoices = []
+        for (center_id, month), (physical, digital) in sorted(self.monthly_usage.items()):
+            if month == current:
+                continue
+            physical_cost = physical * self.physical_price
+            digital_cost = digital * self.digital_price
+            subtotal = physical_cost + digital_cost + self.plan.monthly_fee_try
+            invoices.append(self._invoice(
+                f'C{center_id}', month, 'center_monthly', self.centers[center_id].user_id,
+                physical_mold_count=physical,
+                physical_mold_unit_price=self.physical_price,
+                physical_mold_cost=physical_cost,
+                digital_scan_count=digital,
+                digital_scan_cost=digital_cost,
+                monthly_fee=self.plan.monthly_fee_try,
+                subtotal=subtotal,
+                issued_by_center_id=center_id,
+            ))
+
+        for (producer_id, month), (order_count, gross) in sorted(self.monthly_earnings.items()):
+            if month == current:
+                continue
+            fee = (gross * Decimal('0.075')).quantize(Decimal('0.01'))
+            card_fee = (gross * Decimal('0.026')).quantize(Decimal('0.01'))
+            invoices.append(self._invoice(
+                f'P{producer_id}', month, 'producer_monthly', self.producers[producer_id].user_id,
+                producer_id=producer_id,
+                producer_order_count=order_count,
+                producer_gross_revenue=gross,
+                moldpark_system_fee=fee,
+                credit_card_fee=card_fee,
+                total_deductions=fee + card_fee,
+                producer_net_revenue=gross - fee - card_fee,
+                net_amount=gross - fee - card_fee,
+                subtotal=gross,
+            ))
+
+        Invoice.objects.bulk_create(invoices, batch_size=self.chunk_size)
+        self._count('invoices', len(invoices))
+
+    def _invoice(self, owner, month, invoice_type, user_id, subtotal, **fields):
+        year, month_number = month
+        # Ay kapandıktan sonra, sonraki ayın ilk günü kesilir
+        issue_date = date(year + month_number // 12, month_number % 12 + 1, 1)
+        vat = (subtotal * Decimal('0.20')).quantize(Decimal('0.01'))
+        return Invoice(
+            invoice_number=f'{self.prefix.upper()}-{owner}-{year}{month_number:02d}',
+            invoice_type=invoice_type,
+            user_id=user_id,
+            issued_by=self.admin,
+            issue_date=issue_date,
+            due_date=issue_date + timedelta(days=15),
+            payment_date=issue_date + timedelta(days=self.rng.randint(1, 15)),
+            status='paid',
+            subtotal=subtotal,
+            subtotal_without_vat=subtotal,
+            vat_amount=vat,
+            total_amount=subtotal,
+            total_with_vat=subtotal + vat,
+            **fields,
+        )
+
+    # ------------------------------------------------------------------
+    # Türetilmiş özetler
+    # ------------------------------------------------------------------
+
+    def refresh_derived(self):
+        """bulk_create'in atladığı signal / save mantığının sonuçlarını yeniden hesapla"""
+        self.log('Üretici puanları ve önbellekler yenileniyor...')
+        for producer in self.producers.values():
+            ProducerRatingStats.rebuild(producer)
+        for model in (EarMold, ProducerOrder, Producer, ProducerNetwork):
+            transaction.on_commit(lambda model=model: bump_model_version(model))
+        self.log('Arama indeksi üretiliyor...')
+        rebuild_index()
@@ -0,0 +1,317 @@
+"""
+Tam Metin Arama
+Hasta, sipariş, merkez ve mesaj metinleri kayıt anında normalize edilerek
+core_searchdocument tablosuna yazılır. Sorgular SQLite'ta FTS5 (bm25),
+PostgreSQL'de tsvector + GIN (ts_rank) üzerinden çalışır; ikisi de yoksa
+belge tablosunda LIKE taramasına düşülür - yine de birleştirilmiş tablolar
+taranmaz.
+
+Türkçe normalizasyon hem belgeye hem sorguya uygulanır: I/İ/ı/i ayrımı ile
+ş, ğ, ç, ö, ü katlanır; "Işık", "isik" ve "IŞIK" aynı kaydı bulur. Terimler
+önek olarak eşleşir ve hepsi (AND) geçmelidir.
+"""
+import re
+import unicodedata
+from collections import namedtuple
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+
+from center.models import Center
+from mold.models import EarMold
+from producer.models import ProducerOrder
+
+from .models import Message, SearchDocument
+
+
+FTS_TABLE = 'core_searchdocument_fts'
+PG_CONFIG = 'simple'
+MAX_TERMS = 8
+DEFAULT_LIMIT = 20
+BATCH_SIZE = 500
+
+TURKISH_FOLD = str.maketrans({
+    'I': 'i', 'İ': 'i', 'ı': 'i',
+    'Ş': 's', 'ş': 's', 'Ğ': 'g', 'ğ': 'g',
+    'Ç': 'c', 'ç': 'c', 'Ö': 'o', 'ö': 'o', 'Ü': 'u', 'ü': 'u',
+})
+TERM_RE = re.compile(r'[^\W_]+')
+
+SearchHit = namedtuple('SearchHit', 'kind object_id title rank')
+
+
+def normalize(text):
+    """Türkçe katlamalı, küçük harfli, noktalama içermeyen metin"""
+    text = unicodedata.normalize('NFKD', str(text or '').translate(TURKISH_FOLD).lower())
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(TERM_RE.findall(text))
+
+
+def parse_query(query):
+    """Kullanıcı sorgusunu arama terimlerine ayır"""
+    return normalize(query).split()[:MAX_TERMS]
+
+
+# ==========================================
+# BELGE KAYNAKLARI
+# ==========================================
+
+# model, toplu indekslemede yüklenecek ilişkiler, belgeyi etkileyen alanlar,
+# belge üreten fonksiyon (başlık, parçalar), metni kendisine bağlı türler
+Source = namedtuple('Source', 'model related fields document dependents')
+
+SOURCES = {
+    'mold': Source(
+        EarMold, ('center',), ('patient_name', 'patient_surname', 'center'),
+        lambda mold: (
+            f'{mold.patient_name} {mold.patient_surname}',
+            (mold.patient_name, mold.patient_surname, mold.center.name),
+        ),
+        (('order', lambda mold: ProducerOrder.objects.filter(ear_mold=mold)),),
+    ),
+    'order': Source(
+        ProducerOrder, ('center', 'ear_mold'), ('order_number', 'ear_mold', 'center'),
+        lambda order: (
+            f'{order.order_number} - {order.ear_mold.patient_name} {order.ear_mold.patient_surname}',
+            (order.order_number, order.ear_mold.patient_name, order.ear_mold.patient_surname, order.center.name),
+        ),
+        (),
+    ),
+    'center': Source(
+        Center, ('user',), ('name', 'address', 'phone'),
+        lambda center: (center.name, (center.name, center.address, center.phone, center.user.email)),
+        (
+            ('mold', lambda center: EarMold.objects.filter(center=center)),
+            ('order', lambda center: ProducerOrder.objects.filter(center=center)),
+        ),
+    ),
+    'message': Source(
+        Message, ('sender',), ('subject', 'content', 'sender'),
+        lambda message: (
+            message.subject,
+            (message.subject, message.content, message.sender.get_full_name(), message.sender.username),
+        ),
+        (),
+    ),
+}
+
+KIND_FOR_MODEL = {source.model: kind for kind, source in SOURCES.items()}
+
+
+def build_document(kind, instance):
+    """(başlık, normalize gövde)"""
+    title, parts = SOURCES[kind].document(instance)
+    return str(title)[:255], normalize(' '.join(str(part or '') for part in parts))
+
+
+def affects_document(kind, update_fields):
+    """save(update_fields=...) belgeye giren bir alanı değiştiriyor mu"""
+    if update_fields is None:
+        return True
+    fields = SOURCES[kind].fields
+    return any(name in fields or name.removesuffix('_id') in fields for name in update_fields)
+
+
+# ==========================================
+# İNDEKS BAKIMI
+# ==========================================
+
+def index_object(kind, instance):
+    """
+    Tek kaydın belgesini güncelle
+
+    Returns:
+        bool: Metin değiştiyse True (bağlı belgeler de yenilenmeli)
+    """
+    title, body = build_document(kind, instance)
+    documents = SearchDocument.objects.filter(kind=kind, object_id=instance.pk)
+    current = documents.values_list('title', 'body').first()
+    if current == (title, body):
+        return False
+    if current is None:
+        SearchDocument.objects.create(kind=kind, object_id=instance.pk, title=title, body=body)
+    else:
+        documents.update(title=title, body=body, updated_at=timezone.now())
+    return True
+
+
+def update_object(instance, update_fields=None):
+    """Kayıt sonrası: belgeyi ve metni değiştiyse ona bağlı belgeleri yenile"""
+    kind = KIND_FOR_MODEL[type(instance)]
+    if not affects_document(kind, update_fields):
+        return
+    if index_object(kind, instance):
+        for dependent_kind, related in SOURCES[kind].dependents:
+            index_queryset(dependent_kind, related(instance))
+
+
+def remove_object(instance):
+    SearchDocument.objects.filter(kind=KIND_FOR_MODEL[type(instance)], object_id=instance.pk).delete()
+
+
+def index_queryset(kind, queryset=None, batch_size=BATCH_SIZE):
+    """
+    Kayıtları toplu indeksle (varsa belge üzerine yazılır)
+
+    Returns:
+        int: İndekslenen kayıt sayısı
+    """
+    source = SOURCES[kind]
+    if queryset is None:
+        queryset = source.model.objects.all()
+    queryset = queryset.select_related(*source.related).order_by('pk')
+
+    total = 0
+    batch = []
+    for instance in queryset.iterator(chunk_size=batch_size):
+        title, body = build_document(kind, instance)
+        batch.append(SearchDocument(kind=kind, object_id=instance.pk, title=title, body=body))
+        if len(batch) >= batch_size:
+            total += _write_batch(batch)
+            batch = []
+    if batch:
+        total += _write_batch(batch)
+    return total
+
+
+def _write_batch(documents):
+    SearchDocument.objects.bulk_create(
+        documents,
+        update_conflicts=True,
+        unique_fields=['kind', 'object_id'],
+        update_fields=['title', 'body', 'updated_at'],
+    )
+    return len(documents)
+
+
+def rebuild_index(kinds=None, log=None):
+    """Seçili türlerin belgelerini baştan üret (toplu yüklemeler ve ilk kurulum için)"""
+    log = log or (lambda message: None)
+    counts = {}
+    for kind in kinds or SOURCES:
+        SearchDocument.objects.filter(kind=kind).delete()
+        counts[kind] = index_queryset(kind)
+        log(f'{kind}: {counts[kind]} belge')
+    if connection.vendor == 'sqlite' and _fts_available():
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+    return counts
+
+
+# ==========================================
+# SORGULAR
+# ==========================================
+
+_fts_tables = {}
+
+
+def _fts_available():
+    """SQLite derlemesinde FTS5 yoksa migration sanal tabloyu oluşturmamış olabilir"""
+    key = connection.settings_dict['NAME']
+    if key not in _fts_tables:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+            _fts_tables[key] = cursor.fetchone() is not None
+    return _fts_tables[key]
+
+
+def backend():
+    """Kullanılacak arama motoru: 'fts5', 'postgres' veya 'like'"""
+    if connection.vendor == 'postgresql':
+        return 'postgres'
+    if connection.vendor == 'sqlite' and _fts_available():
+        return 'fts5'
+    return 'like'
+
+
+def _match_expression(terms, engine):
+    if engine == 'fts5':
+        return ' '.join(f'"{term}"*' for term in terms)
+    return ' & '.join(f'{term}:*' for term in terms)
+
+
+def _like_documents(terms, kinds):
+    documents = SearchDocument.objects.filter(kind__in=kinds)
+    for term in terms:
+        documents = documents.filter(body__contains=term)
+    return documents
+
+
+def search(query, kinds=None, limit=DEFAULT_LIMIT):
+    """
+    Sıralı arama
+
+    Args:
+        query: Kullanıcının yazdığı metin
+        kinds: Aranacak türler (varsayılan: hepsi)
+        limit: En fazla sonuç
+
+    Returns:
+        list[SearchHit]: En iyi eşleşme önce (rank büyük olan daha iyi)
+    """
+    terms = parse_query(query)
+    if not terms:
+        return []
+    kinds = list(kinds or SOURCES)
+    engine = backend()
+
+    if engine == 'like':
+        rows = (
+            _like_documents(terms, kinds).order_by('-updated_at')
+            .values_list('kind', 'object_id', 'title')[:limit]
+        )
+        return [SearchHit(kind, object_id, title, 0.0) for kind, object_id, title in rows]
+
+    placeholders = ', '.join(['%s'] * len(kinds))
+    match = _match_expression(terms, engine)
+    if engine == 'fts5':
+        sql = (
+            f'SELECT d.kind, d.object_id, d.title, -bm25({FTS_TABLE}) AS rank '
+            f'FROM {FTS_TABLE} JOIN core_searchdocument d ON d.id = {FTS_TABLE}.rowid '
+            f'WHERE {FTS_TABLE} MATCH %s AND d.kind IN ({placeholders}) '
+            f'ORDER BY rank DESC LIMIT %s'
+        )
+        params = [match, *kinds, limit]
+    else:
+        sql = (
+            f"SELECT kind, object_id, title, ts_rank(search_vector, to_tsquery('{PG_CONFIG}', %s)) AS rank "
+            f"FROM core_searchdocument "
+            f"WHERE search_vector @@ to_tsquery('{PG_CONFIG}', %s) AND kind IN ({placeholders}) "
+            f"ORDER BY rank DESC LIMIT %s"
+        )
+        params = [match, match, *kinds, limit]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [SearchHit(*row) for row in cursor.fetchall()]
+
+
+def search_filter(query, kind, field='pk'):
+    """
+    Listeleme view'ları için filtre: `field` değeri eşleşen belgelerden biri olmalı
+
+    Mevcut sorgu kümesinin sıralaması ve sayfalaması korunur; eşleşme alt
+    sorgu olarak veritabanında kalır. Boş sorgu filtre uygulamaz.
+    """
+    terms = parse_query(query)
+    if not terms:
+        return Q()
+    engine = backend()
+
+    if engine == 'like':
+        return Q(**{f'{field}__in': _like_documents(terms, [kind]).values('object_id')})
+
+    match = _match_expression(terms, engine)
+    if engine == 'fts5':
+        sql = (
+            f'SELECT d.object_id FROM core_searchdocument d WHERE d.kind = %s '
+            f'AND d.id IN (SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s)'
+        )
+    else:
+        sql = (
+            f"SELECT object_id FROM core_searchdocument "
+            f"WHERE kind = %s AND search_vector @@ to_tsquery('{PG_CONFIG}', %s)"
+        )
+    return Q(**{f'{field}__in': RawSQL(sql, [kind, match])})
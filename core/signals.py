@@ -0,0 +1,185 @@
+"""
+Core Signal'ları - Önbellek geçersiz kılma
+Finansal rapor satırları ilgili merkezin verisi değiştiğinde yenilenir;
+dashboard widget'ları bağlı oldukları modellerin sürümü ile geçersiz kılınır.
+Mesaj, bildirim ve revizyon yazımları kullanıcı rozet sayaçlarını günceller.
+Kalıp, sipariş, merkez ve mesaj yazımları tam metin arama belgelerini yeniler.
+"""
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from center.models import Center
+from mold.models import EarMold, ModeledMold, RevisionRequest
+from producer.models import Producer, ProducerNetwork, ProducerOrder
+
+from . import search
+from .badge_counters import apply_state_change, invalidate_broadcasts, revision_user_ids
+from .financial_report import invalidate_center
+from .models import Invoice, Message, MessageReceipt, SimpleNotification, UserSubscription
+from .widget_cache import bump_model_version
+
+
+def _invalidate_on_commit(*center_ids):
+    """Transaction tamamlandığında merkez rapor satırlarını geçersiz kıl"""
+    center_ids = {center_id for center_id in center_ids if center_id}
+    if center_ids:
+        transaction.on_commit(lambda: [invalidate_center(center_id) for center_id in center_ids])
+
+
+def _center_id_for_user(user_id):
+    return Center.objects.filter(user_id=user_id).values_list('id', flat=True).first()
+
+
+@receiver(post_save, sender=Invoice)
+@receiver(post_delete, sender=Invoice)
+def invalidate_financial_report_for_invoice(sender, instance, **kwargs):
+    """Fatura değişince merkez tahsilat satırını yenile"""
+    _invalidate_on_commit(instance.issued_by_center_id, _center_id_for_user(instance.user_id))
+
+
+@receiver(post_save, sender=UserSubscription)
+@receiver(post_delete, sender=UserSubscription)
+def invalidate_financial_report_for_subscription(sender, instance, **kwargs):
+    """Abonelik değişince merkez tahsilat satırını yenile"""
+    _invalidate_on_commit(_center_id_for_user(instance.user_id))
+
+
+@receiver(post_save, sender=EarMold)
+@receiver(post_delete, sender=EarMold)
+def invalidate_financial_report_for_mold(sender, instance, **kwargs):
+    """Kalıp değişince merkez tahsilat satırını yenile"""
+    _invalidate_on_commit(instance.center_id)
+
+
+@receiver(post_save, sender=ModeledMold)
+@receiver(post_delete, sender=ModeledMold)
+def invalidate_financial_report_for_modeled_mold(sender, instance, **kwargs):
+    """Model dosyası değişince (3D modelleme sayımı) merkez satırını yenile"""
+    center_id = EarMold.objects.filter(pk=instance.ear_mold_id).values_list('center_id', flat=True).first()
+    _invalidate_on_commit(center_id)
+
+
+@receiver(post_save, sender=EarMold)
+@receiver(post_delete, sender=EarMold)
+@receiver(post_save, sender=ProducerOrder)
+@receiver(post_delete, sender=ProducerOrder)
+@receiver(post_save, sender=Producer)
+@receiver(post_delete, sender=Producer)
+@receiver(post_save, sender=ProducerNetwork)
+@receiver(post_delete, sender=ProducerNetwork)
+def invalidate_dashboard_widgets(sender, **kwargs):
+    """Widget önbelleklerini model sürümü ile geçersiz kıl"""
+    transaction.on_commit(lambda: bump_model_version(sender))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=Center)
+@receiver(post_delete, sender=Center)
+def invalidate_account_count_widgets(sender, created=True, **kwargs):
+    """Kullanıcı / merkez sayıları sadece ekleme ve silmede değişir - girişteki last_login kaydı sürüm artırmaz"""
+    if created:
+        transaction.on_commit(lambda: bump_model_version(sender))
+
+
+# ==========================================
+# ROZET SAYAÇLARI
+# ==========================================
+
+# Model: (sayaç alanı, durum alanları, durum -> (anahtar, sayılıyor mu))
+BADGE_TRACKING = {
+    Message: (
+        'unread_messages', ('recipient_id', 'is_read'),
+        lambda recipient_id, is_read: (recipient_id, bool(recipient_id) and not is_read),
+    ),
+    SimpleNotification: (
+        'unread_notifications', ('user_id', 'is_read'),
+        lambda user_id, is_read: (user_id, not is_read),
+    ),
+    RevisionRequest: (
+        'pending_revisions', ('modeled_mold_id', 'status'),
+        lambda modeled_mold_id, status: (modeled_mold_id, status == 'pending'),
+    ),
+}
+
+
+def _badge_users(sender):
+    return revision_user_ids if sender is RevisionRequest else (lambda key: [key])
+
+
+def _badge_state(sender, values):
+    _, _, to_state = BADGE_TRACKING[sender]
+    return to_state(*values) if values else None
+
+
+@receiver(pre_save, sender=Message)
+@receiver(pre_save, sender=SimpleNotification)
+@receiver(pre_save, sender=RevisionRequest)
+def load_badge_state(sender, instance, **kwargs):
+    """Veritabanından yüklenmemiş kayıtlar için önceki durumu oku"""
+    if instance._state.adding:
+        return
+    state = getattr(instance, '_badge_state', None)
+    if state is None or None in state:
+        _, fields, _ = BADGE_TRACKING[sender]
+        instance._badge_state = sender.objects.filter(pk=instance.pk).values_list(*fields).first()
+
+
+@receiver(post_save, sender=Message)
+@receiver(post_save, sender=SimpleNotification)
+@receiver(post_save, sender=RevisionRequest)
+def update_badge_counters_on_save(sender, instance, created, **kwargs):
+    field, fields, _ = BADGE_TRACKING[sender]
+    before = None if created else getattr(instance, '_badge_state', None)
+    after = tuple(getattr(instance, name) for name in fields)
+    apply_state_change(field, _badge_state(sender, before), _badge_state(sender, after), _badge_users(sender))
+    instance._badge_state = after
+
+
+@receiver(post_delete, sender=Message)
+@receiver(post_delete, sender=SimpleNotification)
+@receiver(pre_delete, sender=RevisionRequest)
+def update_badge_counters_on_delete(sender, instance, **kwargs):
+    """Silinen kayıt sayaçtan düşülür - revizyonlar için siparişler henüz silinmeden (pre_delete)"""
+    field, fields, _ = BADGE_TRACKING[sender]
+    before = getattr(instance, '_badge_state', None)
+    if before is None or None in before:
+        before = tuple(getattr(instance, name) for name in fields)
+    apply_state_change(field, _badge_state(sender, before), None, _badge_users(sender))
+
+
+@receiver(post_save, sender=Message)
+@receiver(post_delete, sender=Message)
+def invalidate_broadcast_badges(sender, instance, **kwargs):
+    """Toplu mesaj eklenince / silinince tüm kullanıcıların toplu mesaj sayımı yenilenir"""
+    if instance.is_broadcast:
+        invalidate_broadcasts()
+
+
+@receiver(post_save, sender=MessageReceipt)
+@receiver(post_delete, sender=MessageReceipt)
+def invalidate_broadcast_badge_for_receipt(sender, instance, **kwargs):
+    invalidate_broadcasts([instance.user_id])
+
+
+# ==========================================
+# ARAMA İNDEKSİ
+# ==========================================
+
+@receiver(post_save, sender=EarMold)
+@receiver(post_save, sender=ProducerOrder)
+@receiver(post_save, sender=Center)
+@receiver(post_save, sender=Message)
+def update_search_document(sender, instance, update_fields=None, **kwargs):
+    """Belge aynı transaction içinde yazılır - arama kayıtla birlikte görünür"""
+    search.update_object(instance, update_fields)
+
+
+@receiver(post_delete, sender=EarMold)
+@receiver(post_delete, sender=ProducerOrder)
+@receiver(post_delete, sender=Center)
+@receiver(post_delete, sender=Message)
+def remove_search_document(sender, instance, **kwargs):
+    search.remove_object(instance)
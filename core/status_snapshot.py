@@ -0,0 +1,86 @@
+"""
+Durum Anlık Görüntüsü Servisi
+Sistem durumu / sağlık / içgörü API'lerinin JSON belgesini önbellekte tutar.
+Belge sabit aralıklarla (`refresh_status_snapshots` komutu) ya da süresi
+dolduğunda ilk istekte yeniden hesaplanır. Aynı anda gelen istekler için
+hesaplama tek seferlik kilitle korunur: kilidi alan istek hesaplar, diğerleri
+eski belgeyi sunar ya da belge yoksa hesaplamanın bitmesini bekler. Yanıtlar
+`ETag` / `Cache-Control` ile döner; böylece veritabanı yükü istemci
+sayısından bağımsız kalır.
+"""
+import hashlib
+import json
+import time
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+
+SNAPSHOT_KEY = 'status_snapshot:{}'
+LOCK_KEY = 'status_snapshot:{}:lock'
+
+DEFAULT_INTERVAL = 15  # saniye
+LOCK_TIMEOUT = 30  # hesaplama takılırsa kilit kendiliğinden düşer
+WAIT_TIMEOUT = 10
+POLL_INTERVAL = 0.05
+# Süresi dolan belge, yenisi hesaplanırken sunulabilsin diye daha uzun saklanır
+STORE_TIMEOUT = 60 * 10
+
+
+def build_snapshot(name, builder):
+    """Belgeyi hesapla, JSON olarak serileştir ve önbelleğe yaz"""
+    content = json.dumps(builder(), cls=DjangoJSONEncoder)
+    snapshot = {
+        'content': content,
+        'etag': '"{}"'.format(hashlib.md5(content.encode()).hexdigest()),
+        'generated_at': time.time(),
+    }
+    cache.set(SNAPSHOT_KEY.format(name), snapshot, STORE_TIMEOUT)
+    return snapshot
+
+
+def get_snapshot(name, builder, interval=DEFAULT_INTERVAL):
+    """
+    Güncel belgeyi döndür - gerekiyorsa tek seferlik kilitle yeniden hesapla
+
+    Args:
+        name: Belge anahtarı (ör. 'system_status' ya da kullanıcıya özel anahtar)
+        builder: Belgeyi (JSON'a çevrilebilir dict) üreten fonksiyon
+        interval: Belgenin güncel sayıldığı süre (saniye)
+    """
+    key = SNAPSHOT_KEY.format(name)
+    snapshot = cache.get(key)
+    if snapshot is not None and time.time() - snapshot['generated_at'] < interval:
+        return snapshot
+
+    lock_key = LOCK_KEY.format(name)
+    if cache.add(lock_key, 1, LOCK_TIMEOUT):
+        try:
+            return build_snapshot(name, builder)
+        finally:
+            cache.delete(lock_key)
+
+    # Başka bir istek hesaplıyor - varsa eski belgeyi sun
+    if snapshot is not None:
+        return snapshot
+
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        snapshot = cache.get(key)
+        if snapshot is not None:
+            return snapshot
+
+    # Kilit sahibi zamanında bitiremedi
+    return build_snapshot(name, builder)
+
+
+def snapshot_response(request, snapshot, interval=DEFAULT_INTERVAL):
+    """Belgeyi ETag / Cache-Control ile sun - If-None-Match eşleşirse 304 döner"""
+    response = HttpResponse(snapshot['content'], content_type='application/json')
+    response['ETag'] = snapshot['etag']
+    age = time.time() - snapshot['generated_at']
+    patch_cache_control(response, private=True, max_age=max(0, int(interval - age)))
+    return get_conditional_response(request, etag=snapshot['etag'], response=response)
@@ -10,57 +10,80 @@ from django.contrib.auth.models import User
 from center.models import Center
 from producer.models import Producer, ProducerOrder, ProducerNetwork
 from mold.models import EarMold
+from core.widget_cache import cached_widget
+from core.lead_time import get_lead_time_stats
 from datetime import datetime, timedelta
 import json
 
 register = template.Library()
 
 
+ACTIVE_ORDER_STATUSES = ['received', 'designing', 'production', 'quality_check']
+
+PIPELINE_STAGES = [
+    ('received', 'Alınan Siparişler', 'primary'),
+    ('designing', '3D Tasarım', 'info'),
+    ('production', 'Üretimde', 'warning'),
+    ('quality_check', 'Kalite Kontrol', 'secondary'),
+    ('packaging', 'Paketleme', 'success'),
+    ('shipping', 'Kargoda', 'dark'),
+]
+
+NETWORK_STATUSES = ['active', 'pending', 'suspended', 'terminated']
+
+
+def _status_counts(queryset):
+    """Durum başına kayıt sayısı - tek gruplu sorgu"""
+    return dict(queryset.order_by().values_list('status').annotate(count=Count('id')))
+
+
 @register.inclusion_tag('core/widgets/system_stats.html')
+@cached_widget('system_stats', models=(User, Center, Producer, EarMold, ProducerOrder))
 def system_stats():
     """Sistem genel istatistikleri widget'ı"""
     now = timezone.now()
-    today = now.date()
     this_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
     
+    # Merkez ve üretici kullanıcıya birebir bağlı - hesap sayıları tek sorguda
+    accounts = User.objects.aggregate(
+        total_users=Count('id'),
+        total_centers=Count('center'),
+        total_producers=Count('producer'),
+        active_producers=Count('producer', filter=Q(producer__is_active=True, producer__is_verified=True)),
+    )
+    molds = EarMold.objects.aggregate(
+        total_molds=Count('id'),
+        molds_this_month=Count('id', filter=Q(created_at__gte=this_month)),
+    )
+    orders = ProducerOrder.objects.aggregate(
+        active_orders=Count('id', filter=Q(status__in=ACTIVE_ORDER_STATUSES)),
+        completed_orders=Count('id', filter=Q(status='delivered')),
+    )
+    
     stats = {
-        'total_users': User.objects.count(),
-        'total_centers': Center.objects.count(),
-        'total_producers': Producer.objects.count(),
-        'active_producers': Producer.objects.filter(is_active=True, is_verified=True).count(),
-        'total_molds': EarMold.objects.count(),
-        'molds_this_month': EarMold.objects.filter(created_at__gte=this_month).count(),
-        'active_orders': ProducerOrder.objects.filter(
-            status__in=['received', 'designing', 'production', 'quality_check']
-        ).count(),
-        'completed_orders': ProducerOrder.objects.filter(status='delivered').count(),
+        **accounts,
+        **molds,
+        **orders,
     }
     
     return {'stats': stats}
 
 
 @register.inclusion_tag('core/widgets/production_pipeline.html')
+@cached_widget('production_pipeline', models=(ProducerOrder,))
 def production_pipeline():
     """Üretim hattı durumu widget'ı"""
-    pipeline_stats = []
-    
-    stages = [
-        ('received', 'Alınan Siparişler', 'primary'),
-        ('designing', '3D Tasarım', 'info'),
-        ('production', 'Üretimde', 'warning'),
-        ('quality_check', 'Kalite Kontrol', 'secondary'),
-        ('packaging', 'Paketleme', 'success'),
-        ('shipping', 'Kargoda', 'dark'),
-    ]
+    counts = _status_counts(ProducerOrder.objects.filter(status__in=[code for code, _, _ in PIPELINE_STAGES]))
     
-    for stage_code, stage_name, color in stages:
-        count = ProducerOrder.objects.filter(status=stage_code).count()
-        pipeline_stats.append({
+    pipeline_stats = [
+        {
             'stage': stage_name,
-            'count': count,
+            'count': counts.get(stage_code, 0),
             'color': color,
-            'percentage': 0  # Hesaplanacak
-        })
+            'percentage': 0,
+        }
+        for stage_code, stage_name, color in PIPELINE_STAGES
+    ]
     
     # Yüzde hesaplama
     total = sum(stat['count'] for stat in pipeline_stats)
@@ -72,25 +95,20 @@ def production_pipeline():
 
 
 @register.inclusion_tag('core/widgets/performance_metrics.html')
+@cached_widget('performance_metrics', models=(EarMold, ProducerOrder, Producer))
 def performance_metrics():
     """Performans metrikleri widget'ı"""
     now = timezone.now()
     last_30_days = now - timedelta(days=30)
     
-    # Ortalama teslimat süresi
-    completed_orders = ProducerOrder.objects.filter(
-        status='delivered',
-        created_at__gte=last_30_days,
-        actual_delivery__isnull=False
+    # Sipariş sayıları
+    orders = ProducerOrder.objects.filter(created_at__gte=last_30_days).aggregate(
+        total_orders_30d=Count('id'),
+        completed_orders_30d=Count('id', filter=Q(status='delivered', actual_delivery__isnull=False)),
     )
     
-    avg_delivery_time = 0
-    if completed_orders.exists():
-        total_time = sum([
-            (order.actual_delivery - order.created_at).days 
-            for order in completed_orders
-        ])
-        avg_delivery_time = round(total_time / completed_orders.count(), 1)
+    # Teslimat süreleri (ortalama, medyan, p90, p99) veritabanında hesaplanır
+    lead_time = get_lead_time_stats(30)
     
     # Kalite skorları
     quality_scores = EarMold.objects.filter(
@@ -101,36 +119,33 @@ def performance_metrics():
     avg_quality = round(quality_scores['avg_quality'] or 0, 1)
     
     # Üretici performansı
-    top_producers = Producer.objects.filter(
+    top_producers = list(Producer.objects.filter(
         orders__created_at__gte=last_30_days
     ).annotate(
         order_count=Count('orders'),
         completed_count=Count('orders', filter=Q(orders__status='delivered'))
-    ).filter(order_count__gt=0).order_by('-completed_count')[:5]
+    ).filter(order_count__gt=0).order_by('-completed_count')[:5])
     
     metrics = {
-        'avg_delivery_time': avg_delivery_time,
+        'avg_delivery_time': lead_time['overall']['mean'],
+        'lead_time': lead_time['overall'],
+        'lead_time_by_priority': lead_time['by_priority'],
         'avg_quality_score': avg_quality,
-        'total_orders_30d': ProducerOrder.objects.filter(created_at__gte=last_30_days).count(),
-        'completed_orders_30d': completed_orders.count(),
         'top_producers': top_producers,
+        **orders,
     }
     
     return {'metrics': metrics}
 
 
 @register.inclusion_tag('core/widgets/network_health.html')
+@cached_widget('network_health', models=(ProducerNetwork,))
 def network_health():
     """Ağ sağlığı widget'ı"""
-    networks = ProducerNetwork.objects.all()
-    
-    network_stats = {
-        'total': networks.count(),
-        'active': networks.filter(status='active').count(),
-        'pending': networks.filter(status='pending').count(),
-        'suspended': networks.filter(status='suspended').count(),
-        'terminated': networks.filter(status='terminated').count(),
-    }
+    counts = _status_counts(ProducerNetwork.objects.all())
+    
+    network_stats = {status: counts.get(status, 0) for status in NETWORK_STATUSES}
+    network_stats['total'] = sum(counts.values())
     
     # Sağlık skoru hesaplama
     if network_stats['total'] > 0:
@@ -208,6 +223,7 @@ def format_duration(minutes):
 
 
 @register.inclusion_tag('core/widgets/recent_activities.html')
+@cached_widget('recent_activities', models=(EarMold, ProducerOrder))
 def recent_activities(limit=10):
     """Son aktiviteler widget'ı"""
     activities = []
@@ -249,6 +265,7 @@ def recent_activities(limit=10):
 
 
 @register.inclusion_tag('core/widgets/system_alerts.html')
+@cached_widget('system_alerts', models=(ProducerOrder, ProducerNetwork, Producer))
 def system_alerts():
     """Sistem uyarıları widget'ı"""
     alerts = []
@@ -256,7 +273,7 @@ def system_alerts():
     # Bekleyen siparişler
     overdue_orders = ProducerOrder.objects.filter(
         estimated_delivery__lt=timezone.now(),
-        status__in=['received', 'designing', 'production', 'quality_check']
+        status__in=ACTIVE_ORDER_STATUSES
     ).count()
     
     if overdue_orders > 0:
@@ -360,6 +377,7 @@ def priority_color(priority):
 
 
 @register.inclusion_tag('core/widgets/system_health_widget.html')
+@cached_widget('system_health_widget', models=(ProducerOrder, ProducerNetwork, Producer))
 def system_health_widget():
     """Sistem sağlık widget'ı"""
     try:
@@ -405,9 +423,12 @@ def system_health_widget():
             disk_usage = 0
         
         # Ağ sağlığı
-        from producer.models import ProducerNetwork
-        active_networks = ProducerNetwork.objects.filter(status='active').count()
-        total_networks = ProducerNetwork.objects.count()
+        networks = ProducerNetwork.objects.aggregate(
+            active=Count('id', filter=Q(status='active')),
+            total=Count('id'),
+        )
+        active_networks = networks['active']
+        total_networks = networks['total']
         
         network_status = 'healthy'
         if total_networks > 0:
@@ -422,10 +443,9 @@ def system_health_widget():
         critical_alerts = []
         
         # Geciken siparişler
-        from producer.models import ProducerOrder
         overdue_orders = ProducerOrder.objects.filter(
             estimated_delivery__lt=timezone.now(),
-            status__in=['received', 'designing', 'production', 'quality_check']
+            status__in=ACTIVE_ORDER_STATUSES
         ).count()
         
         if overdue_orders > 10:
@@ -436,16 +456,13 @@ def system_health_widget():
             health_score -= 10
         
         # Güvenlik riskleri
-        from producer.models import Producer
         risky_producers = Producer.objects.filter(
-            user__is_staff=True
-        ) | Producer.objects.filter(
-            user__is_superuser=True
-        )
+            Q(user__is_staff=True) | Q(user__is_superuser=True)
+        ).count()
         
-        if risky_producers.exists():
+        if risky_producers:
             critical_alerts.append({
-                'message': f'{risky_producers.count()} üretici hesabının admin yetkisi var',
+                'message': f'{risky_producers} üretici hesabının admin yetkisi var',
                 'type': 'security_risk'
             })
             health_score -= 25
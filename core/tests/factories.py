@@ -0,0 +1,47 @@
+"""
+Testlerde kullanılan kayıt oluşturucular
+"""
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+
+from center.models import Center
+from mold.models import EarMold
+from producer.models import Producer, ProducerNetwork, ProducerOrder
+
+
+def make_user(username, **kwargs):
+    return User.objects.create_user(
+        username=username, email=f'{username}@example.com', password='test-pass-123', **kwargs
+    )
+
+
+def make_center(name='Merkez', **kwargs):
+    return Center.objects.create(user=make_user(name), name=name, address='Adres', phone='5550000000', **kwargs)
+
+
+def make_producer(name='Uretici', **kwargs):
+    kwargs.setdefault('is_verified', True)
+    return Producer.objects.create(
+        user=make_user(name), company_name=name, address='Adres', phone='5550000000', tax_number=name, **kwargs
+    )
+
+
+def make_network(producer, center, status='active'):
+    return ProducerNetwork.objects.create(producer=producer, center=center, status=status)
+
+
+def make_mold(center, physical=True, **kwargs):
+    values = {
+        'patient_name': 'Ayşe', 'patient_surname': 'Yılmaz', 'patient_age': 30, 'patient_gender': 'F',
+        'mold_type': 'full', 'vent_diameter': 1.0,
+    }
+    values.update(kwargs)
+    return EarMold.objects.create(center=center, is_physical_shipment=physical, **values)
+
+
+def make_order(producer, center, mold=None, status='received', price=Decimal('100.00'), **kwargs):
+    return ProducerOrder.objects.create(
+        producer=producer, center=center, ear_mold=mold or make_mold(center),
+        status=status, price=price, **kwargs
+    )
@@ -0,0 +1,142 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+
+from core.badge_counters import get_badge_counts
+from core.context_processors import unread_messages
+from core.models import Message, SimpleNotification, UserBadgeCounter
+from core.utils import mark_all_as_read
+from mold.models import ModeledMold, RevisionRequest
+
+from .factories import make_center, make_mold, make_order, make_producer
+
+
+class BadgeCounterTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.center = make_center()
+        self.producer = make_producer()
+        self.mold = make_mold(self.center)
+        make_order(self.producer, self.center, self.mold)
+        self.modeled = ModeledMold.objects.create(ear_mold=self.mold, file='modeled/test.stl')
+        self.admin = User.objects.create_superuser('yonetici', 'yonetici@example.com', 'test-pass-123')
+
+    def context(self, user):
+        request = RequestFactory().get('/')
+        request.user = user
+        return unread_messages(request)
+
+    def send(self, count=1):
+        for _ in range(count):
+            Message.objects.create(
+                sender=self.admin, recipient=self.producer.user, message_type='admin_to_producer',
+                subject='Konu', content='Mesaj',
+            )
+
+    def revision(self):
+        return RevisionRequest.objects.create(
+            modeled_mold=self.modeled, center=self.center, revision_type='other',
+            title='Revizyon', description='Kenar düzeltme',
+        )
+
+    def test_counts_are_served_from_cache(self):
+        SimpleNotification.objects.create(user=self.producer.user, title='Eski', message='Bildirim')
+        UserBadgeCounter.objects.all().delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.send(3)
+            SimpleNotification.objects.create(user=self.producer.user, title='Yeni', message='Bildirim')
+            self.revision()
+
+        context = self.context(self.producer.user)
+        self.assertEqual(context['unread_message_count'], 3)
+        self.assertEqual(context['unread_notifications'], 2)
+        self.assertEqual(context['pending_revision_requests'], 1)
+        with self.assertNumQueries(0):
+            self.context(self.producer.user)
+
+    def test_broadcasts_match_inbox(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.send(1)
+            for message_type, audience in (('admin_to_producer', 'broadcast_to_producers'), ('admin_to_all', None)):
+                Message.objects.create(
+                    sender=self.admin, message_type=message_type, is_broadcast=True,
+                    subject='Duyuru', content='Toplu mesaj', **({audience: True} if audience else {}),
+                )
+            Message.objects.create(
+                sender=self.admin, message_type='admin_to_center', is_broadcast=True, broadcast_to_centers=True,
+                subject='Merkezlere', content='Toplu mesaj',
+            )
+
+        context = self.context(self.producer.user)
+        self.assertEqual((context['unread_direct_count'], context['unread_broadcast_count']), (1, 2))
+        self.client.force_login(self.producer.user)
+        inbox = self.client.get(reverse('core:message_list'), {'filter': 'sent'})
+        self.assertEqual(inbox.context['stats']['unread_received'], context['unread_message_count'])
+        with self.assertNumQueries(0):
+            self.context(self.producer.user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.get(reverse('core:message_list'))
+        self.assertEqual(self.context(self.producer.user)['unread_message_count'], 0)
+        self.assertEqual(self.context(self.center.user)['unread_broadcast_count'], 2)
+
+    def test_write_paths_adjust_counters(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.send(3)
+            revision = self.revision()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            message = Message.objects.filter(recipient=self.producer.user).first()
+            message.mark_as_read()
+            message.mark_as_read()
+            Message.objects.filter(recipient=self.producer.user, is_read=False).first().delete()
+            revision.status = 'producer_review'
+            revision.save()
+            mark_all_as_read(self.producer.user)
+
+        counts = get_badge_counts(self.producer.user.id)
+        self.assertEqual(counts['unread_messages'], 1)
+        self.assertEqual(counts['pending_revisions'], 0)
+        self.assertEqual(counts, UserBadgeCounter.compute(self.producer.user.id))
+
+    def test_status_change_on_deferred_instance(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            revision = self.revision()
+            RevisionRequest.objects.filter(pk=revision.pk).update(status='producer_review')
+        UserBadgeCounter.rebuild(self.producer.user.id)
+        cache.clear()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            deferred = RevisionRequest.objects.defer('status').get(pk=revision.pk)
+            deferred.status = 'pending'
+            deferred.save()
+        self.assertEqual(get_badge_counts(self.producer.user.id)['pending_revisions'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.mold.delete()
+        self.assertEqual(get_badge_counts(self.producer.user.id)['pending_revisions'], 0)
+
+    def test_rebuild_command(self):
+        self.send(2)
+        UserBadgeCounter.objects.filter(user=self.producer.user).update(unread_messages=0)
+
+        call_command('rebuild_badge_counters', stdout=StringIO())
+
+        self.assertEqual(UserBadgeCounter.objects.get(user=self.producer.user).unread_messages, 2)
+
+    def test_deleting_user_does_not_recreate_counter_row(self):
+        recipient = User.objects.create_user('alici', password='test-pass-123')
+        get_badge_counts(recipient.pk)
+        Message.objects.create(
+            sender=self.admin, recipient=recipient, message_type='admin_to_center',
+            subject='Konu', content='Mesaj',
+        )
+        self.assertEqual(UserBadgeCounter.objects.get(user=recipient).unread_messages, 1)
+
+        recipient.delete()
+        self.assertFalse(UserBadgeCounter.objects.filter(user_id=recipient.pk).exists())
@@ -0,0 +1,71 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from core.benchmark import BenchmarkError, BenchmarkRunner, compare
+
+
+def result(**metrics):
+    values = {'p50_ms': 10.0, 'p95_ms': 20.0, 'queries': 10, 'peak_kb': 100.0}
+    values.update(metrics)
+    return values
+
+
+class CompareTests(TestCase):
+
+    def test_regressions_above_threshold(self):
+        baseline = {'endpoints': {'a': result(), 'b': result()}}
+        report = {'endpoints': {'a': result(queries=12), 'b': result(peak_kb=126.0), 'c': result()}}
+
+        regressions = compare(report, baseline, threshold=0.25)
+
+        self.assertEqual([(name, metric) for name, metric, *_ in regressions], [('b', 'peak_kb')])
+
+    def test_small_time_changes_are_tolerated(self):
+        baseline = {'endpoints': {'a': result(p50_ms=1.0)}}
+        self.assertEqual(compare({'endpoints': {'a': result(p50_ms=5.0)}}, baseline), [])
+        self.assertEqual(len(compare({'endpoints': {'a': result(p50_ms=7.0)}}, baseline)), 1)
+
+    def test_unknown_endpoint_is_rejected(self):
+        with self.assertRaises(BenchmarkError):
+            BenchmarkRunner(only=['nope'])
+
+
+class BenchCommandTests(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.baseline = os.path.join(self.directory, 'baseline.json')
+
+    def bench(self, *args):
+        with override_settings(MEDIA_ROOT=self.directory):
+            call_command(
+                'bench', '--iterations', '1', '--warmup', '0', '--baseline', self.baseline,
+                '--only', 'center_dashboard', *args, stdout=StringIO(),
+            )
+
+    def test_missing_dataset(self):
+        with self.assertRaises(CommandError):
+            self.bench()
+
+    def test_baseline_save_and_regression_exit(self):
+        with override_settings(MEDIA_ROOT=self.directory):
+            call_command('seed_scale', '--centers', '2', '--producers', '1', '--molds', '30', stdout=StringIO())
+
+        self.bench('--save-baseline')
+        with open(self.baseline) as baseline_file:
+            data = json.load(baseline_file)
+        self.assertEqual(list(data['endpoints']), ['center_dashboard'])
+        self.assertGreater(data['endpoints']['center_dashboard']['queries'], 1)
+
+        data['endpoints']['center_dashboard']['queries'] = 1
+        with open(self.baseline, 'w') as baseline_file:
+            json.dump(data, baseline_file)
+        with self.assertRaises(SystemExit):
+            self.bench()
@@ -0,0 +1,90 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+
+from core import cache_versions
+from core.templatetags.moldpark_extras import production_pipeline, system_stats
+from core.widget_cache import cached_widget, get_model_versions
+from producer.models import ProducerOrder
+
+from .factories import make_center, make_order, make_producer
+
+
+class CacheVersionTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_missing_version_is_initialized_once(self):
+        version = cache_versions.get_version('test:version')
+        self.assertIsNotNone(version)
+        self.assertEqual(cache_versions.get_version('test:version'), version)
+
+    def test_get_versions_reads_many_keys(self):
+        cache.set('test:a', 5, None)
+        versions = cache_versions.get_versions(['test:a', 'test:b'])
+        self.assertEqual(versions['test:a'], 5)
+        self.assertIsNotNone(versions['test:b'])
+
+    def test_bump_changes_version(self):
+        version = cache_versions.get_version('test:version')
+        cache_versions.bump_version('test:version')
+        self.assertEqual(cache_versions.get_version('test:version'), version + 1)
+
+    def test_bump_initializes_missing_version(self):
+        cache_versions.bump_version('test:missing')
+        self.assertIsNotNone(cache.get('test:missing'))
+
+
+class WidgetCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.center = make_center()
+        self.producer = make_producer()
+
+    def test_widget_result_is_cached_per_arguments(self):
+        calls = []
+
+        @cached_widget('test_widget', models=(ProducerOrder,))
+        def widget(limit=5):
+            calls.append(limit)
+            return {'limit': limit}
+
+        self.assertEqual(widget(limit=5), {'limit': 5})
+        self.assertEqual(widget(limit=5), {'limit': 5})
+        self.assertEqual(widget(limit=10), {'limit': 10})
+        self.assertEqual(calls, [5, 10])
+
+    def test_saving_a_model_invalidates_dependent_widgets(self):
+        make_order(self.producer, self.center, status='received')
+        with self.assertNumQueries(1):
+            counts = production_pipeline()
+        with self.assertNumQueries(0):
+            self.assertEqual(production_pipeline(), counts)
+
+        versions = get_model_versions(['producer.producerorder'])
+        with self.captureOnCommitCallbacks(execute=True):
+            make_order(self.producer, self.center, status='received')
+        self.assertNotEqual(get_model_versions(['producer.producerorder']), versions)
+
+        received = production_pipeline()['pipeline_stats'][0]
+        self.assertEqual(received['count'], 2)
+
+    def test_system_stats_follow_account_changes(self):
+        with self.assertNumQueries(3):
+            stats = system_stats()['stats']
+        self.assertEqual((stats['total_users'], stats['total_centers'], stats['total_producers']), (2, 1, 1))
+        self.assertEqual(stats['active_producers'], 1)
+
+        # Giriş kaydı (last_login) sayıları değiştirmez - önbellek korunur
+        with self.captureOnCommitCallbacks(execute=True):
+            self.center.user.save(update_fields=['last_login'])
+        with self.assertNumQueries(0):
+            system_stats()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.create_user('yeni', 'yeni@example.com', 'test-pass-123')
+            make_center('Yeni Merkez')
+        stats = system_stats()['stats']
+        self.assertEqual((stats['total_users'], stats['total_centers']), (4, 2))
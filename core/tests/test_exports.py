@@ -0,0 +1,105 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from core.exports import ExportError, build_queryset, get_dataset, select_columns
+from core.models import Invoice
+from producer.models import ProducerOrder
+
+from .factories import make_center, make_mold, make_order, make_producer
+
+
+def _aware(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+class ExportQuerysetTests(TestCase):
+    def setUp(self):
+        self.center = make_center()
+        self.producer = make_producer()
+        self.orders = []
+        for stamp in [(2025, 1, 1, 0, 0), (2025, 1, 1, 23, 59), (2025, 1, 2, 0, 0), (2024, 12, 31, 23, 59)]:
+            order = make_order(self.producer, self.center, make_mold(self.center))
+            ProducerOrder.objects.filter(pk=order.pk).update(created_at=_aware(*stamp))
+            self.orders.append(order)
+
+    def test_datetime_range_includes_whole_end_day(self):
+        queryset = build_queryset(get_dataset('orders'), '2025-01-01', '2025-01-01')
+
+        self.assertEqual(
+            set(queryset.values_list('pk', flat=True)),
+            {self.orders[0].pk, self.orders[1].pk},
+        )
+
+    def test_datetime_range_does_not_cast_column(self):
+        queryset = build_queryset(get_dataset('orders'), '2025-01-01', '2025-01-02')
+        sql = str(queryset.query).lower()
+
+        self.assertNotIn('django_datetime_cast_date', sql)
+        self.assertIn('"created_at" >=', sql)
+        self.assertIn('"created_at" <', sql)
+
+    def test_date_field_range_is_inclusive(self):
+        for day in (1, 2, 3):
+            Invoice.objects.create(
+                user=self.center.user, issued_by_center=self.center,
+                invoice_type='center_admin_invoice', invoice_number=f'I{day}',
+                issue_date=date(2025, 1, day), due_date=date(2025, 2, 1),
+            )
+
+        queryset = build_queryset(get_dataset('invoices'), '2025-01-02', '2025-01-03')
+
+        self.assertEqual(
+            sorted(queryset.values_list('invoice_number', flat=True)), ['I2', 'I3'],
+        )
+
+    def test_filters_and_errors(self):
+        dataset = get_dataset('orders')
+
+        queryset = build_queryset(dataset, filters={'producer': str(self.producer.pk), 'status': ''})
+        self.assertEqual(queryset.count(), 4)
+
+        with self.assertRaises(ExportError):
+            build_queryset(dataset, filters={'nope': '1'})
+        with self.assertRaises(ExportError):
+            build_queryset(dataset, filters={'center': 'abc'})
+        with self.assertRaises(ExportError):
+            build_queryset(dataset, start_date='2025-02-30')
+        with self.assertRaises(ExportError):
+            select_columns(dataset, ['nope'])
+        with self.assertRaises(ExportError):
+            get_dataset('nope')
+
+
+class ExportViewTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser('adm', 'adm@example.com', 'test-pass-123')
+        self.center = make_center()
+        for day in (1, 2, 3):
+            Invoice.objects.create(
+                user=self.center.user, issued_by_center=self.center,
+                invoice_type='center_admin_invoice', invoice_number=f'I{day}',
+                status='paid' if day > 1 else 'issued',
+                issue_date=date(2025, 1, day), due_date=date(2025, 2, 1),
+                total_amount=Decimal('10.50'),
+            )
+        self.client.force_login(self.admin)
+
+    def test_csv_stream_with_columns_and_filters(self):
+        response = self.client.get(
+            '/financial/export/invoices/?start_date=2025-01-02&status=paid'
+            '&columns=invoice_number,total_amount'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        lines = b''.join(response.streaming_content).decode('utf-8-sig').strip().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(sorted(line.split(',')[0] for line in lines[1:]), ['I2', 'I3'])
+
+    def test_invalid_requests(self):
+        self.assertEqual(self.client.get('/financial/export/invoices/?columns=nope').status_code, 400)
+        self.assertEqual(self.client.get('/financial/export/invoices/?end_date=2025-13-01').status_code, 400)
+        self.assertEqual(self.client.get('/financial/export/nope/').status_code, 404)
@@ -0,0 +1,143 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Sum
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.financial_report import CenterCollectionsReport, get_center_versions, invalidate_center
+from core.ledger_service import close_through
+from core.models import (
+    CenterLedgerSnapshot, Invoice, PricingConfiguration, PricingPlan, ProducerLedgerSnapshot,
+)
+from mold.models import EarMold
+from producer.earnings_service import month_bounds
+from producer.models import ProducerOrder
+
+from .factories import make_center, make_mold, make_network, make_order, make_producer
+
+
+class SpyReport(CenterCollectionsReport):
+    """Hangi merkezlerin yeniden hesaplandığını kaydeder"""
+
+    def compute_rows(self, centers):
+        self.computed.append(sorted(center.id for center in centers))
+        return super().compute_rows(centers)
+
+
+class FinancialReportTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        PricingPlan.objects.create(
+            name='Standart Abonelik', plan_type='standard', per_mold_price_try=450,
+            modeling_service_fee_try=19, monthly_fee_try=100,
+        )
+        self.pricing = PricingConfiguration.get_active()
+        self.centers = [make_center('Merkez A'), make_center('Merkez B')]
+        for center in self.centers:
+            make_mold(center, physical=True, status='completed')
+            make_mold(center, physical=False, status='delivered')
+            make_mold(center, physical=True, status='waiting')
+
+    def report(self):
+        now = timezone.now()
+        report = SpyReport('this_month', now - timedelta(days=1), now + timedelta(days=1), self.pricing)
+        report.computed = []
+        return report
+
+    def rows(self, report):
+        return {row['center'].id: row for row in report.build(self.centers)}
+
+    def test_rows_count_molds_with_plan_prices(self):
+        row = self.rows(self.report())[self.centers[0].id]
+
+        self.assertEqual(row['physical_count'], 1)
+        self.assertEqual(row['digital_count'], 1)
+        self.assertEqual(row['physical_amount'], Decimal('450'))
+        self.assertEqual(row['digital_amount'], Decimal('19'))
+
+    def test_rows_are_served_from_cache(self):
+        first = self.report()
+        self.rows(first)
+        self.assertEqual(first.computed, [sorted(center.id for center in self.centers)])
+
+        second = self.report()
+        with self.assertNumQueries(0):
+            self.rows(second)
+        self.assertEqual(second.computed, [])
+
+    def test_mold_change_recomputes_only_its_center(self):
+        self.rows(self.report())
+        with self.captureOnCommitCallbacks(execute=True):
+            make_mold(self.centers[1], physical=True, status='completed')
+
+        report = self.report()
+        rows = self.rows(report)
+        self.assertEqual(report.computed, [[self.centers[1].id]])
+        self.assertEqual(rows[self.centers[1].id]['physical_count'], 2)
+        self.assertEqual(rows[self.centers[0].id]['physical_count'], 1)
+
+    def test_invoice_saved_for_center_user_bumps_version(self):
+        center = self.centers[0]
+        before = get_center_versions([center.id])
+        today = timezone.localdate()
+        with self.captureOnCommitCallbacks(execute=True):
+            Invoice.objects.create(
+                user=center.user, invoice_type='center_admin_invoice', invoice_number='PKG-1',
+                issue_date=today, due_date=today, total_amount=Decimal('777.00'),
+            )
+        self.assertNotEqual(get_center_versions([center.id]), before)
+
+    def test_invalidate_ignores_empty_center(self):
+        invalidate_center(None)
+        before = get_center_versions([self.centers[0].id])
+        invalidate_center(self.centers[0].id)
+        self.assertEqual(
+            get_center_versions([self.centers[0].id])[self.centers[0].id],
+            before[self.centers[0].id] + 1,
+        )
+
+
+class ControlPanelClosedMonthTests(TestCase):
+    """Kapatılmış geçen ay - merkez ve üretici blokları aynı defterden"""
+
+    def setUp(self):
+        cache.clear()
+        PricingPlan.objects.create(
+            name='Standart Abonelik', plan_type='standard', per_mold_price_try=450,
+            modeling_service_fee_try=19, monthly_fee_try=100,
+        )
+        center, producer = make_center(), make_producer()
+        make_network(producer, center)
+        last_month = timezone.localdate().replace(day=1) - timedelta(days=1)
+        self.start, end = month_bounds(last_month.year, last_month.month)
+        # Biri ayın ilk günü, biri son günü - 28. gün sınırına takılmamalı
+        for created_at in (self.start + timedelta(hours=12), end - timedelta(hours=2)):
+            mold = make_mold(center, physical=True, status='completed')
+            order = make_order(producer, center, mold, price=Decimal('400.00'))
+            EarMold.objects.filter(pk=mold.pk).update(created_at=created_at)
+            ProducerOrder.objects.filter(pk=order.pk).update(created_at=created_at)
+        close_through(last_month.year, last_month.month)
+        admin = User.objects.create_superuser('yonetici', 'yonetici@example.com', 'test-pass-123')
+        self.client.force_login(admin)
+
+    def test_center_and_producer_totals_match_snapshot(self):
+        ProducerOrder.objects.update(price=Decimal('999.00'))
+
+        context = self.client.get(reverse('core:admin_financial_control_panel'), {'period': 'last_month'}).context
+
+        self.assertEqual(context['closed_period'].month, self.start.month)
+        self.assertEqual(
+            context['total_collections_from_centers'],
+            CenterLedgerSnapshot.objects.aggregate(total=Sum('gross_amount'))['total'],
+        )
+        producer_rows = ProducerLedgerSnapshot.objects.aggregate(gross=Sum('gross_revenue'), orders=Sum('total_orders'))
+        self.assertEqual(producer_rows['orders'], 2)
+        self.assertEqual(context['total_producer_gross_revenue'], producer_rows['gross'])
+        self.assertEqual(context['total_completed_producer_orders'], 2)
+        self.assertEqual(context['total_physical_molds'], 2)
+        self.assertEqual(sum(row['physical_count'] for row in context['centers_with_physical_molds']), 2)
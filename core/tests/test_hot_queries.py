@@ -0,0 +1,56 @@
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from core.hot_queries import HOT_QUERIES, explain_all
+
+
+class HotQueryTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        media_root = tempfile.mkdtemp()
+        try:
+            with override_settings(MEDIA_ROOT=media_root):
+                call_command('seed_scale', '--centers', '3', '--producers', '2', '--molds', '300',
+                             '--months', '3', stdout=StringIO())
+        finally:
+            shutil.rmtree(media_root, ignore_errors=True)
+
+    def test_expected_indexes_exist(self):
+        with connection.cursor() as cursor:
+            names = set()
+            for table in ('mold_earmold', 'producer_producerorder', 'core_invoice', 'core_simplenotification'):
+                names.update(connection.introspection.get_constraints(cursor, table))
+        for query in HOT_QUERIES:
+            self.assertIn(query.index, names, query.name)
+
+    def test_plans_use_expected_indexes(self):
+        results = explain_all()
+        self.assertEqual([result['name'] for result in results], [query.name for query in HOT_QUERIES])
+        for result in results:
+            self.assertTrue(result['uses_index'], f'{result["name"]}: {result["plan"]}')
+
+    def test_command_check_and_only(self):
+        out = StringIO()
+        call_command('explain_hot_queries', '--only', 'order_overdue', '--sql', '--check', stdout=out)
+        self.assertIn('order_overdue', out.getvalue())
+        self.assertIn('order_status_delivery_idx', out.getvalue())
+        self.assertNotIn('mold_status_counts', out.getvalue())
+
+    def test_check_raises_command_error_listing_missing_indexes(self):
+        results = [
+            {'name': name, 'description': '', 'index': 'idx', 'sql': '', 'plan': 'SCAN', 'uses_index': uses_index}
+            for name, uses_index in (('order_overdue', False), ('mold_status_counts', True), ('invoice_due', False))
+        ]
+        with mock.patch('core.management.commands.explain_hot_queries.explain_all', return_value=results):
+            with self.assertRaisesMessage(CommandError, 'order_overdue, invoice_due'):
+                call_command('explain_hot_queries', '--check', stdout=StringIO())
+            out = StringIO()
+            call_command('explain_hot_queries', stdout=out)
+        self.assertIn('order_overdue, invoice_due', out.getvalue())
@@ -0,0 +1,129 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core import keyset
+from core.keyset import decode_cursor, encode_cursor, grouped_counts, keyset_paginate, sum_counts
+from producer.models import ProducerOrder
+
+from .factories import make_center, make_network, make_order, make_producer
+
+
+class CursorTests(TestCase):
+
+    def test_round_trip(self):
+        created_at = timezone.now()
+        self.assertEqual(decode_cursor(encode_cursor(created_at, 42)), (created_at, 42))
+
+    def test_invalid_cursor_starts_from_beginning(self):
+        for token in ('', None, 'garbage', encode_cursor(timezone.now(), 1)[:-3] + '!!'):
+            self.assertIsNone(decode_cursor(token))
+
+
+class KeysetPaginateTests(TestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.producer = make_producer()
+        self.center = make_center()
+        now = timezone.now()
+        # Aynı zaman damgalı satırlar id ile ayrışır
+        for index in range(7):
+            order = make_order(self.producer, self.center, status='delivered' if index % 3 else 'received')
+            ProducerOrder.objects.filter(pk=order.pk).update(created_at=now - timedelta(minutes=index // 2))
+        self.queryset = ProducerOrder.objects.filter(producer=self.producer)
+        self.expected = list(self.queryset.order_by('-created_at', '-pk').values_list('pk', flat=True))
+
+    def page(self, query=''):
+        return keyset_paginate(self.factory.get('/list/?' + query), self.queryset, per_page=3)
+
+    def test_walk_forward_and_back(self):
+        seen, pages, page = [], [], self.page('status=all')
+        while True:
+            pages.append(page)
+            seen.extend(order.pk for order in page)
+            if not page.has_next:
+                break
+            self.assertIn('status=all', page.next_query)
+            page = self.page(page.next_query)
+
+        self.assertEqual(seen, self.expected)
+        self.assertEqual(len(pages), 3)
+        self.assertFalse(pages[0].has_previous)
+
+        back = self.page(pages[2].previous_query)
+        self.assertEqual([order.pk for order in back], [order.pk for order in pages[1]])
+        first = self.page(back.previous_query)
+        self.assertEqual([order.pk for order in first], self.expected[:3])
+        self.assertFalse(first.has_previous)
+        self.assertEqual(first.first_query, 'status=all')
+
+    def test_cursor_past_end_keeps_link_to_start(self):
+        last = ProducerOrder.objects.get(pk=self.expected[-1])
+        page = self.page('after=' + encode_cursor(last.created_at, last.pk))
+        self.assertFalse(page)
+        self.assertTrue(page.has_previous)
+        self.assertFalse(page.has_next)
+
+    def test_per_page_is_clamped(self):
+        request = self.factory.get('/list/', {'per_page': 1000})
+        self.assertEqual(len(keyset_paginate(request, self.queryset)), 7)
+        request = self.factory.get('/list/', {'per_page': 'x'})
+        self.assertEqual(len(keyset_paginate(request, self.queryset, per_page=2)), 2)
+
+
+class GroupedCountsTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        producer, center = make_producer(), make_center()
+        for status in ('received', 'received', 'delivered'):
+            make_order(producer, center, status=status)
+
+    def test_counts_in_one_query(self):
+        with self.assertNumQueries(1):
+            counts, approximate = grouped_counts(ProducerOrder.objects.all(), 'status')
+        self.assertEqual(counts, {'received': 2, 'delivered': 1})
+        self.assertFalse(approximate)
+        self.assertEqual(sum_counts(counts), 3)
+        self.assertEqual(sum_counts(counts, ['delivered', 'shipping']), 1)
+
+    def test_large_results_are_cached_as_approximate(self):
+        with mock.patch.object(keyset, 'LARGE_RESULT_THRESHOLD', 3):
+            grouped_counts(ProducerOrder.objects.all(), 'status', name='orders', params={'user': 1})
+            with self.assertNumQueries(0):
+                counts, approximate = grouped_counts(
+                    ProducerOrder.objects.all(), 'status', name='orders', params={'user': 1},
+                )
+        self.assertTrue(approximate)
+        self.assertEqual(counts['received'], 2)
+
+        _, approximate = grouped_counts(ProducerOrder.objects.all(), 'status', name='orders', params={'user': 2})
+        self.assertFalse(approximate)
+
+
+class KeysetListViewTests(TestCase):
+
+    def test_producer_mold_list_pages_every_order_once(self):
+        producer, center = make_producer(), make_center()
+        make_network(producer, center)
+        for _ in range(30):
+            make_order(producer, center)
+        self.client.force_login(producer.user)
+        url = reverse('producer:mold_list')
+
+        seen, response = [], self.client.get(url)
+        while True:
+            page = response.context['page']
+            seen.extend(order.pk for order in page)
+            if not page.has_next:
+                break
+            response = self.client.get(f'{url}?{page.next_query}')
+
+        self.assertEqual(sorted(seen), sorted(ProducerOrder.objects.values_list('pk', flat=True)))
+        self.assertEqual(len(set(seen)), 30)
+        self.assertEqual(response.context['total_orders'], 30)
@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.lead_time import compute_lead_times
+from producer.models import ProducerOrder
+
+from .factories import make_center, make_network, make_order, make_producer, make_user
+
+
+def deliver(order, days):
+    ProducerOrder.objects.filter(pk=order.pk).update(
+        status='delivered', actual_delivery=order.created_at + timedelta(days=days)
+    )
+
+
+class LeadTimeData:
+
+    def setUp(self):
+        cache.clear()
+        self.center = make_center()
+        self.fast = make_producer('Hizli')
+        self.slow = make_producer('Yavas')
+        for days in (1, 2, 3):
+            deliver(make_order(self.fast, self.center), days)
+        deliver(make_order(self.slow, self.center, priority='urgent'), 10)
+        make_order(self.slow, self.center)  # teslim edilmedi
+
+
+class LeadTimeStatsTests(LeadTimeData, TestCase):
+
+    def test_overall_and_grouped_statistics(self):
+        with self.assertNumQueries(1):
+            stats = compute_lead_times(timezone.now() - timedelta(days=30))
+        self.assertEqual(stats['overall']['count'], 4)
+        self.assertEqual(stats['overall']['mean'], 4.0)
+        self.assertEqual(stats['overall']['median'], 2.5)
+
+        by_producer = {row['name']: row for row in stats['by_producer']}
+        self.assertEqual(by_producer['Hizli']['count'], 3)
+        self.assertEqual(by_producer['Hizli']['median'], 2.0)
+        self.assertEqual(by_producer['Yavas']['mean'], 10.0)
+        self.assertEqual(
+            {row['priority']: row['count'] for row in stats['by_priority']},
+            {'normal': 3, 'urgent': 1},
+        )
+
+    def test_orders_outside_window_are_skipped(self):
+        ProducerOrder.objects.filter(producer=self.slow).update(created_at=timezone.now() - timedelta(days=60))
+        stats = compute_lead_times(timezone.now() - timedelta(days=30))
+        self.assertEqual([row['name'] for row in stats['by_producer']], ['Hizli'])
+
+
+class LeadTimeApiTests(LeadTimeData, TestCase):
+
+    def producer_names(self, user):
+        self.client.force_login(user)
+        response = self.client.get(reverse('core:lead_time_api'), {'days': 30})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['overall']['count'], 4)
+        return {row['name'] for row in data['by_producer']}
+
+    def test_staff_sees_every_producer(self):
+        self.assertEqual(self.producer_names(make_user('personel', is_staff=True)), {'Hizli', 'Yavas'})
+
+    def test_producer_sees_only_itself(self):
+        self.assertEqual(self.producer_names(self.fast.user), {'Hizli'})
+
+    def test_center_sees_only_its_active_network(self):
+        make_network(self.slow, self.center)
+        make_network(self.fast, self.center, status='terminated')
+        self.assertEqual(self.producer_names(self.center.user), {'Yavas'})
+
+    def test_other_users_see_no_producer_breakdown(self):
+        self.assertEqual(self.producer_names(make_user('ziyaretci')), set())
+
+    def test_invalid_days(self):
+        self.client.force_login(self.center.user)
+        self.assertEqual(self.client.get(reverse('core:lead_time_api'), {'days': 'x'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('core:lead_time_api'), {'days': 0}).status_code, 400)
@@ -0,0 +1,77 @@
+import shutil
+import socket
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core.load_test import (
+    CENTER_WEIGHTS, CenterUser, LoadStats, LoadTestDriver, LoadTestError, ProducerUser,
+    encode_multipart, parse_weights,
+)
+
+
+class LoadTestHelperTests(SimpleTestCase):
+
+    def test_parse_weights(self):
+        self.assertEqual(parse_weights('mold_create=5, mold_download=0.5,'), {'mold_create': 5.0, 'mold_download': 0.5})
+        with self.assertRaises(LoadTestError):
+            parse_weights('mold_create=çok')
+
+    def test_stats_report(self):
+        stats = LoadStats()
+        for elapsed in (0.010, 0.020, 0.030):
+            stats.record('center_dashboard', elapsed)
+        stats.record('mold_create', 0.100, error='HTTP 500')
+
+        report = stats.report()
+        dashboard = report['steps']['center_dashboard']
+        self.assertEqual((dashboard['requests'], dashboard['errors']), (3, 0))
+        self.assertEqual(dashboard['max_ms'], 30.0)
+        self.assertEqual(report['total']['requests'], 4)
+        self.assertEqual(report['total']['error_rate'], 0.25)
+        self.assertEqual(report['error_samples'], {'mold_create': 'HTTP 500'})
+
+    def test_encode_multipart(self):
+        body, content_type = encode_multipart({'patient_name': 'Ayşe'}, {'scan_file': ('scan.stl', b'solid')})
+        boundary = content_type.split('boundary=')[1]
+        self.assertTrue(content_type.startswith('multipart/form-data'))
+        self.assertIn('name="patient_name"\r\n\r\nAyşe'.encode(), body)
+        self.assertIn(b'filename="scan.stl"', body)
+        self.assertTrue(body.endswith(f'--{boundary}--\r\n'.encode()))
+
+
+class LoadTestDriverTests(TestCase):
+
+    def test_weight_overrides(self):
+        driver = LoadTestDriver('http://127.0.0.1:1/', weights={'mold_create': 0})
+        self.assertEqual(driver.base_url, 'http://127.0.0.1:1')
+        self.assertEqual(driver.center_weights['mold_create'], 0)
+        self.assertEqual(driver.center_weights['center_dashboard'], CENTER_WEIGHTS['center_dashboard'])
+        with self.assertRaises(LoadTestError):
+            LoadTestDriver('http://127.0.0.1:1', weights={'nope': 1})
+
+    def test_missing_dataset(self):
+        with self.assertRaises(LoadTestError):
+            LoadTestDriver('http://127.0.0.1:1', centers=1, producers=1).build_users()
+
+    def test_users_share_seeded_accounts(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        with override_settings(MEDIA_ROOT=media_root):
+            call_command('seed_scale', '--centers', '2', '--producers', '1', '--molds', '40', stdout=StringIO())
+
+        users = LoadTestDriver('http://127.0.0.1:1', centers=3, producers=2).build_users()
+
+        self.assertEqual(sum(isinstance(user, CenterUser) for user in users), 3)
+        self.assertEqual(sum(isinstance(user, ProducerUser) for user in users), 2)
+        self.assertTrue(all(user.orders for user in users if isinstance(user, ProducerUser)))
+
+    def test_unreachable_server(self):
+        # Boş bir port al; dinleyen olmadığı için bağlantı reddedilir
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+        with self.assertRaises(LoadTestError):
+            LoadTestDriver(f'http://127.0.0.1:{port}').check_server()
@@ -0,0 +1,127 @@
+from importlib import import_module
+
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from core.badge_counters import get_badge_counts
+from core.models import Message, MessageReceipt
+
+from .factories import make_center, make_producer
+
+
+backfill_migration = import_module('core.migrations.0034_backfill_broadcast_receipts')
+
+
+class MessageReceiptTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser('yonetici', 'yonetici@example.com', 'test-pass-123')
+        self.center = make_center()
+        self.user = self.center.user
+
+    def direct(self, **kwargs):
+        return Message.objects.create(
+            sender=self.admin, recipient=self.user, message_type='admin_to_center',
+            subject='Direkt', content='İçerik', **kwargs
+        )
+
+    def broadcast(self, to='center', sender=None):
+        return Message.objects.create(
+            sender=sender or self.admin, is_broadcast=True, subject='Duyuru', content='İçerik',
+            message_type=f'admin_to_{to}',
+            broadcast_to_centers=to == 'center', broadcast_to_producers=to == 'producer',
+        )
+
+    def inbox_stats(self, user):
+        self.client.force_login(user)
+        return self.client.get(reverse('core:message_list'), {'filter': 'sent'}).context['stats']
+
+    def test_inbox_counts_direct_and_visible_broadcasts(self):
+        self.direct(priority='urgent')
+        self.direct()
+        self.broadcast('center')
+        self.broadcast('producer')
+        stats = self.inbox_stats(self.user)
+        self.assertEqual(stats['total_received'], 3)
+        self.assertEqual(stats['unread_received'], 3)
+        self.assertEqual(stats['urgent_messages'], 1)
+
+    def test_visiting_inbox_marks_everything_read_in_bulk(self):
+        for _ in range(3):
+            self.direct()
+        broadcasts = [self.broadcast('center') for _ in range(3)]
+        self.assertEqual(get_badge_counts(self.user.pk)['unread_messages'], 3)
+
+        self.client.force_login(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.get(reverse('core:message_list'))
+        # Sayfa okundu işaretlenmeden önceki durumu gösterir
+        self.assertTrue(any(not message.user_is_read for message in response.context['messages']))
+
+        self.assertFalse(Message.objects.filter(recipient=self.user, is_read=False).exists())
+        self.assertEqual(
+            set(MessageReceipt.objects.filter(user=self.user).values_list('message_id', flat=True)),
+            {message.pk for message in broadcasts},
+        )
+        self.assertEqual(get_badge_counts(self.user.pk)['unread_messages'], 0)
+        self.assertEqual(self.inbox_stats(self.user)['unread_received'], 0)
+
+    def test_receipts_are_per_user(self):
+        other = make_center('Diger').user
+        message = self.broadcast('center')
+        MessageReceipt.mark_read(self.user, Message.objects.filter(pk=message.pk))
+        self.assertEqual(self.inbox_stats(self.user)['unread_received'], 0)
+        self.assertEqual(self.inbox_stats(other)['unread_received'], 1)
+
+    def test_broadcast_detail_records_receipt_only_when_visible(self):
+        visible = self.broadcast('center')
+        hidden = self.broadcast('producer')
+        self.client.force_login(self.user)
+        self.client.get(reverse('core:message_detail', args=[visible.pk]))
+        self.assertTrue(MessageReceipt.objects.filter(message=visible, user=self.user).exists())
+        self.client.post(reverse('core:message_mark_read', args=[hidden.pk]))
+        self.assertFalse(MessageReceipt.objects.filter(message=hidden).exists())
+
+    def test_own_broadcasts_are_not_unread_for_admin(self):
+        self.broadcast('center')
+        self.broadcast('producer', sender=User.objects.create_superuser('diger', 'd@example.com', 'x'))
+        stats = self.inbox_stats(self.admin)
+        self.assertEqual(stats['total_received'], 2)
+        self.assertEqual(stats['unread_received'], 1)
+
+        self.client.force_login(self.admin)
+        messages = self.client.get(reverse('core:message_list'), {'filter': 'all'}).context['messages']
+        own = next(message for message in messages if message.sender_id == self.admin.pk)
+        self.assertTrue(own.user_is_read)
+
+
+class BroadcastReceiptBackfillTests(TestCase):
+
+    def test_existing_broadcasts_stay_read_for_their_audience(self):
+        admin = User.objects.create_superuser('yonetici', 'yonetici@example.com', 'test-pass-123')
+        other_admin = User.objects.create_superuser('diger', 'diger@example.com', 'test-pass-123')
+        center_user = make_center().user
+        producer_user = make_producer().user
+        to_centers = Message.objects.create(
+            sender=admin, is_broadcast=True, broadcast_to_centers=True,
+            message_type='admin_to_center', subject='Merkezlere', content='İçerik',
+        )
+        to_producers = Message.objects.create(
+            sender=admin, is_broadcast=True, broadcast_to_producers=True,
+            message_type='admin_to_producer', subject='Üreticilere', content='İçerik',
+        )
+        MessageReceipt.objects.create(message=to_centers, user=center_user)
+
+        backfill_migration.backfill_broadcast_receipts(apps, None)
+
+        receipts = set(MessageReceipt.objects.values_list('message_id', 'user_id'))
+        self.assertEqual(receipts, {
+            (to_centers.pk, center_user.pk), (to_centers.pk, other_admin.pk),
+            (to_producers.pk, producer_user.pk), (to_producers.pk, other_admin.pk),
+        })
+        for user in (center_user, producer_user, other_admin):
+            self.assertFalse(Message.objects.filter(Message.received_filter(user) & Message.unread_filter(user)).exists())
@@ -0,0 +1,67 @@
+import re
+
+from django.core.cache import cache
+from django.test import TestCase, modify_settings, override_settings
+from django.urls import reverse
+
+from core.metrics import install_template_timer
+
+from .factories import make_center, make_user
+
+
+@override_settings(METRICS_ENABLED=True, METRICS_TOKEN='scrape-token')
+@modify_settings(MIDDLEWARE={'prepend': 'core.metrics.MetricsMiddleware'})
+class MetricsViewTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        install_template_timer()
+
+    def test_requests_through_local_proxy_are_rejected(self):
+        # nginx arkasında tüm istekler 127.0.0.1'den gelir
+        response = self.client.get('/metrics', REMOTE_ADDR='127.0.0.1')
+        self.assertEqual(response.status_code, 403)
+
+    def test_non_staff_user_is_rejected(self):
+        self.client.force_login(make_center().user)
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+
+    def test_wrong_token_is_rejected(self):
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong')
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(METRICS_TOKEN='')
+    def test_empty_token_setting_never_matches(self):
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer ')
+        self.assertEqual(response.status_code, 403)
+
+    def test_staff_user_can_read_metrics(self):
+        self.client.force_login(make_user('staff', is_staff=True))
+        self.assertEqual(self.client.get('/metrics').status_code, 200)
+
+    def test_request_metrics_are_labelled_by_view_name(self):
+        center = make_center()
+        self.client.force_login(center.user)
+        self.assertEqual(self.client.get(reverse('center:dashboard')).status_code, 200)
+        cache.set('metrics-test', 1)
+        cache.get('metrics-test')
+        self.client.logout()
+
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer scrape-token')
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('moldpark_request_latency_seconds_count{method="GET",view="center:dashboard"}', body)
+        self.assertIn('moldpark_request_template_seconds_count{view="center:dashboard"}', body)
+        queries = re.search(r'moldpark_request_db_queries_sum\{view="center:dashboard"\} (\S+)', body)
+        self.assertGreater(float(queries.group(1)), 0)
+        self.assertIn('moldpark_cache_requests_total{result="hit"}', body)
+        self.assertNotIn('view="metrics"', body)
+
+
+class MetricsDisabledTests(TestCase):
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_endpoint_is_hidden_when_disabled(self):
+        self.client.force_login(make_user('staff', is_staff=True))
+        self.assertEqual(self.client.get('/metrics').status_code, 404)
@@ -0,0 +1,184 @@
+import os
+import shutil
+import tempfile
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.models import PricingPlan, SimpleNotification, UsageLedgerEntry, UserSubscription
+from core.order_intake import IntakeError, check_intake, create_mold_order
+from mold.forms import EarMoldForm
+from mold.models import EarMold
+from producer.models import ProducerNetwork, ProducerOrder
+
+from .factories import make_center, make_network, make_producer
+
+
+ORDER_DATA = {
+    'order_type': 'physical', 'patient_name': 'Ayşe', 'patient_surname': 'Işık', 'patient_age': 40,
+    'patient_gender': 'F', 'ear_side': 'right', 'mold_type': 'full', 'vent_diameter': 1.0,
+    'priority': 'high', 'notes': '', 'special_instructions': 'Dikkat',
+}
+
+
+class OrderIntakeData:
+
+    def setUp(self):
+        cache.clear()
+        self.center = make_center()
+        self.producer = make_producer()
+        make_network(self.producer, self.center)
+        self.plan = PricingPlan.objects.create(
+            name='Standart Abonelik', plan_type='standard', description='Standart',
+            monthly_fee_try=100, per_mold_price_try=450, modeling_service_fee_try=19,
+        )
+        self.subscription = UserSubscription.objects.create(user=self.center.user, plan=self.plan, status='active')
+
+    def unsaved_mold(self, **data):
+        form = EarMoldForm({**ORDER_DATA, **data}, user=self.center.user)
+        self.assertTrue(form.is_valid(), form.errors)
+        return form.save(commit=False)
+
+
+class CreateMoldOrderTests(OrderIntakeData, TestCase):
+
+    def test_creates_mold_order_and_usage_together(self):
+        User.objects.create_superuser('yonetici', 'yonetici@example.com', 'test-pass-123')
+        with self.captureOnCommitCallbacks(execute=True):
+            intake = create_mold_order(self.center, self.unsaved_mold())
+
+        mold = EarMold.objects.get()
+        self.assertEqual(mold.status, 'processing')
+        self.assertEqual(mold.unit_price, Decimal('450.00'))
+        order = ProducerOrder.objects.get()
+        self.assertEqual((order.ear_mold, order.producer, order.priority), (mold, self.producer, 'high'))
+        self.assertEqual(order.price, Decimal('450.00'))
+        self.assertEqual(order.producer_notes, 'Dikkat')
+        self.assertEqual(UsageLedgerEntry.objects.get().ear_mold, mold)
+        self.assertEqual(intake.usage.total_cost, Decimal('450.00'))
+        self.subscription.refresh_from_db()
+        self.assertEqual(self.subscription.models_used_this_month, 1)
+        # Üretici, merkez ve yönetici
+        self.assertEqual(SimpleNotification.objects.count(), 3)
+
+    def test_failure_rolls_back_every_write(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with mock.patch.object(ProducerOrder, 'save', side_effect=RuntimeError('kayıt hatası')):
+                with self.assertRaises(RuntimeError):
+                    create_mold_order(self.center, self.unsaved_mold())
+        self.assertFalse(EarMold.objects.exists())
+        self.assertFalse(UsageLedgerEntry.objects.exists())
+        self.subscription.refresh_from_db()
+        self.assertEqual(self.subscription.models_used_this_month, 0)
+        self.assertFalse(SimpleNotification.objects.exists())
+
+    def test_notify_false_sends_nothing(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            create_mold_order(self.center, self.unsaved_mold(), notify=False)
+        self.assertFalse(SimpleNotification.objects.exists())
+
+    def test_intake_errors(self):
+        ProducerNetwork.objects.update(status='suspended')
+        with self.assertRaises(IntakeError) as error:
+            check_intake(self.center)
+        self.assertEqual(error.exception.code, 'no_network')
+
+        self.subscription.delete()
+        with self.assertRaises(IntakeError) as error:
+            check_intake(self.center)
+        self.assertEqual(error.exception.code, 'no_subscription')
+
+
+class MoldCreateViewTests(OrderIntakeData, TestCase):
+
+    def test_form_creates_order(self):
+        self.client.force_login(self.center.user)
+        response = self.client.post(reverse('mold:mold_create'), ORDER_DATA)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(ProducerOrder.objects.get().ear_mold, EarMold.objects.get())
+
+    def test_api_creates_order(self):
+        self.client.force_login(self.center.user)
+        response = self.client.post(reverse('mold:mold_create_api'), ORDER_DATA, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual(data['order_number'], ProducerOrder.objects.get().order_number)
+        self.assertEqual(data['total_cost'], '450.00')
+
+    def test_api_validation_and_intake_errors(self):
+        self.client.force_login(self.center.user)
+        url = reverse('mold:mold_create_api')
+        response = self.client.post(url, {**ORDER_DATA, 'order_type': 'digital'}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('scan_file', response.json()['errors'])
+
+        self.subscription.delete()
+        response = self.client.post(url, ORDER_DATA, content_type='application/json')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['code'], 'no_subscription')
+
+    def test_api_rejects_non_center_accounts(self):
+        self.client.force_login(self.producer.user)
+        response = self.client.post(reverse('mold:mold_create_api'), ORDER_DATA, content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+
+
+class ImportMoldsCommandTests(OrderIntakeData, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        media = override_settings(MEDIA_ROOT=os.path.join(self.directory, 'media'))
+        media.enable()
+        self.addCleanup(media.disable)
+
+    def run_import(self, *lines):
+        path = os.path.join(self.directory, 'siparisler.csv')
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write('\n'.join(lines) + '\n')
+        stdout, stderr = StringIO(), StringIO()
+        call_command('import_molds', path, '--center', self.center.user.username, '--no-notify',
+                     stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_rows_are_imported_independently(self):
+        with open(os.path.join(self.directory, 'tarama.stl'), 'wb') as handle:
+            handle.write(b'solid tarama\nendsolid tarama\n')
+        stdout, stderr = self.run_import(
+            'patient_name,patient_surname,patient_age,patient_gender,ear_side,mold_type,vent_diameter,scan_file',
+            'Ali,Veli,30,M,left,full,1.0,',
+            'Can,Öz,31,M,left,full,1.0,tarama.stl',
+            'Hatalı,Satır,abc,M,left,full,1.0,',
+        )
+        self.assertEqual(EarMold.objects.count(), 2)
+        self.assertEqual(EarMold.objects.filter(is_physical_shipment=False).count(), 1)
+        self.assertIn('Satır 4', stderr)
+        self.assertIn('patient_age', stderr)
+        self.assertIn('2 sipariş oluşturuldu, 1 satır hatalı', stdout)
+
+    def test_blank_order_type_and_priority_use_defaults(self):
+        _, stderr = self.run_import(
+            'patient_name,patient_surname,patient_age,patient_gender,ear_side,mold_type,vent_diameter,order_type,priority',
+            'Ali,Veli,30,M,left,full,1.0,,',
+        )
+        self.assertEqual(stderr, '')
+        mold = EarMold.objects.get()
+        self.assertTrue(mold.is_physical_shipment)
+        self.assertEqual(mold.priority, 'normal')
+
+    def test_dry_run_writes_nothing(self):
+        path = os.path.join(self.directory, 'siparisler.csv')
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write('patient_name,patient_surname,patient_age,patient_gender,ear_side,mold_type,vent_diameter\n')
+            handle.write('Ali,Veli,30,M,left,full,1.0\n')
+        stdout = StringIO()
+        call_command('import_molds', path, '--center', str(self.center.pk), '--dry-run', stdout=stdout)
+        self.assertIn('1 sipariş doğrulandı', stdout.getvalue())
+        self.assertFalse(EarMold.objects.exists())
@@ -0,0 +1,65 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+
+from core import cache_versions, pricing_cache
+from core.context_processors import pricing_config
+from core.models import PricingConfiguration
+
+
+class PricingCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        pricing_cache.invalidate()
+        self.pricing = PricingConfiguration.get_active()
+
+    def tearDown(self):
+        # Süreç belleğindeki kopya geri alınan kayıtları göstermesin
+        pricing_cache.invalidate()
+
+    def test_active_pricing_is_read_from_process_memory(self):
+        request = RequestFactory().get('/')
+        with self.assertNumQueries(0):
+            for _ in range(3):
+                context = pricing_config(request)
+        self.assertEqual(context['pricing'].pk, self.pricing.pk)
+        self.assertIsInstance(context['pricing'].vat_rate, Decimal)
+
+    def test_version_bump_from_another_worker_reloads(self):
+        PricingConfiguration.objects.filter(pk=self.pricing.pk).update(physical_mold_price=Decimal('500'))
+        self.assertNotEqual(PricingConfiguration.get_active().physical_mold_price, Decimal('500'))
+
+        cache_versions.bump_version(pricing_cache.VERSION_KEY)
+        self.assertEqual(PricingConfiguration.get_active().physical_mold_price, Decimal('500'))
+
+    def test_saving_pricing_refreshes_copy_and_summary(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            new = PricingConfiguration.objects.create(
+                name='Yeni', is_active=True, physical_mold_price=Decimal('600'),
+            )
+
+        self.assertEqual(PricingConfiguration.get_active().pk, new.pk)
+        self.assertEqual(pricing_cache.get_pricing_summary()['physical']['with_vat'], Decimal('600'))
+
+    def test_callers_get_a_copy(self):
+        PricingConfiguration.get_active().name = 'Degisti'
+        pricing_cache.get_pricing_summary()['physical']['with_vat'] = Decimal('1')
+
+        self.assertEqual(PricingConfiguration.get_active().name, self.pricing.name)
+        self.assertNotEqual(pricing_cache.get_pricing_summary()['physical']['with_vat'], Decimal('1'))
+
+    def test_admin_activate_action_invalidates(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            PricingConfiguration.objects.create(name='Yeni', is_active=True)
+        admin = User.objects.create_superuser('yonetici', 'yonetici@example.com', 'test-pass-123')
+        self.client.force_login(admin)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/django-admin/core/pricingconfiguration/', {
+                'action': 'activate_pricing', '_selected_action': [self.pricing.pk],
+            })
+
+        self.assertEqual(PricingConfiguration.get_active().pk, self.pricing.pk)
@@ -0,0 +1,76 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, modify_settings, override_settings
+from django.urls import reverse
+
+from core.query_profiler import QueryRecorder, fingerprint
+
+from .factories import make_center, make_mold
+
+
+class FingerprintTests(TestCase):
+
+    def test_parameters_and_in_lists_are_normalized(self):
+        first = fingerprint('SELECT * FROM x WHERE id IN (%s, %s) AND y = 5')
+        second = fingerprint("SELECT *  FROM x WHERE id IN (%s) AND y = 7")
+        self.assertEqual(first, second)
+        self.assertIn('IN (...)', first[1])
+
+    def test_different_queries_differ(self):
+        self.assertNotEqual(fingerprint('SELECT a FROM x')[0], fingerprint('SELECT b FROM x')[0])
+
+    def test_recorder_reports_duplicates_with_call_site(self):
+        recorder = QueryRecorder()
+        center = make_center()
+        with connection.execute_wrapper(recorder):
+            for _ in range(3):
+                list(center.molds.all())
+
+        duplicates = recorder.duplicates(threshold=3)
+        self.assertEqual(recorder.count, 3)
+        self.assertEqual(len(duplicates), 1)
+        self.assertEqual(duplicates[0]['count'], 3)
+        self.assertTrue(duplicates[0]['sites'][0].startswith(os.path.join('core', 'tests')))
+        self.assertEqual(recorder.duplicates(threshold=4), [])
+
+
+@modify_settings(MIDDLEWARE={'prepend': 'core.query_profiler.QueryProfilerMiddleware'})
+class ProfilerMiddlewareTests(TestCase):
+
+    def setUp(self):
+        self.center = make_center()
+        for _ in range(3):
+            make_mold(self.center)
+        self.client.force_login(self.center.user)
+
+    @override_settings(QUERY_PROFILER_SAMPLE_RATE=1.0, QUERY_PROFILER_DUPLICATE_THRESHOLD=2)
+    def test_sampled_request_is_logged_and_reported(self):
+        with self.assertLogs('moldpark.query_profile', 'INFO') as logs:
+            self.client.get(reverse('center:dashboard'))
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['view'], 'center:dashboard')
+        self.assertEqual(record['status'], 200)
+        self.assertGreater(record['queries'], 0)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'query_profile.log')
+            with open(path, 'w') as log_file:
+                log_file.write(logs.records[0].getMessage() + '\n')
+            out = StringIO()
+            call_command('perf_report', '--log', path, stdout=out)
+        self.assertIn('center:dashboard', out.getvalue())
+
+    @override_settings(QUERY_PROFILER_SAMPLE_RATE=0.0)
+    def test_unsampled_request_is_not_logged(self):
+        with self.assertNoLogs('moldpark.query_profile', 'INFO'):
+            self.client.get(reverse('center:dashboard'))
+
+    def test_report_without_log_fails(self):
+        with self.assertRaises(CommandError):
+            call_command('perf_report', '--log', os.path.join(tempfile.gettempdir(), 'yok.log'))
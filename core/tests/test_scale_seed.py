@@ -0,0 +1,61 @@
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from center.models import Center
+from core.models import CargoShipment, Invoice, SearchDocument
+from mold.models import EarMold, ModeledMold
+from producer.models import ProducerOrder, ProducerRatingStats
+
+
+class SeedScaleTests(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+
+    def seed(self, *args):
+        out = StringIO()
+        with override_settings(MEDIA_ROOT=self.media_root):
+            call_command('seed_scale', *args, stdout=out)
+        return out.getvalue()
+
+    def test_seeded_data_spans_months_and_related_tables(self):
+        output = self.seed('--centers', '4', '--producers', '2', '--molds', '300', '--months', '6',
+                           '--chunk-size', '100')
+
+        self.assertIn('tamamlandı', output)
+        self.assertEqual(EarMold.objects.count(), 300)
+        self.assertEqual(Center.objects.count(), 4)
+        self.assertTrue(ProducerOrder.objects.filter(status='delivered', actual_delivery__isnull=False).exists())
+        self.assertTrue(ModeledMold.objects.exists())
+        self.assertTrue(Invoice.objects.exists())
+        self.assertTrue(CargoShipment.objects.exists())
+        self.assertTrue(SearchDocument.objects.exists())
+        self.assertTrue(ProducerRatingStats.objects.filter(evaluation_count__gt=0).exists())
+
+        oldest = EarMold.objects.order_by('created_at').values_list('created_at', flat=True).first()
+        self.assertGreater((timezone.now() - oldest).days, 120)
+
+        self.client.force_login(Center.objects.order_by('pk').first().user)
+        self.assertEqual(self.client.get(reverse('center:dashboard')).status_code, 200)
+
+    def test_existing_prefix_requires_flush(self):
+        self.seed('--centers', '2', '--producers', '1', '--molds', '20')
+
+        with self.assertRaises(CommandError):
+            self.seed('--molds', '1')
+
+        self.seed('--centers', '1', '--producers', '1', '--molds', '10', '--flush')
+        self.assertEqual(EarMold.objects.count(), 10)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(CommandError):
+            self.seed('--centers', '0')
+        with self.assertRaises(CommandError):
+            self.seed('--molds', '-1')
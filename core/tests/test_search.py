@@ -0,0 +1,131 @@
+from importlib import import_module
+
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from core import search
+from core.models import Message, SearchDocument
+from producer.models import ProducerOrder
+
+from .factories import make_center, make_mold, make_network, make_order, make_producer
+
+
+backfill_migration = import_module('core.migrations.0033_backfill_search_documents')
+
+
+class NormalizeTests(TestCase):
+
+    def test_turkish_letters_are_folded(self):
+        self.assertEqual(search.normalize('IŞIK İstanbul ğüç'), 'isik istanbul guc')
+        self.assertEqual(search.normalize('Işık'), search.normalize('isik'))
+        self.assertEqual(search.normalize('IŞIK'), search.normalize('ışık'))
+
+    def test_punctuation_is_dropped(self):
+        self.assertEqual(search.normalize('PRD-1A2B, (Ayşe)'), 'prd 1a2b ayse')
+        self.assertEqual(search.normalize(None), '')
+
+    def test_query_terms_are_limited(self):
+        self.assertEqual(search.parse_query('  '), [])
+        self.assertEqual(len(search.parse_query(' '.join('abcdefghijk'))), search.MAX_TERMS)
+
+
+class SearchIndexTests(TestCase):
+
+    def setUp(self):
+        self.center = make_center('Işıklar Merkez')
+        self.producer = make_producer()
+        make_network(self.producer, self.center)
+        self.mold = make_mold(self.center, patient_name='Şükrü', patient_surname='Güneşoğlu')
+        self.order = make_order(self.producer, self.center, self.mold)
+        self.other_order = make_order(self.producer, self.center)
+
+    def test_search_matches_folded_prefixes(self):
+        hits = search.search('sukru gunes')
+        self.assertEqual({(hit.kind, hit.object_id) for hit in hits}, {
+            ('mold', self.mold.pk), ('order', self.order.pk),
+        })
+        self.assertEqual(search.search('IŞIKLAR', kinds=['center'])[0].object_id, self.center.pk)
+
+    def test_search_filter_keeps_queryset(self):
+        orders = ProducerOrder.objects.filter(search.search_filter('şükrü', 'order'))
+        self.assertEqual(list(orders), [self.order])
+        orders = ProducerOrder.objects.filter(search.search_filter(self.other_order.order_number, 'order'))
+        self.assertEqual(list(orders), [self.other_order])
+        self.assertEqual(search.search_filter('', 'order'), search.Q())
+
+    def test_center_rename_reindexes_dependent_documents(self):
+        self.center.name = 'Yeni Ad'
+        self.center.save()
+        self.assertEqual(len(search.search('yeni', kinds=['order'])), 2)
+        self.assertEqual(search.search('isiklar', kinds=['order', 'mold']), [])
+
+    def test_deleted_records_leave_the_index(self):
+        self.mold.delete()
+        self.assertEqual(search.search('sukru'), [])
+
+    def test_rebuild_index_matches_incremental_index(self):
+        documents = set(SearchDocument.objects.values_list('kind', 'object_id', 'title', 'body'))
+        search.rebuild_index()
+        self.assertEqual(set(SearchDocument.objects.values_list('kind', 'object_id', 'title', 'body')), documents)
+
+
+class SearchBackfillMigrationTests(TestCase):
+
+    def setUp(self):
+        admin = User.objects.create_superuser('yonetici', 'yonetici@example.com', 'test-pass-123')
+        center = make_center('Çarşı Merkez')
+        producer = make_producer()
+        make_order(producer, center, make_mold(center, patient_name='Ömer'))
+        Message.objects.create(
+            sender=admin, recipient=center.user, message_type='admin_to_center',
+            subject='Kargo gecikmesi', content='Çarşamba teslim',
+        )
+
+    def test_backfill_fills_documents_for_existing_rows(self):
+        expected = set(SearchDocument.objects.values_list('kind', 'object_id', 'title', 'body'))
+        self.assertEqual({kind for kind, *_ in expected}, set(search.SOURCES))
+        # Migration öncesi durum: kayıtlar var, belge tablosu boş
+        SearchDocument.objects.all().delete()
+        self.assertEqual(search.search('omer'), [])
+
+        backfill_migration.backfill_search_documents(apps, None)
+
+        self.assertEqual(set(SearchDocument.objects.values_list('kind', 'object_id', 'title', 'body')), expected)
+        self.assertEqual({hit.kind for hit in search.search('omer')}, {'mold', 'order'})
+        self.assertEqual(len(search.search('carsamba', kinds=['message'])), 1)
+
+    def test_backfill_keeps_documents_indexed_on_save(self):
+        SearchDocument.objects.filter(kind='center').update(title='Güncel')
+        backfill_migration.backfill_search_documents(apps, None)
+        self.assertEqual(SearchDocument.objects.get(kind='center').title, 'Güncel')
+
+
+class SearchViewTests(TestCase):
+
+    def setUp(self):
+        self.center = make_center()
+        self.producer = make_producer()
+        make_network(self.producer, self.center)
+        self.order = make_order(self.producer, self.center, make_mold(self.center, patient_name='Şükrü'))
+        make_order(self.producer, self.center)
+
+    def test_producer_order_list_search(self):
+        self.client.force_login(self.producer.user)
+        response = self.client.get(reverse('producer:order_list'), {'search': 'sukru'})
+        self.assertEqual(list(response.context['orders']), [self.order])
+        response = self.client.get(reverse('producer:mold_list'), {'search': 'ŞÜKRÜ'})
+        self.assertEqual(list(response.context['producer_orders']), [self.order])
+
+    def test_message_list_search(self):
+        admin = User.objects.create_superuser('yonetici', 'yonetici@example.com', 'test-pass-123')
+        Message.objects.create(
+            sender=admin, recipient=self.center.user, message_type='admin_to_center',
+            subject='Kargo gecikmesi', content='Çarşamba teslim',
+        )
+        self.client.force_login(self.center.user)
+        response = self.client.get(reverse('core:message_list'), {'search': 'carsamba'})
+        self.assertEqual(len(response.context['messages']), 1)
+        response = self.client.get(reverse('core:message_list'), {'search': 'persembe'})
+        self.assertEqual(len(response.context['messages']), 0)
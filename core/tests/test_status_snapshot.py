@@ -0,0 +1,89 @@
+import threading
+import time
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+
+from core import status_snapshot
+from core.status_snapshot import LOCK_KEY, SNAPSHOT_KEY, get_snapshot
+
+
+class SnapshotTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.calls = []
+
+    def builder(self, delay=0):
+        def build():
+            self.calls.append(1)
+            time.sleep(delay)
+            return {'value': len(self.calls)}
+        return build
+
+    def test_fresh_snapshot_is_reused(self):
+        first = get_snapshot('test', self.builder())
+        self.assertEqual(get_snapshot('test', self.builder()), first)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_concurrent_requests_build_once(self):
+        results = []
+        builder = self.builder(delay=0.2)
+        threads = [threading.Thread(target=lambda: results.append(get_snapshot('test', builder))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(len({result['etag'] for result in results}), 1)
+
+    def test_stale_snapshot_served_while_locked(self):
+        stale = get_snapshot('test', self.builder())
+        cache.add(LOCK_KEY.format('test'), 1)
+        with mock.patch.object(status_snapshot.time, 'time', return_value=time.time() + 100):
+            self.assertEqual(get_snapshot('test', self.builder()), stale)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_expired_snapshot_is_rebuilt(self):
+        get_snapshot('test', self.builder())
+        with mock.patch.object(status_snapshot.time, 'time', return_value=time.time() + 100):
+            snapshot = get_snapshot('test', self.builder())
+        self.assertEqual(len(self.calls), 2)
+        self.assertIn('2', snapshot['content'])
+
+
+class SnapshotApiTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(User.objects.create_superuser('yonetici', 'yonetici@example.com', 'test-pass-123'))
+
+    def test_status_api_uses_etag_and_cache_control(self):
+        response = self.client.get('/api/system-status/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('users', response.json())
+        self.assertIn('private', response['Cache-Control'])
+        self.assertIn('max-age', response['Cache-Control'])
+
+        # Sadece oturum ve kullanıcı sorguları
+        with self.assertNumQueries(2):
+            again = self.client.get('/api/system-status/')
+        self.assertEqual(again['ETag'], response['ETag'])
+        self.assertEqual(
+            self.client.get('/api/system-status/', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304,
+        )
+
+    def test_health_and_insights_support_conditional_requests(self):
+        for url in ('/api/system-health/', '/api/performance-insights/'):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+    def test_refresh_command_stores_snapshots(self):
+        call_command('refresh_status_snapshots', stdout=StringIO())
+        self.assertIsNotNone(cache.get(SNAPSHOT_KEY.format('system_status')))
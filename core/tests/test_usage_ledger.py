@@ -0,0 +1,103 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import PricingPlan, UsageLedgerEntry, UserSubscription
+from core.usage_ledger import current_month_total, monthly_usage, record_mold_usage, with_current_month
+
+from .factories import make_center, make_mold
+
+
+class UsageLedgerTests(TestCase):
+
+    def setUp(self):
+        self.center = make_center()
+        self.plan = PricingPlan.objects.create(
+            name='Standart Abonelik', plan_type='standard', per_mold_price_try=450,
+            modeling_service_fee_try=19, monthly_fee_try=100,
+        )
+        self.subscription = UserSubscription.objects.create(user=self.center.user, plan=self.plan, status='active')
+
+    def age_counters(self):
+        UserSubscription.objects.filter(pk=self.subscription.pk).update(
+            last_reset_date=timezone.now() - timedelta(days=40),
+        )
+        self.subscription.refresh_from_db()
+
+    def test_record_updates_counters_and_ledger(self):
+        physical = record_mold_usage(self.subscription, make_mold(self.center, physical=True))
+        digital = record_mold_usage(self.subscription, make_mold(self.center, physical=False))
+
+        self.assertEqual((physical.kind, physical.physical_cost), ('physical', Decimal('450')))
+        self.assertEqual((digital.kind, digital.digital_cost), ('digital', Decimal('19')))
+        self.subscription.refresh_from_db()
+        self.assertEqual(self.subscription.models_used_this_month, 1)
+        self.assertEqual(self.subscription.digital_scans_this_month, 1)
+        self.assertEqual(self.subscription.total_mold_cost_this_month, Decimal('469'))
+        self.assertEqual(self.subscription.models_used_total, 2)
+        self.assertEqual(monthly_usage(self.subscription)['mold_cost'], Decimal('469'))
+        self.assertEqual(current_month_total(self.subscription), Decimal('569'))
+
+    def test_entries_are_append_only(self):
+        entry = record_mold_usage(self.subscription, make_mold(self.center))
+        entry.total_cost = Decimal('1')
+        with self.assertRaises(ValidationError):
+            entry.save()
+
+    def test_package_credits_are_spent_once(self):
+        package = PricingPlan.objects.create(name='Paket', plan_type='package', price_try=1000, monthly_fee_try=0)
+        self.subscription.plan = package
+        self.subscription.package_credits = 2
+        self.subscription.save()
+
+        costs = [record_mold_usage(self.subscription, make_mold(self.center)).total_cost for _ in range(3)]
+
+        self.assertEqual(costs[:2], [Decimal('0'), Decimal('0')])
+        self.assertEqual(costs[2], Decimal(str(package.per_mold_price_try)))
+        self.subscription.refresh_from_db()
+        self.assertEqual(self.subscription.used_credits, 2)
+        self.assertEqual(monthly_usage(self.subscription)['used_credits'], 2)
+
+    def test_new_month_resets_counters_but_not_credits(self):
+        self.subscription.package_credits = 5
+        self.subscription.used_credits = 2
+        self.subscription.save()
+        record_mold_usage(self.subscription, make_mold(self.center))
+        self.age_counters()
+
+        record_mold_usage(self.subscription, make_mold(self.center))
+
+        self.subscription.refresh_from_db()
+        self.assertEqual(self.subscription.models_used_this_month, 1)
+        self.assertEqual(self.subscription.used_credits, 2)
+
+    def test_reads_derive_month_from_ledger(self):
+        record_mold_usage(self.subscription, make_mold(self.center))
+        next_month = timezone.now() + timedelta(days=32)
+
+        subscription = with_current_month(UserSubscription.objects.get(pk=self.subscription.pk), next_month)
+
+        self.assertEqual(subscription.models_used_this_month, 0)
+        self.assertEqual(subscription.total_mold_cost_this_month, Decimal('0'))
+
+    def test_pages_do_not_write_subscription(self):
+        record_mold_usage(self.subscription, make_mold(self.center))
+        self.age_counters()
+        self.client.force_login(self.center.user)
+
+        for name in ('core:subscription_dashboard', 'center:dashboard', 'center:my_usage'):
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(reverse(name))
+            writes = [
+                query['sql'] for query in queries
+                if query['sql'].split()[0] in ('UPDATE', 'INSERT', 'DELETE') and 'subscription' in query['sql']
+            ]
+            self.assertEqual(writes, [], name)
+        self.assertEqual(UserSubscription.objects.get(pk=self.subscription.pk).models_used_this_month, 1)
+        self.assertEqual(UsageLedgerEntry.objects.count(), 1)
@@ -30,6 +30,7 @@ urlpatterns = [
     
     # Admin Dashboard
     path('admin-dashboard/', views.admin_dashboard, name='admin_dashboard'),
+    path('admin/search/', views.admin_global_search, name='admin_global_search'),
     
     # Test sayfası
     path('test-language/', views.test_language, name='test_language'),
@@ -59,6 +60,7 @@ urlpatterns = [
     path('api/smart-notifications-status/', api.smart_notifications_status_api, name='smart_notifications_status_api'),
     path('api/trigger-smart-notifications/', api.trigger_smart_notifications_api, name='trigger_smart_notifications_api'),
     path('api/performance-insights/', api.performance_insights_api, name='performance_insights_api'),
+    path('api/lead-time/', api.lead_time_api, name='lead_time_api'),
     
     # Basit Bildirim Sistemi
     path('notifications/', views.simple_notifications, name='simple_notifications'),
@@ -83,6 +85,7 @@ urlpatterns = [
     path('financial/generate-summary/', views_financial.generate_monthly_summary, name='generate_monthly_summary'),
     path('financial/reports/', views_financial.financial_reports, name='financial_reports'),
     path('financial/collections/', views_financial.moldpark_collections_report, name='moldpark_collections_report'),
+    path('financial/export/<str:dataset>/', views_financial.export_report, name='export_report'),
 
     # Yeni Admin Finans Dashboard
     path('admin/financial/', views.admin_financial_dashboard, name='admin_financial_dashboard'),
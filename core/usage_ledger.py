@@ -0,0 +1,166 @@
+"""
+Kullanım Defteri Servisi
+Her kalıp kullanımı UsageLedgerEntry olarak eklenir; abonelik sayaçları
+(models_used_this_month, used_credits, total_mold_cost_this_month ...)
+abonelik satırı kilitliyken F() ifadeleriyle güncellenir. Böylece aynı
+merkezin eşzamanlı kalıp oluşturmaları birbirinin güncellemesini ezmez ve
+paket hakkı iki kez harcanmaz.
+
+Okuma tarafı (aylık kullanım, bu ayın toplamı) defter satırlarından
+türetilir ve yazma yapmaz; ay dönümünde sayaçların sıfırlanmasına gerek
+kalmadan doğru sonuç verir.
+"""
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import UsageLedgerEntry, UserSubscription
+
+
+ZERO = Decimal('0.00')
+
+
+def period_start(when=None):
+    """Yerel saate göre ayın ilk anı (datetime)"""
+    when = timezone.localtime(when or timezone.now())
+    return when.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def reset_monthly_counters(subscription_id, now=None):
+    """
+    Önceki aya ait sayaçları sıfırla (paket hakları sıfırlanmaz)
+
+    Koşullu tek UPDATE - aynı anda çalışan iki istekten yalnızca biri sıfırlar.
+
+    Returns:
+        bool: Sıfırlama yapıldıysa True
+    """
+    now = now or timezone.now()
+    return bool(UserSubscription.objects.filter(
+        pk=subscription_id, last_reset_date__lt=period_start(now),
+    ).update(
+        models_used_this_month=0,
+        digital_scans_this_month=0,
+        total_mold_cost_this_month=ZERO,
+        monthly_fee_paid=False,
+        last_reset_date=now,
+        updated_at=now,
+    ))
+
+
+def charge_usage(subscription, physical):
+    """
+    Kullanımı ücretlendir ve sayaçları güncelle - defter satırı kaydedilmeden döner
+
+    Çağıran açık bir transaction içinde olmalıdır; abonelik satırı transaction
+    sonuna kadar kilitli kalır. Kalıp henüz oluşturulmadan fiyat belirlenebilsin
+    diye satır kaydedilmez (bkz. core.order_intake).
+
+    Args:
+        subscription: UserSubscription (planı okunur, satırı kilitlenir)
+        physical: Fiziksel kalıp ise True, dijital tarama ise False
+
+    Returns:
+        UsageLedgerEntry: Kaydedilmemiş defter satırı
+    """
+    now = timezone.now()
+    plan = subscription.plan
+    locked = UserSubscription.objects.select_for_update().only('pk', 'last_reset_date').get(pk=subscription.pk)
+    if locked.last_reset_date < period_start(now):
+        reset_monthly_counters(locked.pk, now)
+
+    # Paket hakkı koşullu UPDATE ile harcanır - hak bittiyse satır değişmez
+    used_credit = physical and plan.plan_type == 'package' and bool(
+        UserSubscription.objects.filter(pk=locked.pk, used_credits__lt=F('package_credits'))
+        .update(used_credits=F('used_credits') + 1)
+    )
+    physical_cost = Decimal(str(plan.per_mold_price_try)) if physical and not used_credit else ZERO
+    digital_cost = ZERO if physical else Decimal(str(plan.modeling_service_fee_try))
+    total_cost = physical_cost + digital_cost
+
+    UserSubscription.objects.filter(pk=locked.pk).update(
+        models_used_this_month=F('models_used_this_month') + (1 if physical else 0),
+        digital_scans_this_month=F('digital_scans_this_month') + (0 if physical else 1),
+        total_mold_cost_this_month=F('total_mold_cost_this_month') + total_cost,
+        models_used_total=F('models_used_total') + 1,
+        updated_at=now,
+    )
+
+    return UsageLedgerEntry(
+        subscription_id=locked.pk,
+        kind='physical' if physical else 'digital',
+        period=period_start(now).date(),
+        used_package_credit=used_credit,
+        physical_cost=physical_cost,
+        digital_cost=digital_cost,
+        total_cost=total_cost,
+    )
+
+
+@transaction.atomic
+def record_mold_usage(subscription, ear_mold=None):
+    """
+    Kalıp kullanımını deftere yaz ve sayaçları güncelle
+
+    Args:
+        subscription: UserSubscription
+        ear_mold: Kaydedilmiş EarMold - yoksa eski davranış: fiziksel kalıp sayılır
+
+    Returns:
+        UsageLedgerEntry
+    """
+    entry = charge_usage(subscription, ear_mold is None or ear_mold.is_physical_shipment)
+    entry.ear_mold = ear_mold
+    entry.save()
+    return entry
+
+
+def monthly_usage(subscription, when=None):
+    """
+    Ayın kullanım özeti - tek aggregate, yazma yok
+
+    Returns:
+        dict: physical, digital, used_credits, mold_cost
+    """
+    return UsageLedgerEntry.objects.filter(
+        subscription=subscription, period=period_start(when).date(),
+    ).aggregate(
+        physical=Count('id', filter=Q(kind='physical')),
+        digital=Count('id', filter=Q(kind='digital')),
+        used_credits=Count('id', filter=Q(used_package_credit=True)),
+        mold_cost=Coalesce(Sum('total_cost'), ZERO),
+    )
+
+
+def monthly_fee_paid(subscription, when=None):
+    """Aylık ücret bu dönem için ödendi mi (bayrak önceki aydan kalmış olabilir)"""
+    start = period_start(when)
+    if not subscription.monthly_fee_paid:
+        return False
+    return subscription.last_reset_date >= start or bool(
+        subscription.last_payment_date and subscription.last_payment_date >= start
+    )
+
+
+def current_month_total(subscription):
+    """Bu ay toplam maliyet: ödenmemişse aylık ücret + defterdeki kalıp ücretleri"""
+    monthly_fee = ZERO if monthly_fee_paid(subscription) else Decimal(str(subscription.plan.monthly_fee_try))
+    return monthly_fee + monthly_usage(subscription)['mold_cost']
+
+
+def with_current_month(subscription, when=None):
+    """
+    Aboneliğin aylık sayaç alanlarını defterden türetilen değerlerle doldur (kaydetmez)
+
+    Ay dönümünden sonra henüz kullanım olmadıysa sayaçlar önceki aya aittir;
+    şablonlar alanları doğrudan okuduğu için görüntülemeden önce çağrılır.
+    """
+    usage = monthly_usage(subscription, when)
+    subscription.models_used_this_month = usage['physical']
+    subscription.digital_scans_this_month = usage['digital']
+    subscription.total_mold_cost_this_month = usage['mold_cost']
+    subscription.monthly_fee_paid = monthly_fee_paid(subscription, when)
+    return subscription
@@ -1,5 +1,9 @@
 # Basit Bildirim Sistemi Utilities
 
+from django.db import transaction
+from django.utils import timezone
+
+from .badge_counters import adjust, get_badge_counts
 from .models import SimpleNotification
 
 
@@ -43,12 +47,15 @@ def get_user_notifications(user, limit=10, unread_only=False):
 
 def get_unread_count(user):
     """Kullanıcının okunmamış bildirim sayısı"""
-    return user.simple_notifications.filter(is_read=False).count()
+    return get_badge_counts(user.id)['unread_notifications']
 
 
 def mark_all_as_read(user):
     """Kullanıcının tüm bildirimlerini okundu olarak işaretle"""
-    user.simple_notifications.filter(is_read=False).update(is_read=True)
+    with transaction.atomic():
+        updated = user.simple_notifications.filter(is_read=False).update(is_read=True, read_at=timezone.now())
+        # Toplu güncelleme signal göndermez - rozet sayacını güncellenen satır kadar düş
+        adjust([user.id], 'unread_notifications', -updated)
 
 
 # Yaygın bildirim türleri için kısayollar
@@ -1,7 +1,8 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.contrib import messages
 from django.utils.translation import gettext as _
-from .models import ContactMessage, Message, PricingPlan, UserSubscription, PaymentHistory, SimpleNotification, SubscriptionRequest, Invoice, Transaction, Commission
+from .models import ContactMessage, Message, PricingPlan, UserSubscription, PaymentHistory, SimpleNotification, SubscriptionRequest, Invoice, Transaction, Commission, SearchDocument, MessageReceipt
 from .forms import ContactForm, MessageForm, AdminMessageForm, MessageReplyForm, SubscriptionRequestForm, PackagePurchaseForm, SubscriptionPaymentForm
 from django.views.generic import TemplateView
 from django.contrib.auth.decorators import user_passes_test, login_required
@@ -24,6 +25,8 @@ import json
 import logging
 from .smart_notifications import SmartNotificationManager
 from .utils import get_user_notifications, get_unread_count, mark_all_as_read, send_notification
+from .search import search, search_filter
+from .usage_ledger import with_current_month
 from django.core.paginator import Paginator
 
 logger = logging.getLogger(__name__)
@@ -39,21 +42,23 @@ def home(request):
     top_producers = []
     try:
         from producer.models import Producer
-        producers = Producer.objects.filter(is_active=True, is_verified=True)
+        # Sadece değerlendirme almış üreticiler - puanlar özet kaydından okunur
+        producers = Producer.objects.filter(
+            is_active=True, is_verified=True, rating_stats__evaluation_count__gt=0
+        ).select_related('rating_stats')
         
         # Puanlarına göre sırala
         producer_ratings = []
         for producer in producers:
-            avg_rating = producer.get_average_rating()
-            if avg_rating > 0:  # Sadece değerlendirme almış üreticiler
-                producer_ratings.append({
-                    'producer': producer,
-                    'avg_rating': avg_rating,
-                    'quality_rating': producer.get_quality_rating(),
-                    'speed_rating': producer.get_speed_rating(),
-                    'total_evaluations': producer.get_total_evaluations(),
-                    'rating_color': producer.get_rating_color()
-                })
+            stats = producer.rating_stats
+            producer_ratings.append({
+                'producer': producer,
+                'avg_rating': stats.average_rating,
+                'quality_rating': stats.quality_rating,
+                'speed_rating': stats.speed_rating,
+                'total_evaluations': stats.evaluation_count,
+                'rating_color': stats.rating_color
+            })
         
         # Puanlarına göre sırala (en yüksek önce)
         top_producers = sorted(producer_ratings, key=lambda x: x['avg_rating'], reverse=True)[:10]
@@ -433,9 +438,49 @@ def admin_dashboard(request):
         'subscription_by_plan': subscription_by_plan,
         'trial_expired_users': trial_expired_users,
         'trial_warning_users': trial_warning_users,
+        # Genel arama kutusu
+        'search_kind_choices': SearchDocument.KIND_CHOICES,
     }
     return render(request, 'core/dashboard_admin.html', context)
 
+@user_passes_test(lambda u: u.is_superuser)
+def admin_global_search(request):
+    """Admin genel arama - hasta, sipariş, merkez ve mesajlarda sıralı sonuçlar"""
+    query = request.GET.get('q', '').strip()
+    kind = request.GET.get('kind', '')
+    kinds = [kind] if kind in dict(SearchDocument.KIND_CHOICES) else None
+
+    hits = search(query, kinds=kinds, limit=50) if query else []
+
+    # Siparişler kalıp detayına bağlanır - kalıp ID'leri tek sorguda
+    order_molds = dict(ProducerOrder.objects.filter(
+        pk__in=[hit.object_id for hit in hits if hit.kind == 'order']
+    ).values_list('pk', 'ear_mold_id'))
+    links = {
+        'mold': lambda pk: reverse('center:admin_mold_detail', args=[pk]),
+        'order': lambda pk: reverse('center:admin_mold_detail', args=[order_molds[pk]]) if pk in order_molds else None,
+        'center': lambda pk: reverse('center:admin_center_detail', args=[pk]),
+        'message': lambda pk: reverse('core:message_detail', args=[pk]),
+    }
+    kind_labels = dict(SearchDocument.KIND_CHOICES)
+    results = [
+        {
+            'kind': hit.kind,
+            'kind_label': kind_labels.get(hit.kind, hit.kind),
+            'title': hit.title,
+            'url': links[hit.kind](hit.object_id),
+        }
+        for hit in hits
+    ]
+
+    context = {
+        'query': query,
+        'kind': kind,
+        'kind_choices': SearchDocument.KIND_CHOICES,
+        'results': results,
+    }
+    return render(request, 'core/admin_search.html', context)
+
 @user_passes_test(lambda u: u.is_superuser)
 def admin_approve_subscription_request(request, request_id):
     """Admin tarafından abonelik talebi onaylama - JSON response"""
@@ -509,26 +554,9 @@ def message_list(request):
     """Mesaj Listesi"""
     user = request.user
     
-    # Gelen mesajlar
-    if user.is_superuser:
-        # Admin tüm mesajları görebilir
-        received_messages = Message.objects.filter(
-            Q(recipient=user) | 
-            Q(is_broadcast=True) |
-            Q(message_type__in=['center_to_admin', 'producer_to_admin'])
-        ).select_related('sender', 'recipient')
-    else:
-        # Merkez ve üreticiler kendilerine gelen mesajları ve ilgili broadcast mesajları görebilir
-        broadcast_filters = Q(is_broadcast=True, message_type='admin_to_all')
-        
-        if hasattr(user, 'center'):
-            broadcast_filters |= Q(is_broadcast=True, broadcast_to_centers=True, message_type='admin_to_center')
-        if hasattr(user, 'producer'):
-            broadcast_filters |= Q(is_broadcast=True, broadcast_to_producers=True, message_type='admin_to_producer')
-        
-        received_messages = Message.objects.filter(
-            Q(recipient=user) | broadcast_filters
-        ).select_related('sender', 'recipient').distinct()
+    # Gelen mesajlar - direkt mesajlar ve kullanıcıya açık toplu mesajlar
+    received_filter = Message.received_filter(user)
+    received_messages = Message.objects.filter(received_filter).select_related('sender', 'recipient')
     
     # Gönderilen mesajlar
     sent_messages = Message.objects.filter(
@@ -544,62 +572,43 @@ def message_list(request):
     else:
         messages_list = received_messages
     
-    # Arama - silinmiş kullanıcıları da dikkate al
+    # Arama - tam metin indeksi (konu, içerik, gönderen)
     if search_query:
-        messages_list = messages_list.filter(
-            Q(subject__icontains=search_query) |
-            Q(content__icontains=search_query) |
-            Q(sender__first_name__icontains=search_query) |
-            Q(sender__last_name__icontains=search_query) |
-            Q(sender__username__icontains=search_query)
-        ).distinct()
-    
-    # Sayfalama
-    paginator = Paginator(messages_list.order_by('-created_at'), 20)
+        messages_list = messages_list.filter(search_filter(search_query, 'message'))
+    
+    # Sayfalama - toplu mesajların okuma durumu ve cevap sayısı aynı sorguda
+    paginator = Paginator(
+        messages_list.annotate(
+            user_has_read=MessageReceipt.read_by(user),
+            reply_count=Count('replies'),
+        ).order_by('-created_at'), 20
+    )
     page_number = request.GET.get('page')
     messages_page = paginator.get_page(page_number)
     
-    # Gelen mesajlar görüntülendiğinde otomatik olarak okundu işaretle
-    if message_filter == 'received':
-        # Direkt mesajları okundu olarak işaretle
-        unread_direct_messages = received_messages.filter(
-            recipient=user,
-            is_read=False,
-            is_broadcast=False
-        )
-        for msg in unread_direct_messages:
-            msg.mark_as_read()
-        
-        # Broadcast mesajları okundu olarak işaretle (is_read flag'i kullanılıyor)
-        # Broadcast mesajlar için her kullanıcı için ayrı kayıt tutulmuyor,
-        # bu yüzden sadece direkt mesajları işaretliyoruz
-    
-    # Her mesaj için kullanıcının okuma durumunu hesapla
+    # Her mesaj için kullanıcının okuma durumu (okundu işaretlenmeden önceki hali)
     for message in messages_page:
-        if message.is_broadcast:
-            # Broadcast mesajlar için kullanıcı alıcı ise okundu sayılır
-            # (Broadcast mesajlar için ayrı okuma durumu tutulmuyor)
-            message.user_is_read = True  # Broadcast mesajlar her zaman okundu sayılır
-        elif message.recipient == user:
-            # Kullanıcı alıcı ise
+        if message.is_broadcast and message.sender_id != user.id:
+            message.user_is_read = message.user_has_read
+        elif message.recipient_id == user.id:
             message.user_is_read = message.is_read
         else:
             # Kullanıcı gönderen ise
             message.user_is_read = True
     
-    # İstatistikler - silinmiş kullanıcıları da dahil et
-    unread_messages = received_messages.filter(
-        Q(is_read=False, recipient=user, is_broadcast=False)
-    ).distinct()
+    # İstatistikler - tek koşullu aggregate
+    unread_filter = received_filter & Message.unread_filter(user)
+    stats = Message.objects.filter(received_filter | Q(sender=user)).aggregate(
+        total_received=Count('pk', filter=received_filter),
+        unread_received=Count('pk', filter=unread_filter),
+        total_sent=Count('pk', filter=Q(sender=user)),
+        urgent_messages=Count('pk', filter=unread_filter & Q(priority='urgent')),
+    )
     
-    stats = {
-        'total_received': received_messages.count(),
-        'unread_received': unread_messages.count(),
-        'total_sent': sent_messages.count(),
-        'urgent_messages': received_messages.filter(
-            Q(priority='urgent', is_read=False, recipient=user, is_broadcast=False)
-        ).distinct().count(),
-    }
+    # Gelen mesajlar görüntülendiğinde toplu olarak okundu işaretle
+    # (direkt mesajlar tek UPDATE, toplu mesajların okuma kayıtları tek INSERT)
+    if message_filter == 'received' and stats['unread_received']:
+        MessageReceipt.mark_read(user, received_messages)
     
     context = {
         'messages': messages_page,
@@ -637,10 +646,11 @@ def message_detail(request, pk):
         messages.error(request, 'Bu mesajı görüntüleme yetkiniz yok.')
         return redirect('core:message_list')
     
-    # Mesajı okundu olarak işaretle
+    # Mesajı okundu olarak işaretle - toplu mesajlarda kullanıcının okuma kaydı
     if message.recipient == user and not message.is_read:
         message.mark_as_read()
-    # Broadcast mesajlar için ayrı okuma durumu tutulmuyor
+    elif message.is_broadcast:
+        MessageReceipt.objects.get_or_create(message=message, user=user)
     
     # Cevap formu
     reply_form = None
@@ -844,10 +854,8 @@ def message_mark_read(request, pk):
     # Yetki kontrolü
     if message.recipient == user:
         message.mark_as_read()
-    elif message.is_broadcast:
-        recipient_obj = message.recipients.filter(recipient=user).first()
-        if recipient_obj:
-            recipient_obj.mark_as_read()
+    elif message.is_broadcast and Message.objects.filter(Message.received_filter(user), pk=message.pk).exists():
+        MessageReceipt.objects.get_or_create(message=message, user=user)
     
     return JsonResponse({'success': True})
 
@@ -1501,38 +1509,13 @@ def subscription_dashboard(request):
     
     try:
         subscription = UserSubscription.objects.filter(user=request.user, status='active').order_by('-created_at').first()
+        if subscription and subscription.plan.plan_type == 'package' and not subscription.package_credits:
+            # Paket hakları tanımlanmamışsa plan limitini göster (GET isteği kayda yazmaz;
+            # harcanan haklar kullanım defteri ile kalıp oluşturulurken güncellenir)
+            subscription.package_credits = subscription.plan.monthly_model_limit or 0
+            subscription.used_credits = subscription.used_credits or 0
         if subscription:
-            # Paket planıysa ve package_credits 0 ise, plan.monthly_model_limit'ten set et
-            if subscription.plan.plan_type == 'package':
-                if subscription.package_credits is None or subscription.package_credits == 0:
-                    subscription.package_credits = subscription.plan.monthly_model_limit or 0
-                    subscription.used_credits = subscription.used_credits or 0
-                    subscription.save()
-                
-                # Paket satın alma tarihinden sonra kullanılan kalıpları say ve used_credits'i güncelle
-                try:
-                    from mold.models import EarMold
-                    package_start_date = subscription.start_date
-                    used_molds_count = EarMold.objects.filter(
-                        center__user=request.user,
-                        is_physical_shipment=True,
-                        created_at__gte=package_start_date
-                    ).count()
-                    
-                    # used_credits'i güncelle (paket haklarını aşmamalı)
-                    if used_molds_count != subscription.used_credits:
-                        subscription.used_credits = min(used_molds_count, subscription.package_credits or 0)
-                        subscription.save()
-                except Exception as e:
-                    import logging
-                    logger = logging.getLogger(__name__)
-                    logger.warning(f"Credit update error: {e}")
-            
-            # Subscription'ı refresh et
-            try:
-                subscription.refresh_from_db()
-            except Exception:
-                pass
+            with_current_month(subscription)
     except UserSubscription.DoesNotExist:
         subscription = None
     except Exception as e:
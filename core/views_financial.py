@@ -82,9 +82,11 @@ def financial_dashboard(request):
         end_date = now
         period_name = 'Bu Ay'
     elif period == 'last_month':
-        last_month = now.replace(day=1) - timedelta(days=1)
-        start_date = last_month.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        end_date = last_month.replace(day=28, hour=23, minute=59, second=59)
+        # Ayın tamamı - kapatılmış dönemin defter sınırlarıyla aynı
+        from producer.earnings_service import month_bounds
+        last_month = timezone.localdate().replace(day=1) - timedelta(days=1)
+        start_date, next_month_start = month_bounds(last_month.year, last_month.month)
+        end_date = next_month_start - timedelta(microseconds=1)
         period_name = 'Geçen Ay'
     elif period == 'this_year':
         start_date = now.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
@@ -609,6 +611,66 @@ def moldpark_collections_report(request):
     return render(request, 'core/financial/moldpark_collections_report.html', context)
 
 
+@user_passes_test(lambda u: u.is_staff)
+def export_report(request, dataset):
+    """
+    Rapor verilerini dışa aktar - CSV akış halinde, XLSX write-only modunda
+    Parametreler: format (csv/xlsx), start_date, end_date, columns (virgülle), veri setine özel filtreler
+    """
+    import tempfile
+    from django.http import FileResponse, Http404, StreamingHttpResponse
+    from .exports import ExportError, build_queryset, get_dataset, iter_rows, select_columns, stream_csv, write_xlsx
+
+    try:
+        config = get_dataset(dataset)
+    except ExportError:
+        raise Http404("Veri seti bulunamadı")
+
+    if config['superuser_only'] and not request.user.is_superuser:
+        raise Http404("Bu sayfaya erişim yetkiniz yok")
+
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in ('csv', 'xlsx'):
+        return HttpResponse('Geçersiz format (csv veya xlsx)', status=400, content_type='text/plain; charset=utf-8')
+
+    requested_columns = [name.strip() for name in request.GET.get('columns', '').split(',') if name.strip()]
+    filters = {name: request.GET.get(name) for name in config['filters']}
+
+    try:
+        columns = select_columns(config, requested_columns)
+        queryset = build_queryset(
+            config,
+            start_date=request.GET.get('start_date'),
+            end_date=request.GET.get('end_date'),
+            filters=filters,
+        )
+    except ExportError as e:
+        return HttpResponse(str(e), status=400, content_type='text/plain; charset=utf-8')
+
+    headers = [header for _, header in columns]
+    rows = iter_rows(config, queryset, columns, keep_numbers=(export_format == 'xlsx'))
+    filename = f'moldpark_{dataset}_{timezone.localdate():%Y%m%d}'
+
+    if export_format == 'xlsx':
+        output = tempfile.TemporaryFile()
+        try:
+            write_xlsx(headers, rows, output, title=config['title'])
+        except ExportError as e:
+            output.close()
+            return HttpResponse(str(e), status=400, content_type='text/plain; charset=utf-8')
+        output.seek(0)
+        return FileResponse(
+            output,
+            as_attachment=True,
+            filename=f'{filename}.xlsx',
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        )
+
+    response = StreamingHttpResponse(stream_csv(headers, rows), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
+    return response
+
+
 @user_passes_test(lambda u: u.is_superuser)
 def financial_reports(request):
     """Finansal raporlar"""
@@ -628,10 +690,14 @@ def financial_reports(request):
         'total_digital': sum(s.total_modelings for s in yearly_summaries),
     }
     
+    # Kapatılmış dönem defterleri - dönem başına tek satır
+    from .ledger_service import get_period_totals
+
     context = {
         'summaries': summaries,
         'yearly_stats': yearly_stats,
         'current_year': current_year,
+        'ledger_periods': get_period_totals(limit=12),
     }
     
     return render(request, 'core/financial/reports.html', context)
@@ -657,9 +723,11 @@ def admin_financial_control_panel(request):
         end_date = now
         period_name = 'Bu Ay'
     elif period == 'last_month':
-        last_month = now.replace(day=1) - timedelta(days=1)
-        start_date = last_month.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        end_date = last_month.replace(day=28, hour=23, minute=59, second=59)
+        # Ayın tamamı - kapatılmış dönemin defter sınırlarıyla aynı
+        from producer.earnings_service import month_bounds
+        last_month = timezone.localdate().replace(day=1) - timedelta(days=1)
+        start_date, next_month_start = month_bounds(last_month.year, last_month.month)
+        end_date = next_month_start - timedelta(microseconds=1)
         period_name = 'Geçen Ay'
     elif period == 'this_year':
         start_date = now.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
@@ -674,9 +742,22 @@ def admin_financial_control_panel(request):
     # 1. İŞİTME MERKEZLERİNDEN TAHSİLATLAR
     # ==========================================
 
-    # Fiziksel kalıp gönderen işitme merkezleri
-    centers_with_physical_molds = []
-    all_centers = Center.objects.filter(is_active=True)
+    # Merkez satırları toplu sorgularla hazırlanır ve (dönem, fiyatlandırma sürümü)
+    # bazında önbellekten okunur - sadece değişen merkezler yeniden hesaplanır
+    # Kapatılmış ay için satırlar sadece dönem defterinden okunur
+    from .financial_report import CenterCollectionsReport
+    from .ledger_service import get_center_rows, get_closed_period, get_producer_rows
+
+    closed_period = None
+    if period == 'last_month':
+        closed_period = get_closed_period(start_date.year, start_date.month)
+
+    if closed_period:
+        centers_with_physical_molds = get_center_rows(closed_period)
+    else:
+        all_centers = Center.objects.filter(is_active=True).select_related('user')
+        report = CenterCollectionsReport(period, start_date, end_date, pricing)
+        centers_with_physical_molds = report.build(all_centers)
 
     total_collections_from_centers = Decimal('0.00')
     total_monthly_system_fees = Decimal('0.00')  # Aylık sistem ücretleri toplamı
@@ -684,315 +765,12 @@ def admin_financial_control_panel(request):
     # MoldPark gelirini hesaplamak için toplam gelir (sadece fiziksel + dijital hizmetler)
     total_gross_revenue = Decimal('0.00')  # Fiziksel + Dijital hizmetler toplamı (aylık ücret hariç)
 
-    for center in all_centers:
-        # Bu dönemde normal fatura (PKG- prefix'i olmayan) kesilmiş mi kontrol et
-        # start_date ve end_date datetime objesi, issue_date ise date objesi
-        start_date_only = start_date.date() if hasattr(start_date, 'date') else start_date
-        end_date_only = end_date.date() if hasattr(end_date, 'date') else end_date
-        
-        regular_invoices_in_period = Invoice.objects.filter(
-            issued_by_center=center,
-            invoice_type='center_admin_invoice',
-            issue_date__gte=start_date_only,
-            issue_date__lte=end_date_only
-        ).exclude(invoice_number__startswith='PKG-').order_by('-issue_date')
-        
-        # En son fatura tarihini bul (eğer fatura varsa)
-        latest_invoice = regular_invoices_in_period.first() if regular_invoices_in_period.exists() else None
-        latest_invoice_date = latest_invoice.issue_date if latest_invoice else None
-        
-        # Fatura kesilmişse, fatura tarihinden SONRA oluşturulan hizmetleri göstermek için
-        # start_date'i fatura tarihinden sonraya taşı
-        effective_start_date = start_date
-        has_existing_invoice = latest_invoice is not None
-        
-        if has_existing_invoice and latest_invoice_date:
-            # Fatura tarihinden bir gün sonrasından başla
-            from datetime import time as dt_time
-            if isinstance(latest_invoice_date, datetime):
-                effective_start_date = latest_invoice_date + timedelta(days=1)
-            else:
-                # date objesi ise datetime'a çevir
-                effective_start_date = timezone.make_aware(
-                    datetime.combine(latest_invoice_date + timedelta(days=1), dt_time.min)
-                )
-        
-        # Paket faturalarını kontrol et (PKG- prefix'li faturalar)
-        # Tarih filtresini kaldırdık çünkü paket faturaları her zaman gösterilmeli
-        package_invoices = Invoice.objects.filter(
-            user=center.user,
-            invoice_type='center_admin_invoice',
-            invoice_number__startswith='PKG-'
-        ).order_by('-issue_date')
-        
-        # Seçili tarih aralığındaki paket faturalarını kontrol et
-        package_invoices_in_period = package_invoices.filter(
-            issue_date__gte=start_date,
-            issue_date__lte=end_date
-        )
-        
-        # Paket aboneliğini kontrol et (fatura yoksa bile paket aboneliği varsa göster)
-        from core.models import UserSubscription
-        package_subscription = UserSubscription.objects.filter(
-            user=center.user,
-            plan__plan_type='package',
-            status='active'
-        ).order_by('-created_at').first()
-        
-        # Paket faturası varsa, paket fiyatını kullan
-        package_amount = Decimal('0.00')
-        package_info = None
-        package_invoice_numbers = []
-        
-        # Seçili tarih aralığındaki paket faturalarını kullan
-        if package_invoices_in_period.exists():
-            for invoice in package_invoices_in_period:
-                package_amount += invoice.total_amount
-                package_invoice_numbers.append(invoice.invoice_number)
-                # İlk paket bilgisini al
-                if not package_info and invoice.breakdown_data:
-                    package_info = invoice.breakdown_data.get('package_name', 'Paket')
-        # Eğer seçili tarih aralığında paket faturası yoksa ama genel olarak paket faturası varsa
-        elif package_invoices.exists():
-            # En son paket faturasını göster
-            latest_package_invoice = package_invoices.first()
-            package_amount = latest_package_invoice.total_amount
-            package_invoice_numbers.append(latest_package_invoice.invoice_number)
-            if latest_package_invoice.breakdown_data:
-                package_info = latest_package_invoice.breakdown_data.get('package_name', 'Paket')
-        # Paket faturası yoksa ama paket aboneliği varsa, abonelikten bilgi al
-        elif package_subscription:
-            package_amount = package_subscription.plan.price_try
-            package_info = package_subscription.plan.name
-            package_invoice_numbers = ['Fatura Oluşturulmamış']
-        
-        # Merkez aboneliğini al (aylık ücret için)
-        subscription = UserSubscription.objects.filter(user=center.user, status='active').first()
-        # Ortalama birim fiyat hesaplamak için Standart ve Pro fiyatlarını al (sadece gösterim için)
-        standart_plan = PricingPlan.objects.filter(name='Standart Abonelik', is_active=True).first()
-        pro_plan = PricingPlan.objects.filter(name='Pro Abonelik', is_active=True).first()
-        subscription_physical_price = standart_plan.per_mold_price_try if standart_plan else pricing.physical_mold_price
-        subscription_digital_price = standart_plan.modeling_service_fee_try if standart_plan else pricing.digital_modeling_price
-        
-        # Paket faturası yoksa, tek tek kalıpları hesapla
-        # SADECE fatura KESİLMİŞ ise paket faturası değer kabul et. Fatura kesılmadıysa fiziksel kalıpları hesapla
-        has_package_invoice = package_invoices_in_period.exists()  # Seçili tarihte kesılen paket faturası varsa
-        if not has_package_invoice:
-            # Bu merkezden gönderilen fiziksel kalıplar (effective_start_date kullan - fatura tarihinden sonrası)
-            physical_molds = EarMold.objects.filter(
-                center=center,
-                is_physical_shipment=True,
-                created_at__gte=effective_start_date,
-                created_at__lte=end_date,
-                status__in=['completed', 'delivered', 'shipped_to_center']
-            )
-            
-            # 3D modelleme hizmeti: is_physical_shipment=False olanlar VEYA ModeledMold kaydı olanlar
-            from django.db.models import Q
-            from mold.models import ModeledMold
-            digital_only_molds = EarMold.objects.filter(
-                center=center,
-                created_at__gte=effective_start_date,
-                created_at__lte=end_date,
-                status__in=['completed', 'delivered']
-            ).filter(
-                Q(is_physical_shipment=False) | Q(modeled_files__isnull=False)
-            ).distinct()
-            
-            physical_count = physical_molds.count()
-            digital_count = digital_only_molds.count()
-            
-            # Fiziksel kalıp: Her kalıp için o tarihteki abonelik planına göre fiyatlandırma
-            # Standart aboneyken yapılan harcamalar Standart fiyatlar, Pro'ya geçtikten sonra Pro fiyatlar
-            physical_amount_with_vat = Decimal('0.00')
-            physical_before_pro_count = 0
-            physical_after_pro_count = 0
-            physical_before_pro_amount = Decimal('0.00')
-            physical_after_pro_amount = Decimal('0.00')
-            
-            # Pro abonelik başlangıç tarihini bul
-            pro_subscription = UserSubscription.objects.filter(
-                user=center.user,
-                plan__name='Pro Abonelik',
-                status__in=['active', 'cancelled']
-            ).order_by('-start_date').first()
-            
-            pro_subscription_start = None
-            if pro_subscription and pro_subscription.start_date:
-                if isinstance(pro_subscription.start_date, datetime):
-                    pro_subscription_start = pro_subscription.start_date
-                else:
-                    pro_subscription_start = timezone.make_aware(
-                        datetime.combine(pro_subscription.start_date, dt_time.min)
-                    )
-            
-            for mold in physical_molds:
-                if mold.unit_price is not None:
-                    mold_price = mold.unit_price
-                else:
-                    # Kalıbın oluşturulduğu tarihteki abonelik planına göre fiyatlandır
-                    mold_price = get_mold_price_at_date(mold, center.user, pricing)
-                
-                physical_amount_with_vat += mold_price
-                
-                # Pro öncesi/sonrası ayrımı
-                if pro_subscription_start:
-                    if mold.created_at < pro_subscription_start:
-                        physical_before_pro_count += 1
-                        physical_before_pro_amount += mold_price
-                    else:
-                        physical_after_pro_count += 1
-                        physical_after_pro_amount += mold_price
-                else:
-                    physical_before_pro_count += 1
-                    physical_before_pro_amount += mold_price
-            
-            # 3D Modelleme: Her kalıp için o tarihteki abonelik planına göre fiyatlandırma
-            # Standart aboneyken yapılan harcamalar Standart fiyatlar, Pro'ya geçtikten sonra Pro fiyatlar
-            digital_amount_with_vat = Decimal('0.00')
-            digital_before_pro_count = 0
-            digital_after_pro_count = 0
-            digital_before_pro_amount = Decimal('0.00')
-            digital_after_pro_amount = Decimal('0.00')
-            
-            for mold in digital_only_molds:
-                if mold.digital_modeling_price is not None:
-                    mold_price = mold.digital_modeling_price
-                else:
-                    # Kalıbın oluşturulduğu tarihteki abonelik planına göre fiyatlandır
-                    mold_price = get_mold_price_at_date(mold, center.user, pricing)
-                
-                digital_amount_with_vat += mold_price
-                
-                # Pro öncesi/sonrası ayrımı
-                if pro_subscription_start:
-                    if mold.created_at < pro_subscription_start:
-                        digital_before_pro_count += 1
-                        digital_before_pro_amount += mold_price
-                    else:
-                        digital_after_pro_count += 1
-                        digital_after_pro_amount += mold_price
-                else:
-                    digital_before_pro_count += 1
-                    digital_before_pro_amount += mold_price
-        else:
-            # Paket faturası varsa, tek tek kalıp sayısını gösterme
-            physical_count = 0
-            digital_count = 0
-            physical_amount_with_vat = Decimal('0.00')
-            digital_amount_with_vat = Decimal('0.00')
-            physical_before_pro_count = 0
-            physical_after_pro_count = 0
-            physical_before_pro_amount = Decimal('0.00')
-            physical_after_pro_amount = Decimal('0.00')
-            digital_before_pro_count = 0
-            digital_after_pro_count = 0
-            digital_before_pro_amount = Decimal('0.00')
-            digital_after_pro_amount = Decimal('0.00')
-            pro_subscription_start = None
-        
-        # Her aktif merkez için aylık ücreti hesapla (abonelik varsa, abonelik fiyatı kullan)
-        if subscription and subscription.plan and subscription.plan.plan_type in ['package', 'standard']:
-            # Abonelik aylık ücretini kullan
-            monthly_fee = subscription.plan.monthly_fee_try
-        else:
-            # Sistem varsayılan aylık ücretini kullan
-            monthly_fee = pricing.monthly_system_fee
-        
-        total_monthly_system_fees += monthly_fee
-        
-        # Toplam tutar: Paket faturası varsa paket fiyatı, yoksa tek tek kalıplar + aylık ücret
-        if has_package_invoice:
-            # Paket faturası zaten KDV dahil tutarı içerir
-            gross_amount_with_vat = package_amount + monthly_fee  # Toplam tahsilat
-            physical_count = 0  # Paket faturası varsa kalıp sayısını gösterme
-            digital_count = 0
-            
-            # KDV hesaplamaları (paket faturası için)
-            vat_multiplier = Decimal('1') + (pricing.vat_rate / Decimal('100'))
-            gross_amount_without_vat = gross_amount_with_vat / vat_multiplier
-            vat_amount = gross_amount_with_vat - gross_amount_without_vat
-            
-            # MoldPark hizmet bedeli: Aylık ücret düşüldükten sonra kalan tutar üzerinden hesaplanır
-            # (Brüt - Aylık ücret) × %7.5
-            amount_after_monthly_fee = package_amount  # Paket faturası zaten aylık ücret içermiyor
-            moldpark_fee = pricing.calculate_moldpark_fee(amount_after_monthly_fee)
-            
-            # Üreticiye giden: (Brüt - Aylık ücret) - MoldPark komisyonu
-            net_to_producer = amount_after_monthly_fee - moldpark_fee
-        elif physical_count > 0 or digital_count > 0 or monthly_fee > 0:
-            # Toplam tahsilat: Fiziksel + 3D + Aylık ücret
-            gross_amount_with_vat = physical_amount_with_vat + digital_amount_with_vat + monthly_fee
-            
-            # KDV hesaplamaları
-            vat_multiplier = Decimal('1') + (pricing.vat_rate / Decimal('100'))
-            gross_amount_without_vat = gross_amount_with_vat / vat_multiplier
-            vat_amount = gross_amount_with_vat - gross_amount_without_vat
-            
-            # MoldPark hizmet bedeli: Aylık ücret düşüldükten sonra kalan tutar üzerinden hesaplanır
-            # (Brüt - Aylık ücret) × %7.5
-            amount_after_monthly_fee = physical_amount_with_vat + digital_amount_with_vat
-            moldpark_fee = pricing.calculate_moldpark_fee(amount_after_monthly_fee)
-            
-            # Üreticiye giden: (Brüt - Aylık ücret) - MoldPark komisyonu
-            net_to_producer = amount_after_monthly_fee - moldpark_fee
-        else:
-            # Hiçbir şey yoksa sıfır değerler
-            gross_amount_with_vat = Decimal('0.00')
-            gross_amount_without_vat = Decimal('0.00')
-            vat_amount = Decimal('0.00')
-            moldpark_fee = Decimal('0.00')
-            net_to_producer = Decimal('0.00')
-            amount_after_monthly_fee = Decimal('0.00')
-        
-        # Tüm merkezleri göster (hizmet olsun ya da olmasın, fatura kesilmiş olsun ya da olmasın)
-        # Eğer fatura kesilmiş ama yeni hizmet yoksa, sadece gösterim için sıfır değerler
-        if has_existing_invoice and physical_count == 0 and digital_count == 0 and not has_package_invoice:
-            gross_amount_with_vat = Decimal('0.00')
-            gross_amount_without_vat = Decimal('0.00')
-            vat_amount = Decimal('0.00')
-            moldpark_fee = Decimal('0.00')
-            net_to_producer = Decimal('0.00')
-            amount_after_monthly_fee = Decimal('0.00')
-        
-        # Toplamlara ekle - sadece hizmet varsa veya paket faturası varsa
-        if gross_amount_with_vat > 0 or has_package_invoice:
-            if gross_amount_with_vat > 0:
-                total_collections_from_centers += gross_amount_with_vat
-                # MoldPark komisyonu için toplam brüt gelir (sadece fiziksel + dijital hizmetler, aylık ücret hariç)
-                total_gross_revenue += amount_after_monthly_fee
-        
-        # Her zaman merkezi listeye ekle
-        centers_with_physical_molds.append({
-                'center': center,
-                'physical_count': physical_count,
-                'digital_count': digital_count,
-                'physical_amount': physical_amount_with_vat,
-                'digital_amount': digital_amount_with_vat,
-                'physical_before_pro_count': physical_before_pro_count,
-                'physical_after_pro_count': physical_after_pro_count,
-                'physical_before_pro_amount': physical_before_pro_amount,
-                'physical_after_pro_amount': physical_after_pro_amount,
-                'digital_before_pro_count': digital_before_pro_count,
-                'digital_after_pro_count': digital_after_pro_count,
-                'digital_before_pro_amount': digital_before_pro_amount,
-                'digital_after_pro_amount': digital_after_pro_amount,
-                'has_existing_invoice': has_existing_invoice,
-                'latest_invoice': latest_invoice,
-                'latest_invoice_number': latest_invoice.invoice_number if latest_invoice else None,
-                'latest_invoice_date': latest_invoice_date,
-                'has_pro_subscription': pro_subscription_start is not None,
-                'package_amount': package_amount if has_package_invoice else Decimal('0.00'),
-                'package_info': package_info,
-                'package_invoice_numbers': package_invoice_numbers,
-                'has_package_invoice': has_package_invoice,
-                'monthly_system_fee': monthly_fee,
-                'gross_amount': gross_amount_with_vat,
-                'gross_amount_without_vat': gross_amount_without_vat,
-                'vat_amount': vat_amount,
-                'moldpark_fee': moldpark_fee,
-                'net_to_producer': net_to_producer,
-            })
+    for center_data in centers_with_physical_molds:
+        total_monthly_system_fees += center_data['monthly_system_fee']
+        if center_data['gross_amount'] > 0:
+            total_collections_from_centers += center_data['gross_amount']
+            # MoldPark komisyonu için toplam brüt gelir (aylık ücret hariç)
+            total_gross_revenue += center_data['amount_after_monthly_fee']
     
     # ==========================================
     # 2. ÜRETİCİLERE YAPILACAK ÖDEMELER
@@ -1004,166 +782,153 @@ def admin_financial_control_panel(request):
         total_payments_to_producers += center_data.get('net_to_producer', Decimal('0.00'))
     
     # Üretici detayları için ayrı hesaplama (sadece gösterim için)
-    producers_payment_summary = []
-    all_producers = Producer.objects.filter(is_active=True)
-    total_producer_gross_revenue = Decimal('0.00')
-    total_producer_gross_without_vat = Decimal('0.00')
-    total_producer_vat = Decimal('0.00')
-    total_moldpark_producer_fee = Decimal('0.00')
-    total_producer_cc_fee = Decimal('0.00')
-    total_completed_producer_orders = 0
-    total_physical_molds = 0
-    total_digital_molds = 0
-    paid_producers_count = 0
-    pending_producers_count = 0
-    
-    for producer in all_producers:
-        # Önce bu üretici için paket faturalarını kontrol et
-        # Paket faturaları üretici faturası olarak oluşturulmuş olabilir
-        all_producer_invoices = Invoice.objects.filter(
-            producer=producer,
-            invoice_type='producer_invoice',
-            issue_date__gte=start_date.date(),
-            issue_date__lte=end_date.date()
-        )
+    # Kapatılmış ay için satırlar merkezlerle aynı dönem defterinden okunur
+    if closed_period:
+        producers_payment_summary = get_producer_rows(closed_period)
+    else:
+        producers_payment_summary = []
+        all_producers = Producer.objects.filter(is_active=True)
+
+        for producer in all_producers:
+            # Önce bu üretici için paket faturalarını kontrol et
+            # Paket faturaları üretici faturası olarak oluşturulmuş olabilir
+            all_producer_invoices = Invoice.objects.filter(
+                producer=producer,
+                invoice_type='producer_invoice',
+                issue_date__gte=start_date.date(),
+                issue_date__lte=end_date.date()
+            )
+        
+            # Paket faturalarını filtrele (breakdown_data'da package_invoice_number varsa)
+            package_invoices = []
+            for inv in all_producer_invoices:
+                if inv.breakdown_data and inv.breakdown_data.get('package_invoice_number'):
+                    package_invoices.append(inv)
+        
+            # Bu üreticinin tamamladığı işler
+            completed_orders = producer.orders.filter(
+                Q(status='delivered') | 
+                Q(status__in=['received', 'designing', 'production', 'quality_check', 'packaging', 'shipping'], 
+                  ear_mold__is_physical_shipment=True),
+                created_at__gte=start_date,
+                created_at__lte=end_date
+            ).select_related('ear_mold')
+        
+            physical_count = completed_orders.filter(ear_mold__is_physical_shipment=True).count()
+            digital_count = completed_orders.filter(ear_mold__is_physical_shipment=False).count()
         
-        # Paket faturalarını filtrele (breakdown_data'da package_invoice_number varsa)
-        package_invoices = []
-        for inv in all_producer_invoices:
-            if inv.breakdown_data and inv.breakdown_data.get('package_invoice_number'):
-                package_invoices.append(inv)
-        
-        # Bu üreticinin tamamladığı işler
-        completed_orders = producer.orders.filter(
-            Q(status='delivered') | 
-            Q(status__in=['received', 'designing', 'production', 'quality_check', 'packaging', 'shipping'], 
-              ear_mold__is_physical_shipment=True),
-            created_at__gte=start_date,
-            created_at__lte=end_date
-        ).select_related('ear_mold')
-        
-        physical_count = completed_orders.filter(ear_mold__is_physical_shipment=True).count()
-        digital_count = completed_orders.filter(ear_mold__is_physical_shipment=False).count()
-        
-        # Paket faturası varsa, paket fiyatı üzerinden hesapla
-        if len(package_invoices) > 0:
-            # Paket faturalarından toplam brüt kazanç
-            gross_revenue_with_vat = Decimal('0.00')
-            gross_revenue_without_vat = Decimal('0.00')
-            vat_amount = Decimal('0.00')
-            moldpark_cut = Decimal('0.00')
+            # Paket faturası varsa, paket fiyatı üzerinden hesapla
+            if len(package_invoices) > 0:
+                # Paket faturalarından toplam brüt kazanç
+                gross_revenue_with_vat = Decimal('0.00')
+                gross_revenue_without_vat = Decimal('0.00')
+                vat_amount = Decimal('0.00')
+                moldpark_cut = Decimal('0.00')
             
-            for package_invoice in package_invoices:
-                # Paket fiyatı (KDV dahil brüt tutar)
-                package_price = package_invoice.producer_gross_revenue or Decimal('0.00')
-                gross_revenue_with_vat += package_price
+                for package_invoice in package_invoices:
+                    # Paket fiyatı (KDV dahil brüt tutar)
+                    package_price = package_invoice.producer_gross_revenue or Decimal('0.00')
+                    gross_revenue_with_vat += package_price
                 
-                # KDV hesaplamaları (bilgi amaçlı)
-                vat_multiplier = Decimal('1') + (pricing.vat_rate / Decimal('100'))
-                package_without_vat = package_price / vat_multiplier
-                package_vat = package_price - package_without_vat
+                    # KDV hesaplamaları (bilgi amaçlı)
+                    vat_multiplier = Decimal('1') + (pricing.vat_rate / Decimal('100'))
+                    package_without_vat = package_price / vat_multiplier
+                    package_vat = package_price - package_without_vat
                 
-                gross_revenue_without_vat += package_without_vat
-                vat_amount += package_vat
+                    gross_revenue_without_vat += package_without_vat
+                    vat_amount += package_vat
                 
-                # MoldPark komisyonu
-                moldpark_cut += package_invoice.moldpark_service_fee or Decimal('0.00')
+                    # MoldPark komisyonu
+                    moldpark_cut += package_invoice.moldpark_service_fee or Decimal('0.00')
             
-            # Üreticiye net ödeme: KDV DAHİL brüt tutar - MoldPark komisyonu
-            # Paket satın alındığında üretici merkez bu satın almayı karşılayacak olan taraftır
-            net_payment = gross_revenue_with_vat - moldpark_cut
+                # Üreticiye net ödeme: KDV DAHİL brüt tutar - MoldPark komisyonu
+                # Paket satın alındığında üretici merkez bu satın almayı karşılayacak olan taraftır
+                net_payment = gross_revenue_with_vat - moldpark_cut
             
-            # Paket faturası için kalıp sayıları breakdown_data'dan alınabilir
-            total_package_molds = sum(
-                inv.breakdown_data.get('mold_count', 0) if inv.breakdown_data else 0
-                for inv in package_invoices
-            )
-            if total_package_molds > 0:
-                physical_count = total_package_molds
-                digital_count = 0
+                # Paket faturası için kalıp sayıları breakdown_data'dan alınabilir
+                total_package_molds = sum(
+                    inv.breakdown_data.get('mold_count', 0) if inv.breakdown_data else 0
+                    for inv in package_invoices
+                )
+                if total_package_molds > 0:
+                    physical_count = total_package_molds
+                    digital_count = 0
             
-        elif completed_orders.exists():
-            # Normal kalıp bazlı hesaplama - Dinamik fiyatlar kullan
-            gross_revenue_with_vat = Decimal('0.00')
-            gross_revenue_without_vat = Decimal('0.00')
-            vat_amount = Decimal('0.00')
+            elif completed_orders.exists():
+                # Normal kalıp bazlı hesaplama - Dinamik fiyatlar kullan
+                gross_revenue_with_vat = Decimal('0.00')
+                gross_revenue_without_vat = Decimal('0.00')
+                vat_amount = Decimal('0.00')
             
-            for order in completed_orders:
-                if order.ear_mold.is_physical_shipment:
-                    # Fiziksel kalıp - SABIT FIYAT 399 TL
-                    with_vat = Decimal('399.00')
+                for order in completed_orders:
+                    if order.ear_mold.is_physical_shipment:
+                        # Fiziksel kalıp - SABIT FIYAT 399 TL
+                        with_vat = Decimal('399.00')
                     
-                    vat_multiplier = Decimal('1') + (pricing.vat_rate / Decimal('100'))
-                    without_vat = with_vat / vat_multiplier
-                    vat = with_vat - without_vat
+                        vat_multiplier = Decimal('1') + (pricing.vat_rate / Decimal('100'))
+                        without_vat = with_vat / vat_multiplier
+                        vat = with_vat - without_vat
                     
-                    gross_revenue_with_vat += with_vat
-                    gross_revenue_without_vat += without_vat
-                    vat_amount += vat
-                else:
-                    # 3D Modelleme - SABIT FIYAT 15 TL
-                    with_vat = Decimal('15.00')
+                        gross_revenue_with_vat += with_vat
+                        gross_revenue_without_vat += without_vat
+                        vat_amount += vat
+                    else:
+                        # 3D Modelleme - SABIT FIYAT 15 TL
+                        with_vat = Decimal('15.00')
                     
-                    vat_multiplier = Decimal('1') + (pricing.vat_rate / Decimal('100'))
-                    without_vat = with_vat / vat_multiplier
-                    vat = with_vat - without_vat
+                        vat_multiplier = Decimal('1') + (pricing.vat_rate / Decimal('100'))
+                        without_vat = with_vat / vat_multiplier
+                        vat = with_vat - without_vat
                     
-                    gross_revenue_with_vat += with_vat
-                    gross_revenue_without_vat += without_vat
-                    vat_amount += vat
+                        gross_revenue_with_vat += with_vat
+                        gross_revenue_without_vat += without_vat
+                        vat_amount += vat
             
-            # MoldPark komisyonu BRÜT (KDV dahil) tutar üzerinden
-            moldpark_cut = pricing.calculate_moldpark_fee(gross_revenue_with_vat)
+                # MoldPark komisyonu BRÜT (KDV dahil) tutar üzerinden
+                moldpark_cut = pricing.calculate_moldpark_fee(gross_revenue_with_vat)
             
-            # Üreticiye net ödeme: KDV DAHİL brüt tutar - MoldPark komisyonu
-            # NOT: Aylık sistem kullanım ücretleri üretici ödemelerine dahil edilmez
-            net_payment = gross_revenue_with_vat - moldpark_cut
-        else:
-            # Hiç iş yok
-            continue
-        
-        # Toplam hesaplamalara ekle
-        # NOT: total_payments_to_producers zaten işitme merkezlerinden tahsilat bölümündeki net_to_producer değerlerinin toplamından hesaplanıyor
-        # Burada sadece detaylı istatistikler için hesaplama yapılıyor
-        total_producer_gross_revenue += gross_revenue_with_vat
-        total_producer_gross_without_vat += gross_revenue_without_vat
-        total_producer_vat += vat_amount
-        total_moldpark_producer_fee += moldpark_cut
-        total_completed_producer_orders += completed_orders.count() if completed_orders.exists() else 0
-        total_physical_molds += physical_count
-        total_digital_molds += digital_count
-        
-        # Ödeme durumunu kontrol et (bu dönem için)
-        # SimpleNotification'dan son ödeme kaydını bul
-        from core.models import SimpleNotification
-        last_payment = SimpleNotification.objects.filter(
-            user=producer.user,
-            title='✅ Ödeme Onaylandı',
-            created_at__gte=start_date,
-            created_at__lte=end_date
-        ).order_by('-created_at').first()
-        
-        is_paid = last_payment is not None
-        
-        # Ödeme istatistiklerini güncelle
-        if is_paid:
-            paid_producers_count += 1
-        else:
-            pending_producers_count += 1
+                # Üreticiye net ödeme: KDV DAHİL brüt tutar - MoldPark komisyonu
+                # NOT: Aylık sistem kullanım ücretleri üretici ödemelerine dahil edilmez
+                net_payment = gross_revenue_with_vat - moldpark_cut
+            else:
+                # Hiç iş yok
+                continue
         
-        producers_payment_summary.append({
-            'producer': producer,
-            'physical_count': physical_count,
-            'digital_count': digital_count,
-            'total_orders': completed_orders.count() if completed_orders.exists() else 0,
-            'gross_revenue': gross_revenue_with_vat,
-            'gross_revenue_without_vat': gross_revenue_without_vat,
-            'vat_amount': vat_amount,
-            'moldpark_cut': moldpark_cut,
-            'net_payment': net_payment,
-            'is_paid': is_paid,  # Ödeme durumu
-            'has_package_invoice': len(package_invoices) > 0,
-        })
+            producers_payment_summary.append({
+                'producer': producer,
+                'physical_count': physical_count,
+                'digital_count': digital_count,
+                'total_orders': completed_orders.count() if completed_orders.exists() else 0,
+                'gross_revenue': gross_revenue_with_vat,
+                'gross_revenue_without_vat': gross_revenue_without_vat,
+                'vat_amount': vat_amount,
+                'moldpark_cut': moldpark_cut,
+                'net_payment': net_payment,
+                'has_package_invoice': len(package_invoices) > 0,
+            })
+
+    total_producer_gross_revenue = sum((row['gross_revenue'] for row in producers_payment_summary), Decimal('0.00'))
+    total_producer_gross_without_vat = sum(
+        (row['gross_revenue_without_vat'] for row in producers_payment_summary), Decimal('0.00')
+    )
+    total_producer_vat = sum((row['vat_amount'] for row in producers_payment_summary), Decimal('0.00'))
+    total_moldpark_producer_fee = sum((row['moldpark_cut'] for row in producers_payment_summary), Decimal('0.00'))
+    total_completed_producer_orders = sum(row['total_orders'] for row in producers_payment_summary)
+    total_physical_molds = sum(row['physical_count'] for row in producers_payment_summary)
+    total_digital_molds = sum(row['digital_count'] for row in producers_payment_summary)
+
+    # Ödeme durumu (bu dönem için) - son ödeme onayı bildirimleri tek sorguda
+    from core.models import SimpleNotification
+    paid_user_ids = set(SimpleNotification.objects.filter(
+        user_id__in=[row['producer'].user_id for row in producers_payment_summary if row['producer'].pk],
+        title='✅ Ödeme Onaylandı',
+        created_at__gte=start_date,
+        created_at__lte=end_date
+    ).values_list('user_id', flat=True))
+    for row in producers_payment_summary:
+        row['is_paid'] = row['producer'].pk is not None and row['producer'].user_id in paid_user_ids
+    paid_producers_count = sum(1 for row in producers_payment_summary if row['is_paid'])
+    pending_producers_count = len(producers_payment_summary) - paid_producers_count
     
     # ==========================================
     # 3. MOLDPARK NET KAZANCI
@@ -1226,6 +991,7 @@ def admin_financial_control_panel(request):
         'period_name': period_name,
         'start_date': start_date,
         'end_date': end_date,
+        'closed_period': closed_period,
         
         # Tahsilatlar
         'centers_with_physical_molds': centers_with_physical_molds,
@@ -1256,7 +1022,7 @@ def admin_financial_control_panel(request):
         'producer_invoice_stats': producer_invoice_stats,
         
         # Ek Bilgiler
-        'total_centers': all_centers.count(),  # Aktif merkez sayısı
+        'total_centers': len(centers_with_physical_molds),  # Aktif merkez sayısı
         'pricing': pricing,  # Fiyatlandırma bilgisi
     }
     
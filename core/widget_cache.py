@@ -0,0 +1,75 @@
+"""
+Dashboard Widget Önbelleği
+moldpark_extras widget'larının verisini widget başına TTL ile önbelleğe alır.
+Anahtarlar widget'ın bağlı olduğu modellerin sürümlerini içerir; model kayıtları
+değiştiğinde (post_save / post_delete) sürüm artırılır ve ilgili widget'lar
+bir sonraki çizimde yeniden hesaplanır.
+"""
+from functools import wraps
+
+from django.core.cache import cache
+
+from .cache_versions import bump_version, get_versions
+
+
+MODEL_VERSION_KEY = 'widget:model:{}:version'
+WIDGET_KEY = 'widget:{name}:{args}:{versions}'
+
+DEFAULT_TIMEOUT = 60 * 5  # 5 dakika
+
+# Widget başına önbellek süresi (saniye)
+WIDGET_TIMEOUTS = {
+    'system_stats': 60 * 5,
+    'production_pipeline': 60,
+    'performance_metrics': 60 * 15,
+    'network_health': 60 * 5,
+    'recent_activities': 60,
+    'system_alerts': 60 * 2,
+    'system_health_widget': 60,
+    'lead_time': 60 * 15,
+}
+
+
+def model_label(model):
+    return model._meta.label_lower
+
+
+def get_model_versions(labels):
+    """Model sürümlerini döndür - olmayanlar zaman damgası ile başlatılır"""
+    keys = [MODEL_VERSION_KEY.format(label) for label in labels]
+    versions = get_versions(keys)
+    return [str(versions[key]) for key in keys]
+
+
+def bump_model_version(model):
+    """Modele bağlı tüm widget önbelleklerini geçersiz kıl"""
+    bump_version(MODEL_VERSION_KEY.format(model_label(model)))
+
+
+def cached_widget(name, models=(), timeout=None):
+    """
+    Widget verisini önbelleğe alan dekoratör
+
+    Args:
+        name: Widget adı (WIDGET_TIMEOUTS anahtarı)
+        models: Değişince önbelleği geçersiz kılan modeller
+        timeout: Varsayılan yerine kullanılacak süre
+    """
+    labels = [model_label(model) for model in models]
+    timeout = timeout if timeout is not None else WIDGET_TIMEOUTS.get(name, DEFAULT_TIMEOUT)
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = WIDGET_KEY.format(
+                name=name,
+                args='-'.join([str(arg) for arg in args] + [f'{k}={v}' for k, v in sorted(kwargs.items())]),
+                versions='.'.join(get_model_versions(labels)),
+            )
+            data = cache.get(key)
+            if data is None:
+                data = func(*args, **kwargs)
+                cache.set(key, data, timeout)
+            return data
+        return wrapper
+    return decorator
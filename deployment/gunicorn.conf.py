@@ -0,0 +1,22 @@
+"""
+Gunicorn ayarları - Prometheus çok süreçli metrikleri için
+PROMETHEUS_MULTIPROC_DIR ayarlıysa dizin başlangıçta temizlenir ve ölen
+worker'ların metrik dosyaları işaretlenir.
+
+Kullanım: gunicorn -c deployment/gunicorn.conf.py backend.wsgi:application
+"""
+import os
+import shutil
+
+
+def on_starting(server):
+    metrics_dir = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if metrics_dir:
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+        os.makedirs(metrics_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.23 on 2026-10-19 14:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mold', '0015_add_unit_price_fields'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='earmold',
+            index=models.Index(fields=['created_at', 'id'], name='mold_earmol_created_900ca4_idx'),
+        ),
+    ]
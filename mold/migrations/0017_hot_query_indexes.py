@@ -0,0 +1,25 @@
+# Generated by Django 4.2.23 on 2026-10-19 14:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mold', '0016_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='earmold',
+            index=models.Index(fields=['center', 'status'], name='mold_center_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='earmold',
+            index=models.Index(fields=['center', 'created_at'], name='mold_center_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='earmold',
+            index=models.Index(condition=models.Q(('is_physical_shipment', True)), fields=['center', 'created_at'], name='mold_center_physical_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """core.0002'deki ham SQL indeksleri model indeksleriyle (0017) aynı sütunları kapsıyor"""
+
+    dependencies = [
+        ('core', '0002_auto_20250618_1353'),
+        ('mold', '0017_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            "DROP INDEX IF EXISTS idx_earmold_center_status;",
+            reverse_sql="CREATE INDEX IF NOT EXISTS idx_earmold_center_status ON mold_earmold(center_id, status);"
+        ),
+        migrations.RunSQL(
+            "DROP INDEX IF EXISTS idx_mold_center_created;",
+            reverse_sql="CREATE INDEX IF NOT EXISTS idx_mold_center_created ON mold_earmold(center_id, created_at DESC);"
+        ),
+    ]
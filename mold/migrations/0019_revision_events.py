@@ -0,0 +1,124 @@
+# Generated by Django 4.2.23 on 2026-10-19 14:59
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+from datetime import datetime
+
+from django.utils import timezone
+
+
+# Eski tarih alanı -> ulaşılan durum (geçiş adımı bulunmayan talepler için)
+STATUS_FIELDS = [
+    ('producer_reviewed_at', 'producer_review'),
+    ('work_started_at', 'in_progress'),
+    ('quality_checked_at', 'quality_check'),
+    ('completed_at', 'completed'),
+]
+
+# Eski save() her geçişte "Status <eski etiket> → <yeni etiket>" adımı yazardı
+STATUS_STEP_PREFIX = 'Status '
+STATUS_STEP_ARROW = ' → '
+
+
+def _parse_timestamp(value, fallback):
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return fallback
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+
+def _parse_status_step(name, keys):
+    """'Status Beklemede → Kabul Edildi' -> ('pending', 'accepted'); durum adımı değilse None"""
+    if not name.startswith(STATUS_STEP_PREFIX) or STATUS_STEP_ARROW not in name:
+        return None
+    old_label, new_label = name[len(STATUS_STEP_PREFIX):].split(STATUS_STEP_ARROW, 1)
+    to_status = keys.get(new_label.strip())
+    if to_status is None:
+        return None
+    return keys.get(old_label.strip(), ''), to_status
+
+
+def backfill_revision_events(apps, schema_editor):
+    """
+    Mevcut talepler için olaylar: oluşturma, process_steps adımları ve durum geçişleri
+
+    "Status X → Y" adımları etiketleri STATUS_CHOICES ile anahtara çevrilerek
+    zaman ve kullanıcısıyla durum olayı olur. Tarih alanları sadece o duruma
+    ait geçiş adımı bulunmayan talepler için kullanılır.
+    """
+    RevisionRequest = apps.get_model('mold', 'RevisionRequest')
+    RevisionEvent = apps.get_model('mold', 'RevisionEvent')
+    choices = RevisionRequest._meta.get_field('status').choices
+    labels = dict(choices)
+    # Etiket ya da anahtar -> anahtar
+    keys = {**{key: key for key, _ in choices}, **{str(label): key for key, label in choices}}
+
+    events = []
+    revisions = RevisionRequest.objects.order_by('id').values(
+        'id', 'status', 'created_at', 'process_steps', *[field for field, _ in STATUS_FIELDS],
+    )
+    for revision in revisions.iterator(chunk_size=2000):
+        events.append(RevisionEvent(
+            revision_id=revision['id'], event_type='created', step='Revizyon talebi oluşturuldu',
+            to_status='pending', created_at=revision['created_at'],
+        ))
+        reached = set()
+        for step in revision['process_steps'] or []:
+            name = str(step.get('step') or '')
+            if not name:
+                continue
+            event = RevisionEvent(
+                revision_id=revision['id'], event_type='step', step=name[:255],
+                description=str(step.get('description') or ''),
+                user_name=str(step.get('user') or 'System')[:150],
+                created_at=_parse_timestamp(step.get('timestamp'), revision['created_at']),
+            )
+            transition = _parse_status_step(name, keys)
+            if transition:
+                event.event_type = 'status'
+                event.from_status, event.to_status = transition
+                reached.add(event.to_status)
+            events.append(event)
+        for field, status in STATUS_FIELDS:
+            if revision[field] and status not in reached:
+                events.append(RevisionEvent(
+                    revision_id=revision['id'], event_type='status', to_status=status,
+                    step=f'Status → {labels.get(status, status)}', created_at=revision[field],
+                ))
+        if len(events) >= 2000:
+            RevisionEvent.objects.bulk_create(events)
+            events = []
+    RevisionEvent.objects.bulk_create(events)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mold', '0018_drop_legacy_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevisionEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(choices=[('created', 'Oluşturuldu'), ('status', 'Durum Değişikliği'), ('step', 'Süreç Adımı')], max_length=10, verbose_name='Olay Türü')),
+                ('step', models.CharField(max_length=255, verbose_name='Adım')),
+                ('description', models.TextField(blank=True, verbose_name='Açıklama')),
+                ('from_status', models.CharField(blank=True, max_length=20, verbose_name='Önceki Durum')),
+                ('to_status', models.CharField(blank=True, max_length=20, verbose_name='Yeni Durum')),
+                ('user_name', models.CharField(default='System', max_length=150, verbose_name='Kullanıcı')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Tarih')),
+                ('revision', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='events', to='mold.revisionrequest', verbose_name='Revizyon Talebi')),
+            ],
+            options={
+                'verbose_name': 'Revizyon Olayı',
+                'verbose_name_plural': 'Revizyon Olayları',
+                'ordering': ['created_at', 'id'],
+                'indexes': [models.Index(fields=['revision', 'created_at'], name='revision_event_timeline_idx'), models.Index(fields=['to_status', 'revision', 'created_at'], name='revision_event_status_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_revision_events, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.23 on 2026-10-19 19:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mold', '0019_revision_events'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='revisionrequest',
+            name='process_steps',
+        ),
+    ]
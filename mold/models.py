@@ -5,7 +5,8 @@ from django.core.exceptions import ValidationError
 from .validators import validate_file_size
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_save, pre_delete
 from django.dispatch import receiver
 
 def validate_scan_file_size(value):
@@ -151,6 +152,17 @@ class EarMold(models.Model):
         verbose_name = 'Kulak Kalıbı'
         verbose_name_plural = 'Kulak Kalıpları'
         ordering = ['-created_at']
+        indexes = [
+            # Keyset sayfalama: (created_at, id) imleci
+            models.Index(fields=['created_at', 'id']),
+            # Merkez paneli: durum sayımları, aylık kullanım ve fiziksel gönderim listeleri
+            models.Index(fields=['center', 'status'], name='mold_center_status_idx'),
+            models.Index(fields=['center', 'created_at'], name='mold_center_created_idx'),
+            models.Index(
+                fields=['center', 'created_at'], name='mold_center_physical_idx',
+                condition=models.Q(is_physical_shipment=True),
+            ),
+        ]
 
     def approve_delivery(self, center, notes=''):
         """Teslimatı onayla"""
@@ -449,9 +461,6 @@ class RevisionRequest(models.Model):
     admin_response_time = models.DurationField('Admin Yanıt Süresi', blank=True, null=True)
     producer_response_time = models.DurationField('Üretici Yanıt Süresi', blank=True, null=True)
     
-    # Süreç Takibi
-    process_steps = models.JSONField('Süreç Adımları', default=list, blank=True)
-    
     class Meta:
         verbose_name = 'Revizyon Talebi'
         verbose_name_plural = 'Revizyon Talepleri'
@@ -461,6 +470,22 @@ class RevisionRequest(models.Model):
             models.Index(fields=['created_at', 'status']),
         ]
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Üretici rozet sayaçlarına fark uygulamak için yüklenen durumu sakla
+        instance._badge_state = (instance.__dict__.get('modeled_mold_id'), instance.__dict__.get('status'))
+        # Durum geçişlerini save() içinde yeniden okumadan tespit etmek için
+        instance._original_status = instance.__dict__.get('status')
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        # Yeniden okunan değerler yüklenen durum olur - sonraki save() geçiş saymasın
+        if fields is None or 'status' in fields or 'modeled_mold' in fields or 'modeled_mold_id' in fields:
+            self._badge_state = (self.__dict__.get('modeled_mold_id'), self.__dict__.get('status'))
+            self._original_status = self.__dict__.get('status')
+
     @property
     def mold(self):
         """Uyumluluk için - modeled_mold.ear_mold'a referans"""
@@ -479,23 +504,25 @@ class RevisionRequest(models.Model):
             pass
         return f'RevisionRequest #{self.pk}'
     
+    # Durum -> Bootstrap renk sınıfı (RevisionEvent.get_status_color de kullanır)
+    STATUS_COLORS = {
+        'pending': 'warning',
+        'admin_review': 'info',
+        'approved': 'success',
+        'rejected': 'danger',
+        'producer_review': 'primary',
+        'accepted': 'success',
+        'producer_rejected': 'danger',
+        'in_progress': 'primary',
+        'quality_check': 'info',
+        'ready_for_delivery': 'success',
+        'completed': 'success',
+        'cancelled': 'secondary',
+    }
+
     def get_status_color(self):
         """Bootstrap renk sınıfı döndürür"""
-        color_map = {
-            'pending': 'warning',
-            'admin_review': 'info',
-            'approved': 'success', 
-            'rejected': 'danger',
-            'producer_review': 'primary',
-            'accepted': 'success',
-            'producer_rejected': 'danger',
-            'in_progress': 'primary',
-            'quality_check': 'info',
-            'ready_for_delivery': 'success',
-            'completed': 'success',
-            'cancelled': 'secondary',
-        }
-        return color_map.get(self.status, 'secondary')
+        return self.STATUS_COLORS.get(self.status, 'secondary')
     
     def get_priority_color(self):
         """Öncelik için Bootstrap renk sınıfı döndürür"""
@@ -547,60 +574,20 @@ class RevisionRequest(models.Model):
         expected_date = self.get_expected_completion_date()
         return date.today() > expected_date
     
-    def add_process_step(self, step_name, description="", user=None):
-        """Süreç adımı ekle - harici kullanım için"""
-        from django.utils import timezone
-        
-        # User kontrolü - string, User objesi veya None olabilir
-        if user is None:
-            user_name = 'System'
-        elif hasattr(user, 'username'):
-            user_name = user.username
-        elif isinstance(user, str):
-            user_name = user
-        else:
-            user_name = str(user)
-        
-        step = {
-            'step': step_name,
-            'description': description,
-            'timestamp': timezone.now().isoformat(),
-            'user': user_name,
-        }
-        
-        if not self.process_steps:
-            self.process_steps = []
-        
-        self.process_steps.append(step)
-        self.save()
-    
-    def add_process_step_without_save(self, step_name, description="", user=None):
-        """Süreç adımı ekle - save çağırmadan"""
-        from django.utils import timezone
-        
-        # User kontrolü - string, User objesi veya None olabilir
-        if user is None:
-            user_name = 'System'
-        elif hasattr(user, 'username'):
-            user_name = user.username
-        elif isinstance(user, str):
-            user_name = user
-        else:
-            user_name = str(user)
-        
-        step = {
-            'step': step_name,
-            'description': description,
-            'timestamp': timezone.now().isoformat(),
-            'user': user_name,
-        }
-        
-        if not self.process_steps:
-            self.process_steps = []
-        
-        self.process_steps.append(step)
-        # save() çağırma - sonsuz döngü önlemek için
-        RevisionRequest.objects.filter(pk=self.pk).update(process_steps=self.process_steps)
+    def add_process_step(self, step_name, description="", user=None, status=''):
+        """Süreç adımı ekle - olay tablosuna tek INSERT, talep satırı yeniden yazılmaz"""
+        return RevisionEvent.objects.create(
+            revision=self,
+            event_type='step',
+            step=step_name,
+            description=description or '',
+            to_status=status,
+            user_name=RevisionEvent.user_display(user),
+        )
+
+    def add_process_step_without_save(self, step_name, description="", user=None, status=''):
+        """Geriye uyumluluk - add_process_step zaten talebi kaydetmez"""
+        return self.add_process_step(step_name, description, user, status)
     
     def calculate_response_times(self):
         """Yanıt sürelerini hesapla"""
@@ -614,42 +601,44 @@ class RevisionRequest(models.Model):
         """Revizyon talebi kaydedilirken otomatik işlemler"""
         from django.utils import timezone
         
-        # Status değişikliklerini takip et
-        process_step_needed = False
-        step_description = ""
+        adding = self._state.adding
+        old_status = None if adding else getattr(self, '_original_status', None)
+        if not adding and old_status is None:
+            # Durum alanı yüklenmemiş (only/defer) - sadece durumu oku
+            old_status = RevisionRequest.objects.filter(pk=self.pk).values_list('status', flat=True).first()
         
-        if self.pk:
-            try:
-                old_instance = RevisionRequest.objects.get(pk=self.pk)
-                if old_instance.status != self.status:
-                    # Status değişti - tarih güncelle
-                    now = timezone.now()
-                    
-                    if self.status == 'producer_review':
-                        self.producer_reviewed_at = now
-                    elif self.status == 'in_progress':
-                        self.work_started_at = now
-                    elif self.status == 'quality_check':
-                        self.quality_checked_at = now
-                    elif self.status == 'completed':
-                        self.completed_at = now
-                        self.resolved_at = now
-                    
-                    # Süreç adımı için bilgi hazırla
-                    process_step_needed = True
-                    step_description = f"Status {old_instance.get_status_display()} → {self.get_status_display()}"
-            except RevisionRequest.DoesNotExist:
-                pass
+        # Status değişti - tarih güncelle
+        status_changed = not adding and old_status is not None and old_status != self.status
+        if status_changed:
+            now = timezone.now()
+            
+            if self.status == 'producer_review':
+                self.producer_reviewed_at = now
+            elif self.status == 'in_progress':
+                self.work_started_at = now
+            elif self.status == 'quality_check':
+                self.quality_checked_at = now
+            elif self.status == 'completed':
+                self.completed_at = now
+                self.resolved_at = now
         
         # Yanıt sürelerini hesapla
         self.calculate_response_times()
         
-        # Önce kaydet
         super().save(*args, **kwargs)
         
-        # Sonra süreç adımını ekle (sonsuz döngü önlemek için)
-        if process_step_needed:
-            self.add_process_step_without_save(step_description)
+        # Geçişi olay tablosuna ekle
+        if adding:
+            RevisionEvent.objects.create(
+                revision=self, event_type='created', step='Revizyon talebi oluşturuldu',
+                to_status=self.status, created_at=self.created_at,
+            )
+        elif status_changed:
+            RevisionEvent.objects.create(
+                revision=self, event_type='status', from_status=old_status, to_status=self.status,
+                step=f"Status {dict(self.STATUS_CHOICES).get(old_status, old_status)} → {self.get_status_display()}",
+            )
+        self._original_status = self.status
     
     def get_next_steps(self):
         """Sonraki adımları döndür"""
@@ -667,55 +656,106 @@ class RevisionRequest(models.Model):
         return next_steps.get(self.status, [])
     
     def get_timeline_data(self):
-        """Zaman çizelgesi verilerini döndür"""
+        """Zaman çizelgesi verilerini döndür - durum olaylarından (prefetch edilmişse sorgu yok)"""
+        from .revision_timeline import STAGES
+
         timeline = []
-        
-        if self.created_at:
-            timeline.append({
-                'date': self.created_at,
-                'title': 'Revizyon Talebi Oluşturuldu',
-                'description': f'{self.center.company_name} tarafından revizyon talep edildi',
-                'status': 'pending',
-                'icon': 'fas fa-plus',
-            })
-        
-        if self.producer_reviewed_at:
-            timeline.append({
-                'date': self.producer_reviewed_at,
-                'title': 'Üretici İncelemesi',
-                'description': 'Üretici tarafından incelendi',
-                'status': 'producer_review',
-                'icon': 'fas fa-industry',
-            })
-        
-        if self.work_started_at:
-            timeline.append({
-                'date': self.work_started_at,
-                'title': 'İş Başladı',
-                'description': 'Revizyon işlemi başladı',
-                'status': 'in_progress',
-                'icon': 'fas fa-tools',
-            })
-        
-        if self.quality_checked_at:
-            timeline.append({
-                'date': self.quality_checked_at,
-                'title': 'Kalite Kontrol',
-                'description': 'Kalite kontrol yapıldı',
-                'status': 'quality_check',
-                'icon': 'fas fa-check-circle',
-            })
-        
-        if self.completed_at:
+        for event in self.events.all():
+            status = 'pending' if event.event_type == 'created' else event.to_status
+            if event.event_type == 'step' or status not in STAGES:
+                continue
+            title, description, icon = STAGES[status]
+            if event.event_type == 'created':
+                description = f'{self.center.name} tarafından revizyon talep edildi'
             timeline.append({
-                'date': self.completed_at,
-                'title': 'Tamamlandı',
-                'description': 'Revizyon süreci tamamlandı',
-                'status': 'completed',
-                'icon': 'fas fa-flag-checkered',
+                'date': event.created_at,
+                'title': title,
+                'description': description,
+                'status': status,
+                'icon': icon,
             })
-        
-        return sorted(timeline, key=lambda x: x['date'])
+        return timeline
+
+
+class RevisionEvent(models.Model):
+    """Revizyon talebi olayları - sadece ekleme yapılır, zaman çizelgesi ve SLA bu tablodan okunur"""
+
+    EVENT_TYPE_CHOICES = [
+        ('created', 'Oluşturuldu'),
+        ('status', 'Durum Değişikliği'),
+        ('step', 'Süreç Adımı'),
+    ]
+
+    # FK indeksi yerine (revision, created_at) bileşik indeksi kullanılır
+    revision = models.ForeignKey(RevisionRequest, on_delete=models.CASCADE, related_name='events', verbose_name='Revizyon Talebi', db_index=False)
+    event_type = models.CharField('Olay Türü', max_length=10, choices=EVENT_TYPE_CHOICES)
+    step = models.CharField('Adım', max_length=255)
+    description = models.TextField('Açıklama', blank=True)
+    from_status = models.CharField('Önceki Durum', max_length=20, blank=True)
+    to_status = models.CharField('Yeni Durum', max_length=20, blank=True)
+    user_name = models.CharField('Kullanıcı', max_length=150, default='System')
+    created_at = models.DateTimeField('Tarih', default=timezone.now)
+
+    class Meta:
+        verbose_name = 'Revizyon Olayı'
+        verbose_name_plural = 'Revizyon Olayları'
+        ordering = ['created_at', 'id']
+        indexes = [
+            # Talep bazında zaman çizelgesi
+            models.Index(fields=['revision', 'created_at'], name='revision_event_timeline_idx'),
+            # SLA: duruma ilk ulaşma zamanları
+            models.Index(fields=['to_status', 'revision', 'created_at'], name='revision_event_status_idx'),
+        ]
+
+    def __str__(self):
+        return f'#{self.revision_id} {self.step}'
+
+    def save(self, *args, **kwargs):
+        if self.pk:
+            raise ValidationError('Revizyon olayları değiştirilemez.')
+        super().save(*args, **kwargs)
+
+    @property
+    def timestamp(self):
+        """Eski process_steps sözlükleriyle uyumlu alan adı"""
+        return self.created_at
+
+    @property
+    def user(self):
+        return self.user_name
+
+    def get_status_color(self):
+        """Olayın ulaştığı durumun Bootstrap rengi - durum içermeyen adımlar için secondary"""
+        return RevisionRequest.STATUS_COLORS.get(self.to_status, 'secondary')
+
+    @staticmethod
+    def user_display(user):
+        """User objesi, string veya None"""
+        if user is None:
+            return 'System'
+        if hasattr(user, 'username'):
+            return user.username
+        return str(user)
+
+    @classmethod
+    def record_status_change(cls, revisions, to_status, user=None):
+        """
+        Toplu UPDATE ile durumu değişen talepler için olaylar (save() çağrılmadığında)
+
+        Args:
+            revisions: (id, önceki durum) çiftleri - UPDATE'ten önce okunmuş
+        """
+        label = dict(RevisionRequest.STATUS_CHOICES)
+        now = timezone.now()
+        return cls.objects.bulk_create([
+            cls(
+                revision_id=revision_id, event_type='status', from_status=old_status, to_status=to_status,
+                step=f'Status {label.get(old_status, old_status)} → {label.get(to_status, to_status)}',
+                user_name=cls.user_display(user), created_at=now,
+            )
+            for revision_id, old_status in revisions
+            if old_status != to_status
+        ])
 
 
 class MoldEvaluation(models.Model):
@@ -754,6 +794,54 @@ class MoldEvaluation(models.Model):
     def __str__(self):
         return f'{self.mold} - Kalite: {self.quality_score}/10, Hız: {self.speed_score}/10'
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Üretici puan özetine fark uygulamak için yüklenen puanları sakla
+        instance._loaded_scores = (
+            instance.__dict__.get('quality_score'),
+            instance.__dict__.get('speed_score'),
+        )
+        return instance
+    
+    def save(self, *args, **kwargs):
+        """Kaydederken üretici değerlendirme özetini aynı işlemde güncelle"""
+        with transaction.atomic():
+            previous = None
+            if not self._state.adding:
+                previous = getattr(self, '_loaded_scores', None)
+                if previous is None or None in previous:
+                    previous = MoldEvaluation.objects.filter(pk=self.pk).values_list(
+                        'quality_score', 'speed_score'
+                    ).first()
+            
+            super().save(*args, **kwargs)
+            
+            if previous is None:
+                self.update_producer_rating_stats(1, self.quality_score, self.speed_score)
+            else:
+                self.update_producer_rating_stats(
+                    0,
+                    self.quality_score - previous[0],
+                    self.speed_score - previous[1],
+                )
+            self._loaded_scores = (self.quality_score, self.speed_score)
+    
+    def get_producer_ids(self):
+        """Bu kalıbın siparişlerinin bağlı olduğu üreticiler"""
+        from producer.models import ProducerOrder
+        return list(
+            ProducerOrder.objects.filter(ear_mold_id=self.mold_id)
+            .values_list('producer_id', flat=True).distinct()
+        )
+    
+    def update_producer_rating_stats(self, count, quality, speed):
+        """Üretici puan özetlerine fark uygula"""
+        from producer.models import ProducerRatingStats
+        ProducerRatingStats.apply_delta(
+            self.get_producer_ids(), count=count, quality=quality, speed=speed
+        )
+    
     def get_average_score(self):
         """Ortalama puanı hesaplar"""
         scores = [self.quality_score, self.speed_score]
@@ -786,6 +874,17 @@ class MoldEvaluation(models.Model):
 # SIGNALS - Otomatik İşlemler
 # ========================================
 
+@receiver(pre_delete, sender=MoldEvaluation)
+def decrement_producer_rating_stats(sender, instance, **kwargs):
+    """Değerlendirme silinirken üretici puan özetinden düş"""
+    # pre_delete, silme işleminin transaction'ı içinde ve kalıbın siparişleri
+    # henüz silinmeden çalışır
+    scores = getattr(instance, '_loaded_scores', None)
+    if scores is None or None in scores:
+        scores = (instance.quality_score, instance.speed_score)
+    instance.update_producer_rating_stats(-1, -scores[0], -scores[1])
+
+
 # Signal sistemi geçici olarak devre dışı - Manuel oluşturma tercih ediliyor
 # @receiver(post_save, sender=EarMold)
 # def create_cargo_shipment_on_mold_completion(sender, instance, created, **kwargs):
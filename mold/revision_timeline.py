@@ -0,0 +1,116 @@
+"""
+Revizyon Zaman Çizelgesi ve SLA
+Durum geçişleri RevisionEvent tablosuna eklenir; zaman çizelgeleri ve SLA
+ölçümleri talepteki tarih alanlarından tek tek değil, olay tablosunun
+(revision, created_at) indeksi üzerinden tüm talepler için tek sorguda
+hesaplanır. Gecikme sayımı da Python döngüsü yerine veritabanında yapılır.
+"""
+from collections import namedtuple
+from datetime import timedelta
+
+from django.db.models import Case, DateField, ExpressionWrapper, F, Min, Q, Value, When
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import RevisionEvent, RevisionRequest
+
+
+# Durum -> (başlık, açıklama, ikon) - zaman çizelgesinde gösterilen aşamalar
+STAGES = {
+    'pending': ('Revizyon Talebi Oluşturuldu', 'Revizyon talep edildi', 'fas fa-plus'),
+    'producer_review': ('Üretici İncelemesi', 'Üretici tarafından incelendi', 'fas fa-industry'),
+    'in_progress': ('İş Başladı', 'Revizyon işlemi başladı', 'fas fa-tools'),
+    'quality_check': ('Kalite Kontrol', 'Kalite kontrol yapıldı', 'fas fa-check-circle'),
+    'completed': ('Tamamlandı', 'Revizyon süreci tamamlandı', 'fas fa-flag-checkered'),
+}
+
+# Beklenen teslim tarihi girilmemişse önceliğe göre süre (gün)
+PRIORITY_DAYS = {'low': 10, 'normal': 7, 'high': 4, 'urgent': 2}
+DEFAULT_PRIORITY_DAYS = 7
+CLOSED_STATUSES = ('completed', 'cancelled')
+
+SlaSummary = namedtuple('SlaSummary', 'count reviewed completed avg_review_hours avg_completion_days')
+
+
+def stage_times(revisions):
+    """
+    Taleplerin her aşamaya ilk ulaştığı an - tek gruplu sorgu
+
+    Args:
+        revisions: RevisionRequest sorgu kümesi veya id listesi
+
+    Returns:
+        dict: revision_id -> {'created' veya durum: datetime}
+    """
+    statuses = [status for status in STAGES if status != 'pending']
+    rows = (
+        RevisionEvent.objects.filter(revision__in=revisions)
+        .filter(Q(event_type='created') | Q(event_type='status', to_status__in=statuses))
+        .values('revision_id')
+        .annotate(
+            created=Min('created_at', filter=Q(event_type='created')),
+            **{status: Min('created_at', filter=Q(event_type='status', to_status=status)) for status in statuses},
+        )
+        .order_by()
+    )
+    return {
+        row.pop('revision_id'): {status: value for status, value in row.items() if value}
+        for row in rows
+    }
+
+
+def sla_summary(revisions):
+    """
+    İnceleme ve tamamlanma süreleri
+
+    Returns:
+        SlaSummary: avg_review_hours (oluşturma -> üretici incelemesi),
+        avg_completion_days (oluşturma -> tamamlanma)
+    """
+    times = stage_times(revisions)
+    review_hours = []
+    completion_days = []
+    for stages in times.values():
+        created = stages.get('created')
+        if not created:
+            continue
+        if 'producer_review' in stages:
+            review_hours.append((stages['producer_review'] - created).total_seconds() / 3600)
+        if 'completed' in stages:
+            completion_days.append((stages['completed'] - created).total_seconds() / 86400)
+    return SlaSummary(
+        count=len(times),
+        reviewed=len(review_hours),
+        completed=len(completion_days),
+        avg_review_hours=round(sum(review_hours) / len(review_hours), 1) if review_hours else None,
+        avg_completion_days=round(sum(completion_days) / len(completion_days), 1) if completion_days else None,
+    )
+
+
+def with_due_date(queryset):
+    """due_date: beklenen teslim tarihi, yoksa oluşturma + öncelik süresi (RevisionRequest.get_expected_completion_date)"""
+    created = TruncDate('created_at', tzinfo=timezone.get_current_timezone())
+    default_due = Case(
+        *[
+            When(priority=priority, then=ExpressionWrapper(
+                created + Value(timedelta(days=days)), output_field=DateField(),
+            ))
+            for priority, days in PRIORITY_DAYS.items()
+        ],
+        default=ExpressionWrapper(created + Value(timedelta(days=DEFAULT_PRIORITY_DAYS)), output_field=DateField()),
+        output_field=DateField(),
+    )
+    return queryset.annotate(
+        due_date=Case(
+            When(expected_delivery__isnull=False, then=F('expected_delivery')),
+            default=default_due,
+            output_field=DateField(),
+        )
+    )
+
+
+def overdue(queryset=None, today=None):
+    """Gecikmedeki açık talepler - RevisionRequest.is_overdue ile aynı kural, veritabanında"""
+    queryset = RevisionRequest.objects.all() if queryset is None else queryset
+    today = today or timezone.localdate()
+    return with_due_date(queryset.exclude(status__in=CLOSED_STATUSES)).filter(due_date__lt=today)
@@ -1,3 +1,222 @@
-from django.test import TestCase
+import importlib
+from datetime import timedelta
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.tests.factories import make_center, make_mold, make_network, make_order, make_producer
+from mold.models import ModeledMold, RevisionEvent, RevisionRequest
+from mold.revision_timeline import overdue, sla_summary, stage_times
+
+
+class RevisionData:
+
+    def setUp(self):
+        self.center = make_center()
+        self.producer = make_producer()
+        make_network(self.producer, self.center)
+        self.mold = make_mold(self.center)
+        self.order = make_order(self.producer, self.center, self.mold)
+        self.modeled_mold = ModeledMold.objects.create(ear_mold=self.mold, file='modeled/test.stl')
+
+    def revision(self, **kwargs):
+        return RevisionRequest.objects.create(
+            modeled_mold=self.modeled_mold, center=self.center, revision_type='other',
+            title='Revizyon', description='Açıklama', **kwargs
+        )
+
+
+class RevisionEventTests(RevisionData, TestCase):
+
+    def test_status_changes_append_events(self):
+        revision = RevisionRequest.objects.get(pk=self.revision().pk)
+        revision.status = 'producer_review'
+        revision.save()
+        revision.status = 'in_progress'
+        revision.save()
+        revision.save()  # durum değişmedi
+        revision.add_process_step('Model düzenlendi', 'Vent genişletildi', self.producer.user, status='in_progress')
+
+        self.assertEqual(list(revision.events.values_list('event_type', 'from_status', 'to_status')), [
+            ('created', '', 'pending'),
+            ('status', 'pending', 'producer_review'),
+            ('status', 'producer_review', 'in_progress'),
+            ('step', '', 'in_progress'),
+        ])
+        self.assertEqual(revision.events.last().user_name, self.producer.user.username)
+        self.assertIsNotNone(RevisionRequest.objects.get(pk=revision.pk).work_started_at)
+
+    def test_status_change_does_not_reload_the_row(self):
+        revision = RevisionRequest.objects.get(pk=self.revision().pk)
+        revision.status = 'producer_review'
+        with CaptureQueriesContext(connection) as queries:
+            revision.save()
+        selects = [query['sql'] for query in queries if query['sql'].startswith('SELECT')]
+        self.assertFalse([sql for sql in selects if 'FROM "mold_revisionrequest"' in sql])
+
+    def test_save_after_refresh_does_not_record_transition(self):
+        revision = RevisionRequest.objects.get(pk=self.revision().pk)
+        other = RevisionRequest.objects.get(pk=revision.pk)
+        other.status = 'completed'
+        other.save()
+        completed_at = RevisionRequest.objects.get(pk=revision.pk).completed_at
+
+        revision.refresh_from_db()
+        revision.save()
+
+        self.assertEqual(revision.events.filter(event_type='status').count(), 1)
+        self.assertEqual(RevisionRequest.objects.get(pk=revision.pk).completed_at, completed_at)
+
+    def test_events_are_append_only(self):
+        event = self.revision().events.get()
+        event.step = 'Değişti'
+        with self.assertRaises(ValidationError):
+            event.save()
+
+    def test_bulk_status_change_records_events(self):
+        revisions = [self.revision(), self.revision(status='completed')]
+        RevisionEvent.record_status_change([(revision.pk, revision.status) for revision in revisions], 'completed')
+        self.assertEqual(RevisionEvent.objects.filter(event_type='status').count(), 1)
+
+    def test_timeline_uses_prefetched_events(self):
+        revision = self.revision()
+        revision.status = 'producer_review'
+        revision.save()
+        revision = RevisionRequest.objects.select_related('center').prefetch_related('events').get(pk=revision.pk)
+        with self.assertNumQueries(0):
+            timeline = revision.get_timeline_data()
+        self.assertEqual([item['status'] for item in timeline], ['pending', 'producer_review'])
+
+    def test_status_color(self):
+        revision = self.revision()
+        revision.add_process_step('Not', user='ali')
+        created, step = revision.events.all()
+        self.assertEqual(created.get_status_color(), 'warning')
+        self.assertEqual(step.get_status_color(), 'secondary')
+
+
+class RevisionTimelineTests(RevisionData, TestCase):
+
+    def test_stage_times_in_one_query(self):
+        revisions = [self.revision() for _ in range(3)]
+        revisions[0].status = 'completed'
+        revisions[0].save()
+        with self.assertNumQueries(1):
+            times = stage_times(RevisionRequest.objects.all())
+        self.assertEqual(set(times), {revision.pk for revision in revisions})
+        self.assertEqual(set(times[revisions[0].pk]), {'created', 'completed'})
+
+    def test_sla_summary(self):
+        revision = self.revision()
+        RevisionEvent.objects.filter(revision=revision).update(created_at=timezone.now() - timedelta(days=2))
+        revision.status = 'producer_review'
+        revision.save()
+        revision.status = 'completed'
+        revision.save()
+        summary = sla_summary(RevisionRequest.objects.all())
+        self.assertEqual((summary.count, summary.reviewed, summary.completed), (1, 1, 1))
+        self.assertEqual(summary.avg_completion_days, 2.0)
+        self.assertEqual(summary.avg_review_hours, 48.0)
+
+    def test_overdue_matches_is_overdue(self):
+        revisions = [self.revision(priority='urgent') for _ in range(4)]
+        RevisionRequest.objects.filter(pk=revisions[0].pk).update(created_at=timezone.now() - timedelta(days=5))
+        RevisionRequest.objects.filter(pk=revisions[1].pk).update(
+            expected_delivery=timezone.localdate() - timedelta(days=1)
+        )
+        RevisionRequest.objects.filter(pk=revisions[2].pk).update(
+            created_at=timezone.now() - timedelta(days=5), status='completed'
+        )
+        expected = {revision.pk for revision in RevisionRequest.objects.all() if revision.is_overdue()}
+        self.assertEqual(expected, {revisions[0].pk, revisions[1].pk})
+        self.assertEqual(set(overdue().values_list('pk', flat=True)), expected)
+
+
+class RevisionViewTests(RevisionData, TestCase):
+
+    def test_admin_revision_list_shows_events(self):
+        revision = self.revision()
+        revision.status = 'producer_review'
+        revision.save()
+        self.client.force_login(User.objects.create_superuser('yonetici', 'yonetici@example.com', 'test-pass-123'))
+        response = self.client.get(reverse('center:admin_revision_list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Üretici İncelemesi')
+
+    def test_producer_mold_detail_colors_timeline_markers_by_status(self):
+        revision = self.revision()
+        revision.status = 'producer_review'
+        revision.save()
+        self.client.force_login(self.producer.user)
+        response = self.client.get(reverse('producer:mold_detail', args=[self.order.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'timeline-marker bg-warning')
+        self.assertContains(response, 'timeline-marker bg-primary')
+
+
+class RevisionEventBackfillTests(TransactionTestCase):
+    """0019 verisi: process_steps JSON geçmişinden olay satırları"""
+
+    migrate_from = [('mold', '0019_revision_events')]
+    migrate_to = [('mold', '0020_remove_revisionrequest_process_steps')]
+
+    def setUp(self):
+        center = make_center()
+        self.revision_id = RevisionRequest.objects.create(
+            modeled_mold=ModeledMold.objects.create(ear_mold=make_mold(center), file='modeled/test.stl'),
+            center=center, revision_type='other', title='Revizyon', description='Açıklama',
+        ).pk
+        self.executor = MigrationExecutor(connection)
+        self.executor.migrate(self.migrate_from)
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(self.migrate_to)
+
+    def test_status_steps_become_status_events(self):
+        apps = self.executor.loader.project_state(self.migrate_from).apps
+        OldRevision = apps.get_model('mold', 'RevisionRequest')
+        apps.get_model('mold', 'RevisionEvent').objects.all().delete()
+
+        base = timezone.now() - timedelta(days=3)
+        stamp = lambda hours: (base + timedelta(hours=hours)).isoformat()
+        OldRevision.objects.filter(pk=self.revision_id).update(
+            status='cancelled',
+            created_at=base,
+            # Tarih alanı sadece son ulaşmayı tutar; geçiş adımı varken kullanılmaz
+            producer_reviewed_at=base + timedelta(hours=5),
+            completed_at=base + timedelta(hours=9),
+            process_steps=[
+                {'step': 'Status Beklemede → Üretici İncelemesi', 'description': '', 'timestamp': stamp(1), 'user': 'System'},
+                {'step': 'Status Üretici İncelemesi → Kabul Edildi', 'description': '', 'timestamp': stamp(2), 'user': 'uretici'},
+                {'step': 'Model düzenlendi', 'description': 'Vent genişletildi', 'timestamp': stamp(3), 'user': 'uretici'},
+                {'step': 'Status Kabul Edildi → Üretici İncelemesi', 'description': '', 'timestamp': stamp(4), 'user': 'System'},
+                {'step': 'Status Üretici İncelemesi → İptal Edildi', 'description': '', 'timestamp': stamp(5), 'user': 'merkez'},
+            ],
+        )
+
+        module = importlib.import_module('mold.migrations.0019_revision_events')
+        module.backfill_revision_events(apps, None)
+
+        events = list(
+            apps.get_model('mold', 'RevisionEvent').objects.filter(revision_id=self.revision_id)
+            .order_by('created_at', 'id')
+            .values_list('event_type', 'from_status', 'to_status', 'user_name')
+        )
+        self.assertEqual(events, [
+            ('created', '', 'pending', 'System'),
+            ('status', 'pending', 'producer_review', 'System'),
+            ('status', 'producer_review', 'accepted', 'uretici'),
+            ('step', '', '', 'uretici'),
+            ('status', 'accepted', 'producer_review', 'System'),
+            ('status', 'producer_review', 'cancelled', 'merkez'),
+            # Geçiş adımı olmayan durum tarih alanından
+            ('status', '', 'completed', 'System'),
+        ])
@@ -6,6 +6,7 @@ app_name = 'mold'
 urlpatterns = [
     path('', views.mold_list, name='mold_list'),
     path('create/', views.mold_create, name='mold_create'),
+    path('api/create/', views.mold_create_api, name='mold_create_api'),
     path('<int:pk>/', views.mold_detail, name='mold_detail'),
     path('<int:pk>/edit/', views.mold_edit, name='mold_edit'),
     path('<int:pk>/delete/', views.mold_delete, name='mold_delete'),
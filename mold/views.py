@@ -11,6 +11,7 @@ from decimal import Decimal
 from .models import EarMold, Revision, QualityCheck, ModeledMold, RevisionRequest, MoldEvaluation
 from .forms import EarMoldForm, RevisionForm, QualityCheckForm, PhysicalShipmentForm, TrackingUpdateForm, RevisionRequestForm, MoldEvaluationForm
 from core.models import CargoShipment
+from core.order_intake import IntakeError, check_intake, create_mold_order, get_or_create_subscription
 from center.decorators import center_required
 from producer.models import Producer, ProducerOrder, ProducerNetwork
 from django.utils import timezone
@@ -20,11 +21,10 @@ from center.models import Center
 import logging
 import json
 import os
-import uuid
 from PIL import Image
 import tempfile
 from django.conf import settings
-from core.utils import send_success_notification, send_order_notification, send_system_notification
+from core.utils import send_order_notification, send_system_notification
 
 logger = logging.getLogger(__name__)
 
@@ -83,80 +83,41 @@ def mold_create(request):
     try:
         center = request.user.center
         
-        # Abonelik kontrolü - Yeni sistem
+        # Abonelik ve üretici ağı kontrolü
         try:
-            from core.models import UserSubscription, PricingPlan
-            subscription = UserSubscription.objects.filter(user=request.user).first()
-            
-            if not subscription:
-                # Standard planı oluştur
-                standard_plan = PricingPlan.objects.filter(plan_type='standard', is_active=True).first()
-                if standard_plan:
-                    subscription = UserSubscription.objects.create(
-                        user=request.user,
-                        plan=standard_plan,
-                        status='active'
-                    )
-                    messages.success(request, 
-                        f'✅ Aboneliğiniz başarıyla oluşturuldu! Aylık {standard_plan.monthly_fee_try} TL sistem kullanımı + kalıp başına {standard_plan.per_mold_price_try} TL ödeyerek sınırsız kalıp üretebilirsiniz.')
-                else:
-                    messages.error(request, 
-                        '❌ Abonelik planı bulunamadı. Lütfen yönetici ile iletişime geçin.')
-                    return redirect('center:dashboard')
-            
-            if not subscription.can_create_model():
-                messages.error(request, 
-                    '❌ Aboneliğiniz aktif değil. Lütfen aboneliğinizi kontrol edin.')
+            subscription, created = get_or_create_subscription(request.user)
+            if created:
+                messages.success(request, 
+                    f'✅ Aboneliğiniz başarıyla oluşturuldu! Aylık {subscription.plan.monthly_fee_try} TL sistem kullanımı + kalıp başına {subscription.plan.per_mold_price_try} TL ödeyerek sınırsız kalıp üretebilirsiniz.')
+            subscription, network = check_intake(center, subscription)
+        except IntakeError as e:
+            if e.code == 'no_network':
+                messages.error(request, f'🏭 {e}')
+                return redirect('center:network_management')
+            if e.code == 'inactive_subscription':
+                messages.error(request, f'❌ {e}')
                 return redirect('core:subscription_dashboard')
+            messages.error(request, f'❌ {e}')
+            return redirect('center:dashboard')
         except Exception as e:
             logger.error(f"Subscription check error: {str(e)}")
             messages.error(request, 
                 f'⚠️ Abonelik kontrolünde hata: {str(e)}')
             return redirect('center:dashboard')
         
-        # Üretici ağ kontrolü
-        active_networks = ProducerNetwork.objects.filter(
-            center=center,
-            status='active'
-        )
-        
-        if not active_networks.exists():
-            messages.error(request, 
-                '🏭 Kalıp siparişi verebilmek için bir üretici ağına katılmanız gerekiyor.')
-            return redirect('center:network_management')
-        
         if request.method == 'POST':
             form = EarMoldForm(request.POST, request.FILES, user=request.user)
             
             if form.is_valid():
                 try:
-                    # Kalıbı oluştur
-                    mold = form.save()
-                    
-                    # Kalıp için kullanılan fiyatları kaydet
-                    if mold.is_physical_shipment:
-                        # Paket planıysa ve hak varsa ücretsiz, yoksa tek kalıp ücreti
-                        if subscription.plan.plan_type == 'package' and subscription.package_credits > subscription.used_credits:
-                            mold.unit_price = Decimal('0.00')  # Paket hakkından kullanıldı
-                        else:
-                            mold.unit_price = subscription.plan.per_mold_price_try  # Tek kalıp ücreti
-                    else:
-                        mold.unit_price = Decimal('0.00')  # Dijital tarama için fiziksel ücret yok
-                    
-                    # 3D modelleme fiyatı
-                    if not mold.is_physical_shipment:
-                        mold.digital_modeling_price = subscription.plan.modeling_service_fee_try
-                    else:
-                        mold.digital_modeling_price = Decimal('0.00')
-                    
-                    mold.save()
-                    
-                    # Kalıp oluşturma maliyetini hesapla ve kaydet
-                    mold_cost = subscription.add_mold_usage(ear_mold=mold)
+                    # Kalıp, sipariş ve kullanım tek transaction içinde; bildirimler commit sonrası
+                    intake = create_mold_order(center, form.save(commit=False), subscription, network)
+                    mold, order, usage, producer = intake.mold, intake.order, intake.usage, intake.producer
 
-                    # Detaylı maliyet bilgisini hesapla
-                    physical_cost = subscription.plan.per_mold_price_try if mold.is_physical_shipment else 0
-                    digital_cost = subscription.plan.modeling_service_fee_try if not mold.is_physical_shipment else 0
+                    # Detaylı maliyet bilgisi
+                    mold_cost = usage.total_cost
+                    physical_cost = usage.physical_cost
+                    digital_cost = usage.digital_cost
 
                     # Maliyet bilgisini kullanıcıya göster
                     if physical_cost > 0 and digital_cost > 0:
@@ -171,69 +132,9 @@ def mold_create(request):
                     messages.info(request,
                         f'{cost_details} (Bu ay toplam: ₺{subscription.get_current_month_total()})')
                     
-                    # Üretici seç (şimdilik ilk aktif ağ)
-                    selected_network = active_networks.first()
-                    producer = selected_network.producer
-                    
-                    # Sipariş oluştur
-                    order = ProducerOrder.objects.create(
-                        producer=producer,
-                        center=center,
-                        ear_mold=mold,
-                        order_number=f'PRD-{uuid.uuid4().hex[:8].upper()}',
-                        status='received',
-                        priority=mold.priority,
-                        producer_notes=mold.special_instructions,
-                        estimated_delivery=timezone.now() + timezone.timedelta(
-                            days=7 if mold.priority == 'normal' else 
-                                 4 if mold.priority == 'high' else 2
-                        )
-                    )
-                    
-                    # Kalıp durumunu güncelle
-                    mold.status = 'processing'
-                    mold.save()
-                    
-                    # Bildirimler gönder
-                    try:
-                        # Üreticiye bildirim
-                        send_order_notification(
-                            producer.user,
-                            'Yeni Kalıp Siparişi',
-                            f'{center.name} merkezinden {mold.patient_name} {mold.patient_surname} '
-                            f'hastası için {mold.get_mold_type_display()} kalıbı siparişi aldınız. '
-                            f'Sipariş No: {order.order_number}',
-                            related_url=f'/producer/orders/{order.id}/',
-                            order_id=order.id
-                        )
-                        
-                        # Merkeze başarı bildirimi
-                        send_success_notification(
-                            request.user,
-                            'Kalıp Siparişi Oluşturuldu',
-                            f'Kalıbınız {producer.company_name} firmasına gönderildi. '
-                            f'Sipariş No: {order.order_number}. '
-                            f'Tahmini teslimat: {order.estimated_delivery.strftime("%d.%m.%Y")}',
-                            related_url=f'/mold/{mold.id}/'
-                        )
-                        
-                        # Admin'lere sistem bildirimi
-                        admin_users = User.objects.filter(is_superuser=True)
-                        for admin in admin_users:
-                            send_system_notification(
-                                admin,
-                                'Yeni Kalıp Siparişi',
-                                f'{center.name} merkezi tarafından {mold.get_mold_type_display()} '
-                                f'kalıbı oluşturuldu ve {producer.company_name} firmasına sipariş verildi.',
-                                related_url='/admin-panel/'
-                            )
-                    except Exception as e:
-                        logger.error(f"Notification error: {e}")
-                        # Bildirim hatası kalıp oluşturmayı etkilemesin
-                    
                     # Kota uyarıları
                     remaining_models = subscription.get_remaining_models()
-                    if subscription.plan.plan_type == 'trial' and remaining_models <= 2:
+                    if subscription.plan.plan_type == 'trial' and remaining_models is not None and remaining_models <= 2:
                         if remaining_models == 0:
                             messages.warning(request, 
                                 '🎯 Deneme paketiniz tükendi! '
@@ -272,7 +173,7 @@ def mold_create(request):
         # Template context
         context = {
             'form': form,
-            'active_networks': active_networks,
+            'active_networks': ProducerNetwork.objects.filter(center=center, status='active'),
             'subscription': subscription,
             'mold_price': subscription.plan.per_mold_price_try if subscription else 0,
             'monthly_fee': subscription.plan.monthly_fee_try if subscription else 0,
@@ -286,6 +187,51 @@ def mold_create(request):
         messages.error(request, 'Kalıp oluşturma sayfası yüklenirken bir hata oluştu.')
         return redirect('center:dashboard')
 
+@require_http_methods(["POST"])
+@login_required
+def mold_create_api(request):
+    """Kalıp siparişi API'si - formla aynı doğrulama ve sipariş alma servisi
+
+    multipart/form-data (dijital taramada scan_file ile) veya JSON gövde kabul eder.
+    """
+    center = getattr(request.user, 'center', None)
+    if center is None:
+        return JsonResponse({'error': 'Sadece işitme merkezi hesapları sipariş verebilir.'}, status=403)
+
+    if request.content_type == 'application/json':
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            return JsonResponse({'error': 'Geçersiz JSON gövdesi.'}, status=400)
+        if not isinstance(data, dict):
+            return JsonResponse({'error': 'JSON gövdesi bir nesne olmalı.'}, status=400)
+        files = None
+    else:
+        data, files = request.POST, request.FILES
+
+    form = EarMoldForm(data, files, user=request.user)
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors.get_json_data()}, status=400)
+
+    try:
+        intake = create_mold_order(center, form.save(commit=False))
+    except IntakeError as e:
+        return JsonResponse({'error': str(e), 'code': e.code}, status=409)
+
+    mold, order, usage = intake.mold, intake.order, intake.usage
+    return JsonResponse({
+        'mold_id': mold.id,
+        'status': mold.status,
+        'order_id': order.id,
+        'order_number': order.order_number,
+        'producer': intake.producer.company_name,
+        'estimated_delivery': order.estimated_delivery.isoformat(),
+        'used_package_credit': usage.used_package_credit,
+        'physical_cost': str(usage.physical_cost),
+        'digital_cost': str(usage.digital_cost),
+        'total_cost': str(usage.total_cost),
+    }, status=201)
+
 @login_required
 @center_required
 def mold_detail(request, pk):
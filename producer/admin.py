@@ -8,8 +8,9 @@ from .models import Producer, ProducerOrder, ProducerNetwork, ProducerProduction
 
 @admin.register(Producer)
 class ProducerAdmin(admin.ModelAdmin):
-    list_display = ('company_name', 'tax_number', 'phone', 'is_active', 'is_verified', 'get_orders_count', 'created_at')
+    list_display = ('company_name', 'tax_number', 'phone', 'is_active', 'is_verified', 'get_orders_count', 'get_rating', 'created_at')
     list_filter = ('is_active', 'is_verified', 'producer_type', 'created_at')
+    list_select_related = ('rating_stats',)
     search_fields = ('company_name', 'tax_number', 'contact_email', 'brand_name')
     readonly_fields = ('created_at', 'updated_at', 'last_activity', 'get_orders_count', 'get_network_centers_count')
     
@@ -53,6 +54,17 @@ class ProducerAdmin(admin.ModelAdmin):
         )
     get_orders_count.short_description = 'Siparişler'
     
+    def get_rating(self, obj):
+        """Ortalama değerlendirme puanı"""
+        stats = obj.get_rating_stats()
+        return format_html(
+            '<span class="badge bg-{}">{}/10</span> ({})',
+            stats.rating_color,
+            stats.average_rating,
+            stats.evaluation_count
+        )
+    get_rating.short_description = 'Puan'
+    
     def get_network_centers_count(self, obj):
         """Ağdaki merkez sayısı"""
         count = obj.network_centers.filter(status='active').count()
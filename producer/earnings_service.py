@@ -0,0 +1,282 @@
+"""
+Üretici Kazanç Hesaplama Servisi
+Sipariş kayıtlarında saklanan fiyatlar üzerinden ay ve merkez bazlı
+brüt, kesinti ve net kazançları tek bir gruplu sorgu ile hesaplar.
+"""
+from datetime import datetime
+from decimal import Decimal
+
+from django.db.models import Case, Count, DateTimeField, DecimalField, F, Q, Sum, Value, When
+from django.db.models.functions import Coalesce, TruncMonth
+from django.utils import timezone
+
+from .models import ProducerOrder
+
+
+MONTH_NAMES = {
+    1: 'Ocak', 2: 'Şubat', 3: 'Mart', 4: 'Nisan',
+    5: 'Mayıs', 6: 'Haziran', 7: 'Temmuz', 8: 'Ağustos',
+    9: 'Eylül', 10: 'Ekim', 11: 'Kasım', 12: 'Aralık'
+}
+
+# Fiziksel kalıplar: Üretici aldığı anda (received) hizmet başlamıştır
+# Dijital kalıplar: Teslim edildiğinde (delivered) hizmet tamamlanmıştır
+IN_PROGRESS_STATUSES = ['received', 'designing', 'production', 'quality_check', 'packaging', 'shipping']
+
+EARNED_ORDER_FILTER = (
+    Q(status='delivered') |
+    Q(status__in=IN_PROGRESS_STATUSES, ear_mold__is_physical_shipment=True)
+)
+
+# Kazancın hangi aya yazılacağı: teslim edilenler teslim tarihine,
+# işlemdeki fiziksel kalıplar sipariş tarihine göre
+EARNED_AT = Case(
+    When(status='delivered', actual_delivery__isnull=False, then=F('actual_delivery')),
+    default=F('created_at'),
+    output_field=DateTimeField(),
+)
+
+ZERO = Decimal('0.00')
+MONEY = DecimalField(max_digits=12, decimal_places=2)
+
+
+def month_bounds(year, month):
+    """Ayın başlangıç ve bir sonraki ayın başlangıç zamanlarını döndür"""
+    start = timezone.make_aware(datetime(year, month, 1))
+    if month == 12:
+        end = timezone.make_aware(datetime(year + 1, 1, 1))
+    else:
+        end = timezone.make_aware(datetime(year, month + 1, 1))
+    return start, end
+
+
+def last_months(limit, reference=None):
+    """Son `limit` ayı (yıl, ay) olarak yeniden eskiye döndür"""
+    reference = reference or timezone.localdate()
+    year, month = reference.year, reference.month
+    months = []
+    for _ in range(limit):
+        months.append((year, month))
+        month -= 1
+        if month == 0:
+            year -= 1
+            month = 12
+    return months
+
+
+class ProducerEarningsService:
+    """Üretici kazanç hesaplamaları"""
+
+    @staticmethod
+    def get_rates():
+        """Aktif fiyatlandırmadan komisyon oranlarını al"""
+        from core.models import PricingConfiguration
+
+        pricing = PricingConfiguration.get_active()
+        return {
+            'moldpark_fee_rate': Decimal(str(pricing.moldpark_commission_rate)) / Decimal('100'),
+            'credit_card_fee_rate': Decimal(str(pricing.credit_card_commission_rate)) / Decimal('100'),
+        }
+
+    @staticmethod
+    def earned_orders(producer, active_network_only=False):
+        """Kazanca sayılan siparişler (kazanç tarihi `earned_at` ile)"""
+        orders = ProducerOrder.objects.filter(producer=producer).filter(EARNED_ORDER_FILTER)
+        if active_network_only:
+            orders = orders.filter(
+                center__producer_networks__producer=producer,
+                center__producer_networks__status='active',
+            )
+        return orders.annotate(earned_at=EARNED_AT)
+
+    @staticmethod
+    def get_breakdown(producer, start=None, end=None, active_network_only=False, rates=None):
+        """
+        Ay ve merkez bazlı kazanç kırılımı - tek sorgu
+
+        Args:
+            producer: Producer nesnesi
+            start: Dahil başlangıç zamanı (None ise sınırsız)
+            end: Hariç bitiş zamanı (None ise sınırsız)
+            active_network_only: Sadece aktif ağdaki merkezleri dahil et
+            rates: get_rates() çıktısı (None ise aktif fiyatlandırmadan alınır)
+
+        Returns:
+            list: Her (ay, merkez) için sayılar ve tutarlar
+        """
+        rates = rates or ProducerEarningsService.get_rates()
+        physical = Q(ear_mold__is_physical_shipment=True)
+
+        orders = ProducerEarningsService.earned_orders(producer, active_network_only)
+        if start is not None:
+            orders = orders.filter(earned_at__gte=start)
+        if end is not None:
+            orders = orders.filter(earned_at__lt=end)
+
+        grouped = (
+            orders
+            .annotate(period=TruncMonth('earned_at'))
+            .values('period', 'center_id')
+            .annotate(
+                physical_count=Count('id', filter=physical),
+                digital_count=Count('id', filter=~physical),
+                physical_gross=Coalesce(Sum('price', filter=physical), Value(ZERO), output_field=MONEY),
+                digital_gross=Coalesce(Sum('price', filter=~physical), Value(ZERO), output_field=MONEY),
+            )
+            .order_by('-period', 'center_id')
+        )
+
+        rows = []
+        for row in grouped:
+            gross = row['physical_gross'] + row['digital_gross']
+            moldpark_fee = gross * rates['moldpark_fee_rate']
+            credit_card_fee = gross * rates['credit_card_fee_rate']
+            period = timezone.localtime(row['period']) if timezone.is_aware(row['period']) else row['period']
+            rows.append({
+                'year': period.year,
+                'month': period.month,
+                'center_id': row['center_id'],
+                'physical_count': row['physical_count'],
+                'digital_count': row['digital_count'],
+                'total_orders': row['physical_count'] + row['digital_count'],
+                'physical_gross': row['physical_gross'],
+                'digital_gross': row['digital_gross'],
+                'gross_revenue': gross,
+                'moldpark_fee': moldpark_fee,
+                'credit_card_fee': credit_card_fee,
+                'net_earnings': gross - moldpark_fee,
+            })
+        return rows
+
+    @staticmethod
+    def summarize(rows):
+        """Kırılım satırlarını tek bir toplamda birleştir"""
+        summary = {
+            'physical_count': 0,
+            'digital_count': 0,
+            'total_orders': 0,
+            'physical_gross': ZERO,
+            'digital_gross': ZERO,
+            'gross_revenue': ZERO,
+            'moldpark_fee': ZERO,
+            'credit_card_fee': ZERO,
+            'net_earnings': ZERO,
+        }
+        for row in rows:
+            for key in summary:
+                summary[key] += row[key]
+        return summary
+
+    @staticmethod
+    def get_center_totals(producer, active_network_only=True):
+        """Merkez bazlı toplam kazançlar - {center_id: özet}"""
+        rows = ProducerEarningsService.get_breakdown(producer, active_network_only=active_network_only)
+        by_center = {}
+        for row in rows:
+            by_center.setdefault(row['center_id'], []).append(row)
+        return {
+            center_id: ProducerEarningsService.summarize(center_rows)
+            for center_id, center_rows in by_center.items()
+        }
+
+    @staticmethod
+    def snapshot_summary(snapshot):
+        """Kapatılmış dönem defter kaydını summarize() biçiminde döndür"""
+        if snapshot is None:
+            return ProducerEarningsService.summarize([])
+        return {key: getattr(snapshot, key) for key in ProducerEarningsService.summarize([])}
+
+    @staticmethod
+    def get_snapshots(producer, months):
+        """Verilen (yıl, ay) listesindeki kapatılmış dönem kayıtları - {(yıl, ay): kayıt veya None}"""
+        from core.models import LedgerPeriod, ProducerLedgerSnapshot
+
+        closed = LedgerPeriod.closed_months(months)
+        if not closed:
+            return {}
+        snapshots = {
+            (row.period.year, row.period.month): row
+            for row in ProducerLedgerSnapshot.objects.filter(
+                producer=producer, period__status='closed', period__year__in={year for year, _ in closed}
+            ).select_related('period')
+        }
+        return {month: snapshots.get(month) for month in closed}
+
+    @staticmethod
+    def get_monthly_series(producer, limit=12, active_network_only=True):
+        """
+        Son `limit` ayın kazanç serisi - boş aylar sıfırla doldurulur
+
+        Tüm ağlar için (active_network_only=False) kapatılmış aylar mali
+        dönem defterinden okunur, canlı sorgu sadece son kapatılan aydan
+        sonrasına bakar. Defter tüm ağların toplamını sakladığı için aktif ağ
+        filtresinde bütün aylar canlı hesaplanır - aynı grafikte iki farklı
+        tanım karışmaz.
+        """
+        from core.ledger_service import get_closed_until
+
+        months = last_months(limit)
+        oldest_year, oldest_month = months[-1]
+        start, _ = month_bounds(oldest_year, oldest_month)
+
+        snapshots = {}
+        if not active_network_only:
+            snapshots = ProducerEarningsService.get_snapshots(producer, months)
+            closed_until = get_closed_until()
+            if closed_until and closed_until > start:
+                start = closed_until
+
+        rows = ProducerEarningsService.get_breakdown(
+            producer, start=start, active_network_only=active_network_only
+        )
+        by_month = {}
+        for row in rows:
+            by_month.setdefault((row['year'], row['month']), []).append(row)
+
+        series = []
+        for year, month in months:
+            if (year, month) in snapshots:
+                summary = ProducerEarningsService.snapshot_summary(snapshots[(year, month)])
+            else:
+                summary = ProducerEarningsService.summarize(by_month.get((year, month), []))
+            summary.update({
+                'year': year,
+                'month': month,
+                'month_name': MONTH_NAMES.get(month, ''),
+            })
+            series.append(summary)
+        return series
+
+    @staticmethod
+    def get_month_summary(producer, year, month, active_network_only=False):
+        """Belirtilen ayın kazanç özeti - kapatılmış aylar defterden okunur"""
+        if not active_network_only:
+            snapshots = ProducerEarningsService.get_snapshots(producer, [(year, month)])
+            if (year, month) in snapshots:
+                return ProducerEarningsService.snapshot_summary(snapshots[(year, month)])
+
+        start, end = month_bounds(year, month)
+        rows = ProducerEarningsService.get_breakdown(
+            producer, start=start, end=end, active_network_only=active_network_only
+        )
+        return ProducerEarningsService.summarize(rows)
+
+    @staticmethod
+    def get_totals(producer):
+        """Tüm zamanların kazanç toplamı - kapatılmış aylar defterden, sonrası canlı"""
+        from core.ledger_service import get_closed_until
+        from core.models import ProducerLedgerSnapshot
+
+        closed_until = get_closed_until()
+        summary = ProducerEarningsService.summarize(
+            ProducerEarningsService.get_breakdown(producer, start=closed_until)
+        )
+        if closed_until:
+            keys = list(summary)
+            closed = ProducerLedgerSnapshot.objects.filter(
+                producer=producer, period__status='closed'
+            ).aggregate(**{key: Sum(key) for key in keys})
+            for key in keys:
+                summary[key] += closed[key] or 0
+        summary['total_deductions'] = summary['moldpark_fee'] + summary['credit_card_fee']
+        return summary
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from producer.models import Producer, ProducerRatingStats
+
+
+class Command(BaseCommand):
+    help = 'Üretici değerlendirme özetlerini (ProducerRatingStats) MoldEvaluation kayıtlarından yeniden hesaplar'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--producer',
+            type=int,
+            help='Sadece belirtilen üretici ID için yeniden hesapla'
+        )
+
+    def handle(self, *args, **options):
+        producers = Producer.objects.all()
+        if options.get('producer'):
+            producers = producers.filter(pk=options['producer'])
+
+        self.stdout.write(self.style.WARNING('Üretici değerlendirme özetleri yeniden hesaplanıyor...'))
+
+        updated_count = 0
+        for producer in producers.iterator():
+            stats = ProducerRatingStats.rebuild(producer)
+            updated_count += 1
+            self.stdout.write(
+                f'[OK] {producer.company_name}: '
+                f'{stats.evaluation_count} değerlendirme, ortalama {stats.average_rating}/10'
+            )
+
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS(f'Toplam {updated_count} üretici güncellendi.'))
@@ -0,0 +1,55 @@
+# Generated by Django 4.2.23 on 2026-10-19 13:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_rating_stats(apps, schema_editor):
+    """Mevcut değerlendirmelerden üretici puan özetlerini oluştur"""
+    Producer = apps.get_model('producer', 'Producer')
+    ProducerRatingStats = apps.get_model('producer', 'ProducerRatingStats')
+    MoldEvaluation = apps.get_model('mold', 'MoldEvaluation')
+
+    for producer in Producer.objects.all():
+        totals = MoldEvaluation.objects.filter(
+            pk__in=MoldEvaluation.objects.filter(
+                mold__producer_orders__producer=producer
+            ).values('pk')
+        ).aggregate(
+            count=models.Count('id'),
+            quality=models.Sum('quality_score'),
+            speed=models.Sum('speed_score'),
+        )
+        ProducerRatingStats.objects.create(
+            producer=producer,
+            evaluation_count=totals['count'] or 0,
+            quality_score_sum=totals['quality'] or 0,
+            speed_score_sum=totals['speed'] or 0,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('producer', '0006_producerorder_price'),
+        ('mold', '0015_add_unit_price_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProducerRatingStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('evaluation_count', models.IntegerField(default=0, verbose_name='Değerlendirme Sayısı')),
+                ('quality_score_sum', models.IntegerField(default=0, verbose_name='Kalite Puanı Toplamı')),
+                ('speed_score_sum', models.IntegerField(default=0, verbose_name='Hız Puanı Toplamı')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Güncellenme Tarihi')),
+                ('producer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='rating_stats', to='producer.producer')),
+            ],
+            options={
+                'verbose_name': 'Üretici Değerlendirme Özeti',
+                'verbose_name_plural': 'Üretici Değerlendirme Özetleri',
+            },
+        ),
+        migrations.RunPython(populate_rating_stats, migrations.RunPython.noop),
+    ]
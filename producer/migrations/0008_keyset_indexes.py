@@ -0,0 +1,17 @@
+# Generated by Django 4.2.23 on 2026-10-19 14:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('producer', '0007_producerratingstats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='producerorder',
+            index=models.Index(fields=['producer', 'created_at', 'id'], name='producer_pr_produce_89f704_idx'),
+        ),
+    ]
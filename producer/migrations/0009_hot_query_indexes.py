@@ -0,0 +1,21 @@
+# Generated by Django 4.2.23 on 2026-10-19 14:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('producer', '0008_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='producerorder',
+            index=models.Index(fields=['producer', 'status', 'created_at'], name='order_producer_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='producerorder',
+            index=models.Index(condition=models.Q(('estimated_delivery__isnull', False)), fields=['status', 'estimated_delivery'], name='order_status_delivery_idx'),
+        ),
+    ]
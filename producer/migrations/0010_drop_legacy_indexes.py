@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """core.0002'deki ham SQL indeksleri model indeksleriyle (0009) kapsanıyor"""
+
+    dependencies = [
+        ('core', '0002_auto_20250618_1353'),
+        ('producer', '0009_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            "DROP INDEX IF EXISTS idx_order_producer_status;",
+            reverse_sql="CREATE INDEX IF NOT EXISTS idx_order_producer_status ON producer_producerorder(producer_id, status);"
+        ),
+        migrations.RunSQL(
+            "DROP INDEX IF EXISTS idx_producer_order_delivery;",
+            reverse_sql=(
+                "CREATE INDEX IF NOT EXISTS idx_producer_order_delivery ON producer_producerorder(estimated_delivery) "
+                "WHERE status IN ('received', 'designing', 'production', 'quality_check');"
+            )
+        ),
+    ]
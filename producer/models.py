@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Count, F, Sum
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator
 from center.models import Center
@@ -106,146 +107,57 @@ class Producer(models.Model):
         """Güvenlik kontrolü: Üretici asla admin olamaz"""
         return False
     
+    def get_rating_stats(self):
+        """Değerlendirme özet kaydı - yoksa boş (kaydedilmemiş) kayıt döner"""
+        try:
+            return self.rating_stats
+        except ProducerRatingStats.DoesNotExist:
+            return ProducerRatingStats(producer=self)
+
     def get_average_rating(self):
         """Ortalama değerlendirme puanını hesaplar"""
-        from mold.models import MoldEvaluation
-        evaluations = MoldEvaluation.objects.filter(
-            mold__producer_orders__producer=self
-        ).distinct()
-        
-        if not evaluations.exists():
-            return 0
-        
-        total_quality = sum(eval.quality_score for eval in evaluations)
-        total_speed = sum(eval.speed_score for eval in evaluations)
-        total_evaluations = evaluations.count()
-        
-        avg_quality = total_quality / total_evaluations
-        avg_speed = total_speed / total_evaluations
-        
-        return round((avg_quality + avg_speed) / 2, 1)
+        return self.get_rating_stats().average_rating
     
     def get_quality_rating(self):
         """Ortalama kalite puanını hesaplar"""
-        from mold.models import MoldEvaluation
-        evaluations = MoldEvaluation.objects.filter(
-            mold__producer_orders__producer=self
-        ).distinct()
-        
-        if not evaluations.exists():
-            return 0
-        
-        total_quality = sum(eval.quality_score for eval in evaluations)
-        return round(total_quality / evaluations.count(), 1)
+        return self.get_rating_stats().quality_rating
     
     def get_speed_rating(self):
         """Ortalama hız puanını hesaplar"""
-        from mold.models import MoldEvaluation
-        evaluations = MoldEvaluation.objects.filter(
-            mold__producer_orders__producer=self
-        ).distinct()
-        
-        if not evaluations.exists():
-            return 0
-        
-        total_speed = sum(eval.speed_score for eval in evaluations)
-        return round(total_speed / evaluations.count(), 1)
+        return self.get_rating_stats().speed_rating
     
     def get_total_evaluations(self):
         """Toplam değerlendirme sayısını döndürür"""
-        from mold.models import MoldEvaluation
-        return MoldEvaluation.objects.filter(
-            mold__producer_orders__producer=self
-        ).distinct().count()
+        return self.get_rating_stats().evaluation_count
     
     def get_rating_color(self):
         """Puan rengi döndürür"""
-        avg_rating = self.get_average_rating()
-        if avg_rating >= 8:
-            return 'success'
-        elif avg_rating >= 6:
-            return 'warning'
-        elif avg_rating > 0:
-            return 'danger'
-        else:
-            return 'secondary'
+        return self.get_rating_stats().rating_color
 
     def get_monthly_revenue(self, year=None, month=None):
         """Belirtilen ay için toplam geliri hesapla"""
-        from django.db.models import Q
-        from decimal import Decimal
+        from .earnings_service import ProducerEarningsService
 
         if not year or not month:
-            from datetime import date
-            current_date = date.today()
+            current_date = timezone.localdate()
             year = current_date.year
             month = current_date.month
 
-        # Ayın başlangıç ve bitiş tarihlerini hesapla
-        from datetime import date
-        start_date = date(year, month, 1)
-        if month == 12:
-            end_date = date(year + 1, 1, 1)
-        else:
-            end_date = date(year, month + 1, 1)
-
-        # Tamamlanan ve işlem gören siparişleri al
-        # Fiziksel kalıplar: Üretici aldığı anda (received) hizmet başlamıştır
-        # Dijital kalıplar: Teslim edildiğinde (delivered) hizmet tamamlanmıştır
-        completed_orders = self.orders.filter(
-            Q(status='delivered', actual_delivery__gte=start_date, actual_delivery__lt=end_date) |
-            Q(status__in=['received', 'designing', 'production', 'quality_check', 'packaging', 'shipping'],
-              ear_mold__is_physical_shipment=True, created_at__gte=start_date, created_at__lt=end_date)
-        ).select_related('ear_mold')
-
-        total_revenue = Decimal('0.00')
-        for order in completed_orders:
-            # Sipariş türüne göre fiyat belirle
-            if order.ear_mold.is_physical_shipment:
-                total_revenue += Decimal('450.00')  # Fiziksel kalıp (güncel fiyat)
-            else:
-                total_revenue += Decimal('50.00')  # 3D Modelleme hizmeti (güncel fiyat)
-
-        return total_revenue
+        return ProducerEarningsService.get_month_summary(self, year, month)['gross_revenue']
 
     def get_total_earnings(self):
         """Toplam kazançları hesapla"""
-        from django.db.models import Q
-        from decimal import Decimal
-
-        total_gross = Decimal('0.00')
-        total_completed_orders = 0
-
-        # Tamamlanan ve işlem gören siparişler
-        # Fiziksel kalıplar: Üretici aldığı anda hizmet başlar
-        # Dijital kalıplar: Teslim edildiğinde hizmet tamamlanır
-        completed_orders = self.orders.filter(
-            Q(status='delivered') |
-            Q(status__in=['received', 'designing', 'production', 'quality_check', 'packaging', 'shipping'],
-              ear_mold__is_physical_shipment=True)
-        ).select_related('ear_mold')
+        from .earnings_service import ProducerEarningsService
 
-        for order in completed_orders:
-            if order.ear_mold.is_physical_shipment:
-                total_gross += Decimal('450.00')  # Fiziksel kalıp (güncel fiyat)
-            else:
-                total_gross += Decimal('50.00')  # 3D Modelleme hizmeti (güncel fiyat)
-            total_completed_orders += 1
-
-        # Kesintiler
-        moldpark_fee = total_gross * Decimal('0.075')  # %7.5
-        credit_card_fee = total_gross * Decimal('0.03')  # %3 (güncel oran)
-        total_deductions = moldpark_fee + credit_card_fee
-
-        net_earnings = total_gross - total_deductions
+        totals = ProducerEarningsService.get_totals(self)
 
         return {
-            'total_orders': total_completed_orders,
-            'gross_revenue': total_gross,
-            'moldpark_fee': moldpark_fee,
-            'credit_card_fee': credit_card_fee,
-            'total_deductions': total_deductions,
-            'net_earnings': net_earnings
+            'total_orders': totals['total_orders'],
+            'gross_revenue': totals['gross_revenue'],
+            'moldpark_fee': totals['moldpark_fee'],
+            'credit_card_fee': totals['credit_card_fee'],
+            'total_deductions': totals['total_deductions'],
+            'net_earnings': totals['gross_revenue'] - totals['total_deductions']
         }
 
     def get_pending_payments(self):
@@ -264,71 +176,110 @@ class Producer(models.Model):
 
     def get_earnings_by_month(self, limit=12):
         """Son X ay için aylık kazançları döndür - Merkez bazlı ödeme takibi kullanarak"""
-        from datetime import date, timedelta
-        from decimal import Decimal
-        from django.db.models import Q
-        from mold.models import EarMold
-
-        earnings = []
-        current_date = date.today()
-
-        for i in range(limit):
-            target_date = current_date - timedelta(days=30 * i)
-            year = target_date.year
-            month = target_date.month
-            
-            # Ay başı ve sonu
-            if month == 12:
-                month_end = date(year + 1, 1, 1)
-            else:
-                month_end = date(year, month + 1, 1)
-            month_start = date(year, month, 1)
-            
-            # Merkez bazlı toplam brüt hesaplama
-            total_monthly_gross = Decimal('0.00')
-            
-            # Tüm aktif merkezler
-            active_networks = self.network_centers.filter(status='active')
-            
-            for network in active_networks:
-                center = network.center
-                
-                # Bu merkeze ait tamamlanan siparişler
-                completed_orders = self.orders.filter(
-                    center=center,
-                    created_at__gte=f'{month_start} 00:00:00',
-                    created_at__lte=f'{month_end} 00:00:00'
-                ).filter(
-                    Q(status='delivered') |  # Dijital
-                    Q(status__in=['received', 'designing', 'production', 'quality_check', 'packaging', 'shipping'],
-                      ear_mold__is_physical_shipment=True)  # Fiziksel
-                ).select_related('ear_mold')
-                
-                # Her siparişin brüt tutarı hesapla
-                for order in completed_orders:
-                    if order.ear_mold.is_physical_shipment:
-                        total_monthly_gross += Decimal('399.00')  # Fiziksel kalıp
-                    else:
-                        total_monthly_gross += Decimal('15.00')  # 3D modelleme
-
-            # Kesintiler - Sadece MoldPark hizmet bedeli (%7.5)
-            moldpark_fee = total_monthly_gross * Decimal('0.075')  # %7.5
-            net_earnings = total_monthly_gross - moldpark_fee
-
-            earnings.append({
-                'year': year,
-                'month': month,
-                'month_name': {
-                    1: 'Ocak', 2: 'Şubat', 3: 'Mart', 4: 'Nisan',
-                    5: 'Mayıs', 6: 'Haziran', 7: 'Temmuz', 8: 'Ağustos',
-                    9: 'Eylül', 10: 'Ekim', 11: 'Kasım', 12: 'Aralık'
-                }.get(month, ''),
-                'gross_revenue': total_monthly_gross,
-                'moldpark_fee': moldpark_fee,
-                'net_earnings': net_earnings
-            })
-
-        return earnings
+        from .earnings_service import ProducerEarningsService
+
+        return [
+            {
+                'year': row['year'],
+                'month': row['month'],
+                'month_name': row['month_name'],
+                'gross_revenue': row['gross_revenue'],
+                'moldpark_fee': row['moldpark_fee'],
+                'net_earnings': row['net_earnings']
+            }
+            for row in ProducerEarningsService.get_monthly_series(self, limit=limit)
+        ]
+
+
+class ProducerRatingStats(models.Model):
+    """Üretici Değerlendirme Özeti - MoldEvaluation kayıtlarından artımlı olarak güncellenir"""
+
+    producer = models.OneToOneField(Producer, on_delete=models.CASCADE, related_name='rating_stats')
+    evaluation_count = models.IntegerField('Değerlendirme Sayısı', default=0)
+    quality_score_sum = models.IntegerField('Kalite Puanı Toplamı', default=0)
+    speed_score_sum = models.IntegerField('Hız Puanı Toplamı', default=0)
+    updated_at = models.DateTimeField('Güncellenme Tarihi', auto_now=True)
+
+    class Meta:
+        verbose_name = 'Üretici Değerlendirme Özeti'
+        verbose_name_plural = 'Üretici Değerlendirme Özetleri'
+
+    def __str__(self):
+        return f'{self.producer.company_name} - {self.average_rating}/10 ({self.evaluation_count})'
+
+    @property
+    def quality_rating(self):
+        if not self.evaluation_count:
+            return 0
+        return round(self.quality_score_sum / self.evaluation_count, 1)
+
+    @property
+    def speed_rating(self):
+        if not self.evaluation_count:
+            return 0
+        return round(self.speed_score_sum / self.evaluation_count, 1)
+
+    @property
+    def average_rating(self):
+        if not self.evaluation_count:
+            return 0
+        avg_quality = self.quality_score_sum / self.evaluation_count
+        avg_speed = self.speed_score_sum / self.evaluation_count
+        return round((avg_quality + avg_speed) / 2, 1)
+
+    @property
+    def rating_color(self):
+        avg_rating = self.average_rating
+        if avg_rating >= 8:
+            return 'success'
+        elif avg_rating >= 6:
+            return 'warning'
+        elif avg_rating > 0:
+            return 'danger'
+        return 'secondary'
+
+    @classmethod
+    def apply_delta(cls, producer_ids, count=0, quality=0, speed=0):
+        """Verilen üreticilerin sayaçlarını F() ifadeleriyle güncelle"""
+        if not producer_ids or not (count or quality or speed):
+            return
+        existing = set(cls.objects.filter(producer_id__in=producer_ids).values_list('producer_id', flat=True))
+        missing = [pk for pk in producer_ids if pk not in existing]
+        if missing:
+            cls.objects.bulk_create(
+                [cls(producer_id=pk) for pk in missing],
+                ignore_conflicts=True
+            )
+        cls.objects.filter(producer_id__in=producer_ids).update(
+            evaluation_count=F('evaluation_count') + count,
+            quality_score_sum=F('quality_score_sum') + quality,
+            speed_score_sum=F('speed_score_sum') + speed,
+            updated_at=timezone.now(),
+        )
+
+    @classmethod
+    def rebuild(cls, producer):
+        """Üreticinin özetini değerlendirmelerden yeniden hesapla"""
+        from mold.models import MoldEvaluation
+
+        totals = MoldEvaluation.objects.filter(
+            pk__in=MoldEvaluation.objects.filter(
+                mold__producer_orders__producer=producer
+            ).values('pk')
+        ).aggregate(
+            count=Count('id'),
+            quality=Sum('quality_score'),
+            speed=Sum('speed_score'),
+        )
+        stats, _ = cls.objects.update_or_create(
+            producer=producer,
+            defaults={
+                'evaluation_count': totals['count'] or 0,
+                'quality_score_sum': totals['quality'] or 0,
+                'speed_score_sum': totals['speed'] or 0,
+            }
+        )
+        return stats
 
 
 class ProducerNetwork(models.Model):
@@ -452,17 +403,32 @@ class ProducerOrder(models.Model):
         verbose_name = 'Üretici Siparişi'
         verbose_name_plural = 'Üretici Siparişleri'
         ordering = ['-created_at']
+        indexes = [
+            # Keyset sayfalama: (created_at, id) imleci üretici bazında
+            models.Index(fields=['producer', 'created_at', 'id']),
+            # Üretici listelerinde durum sekmeleri
+            models.Index(fields=['producer', 'status', 'created_at'], name='order_producer_status_idx'),
+            # Geciken sipariş uyarıları - tahmini teslimatı olmayan siparişler indekse girmez
+            models.Index(
+                fields=['status', 'estimated_delivery'], name='order_status_delivery_idx',
+                condition=models.Q(estimated_delivery__isnull=False),
+            ),
+        ]
 
     def __str__(self):
         return f'{self.order_number} - {self.center.name}'
 
-    def calculate_price(self):
-        """Sipariş fiyatını hesapla"""
+    def calculate_price(self, pricing_plan=None):
+        """Sipariş fiyatını hesapla
+
+        Args:
+            pricing_plan: Fiyatın alınacağı plan - verilmezse ilk aktif plan okunur
+        """
         from core.models import PricingPlan
 
         # Aktif fiyatlandırma planını al
         try:
-            pricing_plan = PricingPlan.objects.filter(is_active=True).first()
+            pricing_plan = pricing_plan or PricingPlan.objects.filter(is_active=True).first()
             if not pricing_plan:
                 # Varsayılan fiyatlar
                 return 450.00 if self.ear_mold.is_physical_shipment else 50.00
@@ -0,0 +1,180 @@
+"""
+Üretici Ödeme Defteri Servisi
+Ağdaki merkezler için kazanç, kesinti ve fatura ödeme durumunu
+merkez başına sorgu çalıştırmadan gruplu sorgularla hazırlar.
+"""
+from django.core.paginator import Paginator
+from django.db.models import Count, F, Max, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+from core.models import Invoice
+
+from .earnings_service import MONEY, ZERO, ProducerEarningsService
+
+
+PENDING_INVOICE_STATUSES = ['issued', 'sent']
+
+INVOICE_TOTALS = {
+    'paid_amount': Coalesce(Sum('net_amount', filter=Q(status='paid')), Value(ZERO), output_field=MONEY),
+    'pending_amount': Coalesce(
+        Sum('net_amount', filter=Q(status__in=PENDING_INVOICE_STATUSES)), Value(ZERO), output_field=MONEY
+    ),
+    'invoices_count': Count('id'),
+    'latest_payment_date': Max('payment_date', filter=Q(status='paid')),
+}
+
+
+def _merge_invoice_totals(first, second):
+    """İki gruplu fatura sonucunu birleştir"""
+    if not first:
+        return second
+    if not second:
+        return first
+    dates = [d for d in (first['latest_payment_date'], second['latest_payment_date']) if d]
+    return {
+        'paid_amount': first['paid_amount'] + second['paid_amount'],
+        'pending_amount': first['pending_amount'] + second['pending_amount'],
+        'invoices_count': first['invoices_count'] + second['invoices_count'],
+        'latest_payment_date': max(dates) if dates else None,
+    }
+
+
+class ProducerPaymentLedger:
+    """Merkez bazlı üretici ödeme defteri"""
+
+    @staticmethod
+    def get_invoice_totals(centers):
+        """
+        Merkezlerin üretici faturalarını iki gruplu sorgu ile topla
+
+        Bir fatura merkez tarafından kesilmişse (issued_by_center) ya da
+        merkezin kullanıcısına aitse (user) o merkeze sayılır. İkinci sorgu
+        her iki koşulu da aynı merkez için sağlayan faturaları dışlar.
+
+        Returns:
+            dict: {center_id: {'paid_amount', 'pending_amount', 'invoices_count', 'latest_payment_date'}}
+        """
+        centers = list(centers)
+        if not centers:
+            return {}
+
+        base = Invoice.objects.filter(invoice_type='producer_invoice').order_by()
+
+        by_center = {
+            row['issued_by_center_id']: row
+            for row in base.filter(issued_by_center__in=centers)
+            .values('issued_by_center_id')
+            .annotate(**INVOICE_TOTALS)
+        }
+        by_user = {
+            row['user_id']: row
+            for row in base.filter(user_id__in=[center.user_id for center in centers])
+            .filter(Q(issued_by_center__isnull=True) | ~Q(issued_by_center__user_id=F('user_id')))
+            .values('user_id')
+            .annotate(**INVOICE_TOTALS)
+        }
+
+        totals = {}
+        for center in centers:
+            merged = _merge_invoice_totals(by_center.get(center.id), by_user.get(center.user_id))
+            if merged:
+                totals[center.id] = merged
+        return totals
+
+    @staticmethod
+    def build_row(network, earnings, invoices):
+        """Tek merkez için defter satırı"""
+        physical_molds = earnings['physical_count']
+        digital_molds = earnings['digital_count']
+
+        # İş kalemleri detayı
+        work_items = []
+        if physical_molds > 0:
+            work_items.append({
+                'name': 'Fiziksel Kalıp Üretimi',
+                'quantity': physical_molds,
+                'unit_price': earnings['physical_gross'] / physical_molds,
+                'total': earnings['physical_gross'],
+                'type': 'physical'
+            })
+        if digital_molds > 0:
+            work_items.append({
+                'name': '3D Modelleme Hizmeti',
+                'quantity': digital_molds,
+                'unit_price': earnings['digital_gross'] / digital_molds,
+                'total': earnings['digital_gross'],
+                'type': 'digital'
+            })
+
+        return {
+            'center': network.center,
+            'network': network,
+            'total_orders': earnings['total_orders'],
+            'physical_molds': physical_molds,
+            'digital_molds': digital_molds,
+            'work_items': work_items,
+            'gross_revenue': earnings['gross_revenue'],  # Brüt tutar (KDV dahil)
+            'moldpark_fee': earnings['moldpark_fee'],
+            'net_earnings': earnings['net_earnings'],
+            'paid_amount': invoices['paid_amount'],
+            'pending_amount': invoices['pending_amount'],
+            'invoices_count': invoices['invoices_count'],
+            'latest_payment_date': invoices['latest_payment_date'],
+        }
+
+    @staticmethod
+    def get_ledger(producer, page=None, per_page=25):
+        """
+        Aktif ağ merkezlerinin ödeme defteri
+
+        Kazançlar tüm aktif merkezler için tek gruplu sorguda, faturalar
+        yalnızca görüntülenen sayfadaki merkezler için iki gruplu sorguda
+        hesaplanır.
+
+        Args:
+            producer: Producer nesnesi
+            page: Merkez listesi sayfa numarası
+            per_page: Sayfa başına merkez sayısı
+
+        Returns:
+            dict: 'page_obj', 'rows' ve tüm merkezleri kapsayan 'totals'
+        """
+        networks = producer.network_centers.filter(status='active').select_related('center').order_by('center__name')
+        page_obj = Paginator(networks, per_page).get_page(page)
+
+        center_earnings = ProducerEarningsService.get_center_totals(producer)
+        empty_earnings = ProducerEarningsService.summarize([])
+        empty_invoices = {
+            'paid_amount': ZERO,
+            'pending_amount': ZERO,
+            'invoices_count': 0,
+            'latest_payment_date': None,
+        }
+
+        page_networks = list(page_obj.object_list)
+        invoice_totals = ProducerPaymentLedger.get_invoice_totals(network.center for network in page_networks)
+
+        rows = [
+            ProducerPaymentLedger.build_row(
+                network,
+                center_earnings.get(network.center_id, empty_earnings),
+                invoice_totals.get(network.center_id, empty_invoices),
+            )
+            for network in page_networks
+        ]
+
+        # Genel toplamlar sayfadan bağımsız - tüm aktif merkezler
+        all_earnings = ProducerEarningsService.summarize(center_earnings.values())
+        totals = {
+            'centers': page_obj.paginator.count,
+            'physical_molds': all_earnings['physical_count'],
+            'digital_molds': all_earnings['digital_count'],
+            'gross_revenue': all_earnings['gross_revenue'],
+            'net_earnings': all_earnings['net_earnings'],
+        }
+
+        return {
+            'page_obj': page_obj,
+            'rows': rows,
+            'totals': totals,
+        }
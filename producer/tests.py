@@ -1,3 +1,246 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.ledger_service import close_period
+from core.tests.factories import make_center, make_mold, make_network, make_order, make_producer
+
+from producer.earnings_service import ProducerEarningsService, month_bounds
+from producer.models import Producer, ProducerOrder, ProducerRatingStats
+
+
+def previous_month(today=None):
+    today = today or timezone.localdate()
+    return (today.year - 1, 12) if today.month == 1 else (today.year, today.month - 1)
+
+
+class ProducerRatingStatsTests(TestCase):
+    """Değerlendirme toplamları değerlendirme kaydedildikçe güncellenir"""
+
+    def setUp(self):
+        self.producer = make_producer()
+        self.center = make_center()
+        self.molds = [make_mold(self.center), make_mold(self.center)]
+        for mold in self.molds:
+            make_order(self.producer, self.center, mold, status='delivered')
+
+    def evaluate(self, mold, quality, speed):
+        from mold.models import MoldEvaluation
+
+        return MoldEvaluation.objects.create(
+            mold=mold, center=self.center, quality_score=quality, speed_score=speed,
+            overall_satisfaction=7,
+        )
+
+    def stats(self):
+        return ProducerRatingStats.objects.get(producer=self.producer)
+
+    def test_create_update_and_delete_adjust_totals(self):
+        first = self.evaluate(self.molds[0], 8, 6)
+        second = self.evaluate(self.molds[1], 10, 10)
+        stats = self.stats()
+        self.assertEqual((stats.evaluation_count, stats.quality_score_sum, stats.speed_score_sum), (2, 18, 16))
+
+        first.quality_score = 4
+        first.save()
+        self.assertEqual(self.stats().quality_score_sum, 14)
+
+        second.delete()
+        stats = self.stats()
+        self.assertEqual((stats.evaluation_count, stats.quality_score_sum, stats.speed_score_sum), (1, 4, 6))
+
+    def test_deleting_mold_removes_its_evaluation(self):
+        self.evaluate(self.molds[0], 8, 6)
+        self.molds[0].delete()
+        self.assertEqual(self.stats().evaluation_count, 0)
+
+    def test_rebuild_command_and_rating_reads(self):
+        self.evaluate(self.molds[0], 9, 7)
+        ProducerRatingStats.objects.all().delete()
+        self.assertEqual(self.producer.get_total_evaluations(), 0)
+
+        call_command('rebuild_producer_ratings', stdout=StringIO())
+
+        producer = Producer.objects.get(pk=self.producer.pk)
+        self.assertEqual(producer.get_total_evaluations(), 1)
+        self.assertEqual(producer.get_average_rating(), 8.0)
+        with self.assertNumQueries(1):
+            [item.get_average_rating() for item in Producer.objects.select_related('rating_stats')]
+
+
+class EarningsServiceTests(TestCase):
+    """Kazançlar siparişte saklanan fiyatlardan tek gruplu sorgu ile"""
+
+    def setUp(self):
+        self.producer = make_producer()
+        self.center = make_center()
+        make_network(self.producer, self.center)
+        make_order(self.producer, self.center, price=Decimal('400.00'))
+        make_order(self.producer, self.center, make_mold(self.center, physical=False),
+                   status='delivered', price=Decimal('20.00'))
+        # İşlemdeki dijital ve iptal edilen siparişler kazanca sayılmaz
+        make_order(self.producer, self.center, make_mold(self.center, physical=False),
+                   status='designing', price=Decimal('20.00'))
+        make_order(self.producer, self.center, status='cancelled', price=Decimal('75.00'))
+
+    def test_breakdown_groups_month_and_center_in_one_query(self):
+        rates = ProducerEarningsService.get_rates()
+        with self.assertNumQueries(1):
+            rows = ProducerEarningsService.get_breakdown(self.producer, rates=rates)
+
+        self.assertEqual(len(rows), 1)
+        row = rows[0]
+        self.assertEqual(row['center_id'], self.center.pk)
+        self.assertEqual((row['physical_count'], row['digital_count']), (1, 1))
+        self.assertEqual(row['physical_gross'], Decimal('400.00'))
+        self.assertEqual(row['digital_gross'], Decimal('20.00'))
+        self.assertEqual(row['moldpark_fee'], Decimal('420.00') * rates['moldpark_fee_rate'])
+        self.assertEqual(row['net_earnings'], row['gross_revenue'] - row['moldpark_fee'])
+
+    def test_delivered_order_is_earned_in_delivery_month(self):
+        year, month = previous_month()
+        start, _ = month_bounds(year, month)
+        order = make_order(self.producer, self.center, make_mold(self.center, physical=False),
+                           status='delivered', price=Decimal('30.00'))
+        ProducerOrder.objects.filter(pk=order.pk).update(actual_delivery=start + timedelta(days=1))
+
+        summary = ProducerEarningsService.get_month_summary(self.producer, year, month)
+        self.assertEqual(summary['gross_revenue'], Decimal('30.00'))
+        self.assertEqual(summary['digital_count'], 1)
+
+    def test_model_totals_delegate_to_service(self):
+        totals = self.producer.get_total_earnings()
+        self.assertEqual(totals['total_orders'], 2)
+        self.assertEqual(totals['gross_revenue'], Decimal('420.00'))
+        self.assertEqual(totals['net_earnings'], totals['gross_revenue'] - totals['total_deductions'])
+        self.assertEqual(self.producer.get_monthly_revenue(), Decimal('420.00'))
+
+    def test_center_totals_skip_inactive_networks(self):
+        other = make_center('Diger Merkez')
+        make_network(self.producer, other, status='terminated')
+        make_order(self.producer, other, price=Decimal('100.00'))
+
+        self.assertEqual(set(ProducerEarningsService.get_center_totals(self.producer)), {self.center.pk})
+        self.assertEqual(
+            set(ProducerEarningsService.get_center_totals(self.producer, active_network_only=False)),
+            {self.center.pk, other.pk},
+        )
+
+
+class MonthlySeriesLedgerTests(TestCase):
+    """Kapatılmış aylar defterden, açık aylar canlı sorgudan"""
+
+    def setUp(self):
+        self.producer = make_producer()
+        self.active_center = make_center('Aktif Merkez')
+        self.left_center = make_center('Ayrilan Merkez')
+        make_network(self.producer, self.active_center)
+        make_network(self.producer, self.left_center, status='terminated')
+
+        self.year, self.month = previous_month()
+        start, _ = month_bounds(self.year, self.month)
+        self.active_order = make_order(self.producer, self.active_center, price=Decimal('400.00'))
+        self.left_order = make_order(self.producer, self.left_center, price=Decimal('100.00'))
+        ProducerOrder.objects.update(created_at=start + timedelta(days=3))
+        close_period(self.year, self.month)
+
+    def series_row(self, **kwargs):
+        series = ProducerEarningsService.get_monthly_series(self.producer, limit=3, **kwargs)
+        return next(row for row in series if (row['year'], row['month']) == (self.year, self.month))
+
+    def test_snapshot_stores_all_network_totals(self):
+        snapshot = self.producer.ledger_rows.get()
+        self.assertEqual(snapshot.total_orders, 2)
+        self.assertEqual(snapshot.gross_revenue, Decimal('500.00'))
+
+    def test_all_network_series_reads_closed_month_from_snapshot(self):
+        ProducerOrder.objects.filter(pk=self.active_order.pk).update(price=Decimal('999.00'))
+        row = self.series_row(active_network_only=False)
+        self.assertEqual(row['gross_revenue'], Decimal('500.00'))
+        self.assertEqual(row['total_orders'], 2)
+
+    def test_active_network_series_does_not_mix_in_snapshot_totals(self):
+        row = self.series_row(active_network_only=True)
+        self.assertEqual(row['gross_revenue'], Decimal('400.00'))
+        self.assertEqual(row['total_orders'], 1)
+
+    def test_active_network_series_matches_month_summary(self):
+        summary = ProducerEarningsService.get_month_summary(
+            self.producer, self.year, self.month, active_network_only=True
+        )
+        self.assertEqual(self.series_row()['gross_revenue'], summary['gross_revenue'])
+
+    def test_open_month_is_computed_live(self):
+        make_order(self.producer, self.active_center, price=Decimal('50.00'))
+        today = timezone.localdate()
+        series = ProducerEarningsService.get_monthly_series(self.producer, limit=1, active_network_only=False)
+        self.assertEqual((series[0]['year'], series[0]['month']), (today.year, today.month))
+        self.assertEqual(series[0]['gross_revenue'], Decimal('50.00'))
+
+
+class PaymentLedgerTests(TestCase):
+
+    def setUp(self):
+        self.producer = make_producer()
+        self.centers = [make_center(f'Merkez {index}') for index in range(3)]
+        for center in self.centers:
+            make_network(self.producer, center)
+        make_order(self.producer, self.centers[0], price=Decimal('400.00'))
+        make_order(self.producer, self.centers[0], make_mold(self.centers[0], physical=False),
+                   status='delivered', price=Decimal('20.00'))
+        make_order(self.producer, self.centers[1], price=Decimal('100.00'))
+
+    def invoice(self, center, number, status, amount, **kwargs):
+        from core.models import Invoice
+
+        kwargs.setdefault('user', center.user)
+        return Invoice.objects.create(
+            invoice_number=number, invoice_type='producer_invoice', producer=self.producer,
+            status=status, net_amount=amount, total_amount=amount,
+            due_date=timezone.localdate(), **kwargs
+        )
+
+    def test_rows_and_totals(self):
+        from producer.payment_ledger import ProducerPaymentLedger
+
+        self.invoice(self.centers[0], 'F-1', 'paid', Decimal('300.00'), issued_by_center=self.centers[0])
+        self.invoice(self.centers[0], 'F-2', 'issued', Decimal('50.00'))
+        ledger = ProducerPaymentLedger.get_ledger(self.producer, per_page=2)
+
+        self.assertEqual(ledger['totals']['centers'], 3)
+        self.assertEqual(ledger['totals']['gross_revenue'], Decimal('520.00'))
+        self.assertEqual(ledger['totals']['physical_molds'], 2)
+        self.assertEqual(ledger['totals']['digital_molds'], 1)
+
+        rows = {row['center']: row for row in ledger['rows']}
+        self.assertEqual(set(rows), set(self.centers[:2]))
+        first = rows[self.centers[0]]
+        self.assertEqual(first['gross_revenue'], Decimal('420.00'))
+        # Merkezin kestiği ve merkez kullanıcısına ait fatura bir kez sayılır
+        self.assertEqual(first['invoices_count'], 2)
+        self.assertEqual(first['paid_amount'], Decimal('300.00'))
+        self.assertEqual(first['pending_amount'], Decimal('50.00'))
+        self.assertEqual([item['type'] for item in first['work_items']], ['physical', 'digital'])
+        self.assertEqual(rows[self.centers[1]]['invoices_count'], 0)
+
+    def test_ledger_page_ignores_inactive_networks(self):
+        from producer.payment_ledger import ProducerPaymentLedger
+
+        self.producer.network_centers.filter(center=self.centers[2]).update(status='suspended')
+        ledger = ProducerPaymentLedger.get_ledger(self.producer)
+        self.assertEqual(ledger['totals']['centers'], 2)
 
-# Create your tests here.
+    def test_pagination_links_keep_filters(self):
+        for index in range(30):
+            make_network(self.producer, make_center(f'Ek {index:02d}'))
+        self.client.force_login(self.producer.user)
+        response = self.client.get(reverse('producer:payments'), {'status': 'paid', 'center_page': 2, 'page': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['center_page_query'], 'status=paid&page=1')
+        self.assertEqual(response.context['invoice_page_query'], 'status=paid&center_page=2')
+        self.assertContains(response, 'href="?status=paid&amp;page=1&center_page=1"')
@@ -29,7 +29,9 @@ from core.utils import send_success_notification, send_order_notification, send_
 
 from center.models import Center
 
-from mold.models import EarMold, ModeledMold, RevisionRequest
+from mold.models import EarMold, ModeledMold, RevisionEvent, RevisionRequest
+
+from mold.revision_timeline import sla_summary
 
 from .models import Producer, ProducerOrder, ProducerNetwork, ProducerProductionLog
 
@@ -41,6 +43,10 @@ from .forms import (
 
 )
 
+from core.badge_counters import get_unread_broadcasts
+from core.keyset import grouped_counts, keyset_paginate, sum_counts
+from core.search import search_filter
+
 from core.models import Invoice
 
 import mimetypes
@@ -498,8 +504,7 @@ def producer_dashboard(request):
 
     
 
-    # MessageRecipient tablosu kaldırıldığı için broadcast hesaplaması yapma
-    unread_broadcast = 0
+    unread_broadcast = get_unread_broadcasts(request.user)
 
     
 
@@ -724,7 +729,7 @@ def order_list(request):
 
     producer = request.user.producer
 
-    orders = producer.orders.all()
+    orders = producer.orders.select_related('center__user', 'ear_mold')
 
     
 
@@ -762,17 +767,17 @@ def order_list(request):
 
     if search:
 
-        orders = orders.filter(
-
-            Q(order_number__icontains=search) |
+        orders = orders.filter(search_filter(search, 'order'))
 
-            Q(ear_mold__patient_name__icontains=search) |
-
-            Q(ear_mold__patient_surname__icontains=search) |
+    
 
-            Q(center__name__icontains=search)
+    # İstatistikler - tek gruplu sorgu
 
-        )
+    status_counts, counts_approximate = grouped_counts(
+        orders, 'status', name='producer_order_list',
+        params={'producer': producer.pk, 'status': status_filter, 'priority': priority_filter,
+                'center': center_filter, 'search': search},
+    )
 
     
 
@@ -784,10 +789,20 @@ def order_list(request):
 
     context = {
 
-        'orders': orders,
+        'orders': keyset_paginate(request, orders),
 
         'network_centers': network_centers,
 
+        'total_orders': sum_counts(status_counts),
+
+        'received_orders': sum_counts(status_counts, ['received']),
+
+        'production_orders': sum_counts(status_counts, ['designing', 'production', 'quality_check', 'packaging']),
+
+        'completed_orders': sum_counts(status_counts, ['shipping', 'delivered']),
+
+        'counts_approximate': counts_approximate,
+
     }
 
     
@@ -1267,43 +1282,39 @@ def mold_list(request):
 
     
 
-    # Arama - güvenli arama
+    # Arama - tam metin indeksi (hasta adı/soyadı, merkez, sipariş no)
 
     search = request.GET.get('search')
 
     if search:
 
-        producer_orders = producer_orders.filter(
+        producer_orders = producer_orders.filter(search_filter(search, 'order'))
 
-            Q(ear_mold__patient_name__icontains=search) |
+    
 
-            Q(ear_mold__patient_surname__icontains=search) |
+    # İstatistikler - tüm sekmeler tek gruplu sorgudan
 
-            Q(center__name__icontains=search) |
+    status_counts, counts_approximate = grouped_counts(
+        producer_orders, 'status', name='producer_mold_list',
+        params={'producer': producer.pk, 'status': status_filter, 'order_status': order_status_filter,
+                'center': center_filter, 'search': search},
+    )
 
-            Q(order_number__icontains=search)
+    total_orders = sum_counts(status_counts)
 
-        )
+    received_orders = sum_counts(status_counts, ['received'])
 
-    
+    production_orders = sum_counts(status_counts, ['designing', 'production', 'quality_check'])
 
-    # Sıralama
+    completed_orders = sum_counts(status_counts, ['delivered'])
 
-    producer_orders = producer_orders.order_by('-created_at')
+    pending_orders = sum_counts(status_counts, ['received', 'designing'])
 
     
 
-    # İstatistikler - güvenli hesaplama
+    # Sayfalama - (created_at, id) imleci ile, geçmiş ne kadar derin olursa olsun sabit maliyet
 
-    total_orders = producer_orders.count()
-
-    received_orders = producer_orders.filter(status='received').count()
-
-    production_orders = producer_orders.filter(status__in=['designing', 'production', 'quality_check']).count()
-
-    completed_orders = producer_orders.filter(status='delivered').count()
-
-    pending_orders = producer_orders.filter(status__in=['received', 'designing']).count()
+    page = keyset_paginate(request, producer_orders.prefetch_related('ear_mold__modeled_files'))
 
     
 
@@ -1333,7 +1344,9 @@ def mold_list(request):
 
         'producer': producer,
 
-        'producer_orders': producer_orders,  # Kalıplar değil, siparişler
+        'producer_orders': page,  # Kalıplar değil, siparişler
+
+        'page': page,
 
         'network_centers': network_centers,
 
@@ -1365,6 +1378,8 @@ def mold_list(request):
 
         'pending_orders': pending_orders,
 
+        'counts_approximate': counts_approximate,
+
         # Limit bilgileri
 
         'monthly_orders': monthly_orders,
@@ -1511,7 +1526,7 @@ def mold_detail(request, pk):
 
             modeled_mold__ear_mold=ear_mold
 
-        ).select_related('center').order_by('-created_at')
+        ).select_related('center').prefetch_related('events').order_by('-created_at')
 
         
 
@@ -1533,15 +1548,9 @@ def mold_detail(request, pk):
 
         
 
-        # Ortalama tamamlanma süresi hesapla
-
-        completed_revisions = all_revisions.filter(status='completed', completed_at__isnull=False)
-
-        if completed_revisions.exists():
+        # Ortalama tamamlanma süresi - revizyon olaylarından tek sorgu
 
-            total_days = sum([(r.completed_at.date() - r.created_at.date()).days for r in completed_revisions])
-
-            revision_stats['avg_completion_time'] = round(total_days / completed_revisions.count(), 1)
+        revision_stats['avg_completion_time'] = sla_summary(all_revisions).avg_completion_days
 
             
 
@@ -2348,7 +2357,9 @@ def mold_upload_result(request, pk):
 
             revision_completed = False
 
-            if revision_requests.exists():
+            previous_statuses = list(revision_requests.values_list('id', 'status'))
+
+            if previous_statuses:
 
                 # Revizyon taleplerini tamamlandı olarak işaretle
 
@@ -2360,6 +2371,10 @@ def mold_upload_result(request, pk):
 
                 )
 
+                # Toplu UPDATE save() çağırmaz - durum geçişlerini olay tablosuna ekle
+
+                RevisionEvent.record_status_change(previous_statuses, 'completed', request.user)
+
                 revision_completed = True
 
                 
@@ -2736,7 +2751,7 @@ def admin_producer_list(request):
 
     
 
-    producers = Producer.objects.all().order_by('-created_at')
+    producers = Producer.objects.select_related('rating_stats').order_by('-created_at')
 
     
 
@@ -3052,11 +3067,11 @@ def admin_mold_list(request):
 
     """Admin: Tüm Kalıpları Görüntüle"""
 
-    from django.core.paginator import Paginator
+    from django.db.models import Exists, OuterRef
 
     
 
-    molds = EarMold.objects.all().order_by('-created_at')
+    molds = EarMold.objects.select_related('center')
 
     
 
@@ -3086,7 +3101,8 @@ def admin_mold_list(request):
 
     if producer_filter:
 
-        molds = molds.filter(producer_orders__producer_id=producer_filter).distinct()
+        # JOIN + distinct yerine EXISTS - satır çoğalmaz, sayım gruplanabilir
+        molds = molds.filter(Exists(ProducerOrder.objects.filter(ear_mold=OuterRef('pk'), producer_id=producer_filter)))
 
     
 
@@ -3096,25 +3112,13 @@ def admin_mold_list(request):
 
     if search:
 
-        molds = molds.filter(
-
-            Q(patient_name__icontains=search) |
-
-            Q(patient_surname__icontains=search) |
-
-            Q(center__name__icontains=search)
-
-        )
+        molds = molds.filter(search_filter(search, 'mold'))
 
     
 
-    # Sayfalama
-
-    paginator = Paginator(molds, 20)  # Her sayfada 20 kalıp
+    # Sayfalama - (created_at, id) imleci ile
 
-    page_number = request.GET.get('page')
-
-    molds_page = paginator.get_page(page_number)
+    molds_page = keyset_paginate(request, molds.prefetch_related('producer_orders__producer'), per_page=20)
 
     
 
@@ -3126,15 +3130,17 @@ def admin_mold_list(request):
 
     
 
-    # İstatistikler
+    # İstatistikler - tüm kalıplar üzerinde tek gruplu sorgu
 
-    total_molds = EarMold.objects.count()
+    status_counts, counts_approximate = grouped_counts(EarMold.objects.all(), 'status', name='admin_mold_list')
 
-    processing_molds = EarMold.objects.filter(status='processing').count()
+    total_molds = sum_counts(status_counts)
 
-    completed_molds = EarMold.objects.filter(status='completed').count()
+    processing_molds = sum_counts(status_counts, ['processing'])
 
-    delivered_molds = EarMold.objects.filter(status='delivered').count()
+    completed_molds = sum_counts(status_counts, ['completed'])
+
+    delivered_molds = sum_counts(status_counts, ['delivered'])
 
     
 
@@ -3174,6 +3180,8 @@ def admin_mold_list(request):
 
         'delivered_molds': delivered_molds,
 
+        'counts_approximate': counts_approximate,
+
     }
 
     
@@ -3494,9 +3502,11 @@ def revision_request_respond(request, request_id):
 
                     'Üretici tarafından kabul edildi',
 
-                    'accepted',
+                    f'Kabul edildi. Tahmini teslim: {revision_request.expected_delivery.strftime("%d.%m.%Y")}. {response or ""}',
 
-                    f'Kabul edildi. Tahmini teslim: {revision_request.expected_delivery.strftime("%d.%m.%Y")}. {response or ""}'
+                    request.user,
+
+                    status='accepted'
 
                 )
 
@@ -3566,9 +3576,11 @@ def revision_request_respond(request, request_id):
 
                     'Üretici tarafından reddedildi',
 
-                    'producer_rejected',
+                    f'Red nedeni: {reason}',
+
+                    request.user,
 
-                    f'Red nedeni: {reason}'
+                    status='producer_rejected'
 
                 )
 
@@ -3684,9 +3696,11 @@ def revision_start_work(request, request_id):
 
                 'Revizyon çalışması başlatıldı',
 
-                'in_progress',
+                'Üretici revizyon çalışmasına başladı',
+
+                request.user,
 
-                'Üretici revizyon çalışmasına başladı'
+                status='in_progress'
 
             )
 
@@ -3872,9 +3886,11 @@ def revision_complete_work(request, request_id):
 
                 'Revizyon tamamlandı',
 
-                'completed',
+                f'Revize edilmiş dosya yüklendi: {revised_file.name}' + (f' - {revision_notes}' if revision_notes else ''),
 
-                f'Revize edilmiş dosya yüklendi: {revised_file.name}' + (f' - {revision_notes}' if revision_notes else '')
+                request.user,
+
+                status='completed'
 
             )
 
@@ -4280,43 +4296,33 @@ def producer_payment_detail(request, invoice_id):
 
 
 
-    # ��lgili sipari�xleri bul (bu fatura d��neminde tamamlanan)
+    # İlgili siparişler ve dönem kazancı (bu fatura döneminde tamamlanan)
+
+    from .earnings_service import ProducerEarningsService, month_bounds
 
     related_orders = []
 
-    if invoice.issue_date:
+    period_earnings = None
 
-        # Fatura ay��n��n ba�x�� ve sonu
+    if invoice.issue_date:
 
         year = invoice.issue_date.year
 
         month = invoice.issue_date.month
 
+        month_start, month_end = month_bounds(year, month)
 
 
-        from datetime import date
-
-        month_start = date(year, month, 1)
-
-        if month == 12:
 
-            month_end = date(year + 1, 1, 1)
-
-        else:
+        related_orders = ProducerEarningsService.earned_orders(producer).filter(
 
-            month_end = date(year, month + 1, 1)
+            earned_at__gte=month_start,
 
+            earned_at__lt=month_end
 
+        ).select_related('ear_mold').order_by("-earned_at")
 
-        related_orders = producer.orders.filter(
-
-            status="delivered",
-
-            actual_delivery__gte=month_start,
-
-            actual_delivery__lt=month_end
-
-        ).order_by("-actual_delivery")
+        period_earnings = ProducerEarningsService.get_month_summary(producer, year, month)
 
 
 
@@ -4328,6 +4334,8 @@ def producer_payment_detail(request, invoice_id):
 
         "related_orders": related_orders,
 
+        "period_earnings": period_earnings,
+
     }
 
 
@@ -4343,118 +4351,41 @@ def producer_payments(request):
     from django.db.models import Sum, Count, Q
     from datetime import datetime, date
 
-    # Kazanç verilerini al
-    earnings_this_month = producer.get_monthly_revenue()
+    from .earnings_service import ProducerEarningsService
+    from .payment_ledger import ProducerPaymentLedger
+
+    # Kazanç verilerini al - sipariş fiyatları üzerinden gruplu sorgular
+    today = timezone.localdate()
+    earnings_this_month = ProducerEarningsService.get_month_summary(producer, today.year, today.month)
     total_earnings = producer.get_total_earnings()
     monthly_earnings = producer.get_earnings_by_month(limit=6)
     pending_payments = producer.get_pending_payments()
 
     # Bu ay detayları (güncel oranlarla)
-    moldpark_fee_this_month = earnings_this_month * Decimal('0.075')  # Sadece %7.5 MoldPark hizmet bedeli
-    
     earnings_this_month = {
-        'gross_revenue': earnings_this_month,
-        'moldpark_fee': moldpark_fee_this_month,  # %7.5
-        'net_earnings': earnings_this_month - moldpark_fee_this_month  # Üreticinin net kazancı
+        'gross_revenue': earnings_this_month['gross_revenue'],
+        'moldpark_fee': earnings_this_month['moldpark_fee'],  # MoldPark hizmet bedeli
+        'net_earnings': earnings_this_month['net_earnings']  # Üreticinin net kazancı
     }
 
     # ============================================
     # MERKEZ BAZLI DETAYLI ÖDEME TAKİBİ
     # ============================================
     
-    # Tüm aktif merkezler
+    # Tüm aktif merkezler (filtre listesi için)
     active_centers = producer.network_centers.filter(status='active').select_related('center')
-    
-    # Her merkez için detaylı ödeme bilgisi
-    center_payment_details = []
-    
-    for network in active_centers:
-        center = network.center
-        
-        # Bu merkeze ait siparişler
-        center_orders = producer.orders.filter(center=center).select_related('ear_mold')
-        
-        # Tamamlanan ve işlem gören siparişler
-        # Fiziksel kalıplar: Üretici aldığı anda (received) hizmet başlamıştır
-        # Dijital kalıplar: Teslim edildiğinde (delivered) hizmet tamamlanmıştır
-        completed_orders = center_orders.filter(
-            Q(status='delivered') |  # Dijital kalıplar için teslim edilmiş
-            Q(status__in=['received', 'designing', 'production', 'quality_check', 'packaging', 'shipping'], 
-              ear_mold__is_physical_shipment=True)  # Fiziksel kalıplar için işlemde olanlar
-        )
-        
-        # Fiziksel ve dijital kalıp sayıları
-        physical_molds = completed_orders.filter(ear_mold__is_physical_shipment=True).count()
-        digital_molds = completed_orders.filter(ear_mold__is_physical_shipment=False).count()
-        
-        # Toplam kazanç hesaplama - Brüt tutarlar (KDV dahil)
-        total_gross = Decimal('0.00')
-        
-        for order in completed_orders:
-            if order.ear_mold.is_physical_shipment:
-                total_gross += Decimal('399.00')  # Fiziksel kalıp (KDV dahil)
-            else:
-                total_gross += Decimal('15.00')  # 3D modelleme (KDV dahil)
-        
-        # Kesintiler - BRÜT tutar (KDV dahil) üzerinden MoldPark hizmet bedeli
-        moldpark_fee = total_gross * Decimal('0.075')  # %7.5 MoldPark hizmet bedeli
-        net_earnings = total_gross - moldpark_fee  # Üreticinin net kazancı
-        
-        # Bu merkeze ait faturalar
-        center_invoices = Invoice.objects.filter(
-            Q(issued_by_center=center) | Q(user=center.user),
-            invoice_type='producer_invoice'
-        ).order_by('-issue_date')
-        
-        # Ödeme durumu
-        paid_amount = sum(inv.net_amount for inv in center_invoices.filter(status='paid') if inv.net_amount)
-        pending_amount = sum(inv.net_amount for inv in center_invoices.filter(status__in=['issued', 'sent']) if inv.net_amount)
-        
-        # İş kalemleri detayı
-        work_items = []
-        
-        # Fiziksel kalıplar
-        if physical_molds > 0:
-            work_items.append({
-                'name': 'Fiziksel Kalıp Üretimi',
-                'quantity': physical_molds,
-                'unit_price': Decimal('399.00'),
-                'total': physical_molds * Decimal('399.00'),
-                'type': 'physical'
-            })
-        
-        # Dijital 3D modelleme
-        if digital_molds > 0:
-            work_items.append({
-                'name': '3D Modelleme Hizmeti',
-                'quantity': digital_molds,
-                'unit_price': Decimal('15.00'),
-                'total': digital_molds * Decimal('15.00'),
-                'type': 'digital'
-            })
-        
-        center_payment_details.append({
-            'center': center,
-            'network': network,
-            'total_orders': completed_orders.count(),
-            'physical_molds': physical_molds,
-            'digital_molds': digital_molds,
-            'work_items': work_items,
-            'gross_revenue': total_gross,  # Brüt tutar (KDV dahil)
-            'moldpark_fee': moldpark_fee,
-            'net_earnings': net_earnings,
-            'paid_amount': paid_amount,
-            'pending_amount': pending_amount,
-            'invoices_count': center_invoices.count(),
-            'latest_payment_date': center_invoices.filter(status='paid').first().payment_date if center_invoices.filter(status='paid').exists() else None
-        })
-    
+
+    # Merkez bazlı ödeme defteri - gruplu sorgular, sayfalı
+    ledger = ProducerPaymentLedger.get_ledger(producer, page=request.GET.get('center_page'))
+    center_payment_details = ledger['rows']
+    center_page_obj = ledger['page_obj']
+
     # Toplam istatistikler
-    total_centers = active_centers.count()
-    total_physical_molds = sum(detail['physical_molds'] for detail in center_payment_details)
-    total_digital_molds = sum(detail['digital_molds'] for detail in center_payment_details)
-    total_gross_from_centers = sum(detail['gross_revenue'] for detail in center_payment_details)
-    total_net_from_centers = sum(detail['net_earnings'] for detail in center_payment_details)
+    total_centers = ledger['totals']['centers']
+    total_physical_molds = ledger['totals']['physical_molds']
+    total_digital_molds = ledger['totals']['digital_molds']
+    total_gross_from_centers = ledger['totals']['gross_revenue']
+    total_net_from_centers = ledger['totals']['net_earnings']
 
     # ============================================
     # FATURA LİSTESİ VE FİLTRELEME
@@ -4500,6 +4431,12 @@ def producer_payments(request):
         invoice_type__startswith='producer'
     ).dates('issue_date', 'year', order='DESC')
 
+    # Sayfa bağlantıları diğer sayfalamanın ve filtrelerin parametrelerini korur
+    center_page_params = request.GET.copy()
+    center_page_params.pop('center_page', None)
+    invoice_page_params = request.GET.copy()
+    invoice_page_params.pop('page', None)
+
     context = {
         'producer': producer,
         'earnings_this_month': earnings_this_month,
@@ -4519,6 +4456,9 @@ def producer_payments(request):
         'status_choices': Invoice.STATUS_CHOICES,
         # Merkez bazlı detaylar
         'center_payment_details': center_payment_details,
+        'center_page_obj': center_page_obj,
+        'center_page_query': center_page_params.urlencode(),
+        'invoice_page_query': invoice_page_params.urlencode(),
         'total_centers': total_centers,
         'total_physical_molds': total_physical_molds,
         'total_digital_molds': total_digital_molds,